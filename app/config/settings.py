@@ -27,6 +27,16 @@ class Settings(BaseSettings):
 
     # Database
     DATABASE_URL: str
+    DATABASE_REPLICA_URL: str = ""       # réplica de lectura para listados/estadísticas ("" = primaria)
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT_SECONDS: float = 30.0
+    DB_POOL_RECYCLE_SECONDS: int = 1800  # < idle timeout de PgBouncer/LB
+    DB_POOL_SLOW_CHECKOUT_MS: float = 100.0
+    DB_STATEMENT_CACHE_SIZE: int = 256   # prepared statements de asyncpg por conexión (0 = sin cache)
+    DB_QUERY_CACHE_SIZE: int = 1200      # SQL compilado cacheado por SQLAlchemy (por engine)
+    REPLICA_MAX_LAG_SECONDS: float = 5.0  # más atraso que esto -> las lecturas van a la primaria
+    REPLICA_CHECK_SECONDS: float = 2.0    # intervalo del chequeo de salud/lag de la réplica
 
     # JWT
     JWT_SECRET: str
@@ -35,7 +45,18 @@ class Settings(BaseSettings):
 
     # Opcional
     IA_BASE_URL: str = ""
-    WEBHOOK_SECRET: str = ""
+    WEBHOOK_SECRET: str = ""  # HMAC de los webhooks de inferencia (vacío = sin verificar)
+    WEBHOOK_TOLERANCE_SECONDS: int = 300  # ventana anti-replay del timestamp firmado
+    WEBHOOK_MAX_BODY_BYTES: int = 10 * 1024 * 1024
+    INFERENCE_REQUEST_TTL_HOURS: int = 72  # ventana de idempotencia de los webhooks de inferencia
+    INFERENCE_PRUNE_SECONDS: int = 3600
+    INFERENCE_BATCH_MAX_ITEMS: int = 5000  # items por request en /api/inferencia/resultados/batch
+    # Webhook asíncrono (202): workers que drenan inference_ingest
+    INFERENCE_INGEST_WORKERS: int = 4
+    INFERENCE_INGEST_BATCH: int = 20
+    INFERENCE_INGEST_POLL_SECONDS: float = 1.0
+    INFERENCE_INGEST_MAX_ATTEMPTS: int = 5
+    INFERENCE_INGEST_RETRY_MAX_SECONDS: float = 300.0
 
     FRONTEND_BASE_URL: str = "http://localhost:5173"
 
@@ -44,6 +65,73 @@ class Settings(BaseSettings):
     TWILIO_FROM_NUMBER: str = "REEMPLAZA"
     TWILIO_DEFAULT_TO_NUMBER: str = "REEMPLAZA"
 
+    # SMS outbox: "twilio" (API REST) o "fake" (local, sin red)
+    SMS_PROVIDER: str = "twilio"
+    SMS_HTTP_MAX_CONNECTIONS: int = 10
+    SMS_RATE_PER_MINUTE: float = 6.0     # por número destino
+    SMS_BURST: int = 3
+    SMS_MAX_ATTEMPTS: int = 5
+    SMS_RETRY_BASE_SECONDS: float = 5.0
+    SMS_RETRY_MAX_SECONDS: float = 600.0
+    OUTBOX_POLL_SECONDS: float = 2.0
+    OUTBOX_BATCH_SIZE: int = 50
+    OUTBOX_CLAIM_LEASE_SECONDS: float = 120.0  # un mensaje "enviando" sin resultado se retoma después de esto
+
+    # Notificaciones en tiempo real: "memory" (un proceso) o "postgres" (LISTEN/NOTIFY)
+    NOTIFY_BUS_BACKEND: str = "memory"
+    NOTIFY_BUS_CHANNEL: str = "notificaciones"
+    WS_SEND_QUEUE_SIZE: int = 100        # por conexión; se descarta el más viejo
+    WS_SEND_TIMEOUT_SECONDS: float = 5.0
+    WS_REPLAY_BUFFER_SIZE: int = 1000    # últimas notificaciones para since=<seq>
+    WS_REPLAY_MAX_ROWS: int = 500        # tope del replay desde la BD
+    WS_REPLAY_REORDER_WINDOW: int = 1000  # seq (ids) que un commit puede llegar atrasado; el replay arranca since - esto
+
+    # Particiones por tiempo de clips/eventos
+    PARTITION_INTERVAL: str = "day"      # "day" | "week"
+    PARTITION_PREMAKE: int = 7           # particiones creadas por adelantado
+    PARTITION_JOB_SECONDS: int = 3600
+    EVENTOS_RETENTION_DAYS: int = 0      # 0 = los eventos no se borran por antigüedad
+    EVENT_STATS_MAX_BUCKETS: int = 5000  # puntos por serie en /api/eventos/stats
+    EVENT_STATS_MINUTE_RETENTION_DAYS: int = 7   # buckets de minuto en eventos_stats (0 = no se borran)
+    EVENT_STATS_HOUR_RETENTION_DAYS: int = 180   # buckets de hora (los de día no se borran)
+    EXPORT_CHUNK_ROWS: int = 1000        # filas por fetch del cursor en /export de eventos y clips
+
+    # FFmpeg
+    FFMPEG_PATH: str = "ffmpeg"
+    FFMPEG_MAX_PROCS: int = 2            # procesos ffmpeg de decodificación simultáneos
+
+    # Snapshots de eventos (SnapshotWorker): miniaturas WebP alrededor del evento
+    SNAPSHOTS_PATH: str = "storage/snapshots"
+    SNAPSHOT_FRAMES: int = 3             # frames por evento, repartidos en su duración
+    SNAPSHOT_SPAN_MS: int = 2000         # duración usada si el evento no la tiene
+    SNAPSHOT_WIDTH: int = 320
+    SNAPSHOT_QUALITY: int = 70
+    SNAPSHOT_TIMEOUT_SECONDS: float = 20.0
+    SNAPSHOT_POLL_SECONDS: float = 2.0
+    SNAPSHOT_BATCH: int = 20
+    SNAPSHOT_LOOKBACK_HOURS: int = 6     # eventos más viejos sin snapshots no se procesan
+    SNAPSHOT_RESCAN_SECONDS: int = 300   # reintento de eventos cuyo clip aún no estaba en disco
+
+    # Sprites de scrub por clip (SpriteWorker): una imagen con un frame cada N segundos + WebVTT
+    SPRITES_PATH: str = "storage/sprites"
+    SPRITE_INTERVAL_SECONDS: int = 5     # segundos entre frames (crece en clips largos)
+    SPRITE_MAX_FRAMES: int = 200         # tope de frames por sprite
+    SPRITE_COLUMNS: int = 10
+    SPRITE_TILE_WIDTH: int = 160
+    SPRITE_TILE_HEIGHT: int = 90
+    SPRITE_QUALITY: int = 60
+    SPRITE_TIMEOUT_SECONDS: float = 120.0
+    SPRITE_PREBUILD: bool = True         # False = solo se generan al primer pedido
+    SPRITE_POLL_SECONDS: float = 10.0
+    SPRITE_BATCH: int = 10
+    SPRITE_LOOKBACK_HOURS: int = 6       # clips más viejos solo se generan al pedirlos
+
+    # Generación de reportes (ReportEngine)
+    REPORTS_PATH: str = "storage/reports"  # artefactos CSV/JSON/PDF cacheados por hash de filtros
+    REPORT_WORKERS: int = 2
+    REPORT_WINDOW_DAYS: int = 1          # días UTC por consulta de agregado (y paso del progreso)
+    REPORT_CACHE_SETTLE_SECONDS: float = 900.0  # tras el fin del rango, margen para eventos tardíos
+
     model_config = SettingsConfigDict(
         env_file=str(ENV_PATH),      # ← aquí el archivo dinámico
         env_file_encoding="utf-8",
@@ -9,12 +9,21 @@ import asyncio
 import os
 
 from app.shared.db import engine, Base
-from app.shared.db import AsyncSessionLocal
+from app.shared.db import AsyncSessionLocal, replica_monitor
 from app.survillance.ingestion.ws_event_consumer import run_ws_event_consumer, WsIngestSettings
 
 from app.config.settings import settings
 from app.survillance.ingestion.camera_supervisor import camera_supervisor
 from app.survillance.ingestion.retention_job import retention_job
+from app.survillance.ingestion.outbox_dispatcher import outbox_dispatcher
+from app.survillance.ingestion.partition_job import partition_job
+from app.survillance.ingestion.inference_prune_job import inference_prune_job
+from app.survillance.ingestion.inference_ingest_worker import inference_ingest_worker
+from app.survillance.ingestion.report_engine import report_engine
+from app.survillance.ingestion.snapshot_worker import snapshot_worker
+from app.survillance.ingestion.sprite_worker import sprite_worker
+from app.shared.services.email_service import email_queue
+from app.survillance.application.services.notification_ws_manager import manager as notification_ws_manager
 
 from app.survillance.interfaces.webSocket.notification_ws import router as notifications_ws_router
 
@@ -70,7 +79,23 @@ async def lifespan(app: FastAPI):
     else:
         print(f"{APP_ENV} mode: using Alembic migrations")
 
+    # Particiones de clips/eventos: las de hoy y las próximas deben existir antes de ingerir
+    try:
+        await partition_job.run_once()
+    except Exception as e:
+        print(f"Partition maintenance failed at startup: {e}")
+    await partition_job.start()
+    await replica_monitor.start()
+    await inference_prune_job.start()
+    await inference_ingest_worker.start()
+    await report_engine.start()
+    await snapshot_worker.start()
+    await sprite_worker.start()
+
     ws_task = background_ws_event_consumer()
+    await outbox_dispatcher.start()
+    await email_queue.start()
+    await notification_ws_manager.start()
 
     print("Application started successfully")
     try:
@@ -86,6 +111,16 @@ async def lifespan(app: FastAPI):
 
         await camera_supervisor.stop_all()
         await retention_job.stop()
+        await partition_job.stop()
+        await inference_prune_job.stop()
+        await inference_ingest_worker.stop()
+        await report_engine.stop()
+        await snapshot_worker.stop()
+        await sprite_worker.stop()
+        await outbox_dispatcher.stop()
+        await email_queue.stop()
+        await notification_ws_manager.stop()
+        await replica_monitor.stop()
         print("Application stopped")
 
 
@@ -116,7 +151,7 @@ app.add_middleware(
     allow_credentials=True,          # ok SIEMPRE que no uses "*"
     allow_methods=["*"],
     allow_headers=["*"],
-    expose_headers=["Content-Range", "Accept-Ranges"],  # <- el <video> los necesita
+    expose_headers=["Content-Range", "Accept-Ranges", "X-Next-Cursor"],  # <- el <video> los necesita; X-Next-Cursor para paginar
 )
 
 
@@ -0,0 +1,107 @@
+"""
+Exportación por streaming: filas (dicts de columnas) que llegan de un cursor
+del servidor se codifican a CSV o NDJSON y se envían en chunks de ~CHUNK_BYTES
+a medida que se producen. La memoria no depende de la cantidad de filas.
+
+Con gzip=True la salida se comprime al vuelo (zlib en modo gzip) y se baja
+como <archivo>.gz. Mismo formato de valores que los response_model: datetimes
+UTC en ISO 8601 con sufijo Z, decimales como string.
+"""
+import csv
+import io
+import zlib
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, Optional, Sequence
+
+from fastapi.responses import StreamingResponse
+
+from app.shared.responses import dumps
+
+EXPORT_FORMATS = ("csv", "ndjson")
+
+_MEDIA_TYPES = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson",
+}
+
+# Tamaño aproximado de cada chunk enviado (antes de comprimir)
+CHUNK_BYTES = 64 * 1024
+
+
+def _csv_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        text = value.isoformat()
+        return text[:-6] + "Z" if text.endswith("+00:00") else text
+    if isinstance(value, (list, tuple)):
+        return " ".join(str(item) for item in value)
+    return value
+
+
+async def _csv_chunks(
+    rows: AsyncIterator[Dict[str, Any]], columns: Sequence[str]
+) -> AsyncIterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    writer.writerow(columns)
+    async for row in rows:
+        writer.writerow([_csv_value(row[column]) for column in columns])
+        if buffer.tell() >= CHUNK_BYTES:
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue().encode("utf-8")
+
+
+async def _ndjson_chunks(
+    rows: AsyncIterator[Dict[str, Any]], columns: Sequence[str]
+) -> AsyncIterator[bytes]:
+    chunk = bytearray()
+    async for row in rows:
+        chunk += dumps({column: row[column] for column in columns})
+        chunk += b"\n"
+        if len(chunk) >= CHUNK_BYTES:
+            yield bytes(chunk)
+            chunk.clear()
+    yield bytes(chunk)
+
+
+async def _gzip(chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    async for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def export_response(
+    rows: AsyncIterator[Dict[str, Any]],
+    columns: Sequence[str],
+    formato: str,
+    filename: str,
+    gzip: bool = False,
+    headers: Optional[Dict[str, str]] = None,
+) -> StreamingResponse:
+    """
+    StreamingResponse que exporta `rows` (solo `columns`, en ese orden) como
+    CSV o NDJSON, opcionalmente comprimido con gzip.
+    """
+    if formato not in EXPORT_FORMATS:
+        raise ValueError(f"Formato de exportación no soportado: {formato}")
+
+    chunks = _csv_chunks(rows, columns) if formato == "csv" else _ndjson_chunks(rows, columns)
+    filename = f"{filename}.{formato}"
+    media_type = _MEDIA_TYPES[formato]
+    if gzip:
+        chunks = _gzip(chunks)
+        filename += ".gz"
+        media_type = "application/gzip"
+
+    return StreamingResponse(
+        chunks,
+        media_type=media_type,
+        headers={
+            "Content-Disposition": f'attachment; filename="{filename}"',
+            **(headers or {}),
+        },
+    )
@@ -0,0 +1,139 @@
+"""
+Utilidades para trabajar con FFmpeg.
+
+Los procesos ffmpeg que decodifican video son CPU-bound: corren acotados por
+un semáforo global (FFMPEG_MAX_PROCS), así una ráfaga de eventos no lanza un
+proceso por frame. Cada proceso tiene timeout y se mata si se cancela.
+"""
+import asyncio
+import logging
+import os
+from pathlib import Path
+from typing import Optional, Sequence, Tuple
+
+from app.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+_slots: Optional[asyncio.Semaphore] = None
+
+
+def _semaphore() -> asyncio.Semaphore:
+    global _slots
+    if _slots is None:
+        _slots = asyncio.Semaphore(max(1, settings.FFMPEG_MAX_PROCS))
+    return _slots
+
+
+async def run_ffmpeg(args: Sequence[str], timeout: float = 30.0) -> Tuple[bool, str]:
+    """
+    Ejecuta ffmpeg con `args` esperando un lugar en el semáforo.
+
+    Returns:
+        (éxito, final del stderr)
+    """
+    async with _semaphore():
+        process = await asyncio.create_subprocess_exec(
+            settings.FFMPEG_PATH, "-hide_banner", "-loglevel", "error", "-nostdin", *args,
+            stdout=asyncio.subprocess.DEVNULL,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        try:
+            _, stderr = await asyncio.wait_for(process.communicate(), timeout)
+        except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+            process.kill()
+            await process.wait()
+            if isinstance(e, asyncio.CancelledError):
+                raise
+            return False, f"timeout ({timeout}s)"
+        return process.returncode == 0, stderr.decode(errors="replace")[-500:]
+
+
+async def extract_frame_webp(
+    src: str,
+    ss: float,
+    out_path: Path,
+    width: int = 320,
+    quality: int = 70,
+    timeout: float = 20.0,
+) -> bool:
+    """
+    Extrae el frame en el segundo `ss` de `src` como miniatura WebP de `width` px
+    de ancho (alto proporcional). -ss antes de -i: busca el keyframe anterior y
+    decodifica solo hasta el instante pedido.
+    Escritura atómica: out_path aparece completo o no aparece.
+
+    Returns:
+        True si fue exitoso
+    """
+    tmp = out_path.with_name(out_path.name + ".tmp")
+    ok, error = await run_ffmpeg([
+        "-ss", f"{max(0.0, ss):.3f}",
+        "-i", src,
+        "-frames:v", "1",
+        "-an",
+        "-vf", f"scale={width}:-2",
+        "-c:v", "libwebp",
+        "-quality", str(quality),
+        "-f", "webp",
+        "-y", str(tmp),
+    ], timeout)
+
+    if ok and tmp.is_file() and tmp.stat().st_size > 0:
+        os.replace(tmp, out_path)
+        return True
+
+    tmp.unlink(missing_ok=True)
+    logger.warning("[FFMPEG] No se pudo extraer el frame %.3fs de %s: %s", ss, src, error.strip())
+    return False
+
+
+async def build_sprite_webp(
+    src: str,
+    out_path: Path,
+    interval: int,
+    columns: int,
+    rows: int,
+    width: int = 160,
+    height: int = 90,
+    quality: int = 60,
+    timeout: float = 120.0,
+) -> bool:
+    """
+    Arma una grilla `columns`x`rows` de frames de `src`, uno cada `interval`
+    segundos, en una sola imagen WebP. Cada celda mide exactamente
+    `width`x`height` (letterbox si el aspecto no coincide), así las
+    coordenadas del WebVTT no dependen del video.
+    -skip_frame nokey: solo se decodifican keyframes; para previews de scrub
+    alcanza y evita decodificar el clip entero.
+    Escritura atómica: out_path aparece completo o no aparece.
+
+    Returns:
+        True si fue exitoso
+    """
+    tmp = out_path.with_name(out_path.name + ".tmp")
+    filters = ",".join((
+        f"fps=1/{interval}",
+        f"scale={width}:{height}:force_original_aspect_ratio=decrease",
+        f"pad={width}:{height}:(ow-iw)/2:(oh-ih)/2",
+        f"tile={columns}x{rows}",
+    ))
+    ok, error = await run_ffmpeg([
+        "-skip_frame", "nokey",
+        "-i", src,
+        "-an",
+        "-vf", filters,
+        "-frames:v", "1",
+        "-c:v", "libwebp",
+        "-quality", str(quality),
+        "-f", "webp",
+        "-y", str(tmp),
+    ], timeout)
+
+    if ok and tmp.is_file() and tmp.stat().st_size > 0:
+        os.replace(tmp, out_path)
+        return True
+
+    tmp.unlink(missing_ok=True)
+    logger.warning("[FFMPEG] No se pudo armar el sprite de %s: %s", src, error.strip())
+    return False
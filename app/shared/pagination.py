@@ -0,0 +1,87 @@
+"""
+Paginación keyset (por cursor) para los endpoints de listado.
+
+El cursor es opaco para el cliente: base64url de la clave de orden de la
+última fila devuelta, p.e. (start_time_utc, id_clip). La página siguiente
+se pide con WHERE (start_time_utc, id_clip) < (:t, :id), que recorre el
+índice compuesto en vez de descartar OFFSET filas.
+"""
+import base64
+import json
+from datetime import datetime
+from typing import Any, Mapping, Optional, Sequence, Tuple, Type
+
+from fastapi import HTTPException, Response, status
+
+# Header con el cursor de la página siguiente (vacío/ausente = última página)
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+# OFFSET se mantiene por compatibilidad, pero acotado: las páginas profundas van por cursor
+MAX_OFFSET = 10_000
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    return value
+
+
+def _decode_value(value: Any) -> Any:
+    if isinstance(value, dict) and "dt" in value:
+        return datetime.fromisoformat(value["dt"])
+    return value
+
+
+def encode_cursor(*values: Any) -> str:
+    """Codifica la clave de orden de la última fila en un token opaco"""
+    raw = json.dumps([_encode_value(v) for v in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def _is_type(value: Any, type_: Type) -> bool:
+    # bool es subclase de int, pero nunca es una clave de orden válida
+    return isinstance(value, type_) and not isinstance(value, bool)
+
+
+def decode_cursor(token: Optional[str], *types: Type) -> Optional[Tuple[Any, ...]]:
+    """
+    Decodifica un cursor cuyos valores tienen los tipos de la clave keyset,
+    p.e. decode_cursor(token, datetime, int) para (start_time_utc, id_clip).
+    Lanza HTTP 400 si el token no es válido (incluido un tipo que no coincide,
+    que de otro modo llegaría a la consulta y fallaría como 500).
+    """
+    if not token:
+        return None
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        if not isinstance(values, list) or len(values) != len(types):
+            raise ValueError("tamaño de cursor inválido")
+        decoded = tuple(_decode_value(v) for v in values)
+        if not all(_is_type(value, type_) for value, type_ in zip(decoded, types)):
+            raise ValueError("tipo de valor de cursor inválido")
+        return decoded
+    except (ValueError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cursor inválido"
+        )
+
+
+def next_cursor(items: Sequence[Any], limit: int, *attrs: str) -> Optional[str]:
+    """
+    Cursor para la página siguiente, o None si la página vino incompleta.
+    `items` pueden ser entidades (atributos) o filas planas (dicts).
+    """
+    if not items or len(items) < limit:
+        return None
+    last = items[-1]
+    if isinstance(last, Mapping):
+        return encode_cursor(*(last[a] for a in attrs))
+    return encode_cursor(*(getattr(last, a) for a in attrs))
+
+
+def set_next_cursor(response: Response, cursor: Optional[str]) -> None:
+    """Publica el cursor de la página siguiente en el header X-Next-Cursor"""
+    if cursor:
+        response.headers[NEXT_CURSOR_HEADER] = cursor
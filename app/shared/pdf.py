@@ -0,0 +1,71 @@
+"""
+Escritor PDF mínimo para reportes de texto: páginas A4 con líneas en Courier
+(fuente estándar de PDF, no se embebe nada), sin dependencias externas.
+
+El texto se codifica en cp1252 (WinAnsiEncoding): cubre español; lo que no
+entra se reemplaza por '?'. Las líneas más largas que el ancho se cortan.
+"""
+from typing import Iterable, List
+
+# A4 en puntos y márgenes
+PAGE_WIDTH = 595
+PAGE_HEIGHT = 842
+MARGIN = 40
+
+FONT_SIZE = 8
+LEADING = 10
+# Courier: cada carácter mide 0.6 em
+MAX_CHARS = int((PAGE_WIDTH - 2 * MARGIN) / (FONT_SIZE * 0.6))
+LINES_PER_PAGE = int((PAGE_HEIGHT - 2 * MARGIN) / LEADING)
+
+
+def _escape(line: str) -> bytes:
+    text = line[:MAX_CHARS].encode("cp1252", errors="replace")
+    return text.replace(b"\\", b"\\\\").replace(b"(", b"\\(").replace(b")", b"\\)")
+
+
+def _content(lines: List[str]) -> bytes:
+    parts = [
+        b"BT",
+        b"/F1 %d Tf" % FONT_SIZE,
+        b"%d TL" % LEADING,
+        b"%d %d Td" % (MARGIN, PAGE_HEIGHT - MARGIN - FONT_SIZE),
+    ]
+    parts.extend(b"(" + _escape(line) + b") Tj T*" for line in lines)
+    parts.append(b"ET")
+    return b"\n".join(parts)
+
+
+def text_pdf(lines: Iterable[str]) -> bytes:
+    """Arma un PDF con las líneas dadas, paginando cada LINES_PER_PAGE"""
+    lines = list(lines) or [""]
+    pages = [lines[i:i + LINES_PER_PAGE] for i in range(0, len(lines), LINES_PER_PAGE)]
+
+    # 1 catálogo, 2 árbol de páginas, 3 fuente; después (página, contenido) por página
+    objects: List[bytes] = [b"", b"", b"<< /Type /Font /Subtype /Type1 /BaseFont /Courier "
+                                      b"/Encoding /WinAnsiEncoding >>"]
+    kids = []
+    for page in pages:
+        page_num = len(objects) + 1
+        content = _content(page)
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 %d %d] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>"
+            % (PAGE_WIDTH, PAGE_HEIGHT, page_num + 1)
+        )
+        objects.append(b"<< /Length %d >>\nstream\n" % len(content) + content + b"\nendstream")
+        kids.append(b"%d 0 R" % page_num)
+    objects[0] = b"<< /Type /Catalog /Pages 2 0 R >>"
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (b" ".join(kids), len(kids))
+
+    out = bytearray(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+    offsets = []
+    for num, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % num + body + b"\nendobj\n"
+
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    return bytes(out)
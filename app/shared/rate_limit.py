@@ -0,0 +1,73 @@
+"""
+Token bucket para limitar la tasa de envíos por clave (p.e. número destino).
+"""
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict
+
+
+@dataclass
+class TokenBucket:
+    """Bucket de `capacity` tokens que se recarga a `rate` tokens por segundo"""
+    rate: float
+    capacity: float
+    tokens: float = -1.0
+    updated_at: float = field(default_factory=time.monotonic)
+
+    def __post_init__(self):
+        if self.rate <= 0:
+            raise ValueError("rate debe ser > 0")
+        if self.capacity < 1:
+            raise ValueError("capacity debe ser >= 1")
+        if self.tokens < 0:
+            self.tokens = self.capacity
+
+    def _refill(self, now: float) -> None:
+        elapsed = max(0.0, now - self.updated_at)
+        self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+        self.updated_at = now
+
+    def try_acquire(self, now: float | None = None) -> float:
+        """
+        Intenta consumir un token.
+        Retorna 0.0 si se consumió, o los segundos a esperar hasta el próximo token.
+        """
+        now = time.monotonic() if now is None else now
+        self._refill(now)
+        if self.tokens >= 1.0:
+            self.tokens -= 1.0
+            return 0.0
+        return (1.0 - self.tokens) / self.rate
+
+
+class KeyedRateLimiter:
+    """Un TokenBucket por clave, creado bajo demanda"""
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.rate = rate
+        self.capacity = capacity
+        self._clock = clock
+        self._buckets: Dict[str, TokenBucket] = {}
+
+    def try_acquire(self, key: str) -> float:
+        """Igual que TokenBucket.try_acquire para el bucket de `key`"""
+        now = self._clock()
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = TokenBucket(self.rate, self.capacity, updated_at=now)
+            self._buckets[key] = bucket
+        return bucket.try_acquire(now)
+
+    def prune(self) -> None:
+        """Descarta buckets llenos (equivalentes a uno nuevo) para acotar memoria"""
+        now = self._clock()
+        for key in list(self._buckets):
+            bucket = self._buckets[key]
+            bucket._refill(now)
+            if bucket.tokens >= bucket.capacity:
+                del self._buckets[key]
@@ -0,0 +1,81 @@
+"""
+Respuesta JSON para los listados grandes: serializa con orjson filas que ya
+son primitivas (dicts de columnas), sin instanciar modelos Pydantic por fila.
+
+El formato de salida coincide con el de los response_model (datetimes UTC
+en ISO 8601 con sufijo Z). Si orjson no está instalado se usa json.
+`loads` es el parser equivalente para bodies crudos (webhooks por lotes).
+`cached_file_response` sirve archivos inmutables (miniaturas) con
+Cache-Control/ETag y responde 304 a los revalidados.
+"""
+import json
+import os
+from datetime import datetime
+from decimal import Decimal
+from typing import Any
+
+from fastapi import Request, Response
+from fastapi.responses import FileResponse
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - dependencia opcional
+    orjson = None
+
+
+def _isoformat(value: datetime) -> str:
+    text = value.isoformat()
+    return text[:-6] + "Z" if text.endswith("+00:00") else text
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return _isoformat(value)
+    if isinstance(value, Decimal):
+        # Igual que Pydantic: Decimal como string, sin perder precisión
+        return str(value)
+    raise TypeError(f"Tipo no serializable: {type(value).__name__}")
+
+
+def dumps(content: Any) -> bytes:
+    """Serializa `content` a JSON (bytes)"""
+    if orjson is not None:
+        return orjson.dumps(content, default=_default, option=orjson.OPT_UTC_Z)
+    return json.dumps(
+        content, default=_default, ensure_ascii=False, separators=(",", ":")
+    ).encode("utf-8")
+
+
+def loads(data: bytes) -> Any:
+    """Parsea JSON desde bytes (ValueError si es inválido)"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+class RowsJSONResponse(Response):
+    """JSONResponse para listas de filas primitivas (ver ClipRepository.list_rows)"""
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def cached_file_response(
+    request: Request,
+    path: str,
+    media_type: str,
+    cache_control: str,
+) -> Response:
+    """FileResponse con Cache-Control; 304 si el ETag del cliente coincide (If-None-Match)"""
+    response = FileResponse(
+        path,
+        media_type=media_type,
+        stat_result=os.stat(path),
+        headers={"Cache-Control": cache_control},
+    )
+    etag = response.headers["etag"]
+    if etag in {tag.strip() for tag in request.headers.get("if-none-match", "").split(",")}:
+        return Response(status_code=304, headers={"ETag": etag, "Cache-Control": cache_control})
+    return response
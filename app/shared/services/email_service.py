@@ -1,31 +1,303 @@
+import asyncio
+import logging
 import os
-import smtplib
+import random
+from dataclasses import dataclass, field
 from email.mime.text import MIMEText
 from email.utils import formataddr
+from pathlib import Path
+from typing import List, Optional, Protocol
+
 from dotenv import load_dotenv
 
+from app.shared.time import now_utc
+
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 SMTP_HOST = os.getenv("SMTP_HOST", "smtp.gmail.com")
 SMTP_PORT = int(os.getenv("SMTP_PORT", "587"))
 SMTP_USER = os.getenv("SMTP_USER")
 SMTP_PASSWORD = os.getenv("SMTP_PASSWORD")
 SMTP_FROM_NAME = os.getenv("SMTP_FROM_NAME", "Urban Sentinel App")
+SMTP_TIMEOUT = float(os.getenv("SMTP_TIMEOUT", "15"))
+
+# "smtp" (aiosmtplib, conexión persistente) o "local" (escribe .eml en disco)
+EMAIL_BACKEND = os.getenv("EMAIL_BACKEND", "smtp")
+EMAIL_LOCAL_DIR = os.getenv("EMAIL_LOCAL_DIR", "./outbox_emails")
+EMAIL_QUEUE_MAXSIZE = int(os.getenv("EMAIL_QUEUE_MAXSIZE", "1000"))
+EMAIL_BATCH_SIZE = int(os.getenv("EMAIL_BATCH_SIZE", "20"))
+EMAIL_MAX_ATTEMPTS = int(os.getenv("EMAIL_MAX_ATTEMPTS", "4"))
+EMAIL_RETRY_BASE_SECONDS = float(os.getenv("EMAIL_RETRY_BASE_SECONDS", "2"))
+# Tras este tiempo sin enviar nada se cierra la sesión SMTP (el servidor la cortaría igual)
+EMAIL_IDLE_CLOSE_SECONDS = float(os.getenv("EMAIL_IDLE_CLOSE_SECONDS", "60"))
 
 print("SMTP_USER (al iniciar):", repr(SMTP_USER))
 print("SMTP_PASSWORD (al iniciar, oculto):", "***" if SMTP_PASSWORD else None)
-def send_email(to_email: str, subject: str, html_body: str):
-    if not SMTP_USER or not SMTP_PASSWORD:
-        raise RuntimeError("SMTP_USER o SMTP_PASSWORD no configurados")
-
-    # Construir mensaje
-    msg = MIMEText(html_body, "html", "utf-8")
-    msg["Subject"] = subject
-    msg["From"] = formataddr((SMTP_FROM_NAME, SMTP_USER))
-    msg["To"] = to_email
-
-    # Enviar por SMTP (Gmail)
-    with smtplib.SMTP(SMTP_HOST, SMTP_PORT) as server:
-        server.starttls()  # TLS
-        server.login(SMTP_USER, SMTP_PASSWORD)
-        server.send_message(msg)
+
+
+@dataclass
+class EmailMessage:
+    to_email: str
+    subject: str
+    html_body: str
+    intentos: int = 0
+
+    def to_mime(self) -> MIMEText:
+        msg = MIMEText(self.html_body, "html", "utf-8")
+        msg["Subject"] = self.subject
+        msg["From"] = formataddr((SMTP_FROM_NAME, SMTP_USER or "no-reply@localhost"))
+        msg["To"] = self.to_email
+        return msg
+
+
+class EmailSink(Protocol):
+    """Destino final de los correos que drena la EmailQueue."""
+
+    async def send(self, message: EmailMessage) -> None:
+        ...
+
+    async def aclose(self) -> None:
+        ...
+
+
+class SmtpEmailSink:
+    """
+    Mantiene UNA sesión SMTP abierta (connect + STARTTLS + login una sola vez)
+    y la reutiliza para todos los envíos; si el servidor la corta, reconecta
+    en el siguiente envío.
+    """
+
+    def __init__(
+        self,
+        host: str = SMTP_HOST,
+        port: int = SMTP_PORT,
+        user: Optional[str] = SMTP_USER,
+        password: Optional[str] = SMTP_PASSWORD,
+        timeout: float = SMTP_TIMEOUT,
+    ) -> None:
+        self.host = host
+        self.port = port
+        self.user = user
+        self.password = password
+        self.timeout = timeout
+        self._smtp = None
+        self._lock = asyncio.Lock()
+
+    async def _connect(self):
+        if not self.user or not self.password:
+            raise RuntimeError("SMTP_USER o SMTP_PASSWORD no configurados")
+
+        import aiosmtplib
+
+        smtp = aiosmtplib.SMTP(
+            hostname=self.host,
+            port=self.port,
+            timeout=self.timeout,
+            start_tls=self.port != 465,
+            use_tls=self.port == 465,
+        )
+        await smtp.connect()
+        await smtp.login(self.user, self.password)
+        logger.info("[EMAIL] Sesión SMTP abierta con %s:%s", self.host, self.port)
+        return smtp
+
+    async def send(self, message: EmailMessage) -> None:
+        async with self._lock:
+            if self._smtp is None or not self._smtp.is_connected:
+                self._smtp = await self._connect()
+            try:
+                await self._smtp.send_message(message.to_mime())
+            except Exception:
+                # La sesión puede haber quedado en un estado inválido: se descarta
+                await self._close_locked()
+                raise
+
+    async def _close_locked(self) -> None:
+        smtp, self._smtp = self._smtp, None
+        if smtp is None:
+            return
+        try:
+            await smtp.quit()
+        except Exception:
+            smtp.close()
+
+    async def aclose(self) -> None:
+        async with self._lock:
+            await self._close_locked()
+
+
+@dataclass
+class LocalEmailSink:
+    """
+    Sink local para desarrollo/pruebas: no sale a la red.
+    Guarda cada correo en `sent` y, si hay `directory`, como .eml en disco.
+    """
+    directory: Optional[str] = None
+    sent: List[EmailMessage] = field(default_factory=list)
+
+    async def send(self, message: EmailMessage) -> None:
+        self.sent.append(message)
+        if self.directory:
+            path = Path(self.directory)
+            name = f"{now_utc():%Y%m%dT%H%M%S%f}_{len(self.sent):05d}.eml"
+            data = message.to_mime().as_bytes()
+            await asyncio.to_thread(_write_file, path, name, data)
+        logger.info("[EMAIL-LOCAL] %s <- %s", message.to_email, message.subject)
+
+    async def aclose(self) -> None:
+        return None
+
+
+def _write_file(directory: Path, name: str, data: bytes) -> None:
+    directory.mkdir(parents=True, exist_ok=True)
+    (directory / name).write_bytes(data)
+
+
+def build_email_sink() -> EmailSink:
+    """Crea el sink configurado en EMAIL_BACKEND ("smtp" | "local")."""
+    if EMAIL_BACKEND == "local":
+        return LocalEmailSink(directory=EMAIL_LOCAL_DIR)
+    return SmtpEmailSink()
+
+
+class EmailQueue:
+    """
+    Cola en memoria de correos salientes. Los handlers solo encolan; un worker
+    en segundo plano drena la cola en lotes sobre la sesión SMTP compartida y
+    reintenta los fallos con backoff.
+    """
+
+    def __init__(
+        self,
+        sink: Optional[EmailSink] = None,
+        maxsize: int = EMAIL_QUEUE_MAXSIZE,
+        batch_size: int = EMAIL_BATCH_SIZE,
+        max_attempts: int = EMAIL_MAX_ATTEMPTS,
+    ):
+        self.sink = sink
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.queue: asyncio.Queue[EmailMessage] = asyncio.Queue(maxsize=maxsize)
+        self.running = False
+        self.task: Optional[asyncio.Task] = None
+        self._retries: set[asyncio.Task] = set()
+
+    async def start(self):
+        """Inicia el worker de la cola"""
+        if self.running:
+            return
+
+        if self.sink is None:
+            self.sink = build_email_sink()
+        self.running = True
+        self.task = asyncio.create_task(self._run_loop())
+        logger.info("[EMAIL] Cola de correos iniciada (%s)", type(self.sink).__name__)
+
+    async def stop(self, drain_timeout: float = 10.0):
+        """Detiene el worker, intentando vaciar antes lo que quede en la cola"""
+        if not self.running:
+            return
+
+        self.running = False
+
+        for t in list(self._retries):
+            t.cancel()
+
+        if self.task:
+            try:
+                await asyncio.wait_for(self.queue.join(), timeout=drain_timeout)
+            except asyncio.TimeoutError:
+                logger.warning("[EMAIL] %s correos sin enviar al detener", self.queue.qsize())
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+
+        if self.sink:
+            await self.sink.aclose()
+
+        logger.info("[EMAIL] Cola de correos detenida")
+
+    async def enqueue(self, to_email: str, subject: str, html_body: str) -> bool:
+        """
+        Encola un correo sin esperar al envío.
+        Retorna False si la cola está llena (el correo se descarta).
+        """
+        message = EmailMessage(to_email=to_email, subject=subject, html_body=html_body)
+        try:
+            self.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            logger.warning("[EMAIL] Cola llena, se descarta correo para %s", to_email)
+            return False
+
+        if not self.running:
+            # Sin worker (p.ej. scripts): se arranca bajo demanda
+            await self.start()
+        return True
+
+    async def _next_batch(self) -> List[EmailMessage]:
+        """Espera al menos un correo y junta los que ya estén en cola"""
+        try:
+            first = await asyncio.wait_for(self.queue.get(), timeout=EMAIL_IDLE_CLOSE_SECONDS)
+        except asyncio.TimeoutError:
+            # Ocioso: se libera la sesión SMTP hasta el próximo correo
+            await self.sink.aclose()
+            return []
+
+        batch = [first]
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self.queue.get_nowait())
+            except asyncio.QueueEmpty:
+                break
+        return batch
+
+    async def _run_loop(self):
+        """Loop principal del worker"""
+        while True:
+            batch = await self._next_batch()
+            for message in batch:
+                try:
+                    await self.sink.send(message)
+                except Exception as e:
+                    self._handle_failure(message, e)
+                finally:
+                    self.queue.task_done()
+
+    def _handle_failure(self, message: EmailMessage, error: Exception) -> None:
+        message.intentos += 1
+        if message.intentos >= self.max_attempts or not self.running:
+            logger.error(
+                "[EMAIL] Correo a %s descartado tras %s intentos: %s",
+                message.to_email, message.intentos, error,
+            )
+            return
+
+        delay = EMAIL_RETRY_BASE_SECONDS * (2 ** (message.intentos - 1))
+        delay *= random.uniform(0.5, 1.0)
+        logger.warning(
+            "[EMAIL] Error enviando a %s (intento %s/%s), reintento en %.1fs: %s",
+            message.to_email, message.intentos, self.max_attempts, delay, error,
+        )
+        task = asyncio.create_task(self._requeue_later(message, delay))
+        self._retries.add(task)
+        task.add_done_callback(self._retries.discard)
+
+    async def _requeue_later(self, message: EmailMessage, delay: float) -> None:
+        await asyncio.sleep(delay)
+        try:
+            self.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            logger.warning("[EMAIL] Cola llena, se descarta reintento para %s", message.to_email)
+
+
+# Instancia global de la cola
+email_queue = EmailQueue()
+
+
+async def send_email(to_email: str, subject: str, html_body: str) -> bool:
+    """Encola un correo en la cola global; el envío real ocurre en segundo plano."""
+    return await email_queue.enqueue(to_email, subject, html_body)
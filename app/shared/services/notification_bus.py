@@ -0,0 +1,162 @@
+# app/shared/services/notification_bus.py
+"""
+Bus pub/sub para repartir notificaciones entre procesos (workers de uvicorn).
+
+- InMemoryNotificationBus: un solo proceso, entrega directa (dev / tests).
+- PostgresNotificationBus: LISTEN/NOTIFY sobre una conexión asyncpg dedicada;
+  cada proceso escucha el canal y entrega a sus propios WebSockets.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+from typing import Any, Awaitable, Callable, Optional, Protocol
+
+from app.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+# mensaje {"topics": [...], "confianza": float|None, "payload": {...}} -> entrega local
+BusHandler = Callable[[dict], Awaitable[None]]
+
+# NOTIFY rechaza payloads de 8000 bytes o más
+PG_NOTIFY_MAX_BYTES = 7900
+
+
+class NotificationBus(Protocol):
+    async def start(self, handler: BusHandler) -> None:
+        ...
+
+    async def publish(self, message: dict) -> None:
+        ...
+
+    async def stop(self) -> None:
+        ...
+
+
+class InMemoryNotificationBus:
+    """Bus local: publish entrega directamente al handler de este proceso."""
+
+    def __init__(self) -> None:
+        self._handler: Optional[BusHandler] = None
+
+    async def start(self, handler: BusHandler) -> None:
+        self._handler = handler
+
+    async def publish(self, message: dict) -> None:
+        if self._handler is not None:
+            await self._handler(message)
+
+    async def stop(self) -> None:
+        self._handler = None
+
+
+def _asyncpg_dsn(database_url: str) -> str:
+    """postgresql+asyncpg://... -> postgresql://... (asyncpg no entiende el dialecto)"""
+    scheme, sep, rest = database_url.partition("://")
+    return f"{scheme.split('+', 1)[0]}{sep}{rest}"
+
+
+class PostgresNotificationBus:
+    """
+    Bus sobre LISTEN/NOTIFY. Usa dos conexiones propias (fuera del pool de
+    SQLAlchemy): una queda en LISTEN y otra publica con pg_notify. Si la
+    conexión de escucha se cae, un supervisor la reabre.
+    """
+
+    def __init__(
+        self,
+        dsn: str,
+        channel: str = "notificaciones",
+        reconnect_seconds: float = 2.0,
+    ) -> None:
+        self.dsn = dsn
+        self.channel = channel
+        self.reconnect_seconds = reconnect_seconds
+        self._handler: Optional[BusHandler] = None
+        self._listen_conn: Any = None
+        self._publish_conn: Any = None
+        self._publish_lock = asyncio.Lock()
+        self._supervisor: Optional[asyncio.Task] = None
+        self._pending: set[asyncio.Task] = set()
+
+    async def start(self, handler: BusHandler) -> None:
+        self._handler = handler
+        await self._listen()
+        self._supervisor = asyncio.create_task(self._supervise())
+        logger.info("[BUS] LISTEN %s", self.channel)
+
+    async def _listen(self) -> None:
+        import asyncpg
+
+        conn = await asyncpg.connect(self.dsn)
+        await conn.add_listener(self.channel, self._on_notify)
+        self._listen_conn = conn
+
+    async def _supervise(self) -> None:
+        """Reabre la conexión de LISTEN si se cerró (reinicio de Postgres, red, ...)"""
+        while True:
+            await asyncio.sleep(self.reconnect_seconds)
+            if self._listen_conn is not None and not self._listen_conn.is_closed():
+                continue
+            try:
+                await self._listen()
+                logger.info("[BUS] LISTEN %s restablecido", self.channel)
+            except Exception as e:
+                logger.warning("[BUS] No se pudo reconectar LISTEN: %s", e)
+
+    def _on_notify(self, _conn, _pid, _channel, raw: str) -> None:
+        try:
+            message = json.loads(raw)
+        except ValueError:
+            message = None
+        if not isinstance(message, dict) or "payload" not in message:
+            logger.warning("[BUS] Mensaje inválido en %s: %.200s", self.channel, raw)
+            return
+        if self._handler is None:
+            return
+        task = asyncio.create_task(self._handler(message))
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+    async def publish(self, message: dict) -> None:
+        raw = json.dumps(message, default=str)
+        if len(raw.encode("utf-8")) > PG_NOTIFY_MAX_BYTES:
+            # Demasiado grande para NOTIFY: solo llega a los clientes de este proceso
+            logger.warning("[BUS] Mensaje para %s excede NOTIFY, entrega solo local", message.get("topics"))
+            if self._handler is not None:
+                await self._handler(message)
+            return
+
+        import asyncpg
+
+        async with self._publish_lock:
+            if self._publish_conn is None or self._publish_conn.is_closed():
+                self._publish_conn = await asyncpg.connect(self.dsn)
+            await self._publish_conn.execute("SELECT pg_notify($1, $2)", self.channel, raw)
+
+    async def stop(self) -> None:
+        if self._supervisor:
+            self._supervisor.cancel()
+            try:
+                await self._supervisor
+            except asyncio.CancelledError:
+                pass
+            self._supervisor = None
+
+        for conn in (self._listen_conn, self._publish_conn):
+            if conn is not None and not conn.is_closed():
+                await conn.close()
+        self._listen_conn = self._publish_conn = None
+        self._handler = None
+
+
+def build_notification_bus() -> NotificationBus:
+    """Crea el bus configurado en settings.NOTIFY_BUS_BACKEND ("memory" | "postgres")."""
+    if settings.NOTIFY_BUS_BACKEND == "postgres":
+        return PostgresNotificationBus(
+            _asyncpg_dsn(settings.DATABASE_URL),
+            channel=settings.NOTIFY_BUS_CHANNEL,
+        )
+    return InMemoryNotificationBus()
@@ -1,16 +1,18 @@
-# app/shared/infra/sms/twilio_sms_service.py
+# app/shared/services/sms_service.py
 from __future__ import annotations
 
-import asyncio
 import logging
-from dataclasses import dataclass
-from typing import Optional
+from dataclasses import dataclass, field
+from typing import List, Optional, Protocol
+
+import httpx
 
-from twilio.rest import Client
 from app.config.settings import settings
 
 logger = logging.getLogger(__name__)
 
+TWILIO_API_BASE = "https://api.twilio.com/2010-04-01"
+
 
 @dataclass
 class TwilioSmsResult:
@@ -18,70 +20,112 @@ class TwilioSmsResult:
     sid: Optional[str]
     success: bool
     error: Optional[Exception] = None
+    # False si reintentar no tiene sentido (número inválido, credenciales, ...)
+    retryable: bool = True
+
+
+class SmsProvider(Protocol):
+    """Proveedor de SMS usado por el dispatcher del outbox."""
+
+    async def send(self, to: str, body: str) -> TwilioSmsResult:
+        ...
+
+    async def aclose(self) -> None:
+        ...
 
 
-class TwilioSmsService:
+class TwilioHttpSmsProvider:
     """
-    Servicio para enviar SMS con Twilio, con reintentos.
-    Lo puedes reutilizar desde cualquier parte de la app.
+    Envía SMS con la API REST de Twilio sobre un httpx.AsyncClient compartido,
+    así las conexiones TLS se reutilizan entre envíos y nada bloquea el event loop.
     """
 
-    def __init__(self) -> None:
-        self._client = Client(
-            settings.TWILIO_ACCOUNT_SID,
-            settings.TWILIO_AUTH_TOKEN,
-        )
-        self._from_number = settings.TWILIO_FROM_NUMBER
-        self._default_to_number = settings.TWILIO_DEFAULT_TO_NUMBER
-
-    async def send_alert_sms(
+    def __init__(
         self,
-        body: str,
-        to: Optional[str] = None,
+        account_sid: str,
+        auth_token: str,
+        from_number: str,
         *,
-        max_retries: int = 1,
-    ) -> TwilioSmsResult:
-        """
-        Envía un SMS y hace hasta max_retries reintentos si falla.
-        Devuelve un TwilioSmsResult con info de éxito/error.
-        """
-        dest = to or self._default_to_number
-        if not dest:
-            raise ValueError("No hay número de destino configurado para SMS")
-
-        loop = asyncio.get_running_loop()
-        last_exc: Optional[Exception] = None
-
-        for attempt in range(max_retries + 1):
+        max_connections: int = 10,
+        timeout_seconds: float = 10.0,
+    ) -> None:
+        self._from_number = from_number
+        self._client = httpx.AsyncClient(
+            base_url=f"{TWILIO_API_BASE}/Accounts/{account_sid}",
+            auth=(account_sid, auth_token),
+            timeout=timeout_seconds,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+            ),
+        )
+
+    async def send(self, to: str, body: str) -> TwilioSmsResult:
+        try:
+            resp = await self._client.post(
+                "/Messages.json",
+                data={"To": to, "From": self._from_number, "Body": body},
+            )
+        except httpx.HTTPError as exc:
+            return TwilioSmsResult(to=to, sid=None, success=False, error=exc)
+
+        if resp.status_code in (200, 201):
+            # El SMS ya salió: un cuerpo ilegible no puede volverlo a encolar
             try:
-                msg = await loop.run_in_executor(
-                    None,
-                    lambda: self._client.messages.create(
-                        body=body,
-                        from_=self._from_number,
-                        to=dest,
-                    ),
-                )
-                logger.info(
-                    "[TwilioSMS] SMS enviado a %s (sid=%s, intento=%s)",
-                    dest,
-                    msg.sid,
-                    attempt + 1,
-                )
-                return TwilioSmsResult(to=dest, sid=msg.sid, success=True)
-
-            except Exception as exc:
-                last_exc = exc
-                logger.warning(
-                    "[TwilioSMS] Error enviando SMS (intento %s/%s): %s",
-                    attempt + 1,
-                    max_retries + 1,
-                    exc,
-                )
-
-        # Si llegó aquí, fallaron todos los intentos
-        return TwilioSmsResult(to=dest, sid=None, success=False, error=last_exc)
-
-
-# instancia global reutilizable
-sms_service = TwilioSmsService()
+                sid = resp.json().get("sid")
+            except (ValueError, AttributeError):
+                sid = None
+            logger.info("[TwilioSMS] SMS enviado a %s (sid=%s)", to, sid)
+            return TwilioSmsResult(to=to, sid=sid, success=True)
+
+        # 429 y 5xx son transitorios; el resto de 4xx no mejora reintentando
+        retryable = resp.status_code == 429 or resp.status_code >= 500
+        detail = resp.text[:300]
+        return TwilioSmsResult(
+            to=to,
+            sid=None,
+            success=False,
+            error=RuntimeError(f"Twilio HTTP {resp.status_code}: {detail}"),
+            retryable=retryable,
+        )
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+
+@dataclass
+class FakeSmsProvider:
+    """
+    Proveedor local: no sale a la red, guarda los mensajes en `sent`.
+    `fail_next` fuerza fallos transitorios para probar reintentos.
+    """
+    sent: List[TwilioSmsResult] = field(default_factory=list)
+    bodies: List[str] = field(default_factory=list)
+    fail_next: int = 0
+
+    async def send(self, to: str, body: str) -> TwilioSmsResult:
+        if self.fail_next > 0:
+            self.fail_next -= 1
+            return TwilioSmsResult(
+                to=to, sid=None, success=False, error=RuntimeError("fallo simulado")
+            )
+        result = TwilioSmsResult(to=to, sid=f"FAKE{len(self.sent) + 1:06d}", success=True)
+        self.sent.append(result)
+        self.bodies.append(body)
+        logger.info("[FakeSMS] %s <- %s", to, body)
+        return result
+
+    async def aclose(self) -> None:
+        return None
+
+
+def build_sms_provider() -> SmsProvider:
+    """Crea el proveedor configurado en settings.SMS_PROVIDER ("twilio" | "fake")."""
+    if settings.SMS_PROVIDER == "fake":
+        return FakeSmsProvider()
+    return TwilioHttpSmsProvider(
+        settings.TWILIO_ACCOUNT_SID,
+        settings.TWILIO_AUTH_TOKEN,
+        settings.TWILIO_FROM_NUMBER,
+        max_connections=settings.SMS_HTTP_MAX_CONNECTIONS,
+    )
@@ -35,6 +35,16 @@ def to_utc(dt: datetime) -> datetime:
     return dt.astimezone(timezone.utc)
 
 
+def truncate_utc(dt: datetime, unit: str) -> datetime:
+    """Trunca a minute/hour/day en UTC (como date_trunc de PostgreSQL)"""
+    dt = to_utc(dt).replace(second=0, microsecond=0)
+    if unit in ("hour", "day"):
+        dt = dt.replace(minute=0)
+    if unit == "day":
+        dt = dt.replace(hour=0)
+    return dt
+
+
 def filename_to_utc(filename: str) -> Optional[datetime]:
     """
     Convierte nombre de archivo tipo 'clip_20251106_153045.mp4' a datetime UTC.
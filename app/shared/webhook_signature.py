@@ -0,0 +1,110 @@
+"""
+Firma HMAC de webhooks entrantes (productores de inferencia).
+
+El productor envía:
+    X-Webhook-Timestamp: segundos unix del envío
+    X-Webhook-Signature: sha256=<hex de HMAC-SHA256(WEBHOOK_SECRET, "<timestamp>." + body)>
+
+La verificación se hace sobre los bytes crudos del body y antes de parsear
+JSON o tocar la base: headers y ventana de tiempo primero (sin leer el body),
+después el HMAC con comparación de tiempo constante. Un request fuera de la
+ventana de WEBHOOK_TOLERANCE_SECONDS se rechaza aunque la firma sea válida
+(replay). Sin WEBHOOK_SECRET configurado no se verifica (desarrollo).
+
+El body se lee por chunks con tope WEBHOOK_MAX_BODY_BYTES: un request sin
+Content-Length (chunked) se corta apenas lo supera, sin bufferearlo entero.
+"""
+import hashlib
+import hmac
+import time
+from typing import Optional
+
+from fastapi import HTTPException, Request, status
+
+from app.config.settings import settings
+
+TIMESTAMP_HEADER = "X-Webhook-Timestamp"
+SIGNATURE_HEADER = "X-Webhook-Signature"
+_PREFIX = "sha256="
+
+
+def sign(secret: str, timestamp: int, body: bytes) -> str:
+    """Valor de X-Webhook-Signature para un body (lo usa también el productor)"""
+    mac = hmac.new(secret.encode(), f"{timestamp}.".encode() + body, hashlib.sha256)
+    return _PREFIX + mac.hexdigest()
+
+
+def check_timestamp(raw: Optional[str], tolerance_seconds: int, now: Optional[float] = None) -> int:
+    """Valida el header de timestamp contra la ventana de replay"""
+    try:
+        timestamp = int(raw)
+    except (TypeError, ValueError):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Timestamp de firma ausente o inválido"
+        )
+    if abs((now if now is not None else time.time()) - timestamp) > tolerance_seconds:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Timestamp de firma fuera de la ventana permitida"
+        )
+    return timestamp
+
+
+def check_signature(secret: str, timestamp: int, body: bytes, signature: Optional[str]) -> None:
+    """Compara la firma recibida con la esperada en tiempo constante"""
+    expected = sign(secret, timestamp, body)
+    if not signature or not hmac.compare_digest(expected.encode(), signature.strip().encode()):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Firma de webhook inválida"
+        )
+
+
+def _too_large(max_bytes: int) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        detail=f"Body mayor a {max_bytes} bytes"
+    )
+
+
+async def read_body(request: Request, max_bytes: int) -> bytes:
+    """Lee el body por chunks; 413 en cuanto el acumulado supera max_bytes"""
+    chunks = []
+    size = 0
+    async for chunk in request.stream():
+        size += len(chunk)
+        if size > max_bytes:
+            raise _too_large(max_bytes)
+        chunks.append(chunk)
+    return b"".join(chunks)
+
+
+async def verified_body(request: Request) -> bytes:
+    """
+    Dependency: devuelve el body crudo ya verificado.
+    Rechaza por tamaño (Content-Length), headers y ventana antes de leer el body.
+    """
+    max_bytes = settings.WEBHOOK_MAX_BODY_BYTES
+    length = request.headers.get("content-length")
+    if length is not None and length.isdigit() and int(length) > max_bytes:
+        raise _too_large(max_bytes)
+
+    secret = settings.WEBHOOK_SECRET
+    timestamp = None
+    if secret:
+        signature = request.headers.get(SIGNATURE_HEADER)
+        if not signature:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Falta la firma del webhook"
+            )
+        timestamp = check_timestamp(
+            request.headers.get(TIMESTAMP_HEADER), settings.WEBHOOK_TOLERANCE_SECONDS
+        )
+
+    body = await read_body(request, max_bytes)
+
+    if secret:
+        check_signature(secret, timestamp, body, signature)
+    return body
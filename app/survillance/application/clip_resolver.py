@@ -2,7 +2,7 @@
 Resuelve rangos de tiempo absolutos a lista de clips con offsets para corte/concatenación.
 """
 from datetime import datetime, timedelta
-from typing import List, Tuple
+from typing import List, Sequence, Tuple
 
 from app.survillance.domain.entities import Clip
 
@@ -31,6 +31,21 @@ class ClipResolver:
             - ss: segundo de inicio dentro del clip
             - dur: duración a cortar
         """
+        return [
+            (str(clip.storage_path), ss, dur)
+            for clip, ss, dur in ClipResolver.resolve_clips(clips, start_time_abs, end_time_abs)
+        ]
+    
+    @staticmethod
+    def resolve_clips(
+        clips: List[Clip],
+        start_time_abs: datetime,
+        end_time_abs: datetime
+    ) -> List[Tuple[Clip, float, float]]:
+        """
+        Igual que resolve_time_range pero retorna (clip, ss, dur): los clips que
+        cubren el rango, en orden, con el corte de cada uno.
+        """
         result = []
         
         for clip in clips:
@@ -63,9 +78,42 @@ class ClipResolver:
             # Asegurar que dur sea positiva
             dur = max(0.1, dur)
             
-            # Convertir storage_path a string si es StoragePath VO
-            storage_path_str = str(clip.storage_path)
-            result.append((storage_path_str, ss, dur))
+            result.append((clip, ss, dur))
+        
+        return result
+    
+    @staticmethod
+    def resolve_many(
+        clips: List[Clip],
+        ranges: Sequence[Tuple[datetime, datetime]]
+    ) -> List[List[Tuple[Clip, float, float]]]:
+        """
+        resolve_clips para varios rangos con un solo barrido sobre los clips
+        ordenados por start_time_utc: los rangos se recorren por inicio y cada
+        uno solo mira los clips desde el primero que todavía no terminó.
+        
+        Args:
+            clips: Lista de clips ordenados por start_time_utc
+            ranges: Rangos absolutos (inicio, fin), en cualquier orden
+        
+        Returns:
+            Para cada rango (en el orden recibido), sus (clip, ss, dur)
+        """
+        result: List[List[Tuple[Clip, float, float]]] = [[] for _ in ranges]
+        first = 0
+        
+        for i in sorted(range(len(ranges)), key=lambda i: ranges[i][0]):
+            start_time_abs, end_time_abs = ranges[i]
+            
+            # Un clip que termina antes de este inicio no cubre ningún rango posterior
+            while first < len(clips) and clips[first].end_time_utc() <= start_time_abs:
+                first += 1
+            
+            last = first
+            while last < len(clips) and clips[last].start_time_utc < end_time_abs:
+                last += 1
+            
+            result[i] = ClipResolver.resolve_clips(clips[first:last], start_time_abs, end_time_abs)
         
         return result
     
@@ -102,4 +150,5 @@ class ClipResolver:
             Offset en milisegundos desde el inicio del clip
         """
         delta = (timestamp_abs - clip.start_time_utc).total_seconds()
-        return int(delta * 1000)
\ No newline at end of file
+        return int(delta * 1000)
+
@@ -32,7 +32,14 @@ from .conexion_dto import (
 from .clip_dto import ClipResponse
 
 # Evento DTOs
-from .evento_dto import EventoResponse
+from .evento_dto import (
+    EventoResponse,
+    SerieConfianzaResponse,
+    EventSnapshotResponse,
+    EventoStatsPunto,
+    EventoStatsSerie,
+    EventoStatsResponse,
+)
 
 # Notificacion DTOs
 from .notificacion_dto import (
@@ -55,6 +62,10 @@ from .inference_dto import (
     InferenceWebhookRequestA,
     InferenceWebhookRequestB,
     InferenceWebhookResponse,
+    InferenceBatchItemResult,
+    InferenceBatchResponse,
+    InferenceAcceptedResponse,
+    InferenceIngestStatus,
 )
 
 __all__ = [
@@ -80,6 +91,11 @@ __all__ = [
     "ClipResponse",
     # Evento
     "EventoResponse",
+    "SerieConfianzaResponse",
+    "EventSnapshotResponse",
+    "EventoStatsPunto",
+    "EventoStatsSerie",
+    "EventoStatsResponse",
     # Notificacion
     "NotificacionCreate",
     "NotificacionUpdate",
@@ -94,6 +110,10 @@ __all__ = [
     "InferenceWebhookRequestA",
     "InferenceWebhookRequestB",
     "InferenceWebhookResponse",
+    "InferenceBatchItemResult",
+    "InferenceBatchResponse",
+    "InferenceAcceptedResponse",
+    "InferenceIngestStatus",
 ]
 
 
@@ -3,7 +3,7 @@ DTOs para Evento.
 """
 from datetime import datetime
 from decimal import Decimal
-from typing import Optional, Any
+from typing import Optional, Any, Dict, List
 from pydantic import BaseModel, ConfigDict, model_validator
 
 
@@ -23,6 +23,7 @@ class EventoResponse(BaseModel):
     procesado: bool
     subclip_path: Optional[str]
     subclip_duracion_sec: Optional[int]
+    clips_cubiertos: Optional[List[int]] = None
 
     @model_validator(mode="before")
     @classmethod
@@ -62,7 +63,49 @@ class EventoResponse(BaseModel):
             "subclip_path": val(getattr(obj, "subclip_path", None)),
             "subclip_duracion_sec": (int(val(getattr(obj, "subclip_duracion_sec", None)))
                                     if getattr(obj, "subclip_duracion_sec", None) is not None else None),
+            "clips_cubiertos": getattr(obj, "clips_cubiertos", None),
         }
 
 
+class SerieConfianzaResponse(BaseModel):
+    """Response de serie de confianza (submuestreada) de un evento"""
+    id_evento: int
+    clases: List[str]
+    n_frames: int
+    n_puntos: int
+    agregacion: str
+    t_ms: List[int]
+    series: Dict[str, List[float]]
+
+
+class EventSnapshotResponse(BaseModel):
+    """Miniatura WebP de un evento; `url` sirve la imagen con headers de cache"""
+    id_snapshot: int
+    id_evento: int
+    timestamp_rel_ms: int
+    url: str
+
+
+class EventoStatsPunto(BaseModel):
+    """Un bucket de la serie de estadísticas"""
+    bucket: datetime
+    total: int
+    confianza_promedio: Optional[float] = None
+    confianza_max: Optional[float] = None
+
+
+class EventoStatsSerie(BaseModel):
+    """Serie temporal de una combinación (cámara, tipo) según la agrupación pedida"""
+    id_conexion: Optional[int] = None
+    tipo_evento: Optional[str] = None
+    total: int
+    puntos: List[EventoStatsPunto]
+
 
+class EventoStatsResponse(BaseModel):
+    """Response de /api/eventos/stats"""
+    granularidad: str
+    por: str
+    start_time: datetime
+    end_time: datetime
+    series: List[EventoStatsSerie]
@@ -1,8 +1,9 @@
 """
 DTOs para Inference Webhook.
 """
+from datetime import datetime
 from typing import Optional, List
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 
 class EventoInferenciaBase(BaseModel):
@@ -25,7 +26,7 @@ class EventoInferenciaB(EventoInferenciaBase):
 
 class InferenceWebhookRequestA(BaseModel):
     """Request webhook con offsets relativos (Contrato A)"""
-    request_id: str
+    request_id: str = Field(max_length=64)  # inference_requests.request_id es String(64)
     conexion_id: int
     clip_id: Optional[int] = None
     clip_path: Optional[str] = None
@@ -35,7 +36,7 @@ class InferenceWebhookRequestA(BaseModel):
 
 class InferenceWebhookRequestB(BaseModel):
     """Request webhook con timestamps absolutos (Contrato B)"""
-    request_id: str
+    request_id: str = Field(max_length=64)
     conexion_id: int
     modelo_version: str
     eventos: List[EventoInferenciaB]
@@ -48,4 +49,40 @@ class InferenceWebhookResponse(BaseModel):
     message: Optional[str] = None
 
 
+class InferenceBatchItemResult(BaseModel):
+    """Resultado de un item del lote (status con semántica HTTP)"""
+    index: int
+    request_id: Optional[str] = None
+    status: int
+    ok: bool
+    created_event_ids: List[int] = []
+    message: Optional[str] = None
+
+
+class InferenceBatchResponse(BaseModel):
+    """Response del webhook por lotes"""
+    received: int
+    created_events: int
+    duplicates: int
+    errors: int
+    items: List[InferenceBatchItemResult]
+
+
+class InferenceAcceptedResponse(BaseModel):
+    """Response 202 del webhook asíncrono: el payload quedó encolado"""
+    ok: bool
+    tracking_id: int
+    request_id: str
+    estado: str
+
 
+class InferenceIngestStatus(BaseModel):
+    """Estado de procesamiento de un webhook aceptado con 202"""
+    tracking_id: int
+    request_id: Optional[str] = None
+    estado: str
+    intentos: int
+    ultimo_error: Optional[str] = None
+    resultado: Optional[InferenceWebhookResponse] = None
+    created_at: Optional[datetime] = None
+    procesado_at: Optional[datetime] = None
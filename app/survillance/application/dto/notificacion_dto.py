@@ -11,6 +11,11 @@ class NotificacionCreate(BaseModel):
     mensaje: Optional[str] = Field(None, max_length=500)
     canal: Optional[str] = Field(None, max_length=50)
     destinatario: Optional[str] = Field(None, max_length=150)
+    # Metadatos para los topics del WebSocket (camara:, oficina:, tipo:)
+    id_conexion: Optional[int] = None
+    id_oficina: Optional[int] = None
+    tipo_evento: Optional[str] = Field(None, max_length=50)
+    confianza: Optional[float] = Field(None, ge=0.0, le=1.0)
 
 
 class NotificacionUpdate(BaseModel):
@@ -4,7 +4,7 @@ DTOs para Reporte.
 from datetime import datetime
 from decimal import Decimal
 from typing import Optional
-from pydantic import BaseModel, Field, ConfigDict
+from pydantic import AliasChoices, BaseModel, Field, ConfigDict
 
 
 class ReporteCreate(BaseModel):
@@ -22,7 +22,8 @@ class ReporteResponse(BaseModel):
     """Response de reporte"""
     model_config = ConfigDict(from_attributes=True)
     
-    id_reporte: int
+    # La entidad de dominio expone el PK como `id`
+    id_reporte: int = Field(validation_alias=AliasChoices("id_reporte", "id"))
     id_usuario: int
     id_clip: Optional[int]
     titulo: Optional[str]
@@ -32,6 +33,6 @@ class ReporteResponse(BaseModel):
     filtro_confianza: Optional[Decimal]
     tipo_evento: Optional[str]
     fecha_generacion: datetime
-
-
-
+    estado: str = Field("pendiente", description="pendiente | generando | listo | fallido")
+    progreso: int = Field(0, description="Avance de la generación (0-100)")
+    error: Optional[str] = None
@@ -1,19 +1,34 @@
 """
 Servicio para procesar webhooks de inferencia (contratos A y B).
 """
+from collections import defaultdict
 from datetime import datetime, timedelta
-from decimal import Decimal
-from typing import List, Union
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 from fastapi import HTTPException, status
+from pydantic import TypeAdapter, ValidationError
 
 from app.shared.time import parse_utc, now_utc
-from app.survillance.domain.entities import Evento, InferenceRequest
+from app.survillance.domain.entities import Clip, Evento, InferenceIngest
+from app.survillance.domain.enums import TipoEvento
+from app.survillance.domain.value_objects.timestamps import MilliSeconds
 from app.survillance.domain.repositories_interfaces import *
 from app.survillance.application.dto import *
 from app.survillance.application.clip_resolver import ClipResolver
 
 
+WebhookRequest = Union[InferenceWebhookRequestA, InferenceWebhookRequestB]
+
+DUPLICATE_MESSAGE = "Request ya procesado (idempotente)"
+
+# Validación directa desde bytes: los eventos del contrato A exigen offsets
+# (t_inicio_ms) y los del B timestamp_utc, así que un payload solo valida en uno
+_WEBHOOK_ADAPTER = TypeAdapter(WebhookRequest)
+
+# 422 (el nombre de la constante cambió entre versiones de Starlette)
+UNPROCESSABLE = 422
+
+
 class InferenceService:
     """Servicio para procesar resultados de inferencia de IA"""
     
@@ -21,11 +36,13 @@ class InferenceService:
         self,
         evento_repo: IEventoRepository,
         clip_repo: IClipRepository,
-        inference_repo: IInferenceRequestRepository
+        inference_repo: IInferenceRequestRepository,
+        ingest_repo: Optional[IInferenceIngestRepository] = None
     ):
         self.evento_repo = evento_repo
         self.clip_repo = clip_repo
         self.inference_repo = inference_repo
+        self.ingest_repo = ingest_repo
     
     async def process_webhook_a(
         self,
@@ -40,146 +57,316 @@ class InferenceService:
         Returns:
             Response con IDs de eventos creados
         """
-        # Verificar idempotencia
-        if await self.inference_repo.exists(data.request_id):
-            return InferenceWebhookResponse(
-                ok=True,
-                created_event_ids=[],
-                message="Request ya procesado (idempotente)"
+        # Idempotencia: registrar el request_id de forma atómica (un round trip)
+        if not await self.inference_repo.claim(data.request_id, now_utc()):
+            return await self._replay(data.request_id)
+        
+        # Obtener clip
+        self._check_clip_ref(data)
+        clip = await self.clip_repo.get_by_id(data.clip_id)
+        
+        # Crear eventos (un solo INSERT para todo el lote)
+        eventos = await self.evento_repo.create_many(self._eventos_a(data, clip))
+        
+        return await self._remember(data.request_id, InferenceWebhookResponse(
+            ok=True,
+            created_event_ids=[evento.id for evento in eventos]
+        ))
+    
+    async def process_webhook_b(
+        self,
+        data: InferenceWebhookRequestB
+    ) -> InferenceWebhookResponse:
+        """
+        Procesa webhook con contrato B (timestamps absolutos).
+        
+        Args:
+            data: Datos del webhook con timestamps UTC absolutos
+        
+        Returns:
+            Response con IDs de eventos creados
+        """
+        # Idempotencia: registrar el request_id de forma atómica (un round trip)
+        if not await self.inference_repo.claim(data.request_id, now_utc()):
+            return await self._replay(data.request_id)
+        
+        # Clips que cubren todos los eventos: una sola consulta por rango
+        clips = await self._clips_for_b([data])
+        
+        # Crear eventos (un solo INSERT para todo el lote)
+        eventos = await self.evento_repo.create_many(
+            self._eventos_b(data, clips.get(data.conexion_id, []))
+        )
+        
+        return await self._remember(data.request_id, InferenceWebhookResponse(
+            ok=True,
+            created_event_ids=[evento.id for evento in eventos]
+        ))
+    
+    async def process_batch(self, payloads: List[Any]) -> InferenceBatchResponse:
+        """
+        Procesa un lote de webhooks (contratos A y B mezclados) con un número fijo
+        de sentencias: un claim de idempotencia, una consulta de clips por ID, una
+        consulta por rango por cámara y un único INSERT para todos los eventos.
+        
+        Un item inválido no invalida el lote: su resultado lleva el status del error
+        y su request_id se libera para que el productor pueda reintentarlo.
+        
+        Args:
+            payloads: Lista de payloads de webhook (dicts)
+        
+        Returns:
+            Resultado por item, en el orden recibido
+        """
+        results: List[Optional[InferenceBatchItemResult]] = [None] * len(payloads)
+        valid: Dict[int, WebhookRequest] = {}
+        seen: Dict[str, int] = {}
+        
+        # 1. Validación de todos los items en una pasada
+        for index, payload in enumerate(payloads):
+            try:
+                data = self.parse(payload)
+            except HTTPException as e:
+                results[index] = self._item_error(index, _request_id(payload), e)
+                continue
+            if data.request_id in seen:
+                results[index] = InferenceBatchItemResult(
+                    index=index, request_id=data.request_id,
+                    status=status.HTTP_409_CONFLICT, ok=False,
+                    message=f"request_id repetido en el lote (item {seen[data.request_id]})"
+                )
+                continue
+            seen[data.request_id] = index
+            valid[index] = data
+        
+        # 2. Idempotencia: los request_id ya vistos devuelven su respuesta original
+        claimed = await self.inference_repo.claim_many(list(seen), now_utc())
+        stored = await self.inference_repo.get_responses(
+            [rid for rid in seen if rid not in claimed]
+        )
+        nuevos: Dict[int, WebhookRequest] = {}
+        for index, data in valid.items():
+            if data.request_id in claimed:
+                nuevos[index] = data
+                continue
+            replay = stored.get(data.request_id) or {}
+            results[index] = InferenceBatchItemResult(
+                index=index, request_id=data.request_id, status=status.HTTP_200_OK, ok=True,
+                created_event_ids=replay.get("created_event_ids", []),
+                message=DUPLICATE_MESSAGE
             )
         
-        # Registrar request
-        inference_req = InferenceRequest(
-            request_id=data.request_id,
-            received_at=now_utc()
+        # 3. Clips: contrato A por ID (una consulta), contrato B por rango (una por cámara)
+        clip_ids = {
+            data.clip_id for data in nuevos.values()
+            if isinstance(data, InferenceWebhookRequestA) and data.clip_id
+        }
+        clips_by_id = {clip.id: clip for clip in await self.clip_repo.get_many(list(clip_ids))}
+        clips_by_camera = await self._clips_for_b(
+            [data for data in nuevos.values() if isinstance(data, InferenceWebhookRequestB)]
         )
-        await self.inference_repo.create(inference_req)
         
-        # Obtener clip
+        # 4. Eventos de todos los items válidos en un solo INSERT
+        eventos: List[Evento] = []
+        owners: List[int] = []
+        failed: List[str] = []
+        for index, data in nuevos.items():
+            try:
+                if isinstance(data, InferenceWebhookRequestA):
+                    self._check_clip_ref(data)
+                    built = self._eventos_a(data, clips_by_id.get(data.clip_id))
+                else:
+                    built = self._eventos_b(data, clips_by_camera.get(data.conexion_id, []))
+            except HTTPException as e:
+                results[index] = self._item_error(index, data.request_id, e)
+                failed.append(data.request_id)
+                continue
+            eventos.extend(built)
+            owners.extend([index] * len(built))
+            results[index] = InferenceBatchItemResult(
+                index=index, request_id=data.request_id, status=status.HTTP_201_CREATED, ok=True
+            )
+        
+        created = await self.evento_repo.create_many(eventos)
+        for index, evento in zip(owners, created):
+            results[index].created_event_ids.append(evento.id)
+        
+        # 5. Respuestas para los reintentos y liberación de los que fallaron
+        await self.inference_repo.store_responses({
+            results[index].request_id: InferenceWebhookResponse(
+                ok=True, created_event_ids=results[index].created_event_ids
+            ).model_dump()
+            for index in nuevos if results[index].ok
+        })
+        await self.inference_repo.release_many(failed)
+        
+        return InferenceBatchResponse(
+            received=len(payloads),
+            created_events=len(created),
+            duplicates=sum(1 for r in results if r.message == DUPLICATE_MESSAGE),
+            errors=sum(1 for r in results if not r.ok),
+            items=results,
+        )
+    
+    async def _clips_for_b(
+        self,
+        requests: List[InferenceWebhookRequestB]
+    ) -> Dict[int, List[Clip]]:
+        """Clips por cámara que cubren la ventana [min inicio, max fin) de sus eventos"""
+        windows: Dict[int, List[datetime]] = defaultdict(list)
+        for data in requests:
+            for ev_data in data.eventos:
+                try:
+                    start, end = _window_b(ev_data)
+                except HTTPException:
+                    continue  # el item falla al armar sus eventos
+                windows[data.conexion_id] += [start, end]
+        
+        return {
+            id_conexion: await self.clip_repo.find_overlapping(
+                id_conexion, min(bounds), max(bounds)
+            )
+            for id_conexion, bounds in windows.items()
+        }
+    
+    @staticmethod
+    def _check_clip_ref(data: InferenceWebhookRequestA) -> None:
         if data.clip_id:
-            clip = await self.clip_repo.get_by_id(data.clip_id)
-        elif data.clip_path:
+            return
+        if data.clip_path:
             # Buscar por path (simplificado, en producción usar índice)
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Búsqueda por clip_path no implementada, usar clip_id"
             )
-        else:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Debe proveer clip_id o clip_path"
-            )
-        
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Debe proveer clip_id o clip_path"
+        )
+    
+    @staticmethod
+    def _eventos_a(data: InferenceWebhookRequestA, clip: Optional[Clip]) -> List[Evento]:
+        """Eventos del contrato A: timestamp absoluto = inicio del clip + offset"""
         if not clip:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Clip no encontrado"
             )
         
-        # Crear eventos
-        created_ids = []
-        
-        for ev_data in data.eventos:
-            # Calcular timestamp absoluto
-            timestamp_evento = ClipResolver.calculate_absolute_timestamp(
-                clip,
-                ev_data.t_inicio_ms
-            )
-            
-            evento = Evento(
-                id_conexion=data.conexion_id,
-                id_clip=clip.id_clip,
-                tipo_evento=ev_data.tipo,
-                confianza=Decimal(str(ev_data.confianza)),
+        return [
+            _evento(
+                data.conexion_id, clip, ev_data,
                 t_inicio_ms=ev_data.t_inicio_ms,
                 t_fin_ms=ev_data.t_fin_ms,
-                timestamp_evento=timestamp_evento,
-                procesado=False
+                timestamp_evento=ClipResolver.calculate_absolute_timestamp(clip, ev_data.t_inicio_ms),
             )
-            
-            evento = await self.evento_repo.create(evento)
-            created_ids.append(evento.id_evento)
-        
-        return InferenceWebhookResponse(
-            ok=True,
-            created_event_ids=created_ids
-        )
+            for ev_data in data.eventos
+        ]
     
-    async def process_webhook_b(
-        self,
-        data: InferenceWebhookRequestB
-    ) -> InferenceWebhookResponse:
+    @staticmethod
+    def _eventos_b(data: InferenceWebhookRequestB, clips: List[Clip]) -> List[Evento]:
         """
-        Procesa webhook con contrato B (timestamps absolutos).
+        Eventos del contrato B. Todos los eventos del payload se resuelven con un
+        solo barrido sobre los clips (ordenados por start_time_utc): un evento que
+        cruza el borde entre segmentos queda ligado al primer clip que cubre
+        (offsets relativos a ese clip) y guarda en clips_cubiertos todos los que
+        atraviesa. Sin clip, offsets desde 0.
+        """
+        windows = [_window_b(ev_data) for ev_data in data.eventos]
+        coberturas = ClipResolver.resolve_many(clips, windows)
+        eventos = []
         
-        Args:
-            data: Datos del webhook con timestamps UTC absolutos
+        for ev_data, (timestamp_evento, _), cobertura in zip(data.eventos, windows, coberturas):
+            clip, ss, _ = cobertura[0] if cobertura else (None, 0.0, 0.0)
+            t_inicio_ms = round(ss * 1000)
+            eventos.append(_evento(
+                data.conexion_id, clip, ev_data,
+                t_inicio_ms=t_inicio_ms,
+                t_fin_ms=t_inicio_ms + ev_data.dur_ms,
+                timestamp_evento=timestamp_evento,
+                clips_cubiertos=[c.id for c, _, _ in cobertura] or None,
+            ))
         
-        Returns:
-            Response con IDs de eventos creados
-        """
-        # Verificar idempotencia
-        if await self.inference_repo.exists(data.request_id):
-            return InferenceWebhookResponse(
-                ok=True,
-                created_event_ids=[],
-                message="Request ya procesado (idempotente)"
-            )
+        return eventos
+    
+    @staticmethod
+    def parse(payload: Any) -> WebhookRequest:
+        """Detecta el contrato (A o B) por presencia de campos y valida el payload"""
+        eventos = payload.get("eventos") if isinstance(payload, dict) else None
+        if isinstance(eventos, list) and eventos and isinstance(eventos[0], dict):
+            primer_evento = eventos[0]
+            try:
+                # Contrato A: tiene t_inicio_ms
+                if "t_inicio_ms" in primer_evento:
+                    return InferenceWebhookRequestA(**payload)
+                
+                # Contrato B: tiene timestamp_utc
+                if "timestamp_utc" in primer_evento:
+                    return InferenceWebhookRequestB(**payload)
+            except ValidationError as e:
+                raise HTTPException(
+                    status_code=UNPROCESSABLE,
+                    detail=e.errors(include_url=False, include_context=False)
+                )
         
-        # Registrar request
-        inference_req = InferenceRequest(
-            request_id=data.request_id,
-            received_at=now_utc()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Formato de webhook inválido (no coincide con contrato A o B)"
         )
-        await self.inference_repo.create(inference_req)
-        
-        # Crear eventos
-        created_ids = []
-        
-        for ev_data in data.eventos:
-            # Parsear timestamp
-            timestamp_evento = parse_utc(ev_data.timestamp_utc)
-            end_time = timestamp_evento + timedelta(milliseconds=ev_data.dur_ms)
-            
-            # Buscar clips que cubren este rango
-            clips = await self.clip_repo.get_by_time_range(
-                data.conexion_id,
-                timestamp_evento,
-                end_time
-            )
-            
-            # Usar el primer clip que intersecta (simplificado)
-            clip = clips[0] if clips else None
-            
-            # Calcular offsets relativos si hay clip
-            if clip:
-                t_inicio_ms = ClipResolver.calculate_relative_offset(
-                    clip,
-                    timestamp_evento
+    
+    @staticmethod
+    def parse_json(body: bytes) -> WebhookRequest:
+        """
+        Valida el body crudo directo en el contrato (A o B) con pydantic-core,
+        sin armar un dict intermedio.
+        """
+        try:
+            data = _WEBHOOK_ADAPTER.validate_json(body)
+        except ValidationError as e:
+            errors = e.errors(include_url=False, include_context=False)
+            if errors and errors[0]["type"] == "json_invalid":
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Body JSON inválido"
                 )
-                t_fin_ms = t_inicio_ms + ev_data.dur_ms
-            else:
-                t_inicio_ms = None
-                t_fin_ms = None
-            
-            evento = Evento(
-                id_conexion=data.conexion_id,
-                id_clip=clip.id_clip if clip else None,
-                tipo_evento=ev_data.tipo,
-                confianza=Decimal(str(ev_data.confianza)),
-                t_inicio_ms=t_inicio_ms,
-                t_fin_ms=t_fin_ms,
-                timestamp_evento=timestamp_evento,
-                procesado=False
-            )
-            
-            evento = await self.evento_repo.create(evento)
-            created_ids.append(evento.id_evento)
+            raise HTTPException(status_code=UNPROCESSABLE, detail=errors)
         
-        return InferenceWebhookResponse(
-            ok=True,
-            created_event_ids=created_ids
+        if not data.eventos:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Formato de webhook inválido (no coincide con contrato A o B)"
+            )
+        return data
+    
+    @staticmethod
+    def _item_error(
+        index: int,
+        request_id: Optional[str],
+        error: HTTPException
+    ) -> InferenceBatchItemResult:
+        return InferenceBatchItemResult(
+            index=index, request_id=request_id, status=error.status_code, ok=False,
+            message=error.detail if isinstance(error.detail, str) else str(error.detail)
+        )
+    
+    async def _remember(
+        self,
+        request_id: str,
+        response: InferenceWebhookResponse
+    ) -> InferenceWebhookResponse:
+        """Guarda la respuesta junto al request_id (misma transacción que los eventos)"""
+        await self.inference_repo.store_response(request_id, response.model_dump())
+        return response
+    
+    async def _replay(self, request_id: str) -> InferenceWebhookResponse:
+        """Respuesta para un request_id ya procesado: la original, si está guardada"""
+        stored = await self.inference_repo.get_response(request_id)
+        response = (
+            InferenceWebhookResponse(**stored)
+            if stored else InferenceWebhookResponse(ok=True, created_event_ids=[])
         )
+        response.message = DUPLICATE_MESSAGE
+        return response
     
     async def process_webhook(
         self,
@@ -194,21 +381,99 @@ class InferenceService:
         Returns:
             Response con IDs de eventos creados
         """
-        # Detectar contrato por presencia de campos
-        if "eventos" in payload and len(payload["eventos"]) > 0:
-            primer_evento = payload["eventos"][0]
-            
-            # Contrato A: tiene t_inicio_ms
-            if "t_inicio_ms" in primer_evento:
-                data = InferenceWebhookRequestA(**payload)
-                return await self.process_webhook_a(data)
-            
-            # Contrato B: tiene timestamp_utc
-            elif "timestamp_utc" in primer_evento:
-                data = InferenceWebhookRequestB(**payload)
-                return await self.process_webhook_b(data)
+        return await self.process(self.parse(payload))
+    
+    async def process(self, data: WebhookRequest) -> InferenceWebhookResponse:
+        """Procesa un webhook ya validado (ver parse/parse_json)"""
+        if isinstance(data, InferenceWebhookRequestA):
+            return await self.process_webhook_a(data)
+        return await self.process_webhook_b(data)
+    
+    async def accept(self, data: WebhookRequest) -> InferenceAcceptedResponse:
+        """
+        Modo asíncrono: encola el webhook ya validado en inference_ingest.
+        Idempotencia, clips y eventos los resuelve después InferenceIngestWorker
+        con process_webhook.
+        
+        Args:
+            data: Webhook validado (contrato A o B)
         
+        Returns:
+            Tracking id para consultar el estado del procesamiento
+        """
+        ingest = await self.ingest_repo.create(
+            InferenceIngest(payload=data.model_dump(), request_id=data.request_id)
+        )
+        return InferenceAcceptedResponse(
+            ok=True,
+            tracking_id=ingest.id,
+            request_id=data.request_id,
+            estado=ingest.estado.value
+        )
+    
+    async def get_ingest_status(self, tracking_id: int) -> InferenceIngestStatus:
+        """Estado de procesamiento de un webhook aceptado con 202"""
+        ingest = await self.ingest_repo.get(tracking_id)
+        if not ingest:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Tracking id no encontrado"
+            )
+        
+        return InferenceIngestStatus(
+            tracking_id=ingest.id,
+            request_id=ingest.request_id,
+            estado=ingest.estado.value,
+            intentos=ingest.intentos,
+            ultimo_error=ingest.ultimo_error,
+            resultado=ingest.resultado,
+            created_at=ingest.created_at,
+            procesado_at=ingest.procesado_at
+        )
+
+
+def _request_id(payload: Any) -> Optional[str]:
+    rid = payload.get("request_id") if isinstance(payload, dict) else None
+    return rid if isinstance(rid, str) else None
+
+
+def _window_b(ev_data: EventoInferenciaB) -> Tuple[datetime, datetime]:
+    """[inicio, fin) absoluto de un evento del contrato B"""
+    try:
+        start = parse_utc(ev_data.timestamp_utc)
+    except ValueError:
         raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Formato de webhook inválido (no coincide con contrato A o B)"
-        )
\ No newline at end of file
+            status_code=UNPROCESSABLE,
+            detail=f"timestamp_utc inválido: {ev_data.timestamp_utc}"
+        )
+    return start, start + timedelta(milliseconds=ev_data.dur_ms)
+
+
+def _evento(
+    id_conexion: int,
+    clip: Optional[Clip],
+    ev_data: EventoInferenciaBase,
+    *,
+    t_inicio_ms: int,
+    t_fin_ms: int,
+    timestamp_evento: datetime,
+    clips_cubiertos: Optional[List[int]] = None
+) -> Evento:
+    """Arma la entidad; tipo/confianza/offsets inválidos se reportan como 422"""
+    try:
+        return Evento(
+            id_conexion=id_conexion,
+            id_clip=clip.id if clip else None,
+            tipo_evento=TipoEvento(ev_data.tipo),
+            confianza=float(ev_data.confianza),
+            t_inicio_ms=MilliSeconds(t_inicio_ms),
+            t_fin_ms=MilliSeconds(t_fin_ms),
+            timestamp_evento=timestamp_evento,
+            procesado=False,
+            clips_cubiertos=clips_cubiertos
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=UNPROCESSABLE,
+            detail=str(e)
+        )
@@ -0,0 +1,143 @@
+"""
+Renderizado de los artefactos de un reporte (CSV, JSON, PDF) a partir de las
+filas agregadas de EventoRepository.stream_report_rows: una fila por
+(día UTC, conexión, tipo de evento).
+
+Funciones puras y sincrónicas: ReportEngine las corre en su pool de threads.
+Los artefactos se comparten entre reportes con los mismos filtros, así que
+no llevan título ni descripción del reporte.
+"""
+import csv
+import io
+from collections import defaultdict
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from app.shared.pdf import text_pdf
+from app.shared.responses import dumps
+
+# formato -> media type de la descarga
+FORMATOS: Dict[str, str] = {
+    "csv": "text/csv",
+    "json": "application/json",
+    "pdf": "application/pdf",
+}
+
+CSV_COLUMNS = (
+    "dia", "id_conexion", "tipo_evento", "total",
+    "confianza_promedio", "confianza_max", "primer_evento", "ultimo_evento",
+)
+
+
+def _iso(value: Optional[datetime]) -> Optional[str]:
+    if value is None:
+        return None
+    text = value.isoformat()
+    return text[:-6] + "Z" if text.endswith("+00:00") else text
+
+
+def _avg(suma: Optional[Decimal], n: int) -> Optional[float]:
+    return round(float(suma) / n, 4) if suma is not None and n else None
+
+
+def _float(value: Optional[Decimal]) -> Optional[float]:
+    return float(value) if value is not None else None
+
+
+def _row(row: Dict[str, Any]) -> Dict[str, Any]:
+    """Fila agregada -> fila del reporte (tipos primitivos)"""
+    return {
+        "dia": row["dia"].date().isoformat(),
+        "id_conexion": row["id_conexion"],
+        "tipo_evento": row["tipo_evento"],
+        "total": row["total"],
+        "confianza_promedio": _avg(row["suma_confianza"], row["n_confianza"]),
+        "confianza_max": _float(row["max_confianza"]),
+        "primer_evento": _iso(row["primer_evento"]),
+        "ultimo_evento": _iso(row["ultimo_evento"]),
+    }
+
+
+def summarize(rows: Sequence[Dict[str, Any]]) -> Dict[str, Any]:
+    """Totales del reporte: general, por día y por (conexión, tipo)"""
+    por_dia: Dict[str, int] = defaultdict(int)
+    grupos: Dict[tuple, list] = defaultdict(lambda: [0, Decimal(0), 0, None])
+    for row in rows:
+        por_dia[row["dia"].date().isoformat()] += row["total"]
+        acc = grupos[(row["id_conexion"], row["tipo_evento"])]
+        acc[0] += row["total"]
+        if row["suma_confianza"] is not None:
+            acc[1] += row["suma_confianza"]
+            acc[2] += row["n_confianza"]
+        if row["max_confianza"] is not None and (acc[3] is None or row["max_confianza"] > acc[3]):
+            acc[3] = row["max_confianza"]
+
+    return {
+        "total": sum(por_dia.values()),
+        "por_dia": [{"dia": dia, "total": total} for dia, total in sorted(por_dia.items())],
+        "por_conexion_tipo": [
+            {
+                "id_conexion": id_conexion,
+                "tipo_evento": tipo_evento,
+                "total": total,
+                "confianza_promedio": _avg(suma, n),
+                "confianza_max": _float(maximo),
+            }
+            for (id_conexion, tipo_evento), (total, suma, n, maximo) in sorted(grupos.items())
+        ],
+    }
+
+
+def render_csv(filtros: Dict[str, Any], rows: Sequence[Dict[str, Any]], generado: datetime) -> bytes:
+    """Una línea por (día, conexión, tipo); utf-8 con BOM para que Excel respete los acentos"""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=CSV_COLUMNS, lineterminator="\n")
+    writer.writeheader()
+    for row in rows:
+        writer.writerow(_row(row))
+    return buffer.getvalue().encode("utf-8-sig")
+
+
+def render_json(filtros: Dict[str, Any], rows: Sequence[Dict[str, Any]], generado: datetime) -> bytes:
+    """Filtros, resumen y filas diarias en un solo documento"""
+    return dumps({
+        "filtros": filtros,
+        "generado": _iso(generado),
+        "resumen": summarize(rows),
+        "filas": [_row(row) for row in rows],
+    })
+
+
+def _fmt(value: Optional[float]) -> str:
+    return "-" if value is None else f"{value:.2f}"
+
+
+def _fmt_filtro(value: Any) -> str:
+    if value is None:
+        return "-"
+    return _iso(value) if isinstance(value, datetime) else str(value)
+
+
+def render_pdf(filtros: Dict[str, Any], rows: Sequence[Dict[str, Any]], generado: datetime) -> bytes:
+    """Resumen legible: filtros, totales por conexión/tipo y por día"""
+    resumen = summarize(rows)
+    lines: List[str] = ["REPORTE DE EVENTOS", f"Generado: {_iso(generado)}", ""]
+    lines += [f"{nombre:<20}{_fmt_filtro(valor)}" for nombre, valor in filtros.items()]
+    lines += ["", f"Total de eventos: {resumen['total']}", "", "POR CONEXION Y TIPO",
+              f"{'conexion':>10}  {'tipo':<20}{'total':>10}{'conf. prom':>12}{'conf. max':>12}"]
+    for grupo in resumen["por_conexion_tipo"]:
+        lines.append(
+            f"{grupo['id_conexion']:>10}  {grupo['tipo_evento']:<20}{grupo['total']:>10}"
+            f"{_fmt(grupo['confianza_promedio']):>12}{_fmt(grupo['confianza_max']):>12}"
+        )
+    lines += ["", "POR DIA (UTC)", f"{'dia':<12}{'total':>10}"]
+    lines += [f"{dia['dia']:<12}{dia['total']:>10}" for dia in resumen["por_dia"]]
+    return text_pdf(lines)
+
+
+RENDERERS: Dict[str, Callable[[Dict[str, Any], Sequence[Dict[str, Any]], datetime], bytes]] = {
+    "csv": render_csv,
+    "json": render_json,
+    "pdf": render_pdf,
+}
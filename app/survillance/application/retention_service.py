@@ -5,7 +5,9 @@ import os
 from datetime import datetime, timedelta
 from typing import Dict, List
 
+from app.config.settings import settings
 from app.shared.time import now_utc
+from app.survillance.application.sprite_sheets import sprite_paths
 from app.survillance.domain.repositories_interfaces import IConexionRepository, IClipRepository
 from app.survillance.domain.entities import Conexion
 
@@ -64,13 +66,17 @@ class RetentionService:
             cutoff_time
         )
         
-        deleted_clips = 0
+        clip_ids = []
         deleted_files = 0
+        # Clips que filtra un reporte: delete_many no los borra, así que el archivo se queda
+        pinned = await self.clip_repo.pinned_ids([clip.id for clip in old_clips if clip.id is not None])
         
         for clip in old_clips:
             # Verificar que no sea un subclip de evento (en carpeta events/)
             if "/events/" in clip.storage_path or "\\events\\" in clip.storage_path:
                 continue
+            if clip.id in pinned:
+                continue
             
             # Eliminar archivo del disco
             if os.path.exists(clip.storage_path):
@@ -80,10 +86,15 @@ class RetentionService:
                 except Exception as e:
                     print(f"Error eliminando archivo {clip.storage_path}: {e}")
             
-            # Eliminar registro de BD
+            # El sprite de scrub no sirve sin el clip
+            for path in sprite_paths(settings.SPRITES_PATH, clip):
+                path.unlink(missing_ok=True)
+            
             if clip.id is not None:
-                await self.clip_repo.delete(clip.id)
-                deleted_clips += 1
+                clip_ids.append(clip.id)
+        
+        # Eliminar registros de BD en una sola sentencia
+        deleted_clips = await self.clip_repo.delete_many(clip_ids)
         
         return {
             "clips": deleted_clips,
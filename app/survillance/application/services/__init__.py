@@ -8,6 +8,7 @@ from .clip_service import ClipService
 from .evento_service import EventoService
 from .notificacion_service import NotificacionService
 from .reporte_service import ReporteService
+from .outbox_service import OutboxService
 
 __all__ = [
     "AuthService",
@@ -17,5 +18,6 @@ __all__ = [
     "EventoService",
     "NotificacionService",
     "ReporteService",
+    "OutboxService",
 ]
 
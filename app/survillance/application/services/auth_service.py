@@ -34,14 +34,12 @@ class AuthService:
             <p><a href="{reset_link}">Restablecer contraseña</a></p>
             <p>Si no fuiste tú, puedes ignorar este correo.</p>
             """
-        try:
-            send_email(
-                to_email=email,
-                subject="Recuperación de contraseña",
-                html_body=html,
-            )
-        except Exception as e:
-            print("ERROR ENVIANDO EMAIL:", e)
+        # Solo se encola: el envío SMTP ocurre en segundo plano (EmailQueue)
+        await send_email(
+            to_email=email,
+            subject="Recuperación de contraseña",
+            html_body=html,
+        )
 
     async def change_password(self, data: ChangePasswordRequest) -> None:
         user = await self.get_by_email(data.email)
@@ -1,11 +1,15 @@
 """
 Servicio para gestión de clips.
 """
+import os
 from datetime import datetime
-from typing import List, Optional
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 
 from fastapi import HTTPException, status
 
+from app.config.settings import settings
+from app.shared.pagination import decode_cursor, next_cursor
 from app.survillance.domain.entities.clip import Clip
 from app.survillance.domain.repositories_interfaces import IClipRepository
 
@@ -16,8 +20,10 @@ from app.survillance.domain.value_objects.timestamps import DurationSeconds
 class ClipService:
     """Servicio para gestión de clips"""
     
-    def __init__(self, clip_repo: IClipRepository):
+    def __init__(self, clip_repo: IClipRepository, sprite_builder=None):
         self.clip_repo = clip_repo
+        # SpriteWorker (o equivalente con paths/ensure) para los sprites de scrub
+        self.sprite_builder = sprite_builder
 
     async def create_clip(
         self,
@@ -58,3 +64,69 @@ class ClipService:
     ) -> List[Clip]:
         """Lista clips con filtros"""
         return await self.clip_repo.get_all(limit, offset, id_conexion, start_time, end_time)
+
+    async def get_page(
+        self,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        offset: int = 0,
+        id_conexion: Optional[int] = None,
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None
+    ) -> Tuple[List[Clip], Optional[str]]:
+        """Página de clips por keyset (start_time_utc, id); retorna (clips, cursor siguiente)"""
+        after = decode_cursor(cursor, datetime, int)
+        clips = await self.clip_repo.get_all(
+            limit, offset, id_conexion, start_time, end_time, after
+        )
+        return clips, next_cursor(clips, limit, "start_time_utc", "id")
+
+    async def get_rows_page(
+        self,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        offset: int = 0,
+        id_conexion: Optional[int] = None,
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """Como get_page, pero con filas planas (proyección) en lugar de entidades"""
+        after = decode_cursor(cursor, datetime, int)
+        rows = await self.clip_repo.list_rows(
+            limit, offset, id_conexion, start_time, end_time, after
+        )
+        return rows, next_cursor(rows, limit, "start_time_utc", "id_clip")
+
+    def stream_rows(
+        self,
+        id_conexion: Optional[int] = None,
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Clips filtrados como stream de filas planas, en orden cronológico (exportaciones)"""
+        return self.clip_repo.stream_rows(
+            id_conexion, start_time, end_time, settings.EXPORT_CHUNK_ROWS
+        )
+
+    async def get_sprite(self, clip: Clip) -> Tuple[Path, Path]:
+        """
+        (imagen, vtt) del sprite de scrub del clip, generándolo si todavía no existe.
+        404 si el video del clip ya no está en disco; 503 si falló la generación.
+        No usa la BD: el llamador puede liberar la sesión antes (la generación
+        puede tardar hasta SPRITE_TIMEOUT_SECONDS).
+        """
+        image, vtt = self.sprite_builder.paths(clip)
+        if vtt.is_file():
+            return image, vtt
+        
+        if not os.path.isfile(str(clip.storage_path)):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Video del clip no disponible"
+            )
+        if not await self.sprite_builder.ensure(clip):
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="No se pudo generar el sprite del clip"
+            )
+        return image, vtt
@@ -1,11 +1,12 @@
 """
 Servicio CRUD de conexiones/cámaras.
 """
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
 from fastapi import HTTPException, status
 
 
+from app.shared.pagination import decode_cursor, next_cursor
 from app.shared.time import now_utc
 from app.survillance.domain.entities.connection import Conexion
 from app.survillance.domain.repositories_interfaces import IConexionRepository
@@ -56,6 +57,21 @@ class ConexionService:
     ) -> List[Conexion]:
         """Lista todas las conexiones con filtros"""
         return await self.conexion_repo.get_all(limit, offset, id_oficina, habilitada)
+
+    async def get_page(
+        self,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        offset: int = 0,
+        id_oficina: Optional[int] = None,
+        habilitada: Optional[bool] = None
+    ) -> Tuple[List[Conexion], Optional[str]]:
+        """Página de conexiones por keyset (id); retorna (conexiones, cursor siguiente)"""
+        after = decode_cursor(cursor, int)
+        conexiones = await self.conexion_repo.get_all(
+            limit, offset, id_oficina, habilitada, after[0] if after else None
+        )
+        return conexiones, next_cursor(conexiones, limit, "id")
     
     async def update(self, id_conexion: int, data: ConexionUpdate) -> Conexion:
         """Actualiza una conexión"""
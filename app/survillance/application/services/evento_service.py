@@ -2,13 +2,29 @@
 Servicio para gestión de eventos.
 """
 from datetime import datetime, timedelta
-from typing import List, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 import os
 
 from fastapi import HTTPException, status
 
+from app.shared.pagination import decode_cursor, next_cursor
+from app.shared.time import now_utc, to_utc, truncate_utc
 from app.survillance.domain.entities.event import Evento
-from app.survillance.domain.repositories_interfaces import IEventoRepository, IClipRepository
+from app.survillance.domain.entities.confidence_series import SerieConfianza
+from app.survillance.domain.entities.event_snapshot import EventSnapshot
+from app.survillance.domain.repositories_interfaces import (
+    IEventoRepository,
+    IClipRepository,
+    ISerieConfianzaRepository,
+    IEventoStatsRepository,
+    IEventSnapshotRepository,
+)
+from app.survillance.application.dto import (
+    SerieConfianzaResponse,
+    EventoStatsPunto,
+    EventoStatsSerie,
+    EventoStatsResponse,
+)
 from app.survillance.application.clip_resolver import ClipResolver
 from app.survillance.domain.value_objects.media_paths import SubclipPath
 from app.survillance.domain.value_objects.timestamps import DurationSeconds
@@ -18,16 +34,39 @@ from app.survillance.domain.value_objects.timestamps import MilliSeconds
 from app.survillance.domain.enums import TipoEvento
 
 
+# Paso de cada granularidad del rollup de estadísticas
+_STATS_STEP = {
+    "minute": timedelta(minutes=1),
+    "hour": timedelta(hours=1),
+    "day": timedelta(days=1),
+}
+
+
+def stats_retention(granularidad: str) -> Optional[timedelta]:
+    """Cuánto se conservan los buckets de una granularidad en eventos_stats (None = siempre)"""
+    days = {
+        "minute": settings.EVENT_STATS_MINUTE_RETENTION_DAYS,
+        "hour": settings.EVENT_STATS_HOUR_RETENTION_DAYS,
+    }.get(granularidad, 0)
+    return timedelta(days=days) if days > 0 else None
+
+
 class EventoService:
     """Servicio para gestión de eventos"""
     
     def __init__(
         self,
         evento_repo: IEventoRepository,
-        clip_repo: IClipRepository
+        clip_repo: IClipRepository,
+        serie_repo: Optional[ISerieConfianzaRepository] = None,
+        stats_repo: Optional[IEventoStatsRepository] = None,
+        snapshot_repo: Optional[IEventSnapshotRepository] = None
     ):
         self.evento_repo = evento_repo
         self.clip_repo = clip_repo
+        self.serie_repo = serie_repo
+        self.stats_repo = stats_repo
+        self.snapshot_repo = snapshot_repo
 
     async def create_evento(
         self,
@@ -83,6 +122,199 @@ class EventoService:
         return await self.evento_repo.get_all(
             limit, offset, id_conexion, tipo_evento, start_time, end_time
         )
+
+    async def get_page(
+        self,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        offset: int = 0,
+        id_conexion: Optional[int] = None,
+        tipo_evento: Optional[str] = None,
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None
+    ) -> Tuple[List[Evento], Optional[str]]:
+        """Página de eventos por keyset (timestamp_evento, id); retorna (eventos, cursor siguiente)"""
+        after = decode_cursor(cursor, datetime, int)
+        eventos = await self.evento_repo.get_all(
+            limit, offset, id_conexion, tipo_evento, start_time, end_time, after
+        )
+        return eventos, next_cursor(eventos, limit, "timestamp_evento", "id")
+    
+    def stream_rows(
+        self,
+        id_conexion: Optional[int] = None,
+        tipo_evento: Optional[str] = None,
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Eventos filtrados como stream de filas planas, en orden cronológico (exportaciones)"""
+        return self.evento_repo.stream_rows(
+            id_conexion, tipo_evento, start_time, end_time, settings.EXPORT_CHUNK_ROWS
+        )
+    
+    async def get_stats(
+        self,
+        granularidad: str = "hour",
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None,
+        por: str = "tipo",
+        id_conexion: Optional[int] = None,
+        tipo_evento: Optional[str] = None,
+    ) -> EventoStatsResponse:
+        """
+        Series por bucket desde el rollup eventos_stats (sin recorrer eventos).
+        Por defecto las últimas 24 h. Los buckets sin eventos se devuelven en 0.
+        """
+        step = _STATS_STEP[granularidad]
+        end_time = to_utc(end_time) if end_time else now_utc()
+        start_time = to_utc(start_time) if start_time else end_time - timedelta(days=1)
+        start = truncate_utc(start_time, granularidad)
+        if start_time >= end_time:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="start_time debe ser anterior a end_time"
+            )
+
+        n_buckets = -(-(end_time - start) // step)
+        if n_buckets > settings.EVENT_STATS_MAX_BUCKETS:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=(
+                    f"El rango pedido son {n_buckets} buckets de {granularidad} "
+                    f"(máximo {settings.EVENT_STATS_MAX_BUCKETS}); usar una granularidad mayor"
+                )
+            )
+
+        retention = stats_retention(granularidad)
+        if retention is not None and start < now_utc() - retention:
+            # Los buckets más viejos ya se podaron: la serie saldría en 0
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=(
+                    f"Los buckets de {granularidad} se conservan {retention.days} días; "
+                    f"usar una granularidad mayor"
+                )
+            )
+
+        rows = await self.stats_repo.series(
+            granularidad, start, end_time, por, id_conexion, tipo_evento
+        )
+
+        # Una serie por combinación de dimensiones, con todos los buckets del rango
+        grouped: Dict[Tuple, Dict[datetime, Dict]] = {}
+        for row in rows:
+            key = (row.get("id_conexion"), row.get("tipo_evento"))
+            grouped.setdefault(key, {})[row["bucket"]] = row
+        if not grouped and por == "total":
+            grouped[(None, None)] = {}
+
+        buckets = [start + step * i for i in range(n_buckets)]
+        series = []
+        for (serie_conexion, serie_tipo), by_bucket in grouped.items():
+            puntos = []
+            for bucket in buckets:
+                row = by_bucket.get(bucket)
+                puntos.append(EventoStatsPunto(
+                    bucket=bucket,
+                    total=row["total"] if row else 0,
+                    confianza_promedio=(
+                        round(float(row["confianza_promedio"]), 4)
+                        if row and row["confianza_promedio"] is not None else None
+                    ),
+                    confianza_max=(
+                        float(row["confianza_max"])
+                        if row and row["confianza_max"] is not None else None
+                    ),
+                ))
+            series.append(EventoStatsSerie(
+                id_conexion=serie_conexion,
+                tipo_evento=serie_tipo,
+                total=sum(p.total for p in puntos),
+                puntos=puntos,
+            ))
+
+        return EventoStatsResponse(
+            granularidad=granularidad,
+            por=por,
+            start_time=start,
+            end_time=end_time,
+            series=series,
+        )
+
+    async def guardar_serie_confianza(
+        self,
+        id_evento: int,
+        columnas: Dict[str, List[float]],
+    ) -> Optional[SerieConfianza]:
+        """
+        Persiste la serie de confianza por clase de un evento.
+        No hace nada si no hay columnas o no hay repositorio de series.
+        """
+        if self.serie_repo is None or not columnas:
+            return None
+        serie = SerieConfianza(id_evento=id_evento, columnas=columnas)
+        if serie.n_frames == 0:
+            return None
+        return await self.serie_repo.create(serie)
+
+    async def get_serie_confianza(
+        self,
+        id_evento: int,
+        puntos: int = 200,
+        agregacion: str = "max",
+    ) -> SerieConfianzaResponse:
+        """
+        Devuelve la serie de confianza del evento submuestreada a `puntos`.
+        t_ms es el offset (relativo al clip) del inicio de cada punto.
+        """
+        evento = await self.get_by_id(id_evento)
+        serie = await self.serie_repo.get_by_evento(id_evento) if self.serie_repo else None
+        if serie is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="El evento no tiene serie de confianza"
+            )
+
+        series = serie.downsample(puntos, agregacion)
+        n_frames = serie.n_frames
+        t_inicio = int(evento.t_inicio_ms)
+        span = max(0, int(evento.t_fin_ms) - t_inicio)
+        t_ms = [
+            t_inicio + (span * a) // n_frames
+            for a, _ in serie.bucket_bounds(puntos)
+        ] if n_frames else []
+
+        return SerieConfianzaResponse(
+            id_evento=id_evento,
+            clases=serie.clases,
+            n_frames=n_frames,
+            n_puntos=len(t_ms),
+            agregacion=agregacion,
+            t_ms=t_ms,
+            series=series,
+        )
+
+    async def get_snapshots(self, id_evento: int) -> List[EventSnapshot]:
+        """Miniaturas del evento en orden de offset (vacío si todavía no se generaron)"""
+        return list(await self.snapshot_repo.list_by_event(id_evento))
+    
+    async def get_snapshot(self, id_evento: int, id_snapshot: Optional[int] = None) -> EventSnapshot:
+        """
+        Una miniatura del evento con su archivo en disco: la pedida, o sin
+        id_snapshot la primera (la del inicio del evento) para las grillas.
+        """
+        if id_snapshot is None:
+            snapshots = await self.snapshot_repo.list_by_event(id_evento, limit=1)
+            snapshot = snapshots[0] if snapshots else None
+        else:
+            snapshot = await self.snapshot_repo.get(id_snapshot)
+        
+        if snapshot is None or snapshot.id_evento != id_evento or not snapshot.ruta_imagen.exists():
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Miniatura no encontrada"
+            )
+        return snapshot
     
     async def generar_subclip(self, id_evento: int, padding: int = 2) -> Evento:
         """
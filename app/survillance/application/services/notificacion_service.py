@@ -1,16 +1,49 @@
 """
 Servicio CRUD de notificaciones.
 """
-from typing import List, Optional
+from typing import Dict, Iterable, List, Optional, Tuple
 
 from fastapi import HTTPException, status
 
+from app.shared.db import after_commit
+from app.shared.pagination import decode_cursor, next_cursor
 from app.survillance.domain.entities.notification import Notificacion
 from app.survillance.domain.repositories_interfaces import INotificacionRepository
 from app.survillance.domain.enums import EstadoNotificacion
 from app.survillance.application.dto import NotificacionCreate, NotificacionUpdate
 
-from app.survillance.application.services.notification_ws_manager import manager
+from app.survillance.application.services.notification_ws_manager import manager, notification_topics
+
+
+def notificacion_topics_of(notif: Notificacion) -> List[str]:
+    """Topics de WebSocket de una notificación persistida"""
+    return notification_topics(
+        destinatario=notif.destinatario,
+        id_conexion=notif.id_conexion,
+        id_oficina=notif.id_oficina,
+        tipo_evento=notif.tipo_evento,
+    )
+
+
+def notificacion_payload(notif: Notificacion) -> dict:
+    """Payload que recibe el cliente WS (en vivo y en replay); seq == id"""
+    payload = {
+        "seq": notif.id,
+        "id": notif.id,
+        "mensaje": notif.mensaje,
+        "canal": notif.canal,
+        "destinatario": notif.destinatario,
+        "estado": notif.estado,
+        "fecha_envio": notif.fecha_envio,
+    }
+    if notif.tipo_evento is not None:
+        payload["tipo_evento"] = notif.tipo_evento
+    if notif.confianza is not None:
+        payload["confianza"] = notif.confianza
+    if notif.id_conexion is not None:
+        payload["id_conexion"] = notif.id_conexion
+    return payload
+
 
 class NotificacionService:
     """Servicio CRUD de notificaciones"""
@@ -19,28 +52,59 @@ class NotificacionService:
         self.notif_repo = notif_repo
     
     async def create(self, data: NotificacionCreate) -> Notificacion:
-        """Crea una notificación"""
+        """
+        Crea una notificación y la publica por WebSocket recién cuando commitea
+        la transacción externa de la sesión del repositorio (persist-then-push):
+        el payload lleva su id, que además es la secuencia para el replay, y
+        una fila que termina en rollback (o su savepoint) nunca se publica.
+        """
         notif = Notificacion(
             mensaje=data.mensaje,
             canal=data.canal,
             destinatario=data.destinatario,
-            estado=EstadoNotificacion.PENDIENTE
+            estado=EstadoNotificacion.PENDIENTE,
+            id_conexion=data.id_conexion,
+            id_oficina=data.id_oficina,
+            tipo_evento=data.tipo_evento,
+            confianza=data.confianza,
         )
-        notif_ws_manager = manager
-
-        payload = {
-                "id": notif.id,
-                "mensaje": notif.mensaje,
-                "canal": notif.canal,
-                "destinatario": notif.destinatario,
-                "estado": notif.estado,
-                "fecha_envio": notif.fecha_envio
-            }
-
-        await notif_ws_manager.send_to_destinatario(destinatario=data.destinatario, payload=payload)
-        
-        return await self.notif_repo.create(notif)
-    
+        notif = await self.notif_repo.create(notif)
+
+        topics = notificacion_topics_of(notif)
+        payload = notificacion_payload(notif)
+
+        async def publish() -> None:
+            await manager.publish(topics, payload, confianza=notif.confianza, seq=notif.id)
+
+        after_commit(self.notif_repo.session, publish)
+        return notif
+
+    async def replay_since(
+        self,
+        since: int,
+        topics: Iterable[str],
+        min_confianza: float = 0.0,
+        limit: int = 500,
+    ) -> List[Notificacion]:
+        """Notificaciones con id > since para los topics dados (replay desde BD)"""
+        por_prefijo: Dict[str, List[str]] = {}
+        for topic in topics:
+            prefijo, _, valor = topic.partition(":")
+            por_prefijo.setdefault(prefijo, []).append(valor)
+
+        def _ints(values: List[str]) -> List[int]:
+            return [int(v) for v in values if v.lstrip("-").isdigit()]
+
+        return list(await self.notif_repo.list_since(
+            since,
+            destinatarios=por_prefijo.get("destinatario", []),
+            id_conexiones=_ints(por_prefijo.get("camara", [])),
+            id_oficinas=_ints(por_prefijo.get("oficina", [])),
+            tipos_evento=por_prefijo.get("tipo", []),
+            min_confianza=min_confianza,
+            limit=limit,
+        ))
+
     async def get_all(
         self,
         limit: int = 100,
@@ -48,6 +112,17 @@ class NotificacionService:
     ) -> List[Notificacion]:
         """Lista notificaciones"""
         return await self.notif_repo.get_all(limit, offset)
+
+    async def get_page(
+        self,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        offset: int = 0
+    ) -> Tuple[List[Notificacion], Optional[str]]:
+        """Página de notificaciones por keyset (id); retorna (notificaciones, cursor siguiente)"""
+        after = decode_cursor(cursor, int)
+        notifs = await self.notif_repo.get_all(limit, offset, after[0] if after else None)
+        return notifs, next_cursor(notifs, limit, "id")
     
     async def update(
         self,
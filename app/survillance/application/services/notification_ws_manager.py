@@ -1,36 +1,349 @@
-from collections import defaultdict
-from typing import Dict, List
-from fastapi import WebSocket
+import asyncio
 import json
+import logging
+from collections import defaultdict, deque
+from typing import Awaitable, Callable, Deque, Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+from fastapi import WebSocket
+
+from app.config.settings import settings
+from app.shared.services.notification_bus import NotificationBus, build_notification_bus
+
+logger = logging.getLogger(__name__)
+
+# Prefijos de topic aceptados en una suscripción
+TOPIC_PREFIXES = ("camara:", "oficina:", "tipo:", "destinatario:")
+
+
+def notification_topics(
+    *,
+    destinatario: Optional[str] = None,
+    id_conexion: Optional[int] = None,
+    id_oficina: Optional[int] = None,
+    tipo_evento: Optional[str] = None,
+) -> List[str]:
+    """Topics a los que pertenece una notificación según sus metadatos"""
+    topics: List[str] = []
+    if destinatario:
+        topics.append(f"destinatario:{destinatario}")
+    if id_conexion is not None:
+        topics.append(f"camara:{id_conexion}")
+    if id_oficina is not None:
+        topics.append(f"oficina:{id_oficina}")
+    if tipo_evento:
+        topics.append(f"tipo:{tipo_evento}")
+    return topics
+
+
+def is_valid_topic(topic: str) -> bool:
+    return any(topic.startswith(p) and len(topic) > len(p) for p in TOPIC_PREFIXES)
+
+
+class _Buffered(NamedTuple):
+    seq: int
+    topics: Tuple[str, ...]
+    confianza: Optional[float]
+    text: str
+
+
+# (since) -> [(seq, texto)] desde la BD, para el replay cuando el buffer no alcanza
+ReplayLoader = Callable[[int], Awaitable[List[Tuple[int, str]]]]
+
+
+class _WSClient:
+    """
+    Un WebSocket con sus topics, su cola de envío acotada y su tarea emisora.
+    Si el cliente es lento y la cola se llena, se descarta el mensaje más viejo.
+
+    Las seq llegan en orden de commit, no de id: una transacción que tomó un
+    id menor puede commitear después. Por eso no se descarta por "seq <= la
+    última enviada" sino por las últimas `seen_size` seq ya enviadas.
+    """
+
+    def __init__(self, ws: WebSocket, queue_size: int, send_timeout: float, seen_size: int = 1000) -> None:
+        self.ws = ws
+        self.topics: Set[str] = set()
+        self.min_confianza: float = 0.0
+        # Mayor secuencia enviada (para informar al cliente, no para deduplicar)
+        self.last_seq: int = 0
+        # Secuencias ya enviadas: evita duplicados entre replay y mensajes en vivo
+        self.seen: Set[int] = set()
+        self._seen_order: Deque[int] = deque()
+        self.seen_size = max(1, seen_size)
+        self.queue: asyncio.Queue[Tuple[Optional[int], str]] = asyncio.Queue(maxsize=queue_size)
+        self.send_timeout = send_timeout
+        self.dropped = 0
+        self.task: Optional[asyncio.Task] = None
+
+    def accepts(self, confianza: Optional[float]) -> bool:
+        # Las notificaciones sin confianza (mensajes generales) no se filtran
+        return confianza is None or confianza >= self.min_confianza
+
+    def matches(self, topics: Iterable[str], confianza: Optional[float]) -> bool:
+        return self.accepts(confianza) and any(t in self.topics for t in topics)
+
+    def offer(self, text: str, seq: Optional[int] = None) -> None:
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.dropped += 1
+        self.queue.put_nowait((seq, text))
+
+    def mark_sent(self, seq: int) -> bool:
+        """Registra `seq` como enviada; False si ya se había enviado"""
+        if seq in self.seen:
+            return False
+        self.seen.add(seq)
+        self._seen_order.append(seq)
+        if len(self._seen_order) > self.seen_size:
+            self.seen.discard(self._seen_order.popleft())
+        self.last_seq = max(self.last_seq, seq)
+        return True
+
+    async def send_now(self, text: str) -> None:
+        await asyncio.wait_for(self.ws.send_text(text), timeout=self.send_timeout)
+
+    async def run(self, on_dead) -> None:
+        try:
+            while True:
+                seq, text = await self.queue.get()
+                if seq is not None and not self.mark_sent(seq):
+                    continue
+                await self.send_now(text)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            # conexión rota o cliente colgado
+            on_dead(self)
+
 
 class NotificationWSManager:
-    def __init__(self) -> None:
-        self.connections: Dict[str, List[WebSocket]] = defaultdict(list)
+    """
+    Reparte notificaciones a los WebSockets de este proceso.
 
-    async def connect(self, destinatario: str, ws: WebSocket):
+    Cada cliente se suscribe a varios topics (camara:<id>, oficina:<id>,
+    tipo:<tipo_evento>, destinatario:<d>) y opcionalmente a una confianza
+    mínima. Se mantiene un índice topic -> clientes, así publicar cuesta
+    O(suscriptores que coinciden) y no un recorrido de todas las conexiones.
+    publish() pasa por el bus para llegar también a los otros procesos.
+
+    Las notificaciones persistidas llevan `seq` (su id). Las últimas quedan
+    en un ring buffer: un cliente que reconecta con since=<seq> recibe el
+    hueco desde el buffer o, si el buffer ya no lo cubre, desde la BD. Como
+    los ids no commitean en orden, el hueco arranca `reorder_window` seq antes
+    de `since`: la entrega es al-menos-una-vez y el cliente descarta las seq
+    que ya tiene.
+    """
+
+    def __init__(
+        self,
+        bus: Optional[NotificationBus] = None,
+        queue_size: int = 100,
+        send_timeout: float = 5.0,
+        replay_buffer_size: int = 1000,
+        reorder_window: int = 1000,
+    ) -> None:
+        self.bus = bus
+        self.queue_size = queue_size
+        self.send_timeout = send_timeout
+        self.reorder_window = max(0, reorder_window)
+        self.index: Dict[str, Set[_WSClient]] = defaultdict(set)
+        self.clients: Dict[int, _WSClient] = {}
+        self.buffer: Deque[_Buffered] = deque(maxlen=replay_buffer_size)
+        # Todo seq > buffer_floor visto por este proceso sigue en el buffer
+        self.buffer_floor: Optional[int] = None
+        self.started = False
+
+    async def start(self) -> None:
+        """Conecta el manager al bus de notificaciones"""
+        if self.started:
+            return
+        if self.bus is None:
+            self.bus = build_notification_bus()
+        await self.bus.start(self.deliver_local)
+        self.started = True
+
+    async def stop(self) -> None:
+        """Se desconecta del bus y detiene las tareas emisoras"""
+        if self.bus is not None and self.started:
+            await self.bus.stop()
+        self.started = False
+        for client in list(self.clients.values()):
+            if client.task:
+                client.task.cancel()
+        self.index.clear()
+        self.clients.clear()
+
+    async def connect(
+        self,
+        ws: WebSocket,
+        topics: Iterable[str] = (),
+        min_confianza: float = 0.0,
+        since: Optional[int] = None,
+        replay_loader: Optional[ReplayLoader] = None,
+    ) -> _WSClient:
+        """
+        Acepta el socket y lo suscribe. Con `since`, primero envía el hueco
+        (buffer o `replay_loader`) y después arranca el envío en vivo; lo que
+        llegue en vivo mientras tanto queda en cola y se deduplica por seq.
+        """
         await ws.accept()
-        self.connections[destinatario].append(ws)
+        client = _WSClient(ws, self.queue_size, self.send_timeout, seen_size=self.reorder_window)
+        self.clients[id(ws)] = client
+        self.subscribe(ws, topics, min_confianza)
+
+        if since is not None:
+            client.last_seq = since
+            desde = max(0, since - self.reorder_window)
+            items = self.replay_from_buffer(client, desde)
+            if items is None and replay_loader is not None:
+                items = await replay_loader(desde)
+            for seq, text in items or ():
+                if client.mark_sent(seq):
+                    await client.send_now(text)
 
-    def disconnect(self, destinatario: str, ws: WebSocket):
-        conns = self.connections.get(destinatario)
-        if not conns:
+        client.task = asyncio.create_task(client.run(self._on_dead))
+        return client
+
+    def replay_from_buffer(self, client: _WSClient, since: int) -> Optional[List[Tuple[int, str]]]:
+        """Hueco (seq > since) desde el ring buffer, o None si el buffer no lo cubre"""
+        if self.buffer_floor is None or since < self.buffer_floor:
+            return None
+        return [
+            (b.seq, b.text)
+            for b in self.buffer
+            if b.seq > since and client.matches(b.topics, b.confianza)
+        ]
+
+    def _remember(self, seq: int, topics: Iterable[str], confianza: Optional[float], text: str) -> None:
+        if self.buffer_floor is None:
+            # Lo anterior a la primera notificación vista no está en este proceso
+            self.buffer_floor = seq - 1
+        if len(self.buffer) == self.buffer.maxlen:
+            self.buffer_floor = max(self.buffer_floor, self.buffer[0].seq)
+        self.buffer.append(_Buffered(seq, tuple(topics), confianza, text))
+
+    def subscribe(
+        self,
+        ws: WebSocket,
+        topics: Iterable[str],
+        min_confianza: Optional[float] = None,
+    ) -> Set[str]:
+        """Agrega topics a la suscripción del cliente; retorna sus topics actuales"""
+        client = self.clients.get(id(ws))
+        if client is None:
+            return set()
+        for topic in topics:
+            if topic in client.topics:
+                continue
+            client.topics.add(topic)
+            self.index[topic].add(client)
+        if min_confianza is not None:
+            client.min_confianza = min_confianza
+        return client.topics
+
+    def unsubscribe(self, ws: WebSocket, topics: Iterable[str]) -> Set[str]:
+        """Quita topics de la suscripción del cliente; retorna sus topics actuales"""
+        client = self.clients.get(id(ws))
+        if client is None:
+            return set()
+        for topic in topics:
+            if topic not in client.topics:
+                continue
+            client.topics.discard(topic)
+            self._unindex(topic, client)
+        return client.topics
+
+    def _unindex(self, topic: str, client: _WSClient) -> None:
+        subs = self.index.get(topic)
+        if subs is None:
             return
-        if ws in conns:
-            conns.remove(ws)
-        if not conns:
-            self.connections.pop(destinatario, None)
+        subs.discard(client)
+        if not subs:
+            self.index.pop(topic, None)
+
+    def reply(self, ws: WebSocket, payload: dict) -> None:
+        """Respuesta directa a un cliente, por su misma cola (un solo emisor por socket)"""
+        client = self.clients.get(id(ws))
+        if client is not None:
+            client.offer(json.dumps(payload, default=str))
+
+    def _on_dead(self, client: _WSClient) -> None:
+        self.disconnect(client.ws)
+
+    def disconnect(self, ws: WebSocket):
+        client = self.clients.pop(id(ws), None)
+        if client is None:
+            return
+        for topic in client.topics:
+            self._unindex(topic, client)
+        if client.task and client.task is not asyncio.current_task():
+            client.task.cancel()
+
+    async def publish(
+        self,
+        topics: List[str],
+        payload: dict,
+        confianza: Optional[float] = None,
+        seq: Optional[int] = None,
+    ) -> None:
+        """Publica una notificación para los clientes suscritos a cualquiera de `topics`."""
+        if not topics:
+            return
+        if not self.started:
+            await self.start()
+        message = {"topics": topics, "confianza": confianza, "seq": seq, "payload": payload}
+        try:
+            await self.bus.publish(message)
+        except Exception as e:
+            # Sin bus al menos llega a los clientes de este proceso
+            logger.warning("[WS-NOTIF] Falló publish en el bus (%s), entrega local", e)
+            await self.deliver_local(message)
 
     async def send_to_destinatario(self, destinatario: str, payload: dict):
         """Envía la notificación a todos los clientes suscritos a ese destinatario."""
-        conns = list(self.connections.get(destinatario, []))
-        dead: List[WebSocket] = []
-        for ws in conns:
-            try:
-                await ws.send_json(payload)
-            except Exception:
-                # conexión rota
-                dead.append(ws)
-        for ws in dead:
-            self.disconnect(destinatario, ws)
-
-manager = NotificationWSManager()
\ No newline at end of file
+        await self.publish(notification_topics(destinatario=destinatario), payload)
+
+    async def deliver_local(self, message: dict) -> None:
+        """Serializa una sola vez y encola en cada cliente que coincide; no espera a los sockets."""
+        topics = message.get("topics") or ()
+        confianza = message.get("confianza")
+        seq = message.get("seq")
+        text = None
+        if seq is not None:
+            text = json.dumps(message["payload"], default=str)
+            self._remember(seq, topics, confianza, text)
+
+        matched: Set[_WSClient] = set()
+        for topic in topics:
+            subs = self.index.get(topic)
+            if subs:
+                matched |= subs
+
+        for client in matched:
+            if not client.accepts(confianza):
+                continue
+            if text is None:
+                text = json.dumps(message["payload"], default=str)
+            client.offer(text, seq)
+
+    def topic_counts(self) -> Dict[str, int]:
+        """Cantidad de suscriptores locales por topic"""
+        return {topic: len(subs) for topic, subs in self.index.items()}
+
+    def get_status(self) -> Dict:
+        return {
+            "backend": type(self.bus).__name__ if self.bus else None,
+            "connections": len(self.clients),
+            "topics": self.topic_counts(),
+            "dropped": sum(c.dropped for c in self.clients.values()),
+            "replay_buffer": len(self.buffer),
+            "replay_floor": self.buffer_floor,
+        }
+
+
+manager = NotificationWSManager(
+    queue_size=settings.WS_SEND_QUEUE_SIZE,
+    send_timeout=settings.WS_SEND_TIMEOUT_SECONDS,
+    replay_buffer_size=settings.WS_REPLAY_BUFFER_SIZE,
+    reorder_window=settings.WS_REPLAY_REORDER_WINDOW,
+)
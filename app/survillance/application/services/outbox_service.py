@@ -0,0 +1,37 @@
+"""
+Servicio del outbox de notificaciones: encola mensajes salientes.
+"""
+from typing import Optional
+
+from fastapi import HTTPException, status
+
+from app.config.settings import settings
+from app.shared.time import now_utc
+from app.survillance.domain.entities.outbox_message import MensajeSalida
+from app.survillance.domain.repositories_interfaces import IOutboxRepository
+
+
+class OutboxService:
+    """Servicio del outbox: el envío real lo hace el OutboxDispatcher"""
+
+    def __init__(self, outbox_repo: IOutboxRepository):
+        self.outbox_repo = outbox_repo
+
+    async def encolar_sms(self, cuerpo: str, destinatario: Optional[str] = None) -> MensajeSalida:
+        """
+        Escribe un SMS en el outbox dentro de la transacción actual.
+        Si la transacción hace rollback, el SMS nunca se envía.
+        """
+        dest = destinatario or settings.TWILIO_DEFAULT_TO_NUMBER
+        if not dest:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="No hay número de destino configurado para SMS"
+            )
+        mensaje = MensajeSalida(
+            canal="sms",
+            destinatario=dest,
+            cuerpo=cuerpo,
+            proximo_intento=now_utc(),
+        )
+        return await self.outbox_repo.create(mensaje)
@@ -1,10 +1,15 @@
 """
-Servicio CRUD de reportes.
+Servicio CRUD de reportes. La generación de los artefactos la hace ReportEngine.
 """
-from typing import List, Optional
+from datetime import datetime
+from typing import List, Optional, Tuple
 
+from fastapi import HTTPException, status
+
+from app.shared.pagination import decode_cursor, next_cursor
 from app.shared.time import now_utc
 from app.survillance.domain.entities.report import Reporte
+from app.survillance.domain.enums import EstadoReporte
 from app.survillance.domain.repositories_interfaces import IReporteRepository
 from app.survillance.application.dto import ReporteCreate
 
@@ -30,6 +35,32 @@ class ReporteService:
         )
         return await self.reporte_repo.create(reporte)
     
+    async def get_by_id(self, id_reporte: int) -> Reporte:
+        """Obtiene reporte por ID (estado y progreso de la generación incluidos)"""
+        reporte = await self.reporte_repo.get(id_reporte)
+        if not reporte:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Reporte no encontrado"
+            )
+        return reporte
+    
+    async def get_ready(self, id_reporte: int) -> Reporte:
+        """Obtiene un reporte con los artefactos generados (409 si todavía no lo están)"""
+        reporte = await self.get_by_id(id_reporte)
+        if reporte.estado != EstadoReporte.LISTO:
+            detail = (
+                f"El reporte falló: {reporte.error}" if reporte.estado == EstadoReporte.FALLIDO
+                else f"El reporte todavía no está listo ({reporte.estado.value}, {reporte.progreso}%)"
+            )
+            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=detail)
+        return reporte
+    
+    async def requeue(self, reporte: Reporte) -> Reporte:
+        """Vuelve a dejar el reporte pendiente de generación"""
+        reporte.mark_pending()
+        return await self.reporte_repo.update(reporte)
+    
     async def get_all(
         self,
         limit: int = 100,
@@ -39,3 +70,15 @@ class ReporteService:
         """Lista reportes"""
         return await self.reporte_repo.get_all(limit, offset, id_usuario)
 
+    async def get_page(
+        self,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        offset: int = 0,
+        id_usuario: Optional[int] = None
+    ) -> Tuple[List[Reporte], Optional[str]]:
+        """Página de reportes por keyset (fecha_generacion, id); retorna (reportes, cursor siguiente)"""
+        after = decode_cursor(cursor, datetime, int)
+        reportes = await self.reporte_repo.get_all(limit, offset, id_usuario, after)
+        return reportes, next_cursor(reportes, limit, "fecha_generacion", "id")
+
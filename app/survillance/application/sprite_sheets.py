@@ -0,0 +1,104 @@
+"""
+Sprites de scrub por clip: una imagen WebP con un frame cada `interval`
+segundos en grilla, más una pista WebVTT de miniaturas que indica, para cada
+tramo del clip, qué celda mostrar (`sprite.webp#xywh=x,y,w,h`). El reproductor
+muestra la preview del scrub con una sola imagen chica, sin pedir rangos del MP4.
+
+Funciones puras: la grilla se calcula solo con la duración del clip y la
+configuración, así el WebVTT no necesita mirar la imagen generada.
+"""
+import math
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import List, Tuple
+
+from app.survillance.domain.entities.clip import Clip
+
+# Nombre con el que el WebVTT referencia la imagen (relativo a la URL del .vtt)
+SPRITE_IMAGE_NAME = "sprite.webp"
+
+
+@dataclass(frozen=True)
+class SpriteLayout:
+    """Grilla de un sprite: `frames` celdas de width x height, `columns` por fila"""
+    interval: int
+    frames: int
+    columns: int
+    rows: int
+    width: int
+    height: int
+
+    @classmethod
+    def for_duration(
+        cls,
+        duration_sec: int,
+        interval: int,
+        max_frames: int,
+        columns: int,
+        width: int,
+        height: int,
+    ) -> "SpriteLayout":
+        """Layout para un clip; en clips largos el intervalo crece para no pasar de max_frames"""
+        duration_sec = max(1, int(duration_sec))
+        interval = max(1, interval, math.ceil(duration_sec / max(1, max_frames)))
+        frames = math.ceil(duration_sec / interval)
+        columns = max(1, min(columns, frames))
+        return cls(
+            interval=interval,
+            frames=frames,
+            columns=columns,
+            rows=math.ceil(frames / columns),
+            width=width,
+            height=height,
+        )
+
+    def cell(self, index: int) -> Tuple[int, int]:
+        """Esquina superior izquierda (x, y) de la celda `index`"""
+        row, column = divmod(index, self.columns)
+        return column * self.width, row * self.height
+
+
+def _vtt_time(seconds: int) -> str:
+    hours, rest = divmod(seconds, 3600)
+    minutes, seconds = divmod(rest, 60)
+    return f"{hours:02d}:{minutes:02d}:{seconds:02d}.000"
+
+
+def render_vtt(layout: SpriteLayout, duration_sec: int, image: str = SPRITE_IMAGE_NAME) -> str:
+    """Pista WebVTT de miniaturas: un cue por celda, hasta el final del clip"""
+    duration_sec = max(1, int(duration_sec))
+    lines: List[str] = ["WEBVTT", ""]
+    for index in range(layout.frames):
+        start = index * layout.interval
+        end = min(start + layout.interval, duration_sec)
+        x, y = layout.cell(index)
+        lines += [
+            f"{_vtt_time(start)} --> {_vtt_time(end)}",
+            f"{image}#xywh={x},{y},{layout.width},{layout.height}",
+            "",
+        ]
+    return "\n".join(lines)
+
+
+def _day_dir(base_path: str, day: datetime) -> Path:
+    return Path(base_path) / day.strftime("%Y/%m/%d")
+
+
+def sprite_paths(base_path: str, clip: Clip) -> Tuple[Path, Path]:
+    """(imagen, vtt) del sprite de un clip, por día UTC de inicio del clip (se poda por fecha)"""
+    folder = _day_dir(base_path, clip.start_time_utc)
+    return folder / f"{clip.id}.webp", folder / f"{clip.id}.vtt"
+
+
+def sprite_day_dirs(base_path: str, desde: datetime, hasta: datetime) -> List[Path]:
+    """
+    Carpetas de sprites de los clips que empiezan en [desde, hasta), alineado a
+    días UTC (como las particiones de clips): contienen solo sprites de esos clips.
+    """
+    dirs = []
+    day = desde
+    while day < hasta:
+        dirs.append(_day_dir(base_path, day))
+        day += timedelta(days=1)
+    return dirs
@@ -6,9 +6,12 @@ from .event import Evento
 from .report import Reporte
 from .notification import Notificacion
 from .inference_request import InferenceRequest
+from .confidence_series import SerieConfianza
+from .outbox_message import MensajeSalida
+from .inference_ingest import InferenceIngest
 
 __all__ = [
     "Oficina", "Conexion", "Clip", "Usuario",
     "Evento", "Notificacion", "InferenceRequest",
-    "Reporte"
+    "Reporte", "SerieConfianza", "MensajeSalida", "InferenceIngest"
 ]
@@ -0,0 +1,71 @@
+"""
+Domain entity: SerieConfianza (per-class confidence time series of an event).
+"""
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+from datetime import datetime
+
+
+@dataclass
+class SerieConfianza:
+    """
+    Domain entity holding the per-frame probability of every class reported
+    by the model for one event, stored column by column (one list per class).
+    """
+    id_evento: int
+    columnas: Dict[str, List[float]] = field(default_factory=dict)
+    created_at: Optional[datetime] = None
+    id: Optional[int] = None
+
+    def __post_init__(self):
+        """Domain validations"""
+        lengths = {len(values) for values in self.columnas.values()}
+        if len(lengths) > 1:
+            raise ValueError("all class columns must have the same number of frames")
+
+    @property
+    def clases(self) -> List[str]:
+        """Classes present in the series, in storage order"""
+        return list(self.columnas.keys())
+
+    @property
+    def n_frames(self) -> int:
+        """Number of frames in the series"""
+        for values in self.columnas.values():
+            return len(values)
+        return 0
+
+    def downsample(self, max_points: int, agregacion: str = "max") -> Dict[str, List[float]]:
+        """
+        Reduces every column to at most max_points buckets.
+
+        Args:
+            max_points: Maximum number of points per class
+            agregacion: "max" keeps the peak of each bucket, "mean" its average
+
+        Returns:
+            Dict class -> downsampled values
+        """
+        if max_points <= 0:
+            raise ValueError("max_points must be > 0")
+        if agregacion not in ("max", "mean"):
+            raise ValueError(f"invalid agregacion: {agregacion}")
+
+        n = self.n_frames
+        if n <= max_points:
+            return {cls: list(values) for cls, values in self.columnas.items()}
+
+        bounds = self.bucket_bounds(max_points)
+        result: Dict[str, List[float]] = {}
+        for cls, values in self.columnas.items():
+            if agregacion == "max":
+                result[cls] = [max(values[a:b]) for a, b in bounds]
+            else:
+                result[cls] = [sum(values[a:b]) / (b - a) for a, b in bounds]
+        return result
+
+    def bucket_bounds(self, max_points: int) -> List[tuple[int, int]]:
+        """Frame ranges [start, end) of each bucket used by downsample()"""
+        n = self.n_frames
+        points = min(n, max_points)
+        return [(i * n // points, (i + 1) * n // points) for i in range(points)]
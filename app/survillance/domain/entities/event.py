@@ -2,7 +2,7 @@
 Domain entity: Event (no infrastructure dependencies).
 """
 from dataclasses import dataclass
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 
 from ..value_objects.timestamps import DurationSeconds, MilliSeconds
@@ -26,6 +26,7 @@ class Evento:
     confianza: Optional[float] = None
     subclip_path: Optional[SubclipPath] = None
     subclip_duracion_sec: Optional[DurationSeconds] = None
+    clips_cubiertos: Optional[List[int]] = None
     id: Optional[int] = None
     
     def __post_init__(self):
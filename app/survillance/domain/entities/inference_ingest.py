@@ -0,0 +1,64 @@
+"""
+Domain entity: InferenceIngest (accepted webhook waiting to be processed).
+"""
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+from datetime import datetime
+
+from ..enums import EstadoIngesta
+
+
+@dataclass
+class InferenceIngest:
+    """
+    Domain entity representing an inference webhook accepted with 202 and
+    stored as-is, processed later by the background ingest workers.
+    """
+    payload: Dict[str, Any]
+    request_id: Optional[str] = None
+    estado: EstadoIngesta = EstadoIngesta.PENDIENTE
+    intentos: int = 0
+    proximo_intento: Optional[datetime] = None
+    resultado: Optional[Dict[str, Any]] = None
+    ultimo_error: Optional[str] = None
+    created_at: Optional[datetime] = None
+    procesado_at: Optional[datetime] = None
+    id: Optional[int] = None
+
+    def __post_init__(self):
+        """Domain validations"""
+        if not isinstance(self.payload, dict):
+            raise ValueError("payload must be a JSON object")
+
+        if self.intentos < 0:
+            raise ValueError("intentos must be >= 0")
+
+    def mark_processed(self, resultado: Dict[str, Any], when: datetime) -> None:
+        """Marks the webhook as processed, keeping the webhook response"""
+        self.estado = EstadoIngesta.PROCESADA
+        self.resultado = resultado
+        self.procesado_at = when
+        self.ultimo_error = None
+
+    def mark_failed_attempt(
+        self,
+        error: str,
+        retry_at: Optional[datetime],
+        max_attempts: int,
+        when: datetime,
+    ) -> None:
+        """
+        Registers a failed attempt. The webhook is scheduled again at retry_at
+        unless retry_at is None (permanent error) or max_attempts was reached.
+        """
+        self.intentos += 1
+        self.ultimo_error = error[:500]
+        if retry_at is None or self.intentos >= max_attempts:
+            self.estado = EstadoIngesta.FALLIDA
+            self.procesado_at = when
+        else:
+            self.proximo_intento = retry_at
+
+    def is_pending(self) -> bool:
+        """Checks if the webhook still has to be processed"""
+        return self.estado == EstadoIngesta.PENDIENTE
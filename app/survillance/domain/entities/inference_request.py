@@ -2,7 +2,7 @@
 Domain entity: InferenceRequest (webhook idempotency control).
 """
 from dataclasses import dataclass
-from typing import Optional
+from typing import Any, Dict, Optional
 from datetime import datetime
 
 
@@ -14,6 +14,7 @@ class InferenceRequest:
     """
     request_id: str
     received_at: datetime
+    response: Optional[Dict[str, Any]] = None
     id: Optional[int] = None
     
     def __post_init__(self):
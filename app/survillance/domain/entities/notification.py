@@ -18,6 +18,11 @@ class Notificacion:
     destinatario: str
     estado: EstadoNotificacion
     fecha_envio: Optional[datetime] = None
+    # Metadatos de topic (WebSocket): cámara, oficina, tipo de evento, confianza
+    id_conexion: Optional[int] = None
+    id_oficina: Optional[int] = None
+    tipo_evento: Optional[str] = None
+    confianza: Optional[float] = None
     id: Optional[int] = None
     
     def __post_init__(self):
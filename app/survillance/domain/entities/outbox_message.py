@@ -0,0 +1,83 @@
+"""
+Domain entity: MensajeSalida (outbox message pending delivery).
+"""
+from dataclasses import dataclass
+from typing import Optional
+from datetime import datetime
+
+from ..enums import EstadoNotificacion
+
+
+@dataclass
+class MensajeSalida:
+    """
+    Domain entity representing a message written to the outbox in the same
+    transaction as the event that caused it, and delivered later by the
+    background dispatcher.
+    """
+    canal: str
+    destinatario: str
+    cuerpo: str
+    estado: EstadoNotificacion = EstadoNotificacion.PENDIENTE
+    intentos: int = 0
+    proximo_intento: Optional[datetime] = None
+    ultimo_error: Optional[str] = None
+    proveedor_id: Optional[str] = None
+    created_at: Optional[datetime] = None
+    enviado_at: Optional[datetime] = None
+    id: Optional[int] = None
+
+    def __post_init__(self):
+        """Domain validations"""
+        if not self.canal or not self.canal.strip():
+            raise ValueError("canal cannot be empty")
+
+        if not self.destinatario or not self.destinatario.strip():
+            raise ValueError("destinatario cannot be empty")
+
+        if not self.cuerpo or not self.cuerpo.strip():
+            raise ValueError("cuerpo cannot be empty")
+
+        if self.intentos < 0:
+            raise ValueError("intentos must be >= 0")
+
+    def mark_sending(self, lease_until: datetime) -> None:
+        """
+        Claims the message for delivery. If no result is recorded before
+        lease_until (the dispatcher died mid-send) it can be claimed again.
+        """
+        self.estado = EstadoNotificacion.ENVIANDO
+        self.proximo_intento = lease_until
+
+    def postpone(self, until: datetime) -> None:
+        """Schedules the message again without counting an attempt"""
+        self.estado = EstadoNotificacion.PENDIENTE
+        self.proximo_intento = until
+
+    def mark_sent(self, proveedor_id: Optional[str], when: datetime) -> None:
+        """Marks the message as delivered"""
+        self.estado = EstadoNotificacion.ENVIADA
+        self.proveedor_id = proveedor_id
+        self.enviado_at = when
+        self.ultimo_error = None
+
+    def mark_failed_attempt(
+        self,
+        error: str,
+        retry_at: Optional[datetime],
+        max_attempts: int,
+    ) -> None:
+        """
+        Registers a failed attempt. The message is scheduled again at retry_at
+        unless retry_at is None (permanent error) or max_attempts was reached.
+        """
+        self.intentos += 1
+        self.ultimo_error = error[:500]
+        if retry_at is None or self.intentos >= max_attempts:
+            self.estado = EstadoNotificacion.FALLIDA
+        else:
+            self.postpone(retry_at)
+
+    def is_pending(self) -> bool:
+        """Checks if the message still has to be delivered"""
+        return self.estado == EstadoNotificacion.PENDIENTE
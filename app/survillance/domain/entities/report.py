@@ -1,10 +1,14 @@
 """
 Domain entity: Report (no infrastructure dependencies).
 """
+import hashlib
+import json
 from dataclasses import dataclass
 from typing import Optional
 from datetime import datetime
 
+from ..enums import EstadoReporte
+
 
 @dataclass
 class Reporte:
@@ -20,6 +24,10 @@ class Reporte:
     filtro_confianza: Optional[float] = None
     tipo_evento: Optional[str] = None
     fecha_generacion: Optional[datetime] = None
+    estado: EstadoReporte = EstadoReporte.PENDIENTE
+    progreso: int = 0
+    artefacto: Optional[str] = None
+    error: Optional[str] = None
     id: Optional[int] = None
     
     def __post_init__(self):
@@ -38,7 +46,57 @@ class Reporte:
         if (self.rango_fecha_inicio and self.rango_fecha_fin and 
             self.rango_fecha_inicio >= self.rango_fecha_fin):
             raise ValueError("rango_fecha_inicio must be before rango_fecha_fin")
+        
+        if not (0 <= self.progreso <= 100):
+            raise ValueError(f"progreso must be between 0 and 100, received: {self.progreso}")
     
     def has_date_range(self) -> bool:
         """Checks if the report has a date range"""
-        return self.rango_fecha_inicio is not None and self.rango_fecha_fin is not None
\ No newline at end of file
+        return self.rango_fecha_inicio is not None and self.rango_fecha_fin is not None
+    
+    def filtro_hash(self) -> str:
+        """
+        Hash of the normalized filters: two reports with the same filters
+        produce the same artifacts (titulo/descripcion are not part of them).
+        """
+        key = {
+            "inicio": self.rango_fecha_inicio.isoformat() if self.rango_fecha_inicio else None,
+            "fin": self.rango_fecha_fin.isoformat() if self.rango_fecha_fin else None,
+            "confianza": f"{self.filtro_confianza:.2f}" if self.filtro_confianza is not None else None,
+            "tipo_evento": self.tipo_evento,
+            "id_clip": self.id_clip,
+        }
+        return hashlib.sha256(json.dumps(key, sort_keys=True).encode()).hexdigest()
+    
+    def is_closed(self, now: datetime) -> bool:
+        """Checks if the range already ended: new events can no longer change the report"""
+        return self.rango_fecha_fin is not None and self.rango_fecha_fin <= now
+    
+    def is_finished(self) -> bool:
+        """Checks if the generation ended (ready or failed)"""
+        return self.estado in (EstadoReporte.LISTO, EstadoReporte.FALLIDO)
+    
+    def mark_pending(self) -> None:
+        """Sends the report back to the generation queue (e.g. its artifacts were deleted)"""
+        self.estado = EstadoReporte.PENDIENTE
+        self.progreso = 0
+        self.artefacto = None
+        self.error = None
+    
+    def mark_generating(self) -> None:
+        """Marks the report as being generated, from 0%"""
+        self.estado = EstadoReporte.GENERANDO
+        self.progreso = 0
+        self.error = None
+    
+    def mark_ready(self, artefacto: str) -> None:
+        """Marks the report as ready, pointing to its artifacts"""
+        self.estado = EstadoReporte.LISTO
+        self.progreso = 100
+        self.artefacto = artefacto
+        self.error = None
+    
+    def mark_failed(self, error: str) -> None:
+        """Marks the report generation as failed"""
+        self.estado = EstadoReporte.FALLIDO
+        self.error = error[:500]
@@ -28,5 +28,20 @@ class EstadoConexion(str, Enum):
 class EstadoNotificacion(str, Enum):
     """Notification states"""
     PENDIENTE = "pendiente"
+    ENVIANDO = "enviando"  # solo outbox: tomado por un dispatcher, envío en curso
     ENVIADA = "enviada"
-    FALLIDA = "fallida"
\ No newline at end of file
+    FALLIDA = "fallida"
+
+class EstadoIngesta(str, Enum):
+    """Processing states of an accepted inference webhook"""
+    PENDIENTE = "pendiente"
+    PROCESADA = "procesada"
+    FALLIDA = "fallida"
+
+
+class EstadoReporte(str, Enum):
+    """Generation states of a report's artifacts"""
+    PENDIENTE = "pendiente"
+    GENERANDO = "generando"
+    LISTO = "listo"
+    FALLIDO = "fallido"
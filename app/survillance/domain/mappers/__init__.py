@@ -9,6 +9,10 @@ from .event_mapper import evento_to_domain, evento_to_orm
 from .notification_mapper import notificacion_to_domain, notificacion_to_orm
 from .report_mapper import reporte_to_domain, reporte_to_orm
 from .inference_request_mapper import inference_request_to_domain, inference_request_to_orm
+from .confidence_series_mapper import serie_confianza_to_domain, serie_confianza_to_orm
+from .outbox_mapper import mensaje_salida_to_domain, mensaje_salida_to_orm
+from .inference_ingest_mapper import inference_ingest_to_domain, inference_ingest_to_orm
+from .event_snapshot_mapper import event_snapshot_to_domain, event_snapshot_to_orm
 
 __all__ = [
     "oficina_to_domain",
@@ -27,5 +31,13 @@ __all__ = [
     "reporte_to_orm",
     "inference_request_to_domain",
     "inference_request_to_orm",
+    "serie_confianza_to_domain",
+    "serie_confianza_to_orm",
+    "mensaje_salida_to_domain",
+    "mensaje_salida_to_orm",
+    "inference_ingest_to_domain",
+    "inference_ingest_to_orm",
+    "event_snapshot_to_domain",
+    "event_snapshot_to_orm",
 ]
 
@@ -0,0 +1,68 @@
+"""
+Mapper for SerieConfianza: conversion between domain entity and ORM model.
+
+The ORM stores the columns as one blob: every class column is a little-endian
+float16 array of n_frames values, concatenated in the order given by `clases`.
+"""
+import struct
+from typing import Dict, List, Optional
+
+from app.survillance.models.confidence_series_model import SerieConfianza as SerieConfianzaORM
+from app.survillance.domain.entities.confidence_series import SerieConfianza
+from ._helpers import _as_dt
+
+FORMATO_F16_COLUMNAR = "f16le-col"
+_F16_SIZE = 2
+
+
+def encode_columns(columnas: Dict[str, List[float]], n_frames: int) -> bytes:
+    """Packs the class columns into a float16 columnar blob"""
+    fmt = f"<{n_frames}e"
+    return b"".join(struct.pack(fmt, *values) for values in columnas.values())
+
+
+def decode_columns(clases: List[str], n_frames: int, datos: bytes) -> Dict[str, List[float]]:
+    """Unpacks a float16 columnar blob into class columns"""
+    fmt = f"<{n_frames}e"
+    stride = n_frames * _F16_SIZE
+    if len(datos) != stride * len(clases):
+        raise ValueError("blob size does not match clases x n_frames")
+    return {
+        cls: list(struct.unpack_from(fmt, datos, i * stride))
+        for i, cls in enumerate(clases)
+    }
+
+
+def serie_confianza_to_domain(orm: SerieConfianzaORM) -> SerieConfianza:
+    """Converts ORM model to domain entity"""
+    if orm.formato != FORMATO_F16_COLUMNAR:
+        raise ValueError(f"unsupported series format: {orm.formato}")
+    return SerieConfianza(
+        id_evento=orm.id_evento,
+        columnas=decode_columns(list(orm.clases), orm.n_frames, orm.datos),
+        created_at=orm.created_at,  # ORM already returns datetime with tz
+        id=orm.id_serie
+    )
+
+
+def serie_confianza_to_orm(
+    entity: SerieConfianza,
+    existing: Optional[SerieConfianzaORM] = None
+) -> SerieConfianzaORM:
+    """Converts domain entity to ORM model"""
+    orm = existing or SerieConfianzaORM()
+
+    # DO NOT set id_serie if entity.id is None (autoincrement)
+    if entity.id is not None:
+        orm.id_serie = entity.id
+
+    orm.id_evento = entity.id_evento
+    orm.clases = entity.clases
+    orm.n_frames = entity.n_frames
+    orm.formato = FORMATO_F16_COLUMNAR
+    orm.datos = encode_columns(entity.columnas, entity.n_frames)
+    # created_at: if None, ORM will use default (now_utc)
+    if entity.created_at is not None:
+        orm.created_at = _as_dt(entity.created_at)
+
+    return orm
@@ -26,6 +26,7 @@ def evento_to_domain(orm: EventoORM) -> Evento:
         confianza=float(orm.confianza) if orm.confianza else None,
         subclip_path=SubclipPath(orm.subclip_path) if orm.subclip_path else None,
         subclip_duracion_sec=DurationSeconds(orm.subclip_duracion_sec) if orm.subclip_duracion_sec is not None else None,
+        clips_cubiertos=list(orm.clips_cubiertos) if orm.clips_cubiertos else None,
         id=orm.id_evento
     )
 
@@ -49,6 +50,7 @@ def evento_to_orm(entity: Evento, existing: Optional[EventoORM] = None) -> Event
     orm.confianza = Decimal(str(entity.confianza)) if entity.confianza is not None else None
     orm.subclip_path = str(entity.subclip_path) if entity.subclip_path else None
     orm.subclip_duracion_sec = int(entity.subclip_duracion_sec) if entity.subclip_duracion_sec is not None else None
+    orm.clips_cubiertos = list(entity.clips_cubiertos) if entity.clips_cubiertos else None
     
     return orm
 
@@ -0,0 +1,37 @@
+"""
+Mapper for EventSnapshot: conversion between domain entity and ORM model.
+"""
+from typing import Optional
+
+from app.survillance.models.event_snapshot_model import EventSnapshot as EventSnapshotORM
+from app.survillance.domain.entities.event_snapshot import EventSnapshot
+from app.survillance.domain.value_objects.media_paths import SnapshotPath
+from app.survillance.domain.value_objects.timestamps import MilliSeconds
+
+
+def event_snapshot_to_domain(orm: EventSnapshotORM) -> EventSnapshot:
+    """Converts ORM model to domain entity"""
+    return EventSnapshot(
+        id_evento=orm.id_evento,
+        ruta_imagen=SnapshotPath(orm.ruta_imagen),
+        timestamp_rel_ms=MilliSeconds(orm.timestamp_rel_ms),
+        id=orm.id_snapshot
+    )
+
+
+def event_snapshot_to_orm(
+    entity: EventSnapshot,
+    existing: Optional[EventSnapshotORM] = None
+) -> EventSnapshotORM:
+    """Converts domain entity to ORM model"""
+    orm = existing or EventSnapshotORM()
+
+    # DO NOT set id_snapshot if entity.id is None (autoincrement)
+    if entity.id is not None:
+        orm.id_snapshot = entity.id
+
+    orm.id_evento = int(entity.id_evento)
+    orm.ruta_imagen = str(entity.ruta_imagen)
+    orm.timestamp_rel_ms = int(entity.timestamp_rel_ms)
+
+    return orm
@@ -0,0 +1,53 @@
+"""
+Mapper for InferenceIngest: conversion between domain entity and ORM model.
+"""
+from typing import Optional
+
+from app.survillance.models.inference_ingest_model import InferenceIngest as InferenceIngestORM
+from app.survillance.domain.entities.inference_ingest import InferenceIngest
+from app.survillance.domain.enums import EstadoIngesta
+from ._helpers import _as_dt
+
+
+def inference_ingest_to_domain(orm: InferenceIngestORM) -> InferenceIngest:
+    """Converts ORM model to domain entity"""
+    return InferenceIngest(
+        payload=orm.payload,
+        request_id=orm.request_id,
+        estado=EstadoIngesta(orm.estado),
+        intentos=orm.intentos,
+        proximo_intento=orm.proximo_intento,  # ORM already returns datetime with tz
+        resultado=orm.resultado,
+        ultimo_error=orm.ultimo_error,
+        created_at=orm.created_at,
+        procesado_at=orm.procesado_at,  # Can be None
+        id=orm.id
+    )
+
+
+def inference_ingest_to_orm(
+    entity: InferenceIngest,
+    existing: Optional[InferenceIngestORM] = None
+) -> InferenceIngestORM:
+    """Converts domain entity to ORM model"""
+    orm = existing or InferenceIngestORM()
+
+    # DO NOT set id if entity.id is None (autoincrement)
+    if entity.id is not None:
+        orm.id = entity.id
+
+    orm.payload = entity.payload
+    orm.request_id = entity.request_id
+    orm.estado = entity.estado.value
+    orm.intentos = entity.intentos
+    orm.resultado = entity.resultado
+    orm.ultimo_error = entity.ultimo_error
+    # proximo_intento / created_at: if None, ORM will use default (now_utc)
+    if entity.proximo_intento is not None:
+        orm.proximo_intento = _as_dt(entity.proximo_intento)
+    if entity.created_at is not None:
+        orm.created_at = _as_dt(entity.created_at)
+    if entity.procesado_at is not None:
+        orm.procesado_at = _as_dt(entity.procesado_at)
+
+    return orm
@@ -13,6 +13,7 @@ def inference_request_to_domain(orm: InferenceRequestORM) -> InferenceRequest:
     return InferenceRequest(
         request_id=orm.request_id,
         received_at=orm.received_at,  # ORM ya devuelve datetime con tz
+        response=orm.response,
         id=orm.id
     )
 
@@ -32,6 +33,8 @@ def inference_request_to_orm(
     # received_at es requerido en dominio, pero si viene None el ORM usará default
     if entity.received_at is not None:
         orm.received_at = _as_dt(entity.received_at)
+    if entity.response is not None:
+        orm.response = entity.response
     
     return orm
 
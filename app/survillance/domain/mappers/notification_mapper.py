@@ -17,6 +17,10 @@ def notificacion_to_domain(orm: NotificacionORM) -> Notificacion:
         destinatario=orm.destinatario or "",
         estado=EstadoNotificacion(orm.estado),
         fecha_envio=orm.fecha_envio,  # ORM already returns datetime with tz or None
+        id_conexion=orm.id_conexion,
+        id_oficina=orm.id_oficina,
+        tipo_evento=orm.tipo_evento,
+        confianza=orm.confianza,
         id=orm.id_notificacion
     )
 
@@ -36,6 +40,10 @@ def notificacion_to_orm(entity: Notificacion, existing: Optional[NotificacionORM
     # fecha_envio can be None
     if entity.fecha_envio is not None:
         orm.fecha_envio = _as_dt(entity.fecha_envio)
+    orm.id_conexion = entity.id_conexion
+    orm.id_oficina = entity.id_oficina
+    orm.tipo_evento = entity.tipo_evento
+    orm.confianza = entity.confianza
     
     return orm
 
@@ -0,0 +1,55 @@
+"""
+Mapper for MensajeSalida: conversion between domain entity and ORM model.
+"""
+from typing import Optional
+
+from app.survillance.models.outbox_model import MensajeSalida as MensajeSalidaORM
+from app.survillance.domain.entities.outbox_message import MensajeSalida
+from app.survillance.domain.enums import EstadoNotificacion
+from ._helpers import _as_dt
+
+
+def mensaje_salida_to_domain(orm: MensajeSalidaORM) -> MensajeSalida:
+    """Converts ORM model to domain entity"""
+    return MensajeSalida(
+        canal=orm.canal,
+        destinatario=orm.destinatario,
+        cuerpo=orm.cuerpo,
+        estado=EstadoNotificacion(orm.estado),
+        intentos=orm.intentos,
+        proximo_intento=orm.proximo_intento,  # ORM already returns datetime with tz
+        ultimo_error=orm.ultimo_error,
+        proveedor_id=orm.proveedor_id,
+        created_at=orm.created_at,
+        enviado_at=orm.enviado_at,  # Can be None
+        id=orm.id
+    )
+
+
+def mensaje_salida_to_orm(
+    entity: MensajeSalida,
+    existing: Optional[MensajeSalidaORM] = None
+) -> MensajeSalidaORM:
+    """Converts domain entity to ORM model"""
+    orm = existing or MensajeSalidaORM()
+
+    # DO NOT set id if entity.id is None (autoincrement)
+    if entity.id is not None:
+        orm.id = entity.id
+
+    orm.canal = entity.canal
+    orm.destinatario = entity.destinatario
+    orm.cuerpo = entity.cuerpo
+    orm.estado = entity.estado.value
+    orm.intentos = entity.intentos
+    orm.ultimo_error = entity.ultimo_error
+    orm.proveedor_id = entity.proveedor_id
+    # proximo_intento / created_at: if None, ORM will use default (now_utc)
+    if entity.proximo_intento is not None:
+        orm.proximo_intento = _as_dt(entity.proximo_intento)
+    if entity.created_at is not None:
+        orm.created_at = _as_dt(entity.created_at)
+    if entity.enviado_at is not None:
+        orm.enviado_at = _as_dt(entity.enviado_at)
+
+    return orm
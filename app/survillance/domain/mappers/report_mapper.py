@@ -6,6 +6,7 @@ from decimal import Decimal
 
 from app.survillance.models.report_model import Reporte as ReporteORM
 from app.survillance.domain.entities.report import Reporte
+from app.survillance.domain.enums import EstadoReporte
 from ._helpers import _as_dt
 
 
@@ -21,6 +22,10 @@ def reporte_to_domain(orm: ReporteORM) -> Reporte:
         filtro_confianza=float(orm.filtro_confianza) if orm.filtro_confianza else None,
         tipo_evento=orm.tipo_evento,
         fecha_generacion=orm.fecha_generacion,  # ORM already returns datetime with tz
+        estado=EstadoReporte(orm.estado) if orm.estado else EstadoReporte.PENDIENTE,
+        progreso=orm.progreso or 0,
+        artefacto=orm.artefacto,
+        error=orm.error,
         id=orm.id_reporte
     )
 
@@ -46,6 +51,10 @@ def reporte_to_orm(entity: Reporte, existing: Optional[ReporteORM] = None) -> Re
         orm.rango_fecha_fin = _as_dt(entity.rango_fecha_fin)
     orm.filtro_confianza = Decimal(str(entity.filtro_confianza)) if entity.filtro_confianza is not None else None
     orm.tipo_evento = entity.tipo_evento
+    orm.estado = entity.estado.value
+    orm.progreso = entity.progreso
+    orm.artefacto = entity.artefacto
+    orm.error = entity.error
     
     return orm
 
@@ -10,6 +10,10 @@ from .notificacion_repository_interface import INotificacionRepository
 from .reporte_repository_interface import IReporteRepository
 from .inference_request_repository_interface import IInferenceRequestRepository
 from .event_snapshot_repository_interface import IEventSnapshotRepository
+from .serie_confianza_repository_interface import ISerieConfianzaRepository
+from .outbox_repository_interface import IOutboxRepository
+from .inference_ingest_repository_interface import IInferenceIngestRepository
+from .evento_stats_repository_interface import IEventoStatsRepository
 
 __all__ = [
     "IOficinaRepository",
@@ -21,6 +25,10 @@ __all__ = [
     "IReporteRepository",
     "IInferenceRequestRepository",
     "IEventSnapshotRepository",
+    "ISerieConfianzaRepository",
+    "IOutboxRepository",
+    "IInferenceIngestRepository",
+    "IEventoStatsRepository",
 ]
 
 
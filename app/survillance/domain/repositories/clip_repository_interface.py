@@ -1,7 +1,7 @@
 """
 Interfaz de repositorio de Clip usando typing.Protocol.
 """
-from typing import Protocol, Sequence, Optional
+from typing import Any, AsyncIterator, Dict, Protocol, Sequence, Optional, Set, Tuple, List
 
 from ..entities.clip import Clip
 from ..value_objects.identifiers import IdClip, IdConexion
@@ -21,9 +21,32 @@ class IClipRepository(Protocol):
         offset: int = 0,
         id_conexion: Optional[IdConexion] = None,
         start_time: Optional[UtcDatetime] = None,
-        end_time: Optional[UtcDatetime] = None
+        end_time: Optional[UtcDatetime] = None,
+        after: Optional[Tuple[UtcDatetime, IdClip]] = None
     ) -> Sequence[Clip]:
-        """Lista clips con filtros opcionales"""
+        """Lista clips con filtros opcionales; `after` es la clave keyset (start_time_utc, id)"""
+        ...
+    
+    async def list_rows(
+        self,
+        limit: int = 50,
+        offset: int = 0,
+        id_conexion: Optional[IdConexion] = None,
+        start_time: Optional[UtcDatetime] = None,
+        end_time: Optional[UtcDatetime] = None,
+        after: Optional[Tuple[UtcDatetime, IdClip]] = None
+    ) -> List[Dict[str, Any]]:
+        """Como list(), pero filas planas (dict por columna) para serializar directo"""
+        ...
+    
+    def stream_rows(
+        self,
+        id_conexion: Optional[IdConexion] = None,
+        start_time: Optional[UtcDatetime] = None,
+        end_time: Optional[UtcDatetime] = None,
+        chunk_size: int = 1000,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Filas planas como list_rows, en orden cronológico y por stream (exportaciones)"""
         ...
     
     async def find_by_time_range(
@@ -35,6 +58,29 @@ class IClipRepository(Protocol):
         """Encuentra clips que intersectan con un rango de tiempo"""
         ...
     
+    async def get_many(self, ids: Sequence[IdClip]) -> List[Clip]:
+        """Obtiene varios clips por ID en una sola consulta"""
+        ...
+    
+    async def list_after_id(
+        self,
+        since: UtcDatetime,
+        after_id: IdClip = 0,
+        limit: int = 50,
+    ) -> List[Clip]:
+        """Clips que empiezan después de `since` con id > after_id, en orden de id"""
+        ...
+    
+    async def find_overlapping(
+        self,
+        id_conexion: IdConexion,
+        start_time: UtcDatetime,
+        end_time: UtcDatetime,
+        max_clip_seconds: int = 3600
+    ) -> List[Clip]:
+        """Clips que se solapan con [start_time, end_time), ordenados por inicio"""
+        ...
+    
     async def find_old_clips(
         self,
         id_conexion: IdConexion,
@@ -50,6 +96,28 @@ class IClipRepository(Protocol):
     async def delete(self, id: IdClip) -> None:
         """Elimina un clip"""
         ...
-
-
-
+    
+    async def create_many(self, clips: Sequence[Clip]) -> List[Clip]:
+        """Crea varios clips en una sola operación, en el orden recibido"""
+        ...
+    
+    async def update_many(self, clips: Sequence[Clip]) -> int:
+        """Actualiza varios clips existentes"""
+        ...
+    
+    async def pinned_ids(self, ids: Sequence[IdClip]) -> Set[IdClip]:
+        """Clips que un reporte usa como filtro (no se borran)"""
+        ...
+    
+    async def detach_eventos(
+        self,
+        ids: Sequence[IdClip],
+        desde: Optional[UtcDatetime] = None,
+        hasta: Optional[UtcDatetime] = None,
+    ) -> int:
+        """Quita los clips de los eventos que los referencian (id_clip, clips_cubiertos)"""
+        ...
+    
+    async def delete_many(self, ids: Sequence[IdClip]) -> int:
+        """Elimina varios clips (salvo los de pinned_ids) soltando sus eventos; retorna la cantidad borrada"""
+        ...
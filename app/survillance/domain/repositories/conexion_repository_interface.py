@@ -19,9 +19,14 @@ class IConexionRepository(Protocol):
         limit: int = 50,
         offset: int = 0,
         id_oficina: Optional[IdOficina] = None,
-        habilitada: Optional[bool] = None
+        habilitada: Optional[bool] = None,
+        after: Optional[IdConexion] = None
     ) -> Sequence[Conexion]:
-        """Lista conexiones con filtros opcionales"""
+        """Lista conexiones con filtros opcionales; `after` es el último id de la página anterior"""
+        ...
+    
+    async def max_retention_minutes(self) -> Optional[int]:
+        """Mayor retention_minutes entre todas las conexiones (None si no hay)"""
         ...
     
     async def list_enabled(self) -> Sequence[Conexion]:
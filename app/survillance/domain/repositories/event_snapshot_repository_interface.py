@@ -1,7 +1,7 @@
 """
 Interfaz de repositorio de EventSnapshot usando typing.Protocol.
 """
-from typing import Protocol, Sequence, Optional
+from typing import List, Protocol, Sequence, Optional
 
 from ..entities.event_snapshot import EventSnapshot
 from ..value_objects.identifiers import IdEventSnapshot, IdEvento
@@ -30,6 +30,11 @@ class IEventSnapshotRepository(Protocol):
     async def delete(self, id: IdEventSnapshot) -> None:
         """Elimina un snapshot"""
         ...
-
-
-
+    
+    async def create_many(self, snapshots: Sequence[EventSnapshot]) -> List[EventSnapshot]:
+        """Crea varios snapshots; un (evento, offset) existente se actualiza"""
+        ...
+    
+    async def delete_by_events(self, ids: Sequence[IdEvento]) -> int:
+        """Elimina los snapshots de varios eventos; retorna la cantidad borrada"""
+        ...
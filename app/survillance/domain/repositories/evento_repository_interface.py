@@ -1,7 +1,7 @@
 """
 Interfaz de repositorio de Evento usando typing.Protocol.
 """
-from typing import Protocol, Sequence, Optional
+from typing import Any, AsyncIterator, Dict, Protocol, Sequence, Optional, Tuple, List
 
 from ..entities.event import Evento
 from ..value_objects.identifiers import IdEvento, IdConexion
@@ -22,9 +22,42 @@ class IEventoRepository(Protocol):
         id_conexion: Optional[IdConexion] = None,
         tipo_evento: Optional[str] = None,
         start_time: Optional[UtcDatetime] = None,
-        end_time: Optional[UtcDatetime] = None
+        end_time: Optional[UtcDatetime] = None,
+        after: Optional[Tuple[UtcDatetime, IdEvento]] = None
     ) -> Sequence[Evento]:
-        """Lista eventos con filtros opcionales"""
+        """Lista eventos con filtros opcionales; `after` es la clave keyset (timestamp_evento, id)"""
+        ...
+    
+    async def list_without_snapshots(
+        self,
+        since: UtcDatetime,
+        after_id: int = 0,
+        limit: int = 50,
+    ) -> List[Evento]:
+        """Eventos con clip desde `since`, id > after_id, que todavía no tienen snapshots"""
+        ...
+    
+    def stream_rows(
+        self,
+        id_conexion: Optional[IdConexion] = None,
+        tipo_evento: Optional[str] = None,
+        start_time: Optional[UtcDatetime] = None,
+        end_time: Optional[UtcDatetime] = None,
+        chunk_size: int = 1000,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Eventos filtrados como stream de dicts de columnas, en orden cronológico"""
+        ...
+    
+    def stream_report_rows(
+        self,
+        start_time: Optional[UtcDatetime],
+        end_time: Optional[UtcDatetime],
+        min_confianza: Optional[float] = None,
+        tipo_evento: Optional[str] = None,
+        id_clip: Optional[int] = None,
+        chunk_size: int = 1000,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Agregado por (día UTC, conexión, tipo) en [start_time, end_time), como stream de filas"""
         ...
     
     async def create(self, evento: Evento) -> Evento:
@@ -34,5 +67,15 @@ class IEventoRepository(Protocol):
     async def update(self, evento: Evento) -> Evento:
         """Actualiza un evento existente"""
         ...
-
-
+    
+    async def create_many(self, eventos: Sequence[Evento]) -> List[Evento]:
+        """Crea varios eventos en una sola operación, en el orden recibido"""
+        ...
+    
+    async def update_many(self, eventos: Sequence[Evento]) -> int:
+        """Actualiza varios eventos existentes"""
+        ...
+    
+    async def delete_many(self, ids: Sequence[IdEvento]) -> int:
+        """Elimina varios eventos (y sus series de confianza y snapshots); retorna la cantidad borrada"""
+        ...
@@ -0,0 +1,35 @@
+"""
+Interfaz de repositorio de estadísticas de eventos usando typing.Protocol.
+"""
+from typing import Any, Dict, List, Optional, Protocol, Sequence
+
+from ..entities.event import Evento
+from ..value_objects.identifiers import IdConexion
+from ..value_objects.timestamps import UtcDatetime
+
+
+class IEventoStatsRepository(Protocol):
+    """Rollup de conteos y confianza de eventos por bucket, cámara y tipo"""
+
+    async def add(self, eventos: Sequence[Evento]) -> None:
+        """Suma eventos recién creados a los buckets de todas las granularidades"""
+        ...
+
+    async def prune(self, granularidad: str, before: UtcDatetime) -> int:
+        """Borra los buckets de una granularidad anteriores a `before`"""
+        ...
+
+    async def series(
+        self,
+        granularidad: str,
+        start_time: UtcDatetime,
+        end_time: UtcDatetime,
+        por: str = "tipo",
+        id_conexion: Optional[IdConexion] = None,
+        tipo_evento: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Filas (bucket, [id_conexion], [tipo_evento], total, confianza_promedio,
+        confianza_max) de [start_time, end_time), agrupadas según `por`
+        """
+        ...
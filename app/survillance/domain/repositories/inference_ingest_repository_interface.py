@@ -0,0 +1,34 @@
+"""
+Interfaz de repositorio de la cola de ingesta de inferencia usando typing.Protocol.
+"""
+from typing import Optional, Protocol, Sequence
+
+from ..entities.inference_ingest import InferenceIngest
+from ..value_objects.timestamps import UtcDatetime
+
+
+class IInferenceIngestRepository(Protocol):
+    """Repositorio de webhooks de inferencia aceptados (202) pendientes de procesar"""
+
+    async def create(self, ingest: InferenceIngest) -> InferenceIngest:
+        """Encola un webhook aceptado"""
+        ...
+
+    async def get(self, id: int) -> Optional[InferenceIngest]:
+        """Obtiene un webhook encolado por su tracking id"""
+        ...
+
+    async def claim_due(self, now: UtcDatetime, limit: int = 20) -> Sequence[InferenceIngest]:
+        """
+        Bloquea y devuelve webhooks pendientes cuyo proximo_intento ya venció.
+        Las filas bloqueadas por otro worker se saltan.
+        """
+        ...
+
+    async def update_many(self, ingests: Sequence[InferenceIngest]) -> int:
+        """Actualiza el estado de varios webhooks encolados"""
+        ...
+
+    async def delete_finished_before(self, cutoff: UtcDatetime, limit: int = 1000) -> int:
+        """Borra webhooks ya procesados o fallidos antes de cutoff"""
+        ...
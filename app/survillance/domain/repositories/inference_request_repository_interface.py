@@ -1,10 +1,11 @@
 """
 Interfaz de repositorio de InferenceRequest usando typing.Protocol.
 """
-from typing import Protocol, Optional
+from typing import Any, Dict, Protocol, Optional, Sequence, Set
 
 from ..entities.inference_request import InferenceRequest
 from ..value_objects.identifiers import IdInferenceRequest
+from ..value_objects.timestamps import UtcDatetime
 
 
 class IInferenceRequestRepository(Protocol):
@@ -25,6 +26,38 @@ class IInferenceRequestRepository(Protocol):
     async def create(self, inference_request: InferenceRequest) -> InferenceRequest:
         """Crea un nuevo inference request"""
         ...
+    
+    async def claim(self, request_id: str, received_at: UtcDatetime) -> bool:
+        """Registra el request_id de forma atómica; False si ya existía"""
+        ...
+    
+    async def claim_many(self, request_ids: Sequence[str], received_at: UtcDatetime) -> Set[str]:
+        """Registra varios request_id; retorna los que eran nuevos"""
+        ...
+    
+    async def release_many(self, request_ids: Sequence[str]) -> None:
+        """Libera request_ids reclamados que fallaron"""
+        ...
+    
+    async def store_responses(self, responses: Dict[str, Dict[str, Any]]) -> None:
+        """Guarda las respuestas de varios requests"""
+        ...
+    
+    async def get_responses(self, request_ids: Sequence[str]) -> Dict[str, Optional[Dict[str, Any]]]:
+        """Respuestas guardadas de varios request_id"""
+        ...
+    
+    async def store_response(self, request_id: str, response: Dict[str, Any]) -> None:
+        """Guarda la respuesta original del request"""
+        ...
+    
+    async def get_response(self, request_id: str) -> Optional[Dict[str, Any]]:
+        """Respuesta guardada de un request_id"""
+        ...
+    
+    async def delete_older_than(self, cutoff: UtcDatetime, limit: int = 1000) -> int:
+        """Borra requests viejos (TTL de idempotencia)"""
+        ...
 
 
 
@@ -1,7 +1,7 @@
 """
 Interfaz de repositorio de Notificacion usando typing.Protocol.
 """
-from typing import Protocol, Sequence, Optional
+from typing import Protocol, Sequence, Optional, Iterable
 
 from ..entities.notification import Notificacion
 from ..value_objects.identifiers import IdNotificacion, IdEvento
@@ -18,11 +18,26 @@ class INotificacionRepository(Protocol):
         self,
         limit: int = 50,
         offset: int = 0,
-        id_evento: Optional[IdEvento] = None
+        id_evento: Optional[IdEvento] = None,
+        after: Optional[IdNotificacion] = None
     ) -> Sequence[Notificacion]:
-        """Lista notificaciones con filtros opcionales"""
+        """Lista notificaciones con filtros opcionales; `after` es el último id de la página anterior"""
         ...
     
+    async def list_since(
+        self,
+        since: int,
+        *,
+        destinatarios: Iterable[str] = (),
+        id_conexiones: Iterable[int] = (),
+        id_oficinas: Iterable[int] = (),
+        tipos_evento: Iterable[str] = (),
+        min_confianza: float = 0.0,
+        limit: int = 500,
+    ) -> Sequence[Notificacion]:
+        """Notificaciones con id > since que coinciden con algún topic, en orden de id"""
+        ...
+
     async def create(self, notificacion: Notificacion) -> Notificacion:
         """Crea una nueva notificación"""
         ...
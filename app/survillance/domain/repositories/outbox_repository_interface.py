@@ -0,0 +1,34 @@
+"""
+Interfaz de repositorio del outbox de notificaciones usando typing.Protocol.
+"""
+from typing import List, Protocol, Sequence
+
+from ..entities.outbox_message import MensajeSalida
+from ..value_objects.timestamps import UtcDatetime
+
+
+class IOutboxRepository(Protocol):
+    """Repositorio del outbox de mensajes salientes"""
+
+    async def create(self, mensaje: MensajeSalida) -> MensajeSalida:
+        """Encola un mensaje (dentro de la transacción del llamador)"""
+        ...
+
+    async def claim_due(self, now: UtcDatetime, limit: int = 50) -> Sequence[MensajeSalida]:
+        """
+        Bloquea y devuelve mensajes pendientes cuyo proximo_intento ya venció.
+        Las filas bloqueadas por otro dispatcher se saltan.
+        """
+        ...
+
+    async def update(self, mensaje: MensajeSalida) -> MensajeSalida:
+        """Actualiza el estado de un mensaje"""
+        ...
+
+    async def create_many(self, mensajes: Sequence[MensajeSalida]) -> List[MensajeSalida]:
+        """Encola varios mensajes (dentro de la transacción del llamador)"""
+        ...
+
+    async def update_many(self, mensajes: Sequence[MensajeSalida]) -> int:
+        """Actualiza el estado de varios mensajes"""
+        ...
@@ -1,10 +1,11 @@
 """
 Interfaz de repositorio de Reporte usando typing.Protocol.
 """
-from typing import Protocol, Sequence, Optional
+from typing import List, Protocol, Sequence, Optional, Tuple
 
 from ..entities.report import Reporte
 from ..value_objects.identifiers import IdReporte, IdUsuario
+from ..value_objects.timestamps import UtcDatetime
 
 
 class IReporteRepository(Protocol):
@@ -18,13 +19,24 @@ class IReporteRepository(Protocol):
         self,
         limit: int = 50,
         offset: int = 0,
-        id_usuario: Optional[IdUsuario] = None
+        id_usuario: Optional[IdUsuario] = None,
+        after: Optional[Tuple[UtcDatetime, IdReporte]] = None
     ) -> Sequence[Reporte]:
-        """Lista reportes con filtros opcionales"""
+        """Lista reportes con filtros opcionales; `after` es la clave keyset (fecha_generacion, id)"""
         ...
     
     async def create(self, reporte: Reporte) -> Reporte:
         """Crea un nuevo reporte"""
         ...
-
-
+    
+    async def update(self, reporte: Reporte) -> Reporte:
+        """Actualiza un reporte existente"""
+        ...
+    
+    async def set_progress(self, id: IdReporte, progreso: int) -> None:
+        """Actualiza el avance (0-100) de un reporte en generación"""
+        ...
+    
+    async def list_unfinished_ids(self, limit: int = 1000) -> List[IdReporte]:
+        """IDs de los reportes pendientes o a medio generar"""
+        ...
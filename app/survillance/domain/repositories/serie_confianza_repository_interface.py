@@ -0,0 +1,19 @@
+"""
+Interfaz de repositorio de SerieConfianza usando typing.Protocol.
+"""
+from typing import Protocol, Optional
+
+from ..entities.confidence_series import SerieConfianza
+from ..value_objects.identifiers import IdEvento
+
+
+class ISerieConfianzaRepository(Protocol):
+    """Repositorio de series de confianza por evento"""
+
+    async def get_by_evento(self, id_evento: IdEvento) -> Optional[SerieConfianza]:
+        """Obtiene la serie de confianza de un evento"""
+        ...
+
+    async def create(self, serie: SerieConfianza) -> SerieConfianza:
+        """Crea una nueva serie de confianza"""
+        ...
@@ -12,6 +12,10 @@ from .repositories import (
     IReporteRepository,
     IInferenceRequestRepository,
     IEventSnapshotRepository,
+    ISerieConfianzaRepository,
+    IOutboxRepository,
+    IInferenceIngestRepository,
+    IEventoStatsRepository,
 )
 
 __all__ = [
@@ -24,4 +28,8 @@ __all__ = [
     "IReporteRepository",
     "IInferenceRequestRepository",
     "IEventSnapshotRepository",
+    "ISerieConfianzaRepository",
+    "IOutboxRepository",
+    "IInferenceIngestRepository",
+    "IEventoStatsRepository",
 ]
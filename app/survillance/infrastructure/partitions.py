@@ -0,0 +1,181 @@
+"""
+Particiones por rango de tiempo de clips y eventos (Postgres, particionado declarativo).
+
+Cada partición cubre un día o una semana (UTC) y se llama <tabla>_pYYYYMMDD
+con la fecha de inicio. Además hay una partición DEFAULT para que un insert
+fuera de rango nunca falle si el job de mantenimiento se atrasa.
+"""
+import logging
+import re
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Any, List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+logger = logging.getLogger(__name__)
+
+# tabla -> columna de partición
+PARTITIONED_TABLES = {
+    "clips": "start_time_utc",
+    "eventos": "timestamp_evento",
+}
+
+# pg_get_expr(relpartbound): FOR VALUES FROM ('2026-10-19 00:00:00+00') TO ('2026-10-20 00:00:00+00')
+_BOUND_RE = re.compile(r"FROM \('(?P<desde>[^']+)'\) TO \('(?P<hasta>[^']+)'\)")
+
+
+@dataclass(frozen=True)
+class Particion:
+    nombre: str
+    tabla: str
+    desde: datetime
+    hasta: datetime
+
+
+def partition_start(day: date, interval: str = "day") -> date:
+    """Inicio de la partición que contiene `day` (los semanales empiezan el lunes)"""
+    if interval == "week":
+        return day - timedelta(days=day.weekday())
+    return day
+
+
+def partition_step(interval: str = "day") -> timedelta:
+    return timedelta(weeks=1) if interval == "week" else timedelta(days=1)
+
+
+def partition_name(table: str, start: date) -> str:
+    return f"{table}_p{start:%Y%m%d}"
+
+
+def _utc(day: date) -> datetime:
+    return datetime.combine(day, time.min, tzinfo=timezone.utc)
+
+
+async def is_partitioned(session: AsyncSession, table: str) -> bool:
+    result = await session.execute(
+        text(
+            "SELECT 1 FROM pg_partitioned_table pt "
+            "JOIN pg_class c ON c.oid = pt.partrelid "
+            "WHERE c.relname = :table AND pg_table_is_visible(c.oid)"
+        ),
+        {"table": table},
+    )
+    return result.scalar() is not None
+
+
+async def list_partitions(session: AsyncSession, table: str) -> List[Particion]:
+    """Particiones de rango de `table` (no incluye la DEFAULT), ordenadas por fecha"""
+    result = await session.execute(
+        text(
+            "SELECT c.relname, pg_get_expr(c.relpartbound, c.oid) FROM pg_inherits i "
+            "JOIN pg_class c ON c.oid = i.inhrelid "
+            "JOIN pg_class p ON p.oid = i.inhparent "
+            "WHERE p.relname = :table AND pg_table_is_visible(p.oid)"
+        ),
+        {"table": table},
+    )
+    particiones = []
+    for nombre, bound in result.all():
+        match = _BOUND_RE.search(bound or "")
+        if not match:
+            continue  # DEFAULT
+        desde = datetime.fromisoformat(match.group("desde"))
+        hasta = datetime.fromisoformat(match.group("hasta"))
+        particiones.append(Particion(nombre, table, desde, hasta))
+    return sorted(particiones, key=lambda p: p.desde)
+
+
+async def ensure_partitions(
+    session: AsyncSession,
+    table: str,
+    first_day: date,
+    last_day: date,
+    interval: str = "day",
+) -> List[str]:
+    """
+    Crea (si faltan) las particiones que cubren [first_day, last_day] y la DEFAULT.
+    Un rango que ya está cubierto por otra partición (p.e. tras cambiar de
+    day a week) se saltea. Retorna los nombres de las particiones creadas.
+    """
+    await session.execute(text(f"CREATE TABLE IF NOT EXISTS {table}_default PARTITION OF {table} DEFAULT"))
+
+    existentes = await list_partitions(session, table)
+    step = partition_step(interval)
+    creadas = []
+    start = partition_start(first_day, interval)
+    while start <= last_day:
+        desde, hasta = _utc(start), _utc(start + step)
+        start += step
+        if any(p.desde < hasta and desde < p.hasta for p in existentes):
+            continue
+        nombre = partition_name(table, desde.date())
+        try:
+            async with session.begin_nested():
+                await session.execute(text(
+                    f"CREATE TABLE {nombre} PARTITION OF {table} "
+                    f"FOR VALUES FROM ('{desde.isoformat()}') TO ('{hasta.isoformat()}')"
+                ))
+            creadas.append(nombre)
+        except Exception as e:
+            # Típicamente: la DEFAULT ya tiene filas de ese rango
+            logger.warning("[PARTITIONS] No se pudo crear %s: %s", nombre, e)
+    return creadas
+
+
+async def drop_partition(session: AsyncSession, particion: Particion) -> None:
+    """Elimina una partición completa (instantáneo, sin bloat de DELETE fila a fila)"""
+    await session.execute(text(f"DROP TABLE IF EXISTS {particion.nombre}"))
+
+
+async def partition_values(
+    session: AsyncSession,
+    particion: Particion,
+    column: str,
+) -> List[Any]:
+    """Valores de `column` guardados en una partición"""
+    result = await session.execute(text(f"SELECT {column} FROM {particion.nombre}"))
+    return [row[0] for row in result.all()]
+
+
+async def partition_paths(
+    session: AsyncSession,
+    particion: Particion,
+    column: str,
+) -> List[Optional[str]]:
+    """Valores de `column` (rutas de archivos) guardados en una partición"""
+    return await partition_values(session, particion, column)
+
+
+async def referencing_values(
+    session: AsyncSession,
+    particion: Particion,
+    key: str,
+    child_table: str,
+    child_column: str,
+    value_column: str,
+) -> List[Any]:
+    """Valores de `value_column` de las filas de `child_table` que apuntan a la partición"""
+    result = await session.execute(text(
+        f"SELECT {value_column} FROM {child_table} "
+        f"WHERE {child_column} IN (SELECT {key} FROM {particion.nombre})"
+    ))
+    return [row[0] for row in result.all()]
+
+
+async def delete_referencing(
+    session: AsyncSession,
+    particion: Particion,
+    key: str,
+    child_table: str,
+    child_column: str,
+) -> int:
+    """
+    Borra las filas de `child_table` que apuntan a filas de la partición.
+    Las tablas particionadas no tienen FK entrantes, así que el cascade es manual.
+    """
+    result = await session.execute(text(
+        f"DELETE FROM {child_table} WHERE {child_column} IN (SELECT {key} FROM {particion.nombre})"
+    ))
+    return result.rowcount or 0
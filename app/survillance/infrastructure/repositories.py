@@ -11,6 +11,8 @@ from .repositories import (
     NotificacionRepository,
     ReporteRepository,
     InferenceRequestRepository,
+    SerieConfianzaRepository,
+    OutboxRepository,
 )
 
 __all__ = [
@@ -22,4 +24,6 @@ __all__ = [
     "NotificacionRepository",
     "ReporteRepository",
     "InferenceRequestRepository",
+    "SerieConfianzaRepository",
+    "OutboxRepository",
 ]
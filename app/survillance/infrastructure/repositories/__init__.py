@@ -9,6 +9,11 @@ from .evento_repository import EventoRepository
 from .notificacion_repository import NotificacionRepository
 from .reporte_repository import ReporteRepository
 from .inference_request_repository import InferenceRequestRepository
+from .serie_confianza_repository import SerieConfianzaRepository
+from .outbox_repository import OutboxRepository
+from .inference_ingest_repository import InferenceIngestRepository
+from .evento_stats_repository import EventoStatsRepository
+from .event_snapshot_repository import EventSnapshotRepository
 
 __all__ = [
     "OficinaRepository",
@@ -19,6 +24,11 @@ __all__ = [
     "NotificacionRepository",
     "ReporteRepository",
     "InferenceRequestRepository",
+    "SerieConfianzaRepository",
+    "OutboxRepository",
+    "InferenceIngestRepository",
+    "EventoStatsRepository",
+    "EventSnapshotRepository",
 ]
 
 
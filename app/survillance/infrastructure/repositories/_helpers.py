@@ -0,0 +1,97 @@
+"""
+Helpers compartidos por los repositorios SQLAlchemy.
+"""
+from typing import Any, Dict, List, Optional, Sequence, Type, TypeVar
+
+from sqlalchemy import inspect, insert, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+T = TypeVar("T")
+
+
+def column_values(model: Any) -> Dict[str, Any]:
+    """
+    Valores de columna asignados en un modelo ORM transitorio (el que arma el mapper).
+    Las columnas que el mapper no tocó quedan afuera, así en un INSERT se
+    aplican los defaults y en un UPDATE conservan su valor.
+    """
+    mapper = inspect(type(model))
+    return {
+        attr.key: model.__dict__[attr.key]
+        for attr in mapper.column_attrs
+        if attr.key in model.__dict__
+    }
+
+
+async def save_returning(
+    session: AsyncSession,
+    orm_cls: Type[T],
+    model: T,
+    id_attr: str,
+    id_value: Optional[int],
+) -> T:
+    """
+    Guarda `model` en un solo round trip y retorna la fila tal como quedó en la base.
+
+    id_value None -> INSERT ... RETURNING (defaults e id generados vuelven inline).
+    id_value dado -> UPDATE ... RETURNING; si la fila no existe, INSERT con ese id.
+    Reemplaza el patrón add + flush + refresh (y el SELECT previo en updates).
+    """
+    values = column_values(model)
+    if id_value is not None:
+        values.pop(id_attr, None)
+        stmt = (
+            update(orm_cls)
+            .where(getattr(orm_cls, id_attr) == id_value)
+            .values(**values)
+            .returning(orm_cls)
+            .execution_options(synchronize_session=False, populate_existing=True)
+        )
+        row = (await session.execute(stmt)).scalar_one_or_none()
+        if row is not None:
+            return row
+        values[id_attr] = id_value
+
+    stmt = (
+        insert(orm_cls)
+        .values(**values)
+        .returning(orm_cls)
+        .execution_options(populate_existing=True)
+    )
+    return (await session.execute(stmt)).scalar_one()
+
+
+async def insert_many_returning(
+    session: AsyncSession,
+    orm_cls: Type[T],
+    models: Sequence[T],
+) -> List[T]:
+    """
+    INSERT de varias filas en lotes (insertmanyvalues: INSERT ... VALUES (...), (...)
+    RETURNING) en lugar de un round trip por fila. Retorna las filas en el mismo
+    orden que `models`.
+    """
+    if not models:
+        return []
+    rows = [column_values(model) for model in models]
+    result = await session.scalars(
+        insert(orm_cls).returning(orm_cls, sort_by_parameter_order=True),
+        rows,
+    )
+    return list(result.all())
+
+
+async def update_many_by_pk(
+    session: AsyncSession,
+    orm_cls: Type[T],
+    models: Sequence[T],
+) -> int:
+    """
+    UPDATE por clave primaria de varias filas con executemany (bulk UPDATE del ORM).
+    Cada modelo debe traer todas las columnas de la PK. Retorna la cantidad de filas enviadas.
+    """
+    if not models:
+        return 0
+    rows = [column_values(model) for model in models]
+    await session.execute(update(orm_cls), rows)
+    return len(rows)
@@ -1,15 +1,89 @@
 """
 Repositorio de Clip: implementación con SQLAlchemy.
 """
-from typing import Optional, Sequence, List
-from datetime import datetime
+from typing import Any, AsyncIterator, Dict, Optional, Sequence, List, Set, Tuple
+from datetime import datetime, timedelta
 
-from sqlalchemy import select, delete as sql_delete
+from sqlalchemy import ARRAY, Integer, Select, bindparam, func, select, text, tuple_, delete as sql_delete
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.survillance.models import Clip as ClipORM
+from app.survillance.models import Clip as ClipORM, Reporte as ReporteORM
 from app.survillance.domain.entities.clip import Clip
 from app.survillance.domain.mappers import clip_to_domain, clip_to_orm
+from ._helpers import save_returning, insert_many_returning, update_many_by_pk
+
+
+# Consultas calientes armadas una sola vez: el compiled cache de SQLAlchemy y el
+# cache de prepared statements de asyncpg las reutilizan en cada llamada.
+_GET_CLIP = select(ClipORM).where(ClipORM.id_clip == bindparam("id"))
+
+# Un evento empieza dentro de su primer clip y puede cubrir los siguientes:
+# su timestamp cae a lo sumo este margen antes del inicio de un clip que cubre
+_MAX_CLIP_SECONDS = 3600
+
+# eventos.id_clip / clips_cubiertos son referencias lógicas (sin FK): al borrar
+# clips se sueltan. Acotado por timestamp_evento para podar particiones.
+_DETACH_EVENTOS = text(
+    "UPDATE eventos SET "
+    "id_clip = CASE WHEN id_clip = ANY(:ids) THEN NULL ELSE id_clip END, "
+    "clips_cubiertos = NULLIF(ARRAY(SELECT c FROM unnest(clips_cubiertos) AS c "
+    "WHERE c <> ALL(:ids)), '{}') "
+    "WHERE timestamp_evento >= :desde AND timestamp_evento < :hasta "
+    "AND (id_clip = ANY(:ids) OR clips_cubiertos && :ids)"
+).bindparams(bindparam("ids", type_=ARRAY(Integer)))
+
+# Columnas de la proyección de list_rows (claves = campos de ClipResponse)
+_ROW_COLUMNS = (
+    ClipORM.id_clip,
+    ClipORM.id_conexion,
+    ClipORM.storage_path,
+    ClipORM.start_time_utc,
+    ClipORM.duration_sec,
+    ClipORM.fecha_guardado,
+)
+
+# Listados: una sentencia por combinación de filtros presentes, armada una sola
+# vez con bindparam. (lambda_stmt re-recorre la sentencia ORM en cada llamada
+# para extraer los valores y resultaba más lento que un select() nuevo; ver
+# benchmarks/bench_statement_cache.py.)
+_PAGE_QUERIES: Dict[Tuple[bool, ...], Select] = {}
+
+_FIND_BY_TIME_RANGE = (
+    select(ClipORM)
+    .where(ClipORM.id_conexion == bindparam("id_conexion"))
+    .where(ClipORM.start_time_utc < bindparam("end_time"))
+    .where(ClipORM.start_time_utc >= bindparam("desde"))
+    .order_by(ClipORM.start_time_utc)
+)
+
+
+def _build_page_query(rows: bool, id_conexion: bool, start_time: bool, end_time: bool, after: bool) -> Select:
+    query = select(*_ROW_COLUMNS) if rows else select(ClipORM)
+    
+    if id_conexion:
+        query = query.where(ClipORM.id_conexion == bindparam("id_conexion"))
+    
+    if start_time:
+        query = query.where(ClipORM.start_time_utc >= bindparam("start_time"))
+    
+    if end_time:
+        query = query.where(ClipORM.start_time_utc <= bindparam("end_time"))
+    
+    if after:
+        query = query.where(
+            tuple_(ClipORM.start_time_utc, ClipORM.id_clip) < tuple_(
+                bindparam("after_time", type_=ClipORM.start_time_utc.type),
+                bindparam("after_id", type_=Integer),
+            )
+        )
+    
+    return (
+        query.order_by(ClipORM.start_time_utc.desc(), ClipORM.id_clip.desc())
+        .limit(bindparam("limit", type_=Integer))
+        .offset(bindparam("offset", type_=Integer))
+        # Lectura apta para la réplica (ver app.shared.db.RoutingSession)
+        .execution_options(use_replica=True)
+    )
 
 
 class ClipRepository:
@@ -20,9 +94,7 @@ class ClipRepository:
     
     async def get(self, id: int) -> Optional[Clip]:
         """Obtiene un clip por ID"""
-        result = await self.session.execute(
-            select(ClipORM).where(ClipORM.id_clip == id)
-        )
+        result = await self.session.execute(_GET_CLIP, {"id": id})
         orm = result.scalar_one_or_none()
         return clip_to_domain(orm) if orm else None
     
@@ -36,10 +108,47 @@ class ClipRepository:
         offset: int = 0,
         id_conexion: Optional[int] = None,
         start_time: Optional[datetime] = None,
-        end_time: Optional[datetime] = None
+        end_time: Optional[datetime] = None,
+        after: Optional[Tuple[datetime, int]] = None
     ) -> Sequence[Clip]:
-        """Lista clips con filtros opcionales"""
-        query = select(ClipORM)
+        """
+        Lista clips con filtros opcionales, del más reciente al más antiguo.
+        `after` = (start_time_utc, id_clip) de la última fila de la página anterior (keyset).
+        """
+        query, params = self._page_query(False, limit, offset, id_conexion, start_time, end_time, after)
+        result = await self.session.execute(query, params)
+        return [clip_to_domain(orm) for orm in result.scalars().all()]
+    
+    async def list_rows(
+        self,
+        limit: int = 50,
+        offset: int = 0,
+        id_conexion: Optional[int] = None,
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None,
+        after: Optional[Tuple[datetime, int]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Igual que list() pero como proyección: solo las columnas de ClipResponse,
+        en dicts planos, sin identity map ni mapeo a entidades de dominio.
+        Para listados de solo lectura que se serializan directo a JSON.
+        """
+        query, params = self._page_query(True, limit, offset, id_conexion, start_time, end_time, after)
+        result = await self.session.execute(query, params)
+        return [dict(row) for row in result.mappings()]
+    
+    async def stream_rows(
+        self,
+        id_conexion: Optional[int] = None,
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None,
+        chunk_size: int = 1000,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Misma proyección que list_rows, en orden (start_time_utc, id_clip)
+        ascendente y por un cursor del servidor de a chunk_size, para exportaciones.
+        """
+        query = select(*_ROW_COLUMNS)
         
         if id_conexion is not None:
             query = query.where(ClipORM.id_conexion == id_conexion)
@@ -50,9 +159,44 @@ class ClipRepository:
         if end_time is not None:
             query = query.where(ClipORM.start_time_utc <= end_time)
         
-        query = query.order_by(ClipORM.start_time_utc.desc()).limit(limit).offset(offset)
-        result = await self.session.execute(query)
-        return [clip_to_domain(orm) for orm in result.scalars().all()]
+        query = (
+            query.order_by(ClipORM.start_time_utc, ClipORM.id_clip)
+            # Lectura apta para la réplica (ver app.shared.db.RoutingSession)
+            .execution_options(use_replica=True, yield_per=chunk_size)
+        )
+        result = await self.session.stream(query)
+        async for row in result.mappings():
+            yield dict(row)
+    
+    @staticmethod
+    def _page_query(
+        rows: bool,
+        limit: int,
+        offset: int,
+        id_conexion: Optional[int],
+        start_time: Optional[datetime],
+        end_time: Optional[datetime],
+        after: Optional[Tuple[datetime, int]]
+    ) -> Tuple[Select, Dict[str, Any]]:
+        """
+        (sentencia, parámetros) del listado con filtros, keyset y orden
+        (start_time_utc, id_clip) descendente; `rows` elige la proyección de list_rows.
+        """
+        key = (rows, id_conexion is not None, start_time is not None, end_time is not None, after is not None)
+        query = _PAGE_QUERIES.get(key)
+        if query is None:
+            query = _PAGE_QUERIES[key] = _build_page_query(*key)
+        
+        params: Dict[str, Any] = {"limit": limit, "offset": offset}
+        if id_conexion is not None:
+            params["id_conexion"] = id_conexion
+        if start_time is not None:
+            params["start_time"] = start_time
+        if end_time is not None:
+            params["end_time"] = end_time
+        if after is not None:
+            params["after_time"], params["after_id"] = after
+        return query, params
     
     async def get_all(
         self,
@@ -60,10 +204,11 @@ class ClipRepository:
         offset: int = 0,
         id_conexion: Optional[int] = None,
         start_time: Optional[datetime] = None,
-        end_time: Optional[datetime] = None
+        end_time: Optional[datetime] = None,
+        after: Optional[Tuple[datetime, int]] = None
     ) -> List[Clip]:
         """Lista todos los clips con filtros (alias para servicios)"""
-        return list(await self.list(limit, offset, id_conexion, start_time, end_time))
+        return list(await self.list(limit, offset, id_conexion, start_time, end_time, after))
     
     async def find_by_time_range(
         self,
@@ -71,14 +216,21 @@ class ClipRepository:
         start_time: datetime,
         end_time: datetime
     ) -> Sequence[Clip]:
-        """Encuentra clips que intersectan con un rango de tiempo"""
+        """
+        Encuentra clips que intersectan con un rango de tiempo. Un clip dura a lo
+        sumo _MAX_CLIP_SECONDS: ese límite inferior acota la búsqueda a las
+        particiones del rango (como find_overlapping). Siempre en la primaria:
+        se usa justo después de escribir clips (read-your-writes).
+        """
+        desde = start_time - timedelta(seconds=_MAX_CLIP_SECONDS)
         result = await self.session.execute(
-            select(ClipORM)
-            .where(ClipORM.id_conexion == id_conexion)
-            .where(ClipORM.start_time_utc < end_time)
-            .order_by(ClipORM.start_time_utc)
+            _FIND_BY_TIME_RANGE, {"id_conexion": id_conexion, "end_time": end_time, "desde": desde}
         )
-        return [clip_to_domain(orm) for orm in result.scalars().all()]
+        clips = [clip_to_domain(orm) for orm in result.scalars().all()]
+        return [
+            clip for clip in clips
+            if clip.start_time_utc + timedelta(seconds=int(clip.duration_sec)) > start_time
+        ]
     
     async def get_by_time_range(
         self,
@@ -89,15 +241,70 @@ class ClipRepository:
         """Alias para servicios"""
         return list(await self.find_by_time_range(id_conexion, start_time, end_time))
     
+    async def get_many(self, ids: Sequence[int]) -> List[Clip]:
+        """Obtiene varios clips por ID en una sola consulta (los inexistentes se omiten)"""
+        if not ids:
+            return []
+        result = await self.session.execute(
+            select(ClipORM).where(ClipORM.id_clip.in_(list(ids)))
+        )
+        return [clip_to_domain(orm) for orm in result.scalars().all()]
+    
+    async def list_after_id(
+        self,
+        since: datetime,
+        after_id: int = 0,
+        limit: int = 50,
+    ) -> List[Clip]:
+        """
+        Clips que empiezan después de `since` con id > after_id, en orden de id
+        (los jobs que procesan cada clip nuevo avanzan after_id).
+        """
+        result = await self.session.execute(
+            select(ClipORM)
+            .where(ClipORM.start_time_utc >= since, ClipORM.id_clip > after_id)
+            .order_by(ClipORM.id_clip)
+            .limit(limit)
+        )
+        return [clip_to_domain(orm) for orm in result.scalars().all()]
+    
+    async def find_overlapping(
+        self,
+        id_conexion: int,
+        start_time: datetime,
+        end_time: datetime,
+        max_clip_seconds: int = 3600
+    ) -> List[Clip]:
+        """
+        Clips de una cámara que se solapan con [start_time, end_time), ordenados por inicio.
+        El límite inferior start_time - max_clip_seconds mantiene la búsqueda acotada
+        al índice (id_conexion, start_time_utc) y a las particiones del rango.
+        """
+        result = await self.session.execute(
+            select(ClipORM)
+            .where(ClipORM.id_conexion == id_conexion)
+            .where(ClipORM.start_time_utc < end_time)
+            .where(ClipORM.start_time_utc >= start_time - timedelta(seconds=max_clip_seconds))
+            .order_by(ClipORM.start_time_utc)
+        )
+        clips = [clip_to_domain(orm) for orm in result.scalars().all()]
+        return [
+            clip for clip in clips
+            if clip.start_time_utc + timedelta(seconds=int(clip.duration_sec)) > start_time
+        ]
+    
     async def find_old_clips(
         self,
         id_conexion: int,
         older_than: datetime
     ) -> Sequence[Clip]:
         """Encuentra clips más antiguos que una fecha"""
+        # Un clip se guarda después de empezar, así que start_time_utc < older_than
+        # no descarta nada y permite el pruning de particiones de clips
         result = await self.session.execute(
             select(ClipORM)
             .where(ClipORM.id_conexion == id_conexion)
+            .where(ClipORM.start_time_utc < older_than)
             .where(ClipORM.fecha_guardado < older_than)
         )
         return [clip_to_domain(orm) for orm in result.scalars().all()]
@@ -108,23 +315,10 @@ class ClipRepository:
         Si entity.id is None: crea nuevo registro.
         Si entity.id is not None: actualiza registro existente.
         """
-        if clip.id is None:
-            # Nueva entidad: crear modelo sin ID
-            model = clip_to_orm(clip)
-            self.session.add(model)
-        else:
-            # Entidad existente: buscar o crear modelo y actualizar
-            result = await self.session.execute(
-                select(ClipORM).where(ClipORM.id_clip == clip.id)
-            )
-            existing_orm = result.scalar_one_or_none()
-            model = clip_to_orm(clip, existing_orm)
-            if existing_orm is None:
-                self.session.add(model)
-        
-        await self.session.flush()
-        await self.session.refresh(model)
-        
+        # Un solo round trip: INSERT/UPDATE ... RETURNING
+        model = await save_returning(
+            self.session, ClipORM, clip_to_orm(clip), "id_clip", clip.id
+        )
         return clip_to_domain(model)
     
     async def create(self, clip: Clip) -> Clip:
@@ -136,6 +330,79 @@ class ClipRepository:
         await self.session.execute(
             sql_delete(ClipORM).where(ClipORM.id_clip == id)
         )
-
-
-
+    
+    async def create_many(self, clips: Sequence[Clip]) -> List[Clip]:
+        """Crea varios clips en lotes (INSERT ... RETURNING), en el orden recibido"""
+        models = await insert_many_returning(
+            self.session, ClipORM, [clip_to_orm(clip) for clip in clips]
+        )
+        return [clip_to_domain(model) for model in models]
+    
+    async def update_many(self, clips: Sequence[Clip]) -> int:
+        """Actualiza varios clips existentes por PK (executemany)"""
+        if any(clip.id is None for clip in clips):
+            raise ValueError("No se puede actualizar un clip sin ID")
+        return await update_many_by_pk(
+            self.session, ClipORM, [clip_to_orm(clip) for clip in clips]
+        )
+    
+    async def pinned_ids(self, ids: Sequence[int]) -> Set[int]:
+        """
+        Clips que un reporte usa como filtro (reportes.id_clip): no se borran,
+        porque soltar la referencia cambiaría el alcance del reporte.
+        """
+        if not ids:
+            return set()
+        result = await self.session.execute(
+            select(ReporteORM.id_clip).where(ReporteORM.id_clip.in_(list(ids))).distinct()
+        )
+        return set(result.scalars().all())
+    
+    async def detach_eventos(
+        self,
+        ids: Sequence[int],
+        desde: Optional[datetime] = None,
+        hasta: Optional[datetime] = None,
+    ) -> int:
+        """
+        Quita los clips `ids` de los eventos que los referencian (id_clip a NULL,
+        fuera de clips_cubiertos). [desde, hasta) es el rango de inicio de los
+        clips; si falta, se calcula. Retorna la cantidad de eventos actualizados.
+        """
+        if not ids:
+            return 0
+        if desde is None or hasta is None:
+            result = await self.session.execute(
+                select(
+                    func.min(ClipORM.start_time_utc), func.max(ClipORM.start_time_utc)
+                ).where(ClipORM.id_clip.in_(list(ids)))
+            )
+            desde, ultimo = result.one()
+            if desde is None:
+                return 0
+            hasta = ultimo + timedelta(microseconds=1)
+        margin = timedelta(seconds=_MAX_CLIP_SECONDS)
+        result = await self.session.execute(
+            _DETACH_EVENTOS,
+            {"ids": list(ids), "desde": desde - margin, "hasta": hasta + margin},
+        )
+        return result.rowcount or 0
+    
+    async def delete_many(self, ids: Sequence[int]) -> int:
+        """
+        Elimina varios clips en una sola sentencia; retorna la cantidad borrada.
+        clips está particionada y no tiene FKs entrantes: los clips que filtra un
+        reporte se saltean (ver pinned_ids) y los eventos sueltan la referencia,
+        en la misma transacción.
+        """
+        if not ids:
+            return 0
+        pinned = await self.pinned_ids(ids)
+        ids = [i for i in ids if i not in pinned]
+        if not ids:
+            return 0
+        await self.detach_eventos(ids)
+        result = await self.session.execute(
+            sql_delete(ClipORM).where(ClipORM.id_clip.in_(ids))
+        )
+        return result.rowcount or 0
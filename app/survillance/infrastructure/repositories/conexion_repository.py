@@ -3,12 +3,17 @@ Repositorio de Conexion: implementación con SQLAlchemy.
 """
 from typing import Optional, Sequence, List
 
-from sqlalchemy import select, delete as sql_delete
+from sqlalchemy import bindparam, func, select, delete as sql_delete
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.survillance.models import Conexion as ConexionORM
 from app.survillance.domain.entities.connection import Conexion
 from app.survillance.domain.mappers import conexion_to_domain, conexion_to_orm
+from ._helpers import save_returning
+
+
+# Consulta caliente armada una sola vez (compiled cache + prepared statements de asyncpg)
+_GET_CONEXION = select(ConexionORM).where(ConexionORM.id_conexion == bindparam("id"))
 
 
 class ConexionRepository:
@@ -19,9 +24,7 @@ class ConexionRepository:
     
     async def get(self, id: int) -> Optional[Conexion]:
         """Obtiene una conexión por ID"""
-        result = await self.session.execute(
-            select(ConexionORM).where(ConexionORM.id_conexion == id)
-        )
+        result = await self.session.execute(_GET_CONEXION, {"id": id})
         orm = result.scalar_one_or_none()
         return conexion_to_domain(orm) if orm else None
     
@@ -34,9 +37,13 @@ class ConexionRepository:
         limit: int = 50,
         offset: int = 0,
         id_oficina: Optional[int] = None,
-        habilitada: Optional[bool] = None
+        habilitada: Optional[bool] = None,
+        after: Optional[int] = None
     ) -> Sequence[Conexion]:
-        """Lista conexiones con filtros opcionales"""
+        """
+        Lista conexiones con filtros opcionales, por id ascendente.
+        `after` = id_conexion de la última fila de la página anterior (keyset).
+        """
         query = select(ConexionORM)
         
         if id_oficina is not None:
@@ -45,7 +52,12 @@ class ConexionRepository:
         if habilitada is not None:
             query = query.where(ConexionORM.habilitada == habilitada)
         
-        query = query.limit(limit).offset(offset)
+        if after is not None:
+            query = query.where(ConexionORM.id_conexion > after)
+        
+        query = query.order_by(ConexionORM.id_conexion).limit(limit).offset(offset)
+        # Lectura apta para la réplica (ver app.shared.db.RoutingSession)
+        query = query.execution_options(use_replica=True)
         result = await self.session.execute(query)
         return [conexion_to_domain(orm) for orm in result.scalars().all()]
     
@@ -54,10 +66,18 @@ class ConexionRepository:
         limit: int = 100,
         offset: int = 0,
         id_oficina: Optional[int] = None,
-        habilitada: Optional[bool] = None
+        habilitada: Optional[bool] = None,
+        after: Optional[int] = None
     ) -> List[Conexion]:
         """Lista todas las conexiones con filtros (alias para servicios)"""
-        return list(await self.list(limit, offset, id_oficina, habilitada))
+        return list(await self.list(limit, offset, id_oficina, habilitada, after))
+    
+    async def max_retention_minutes(self) -> Optional[int]:
+        """Mayor retention_minutes entre todas las conexiones (None si no hay)"""
+        result = await self.session.execute(
+            select(func.max(ConexionORM.retention_minutes))
+        )
+        return result.scalar()
     
     async def list_enabled(self) -> Sequence[Conexion]:
         """Lista solo conexiones habilitadas"""
@@ -72,23 +92,10 @@ class ConexionRepository:
         Si entity.id is None: crea nuevo registro.
         Si entity.id is not None: actualiza registro existente.
         """
-        if conexion.id is None:
-            # Nueva entidad: crear modelo sin ID
-            model = conexion_to_orm(conexion)
-            self.session.add(model)
-        else:
-            # Entidad existente: buscar o crear modelo y actualizar
-            result = await self.session.execute(
-                select(ConexionORM).where(ConexionORM.id_conexion == conexion.id)
-            )
-            existing_orm = result.scalar_one_or_none()
-            model = conexion_to_orm(conexion, existing_orm)
-            if existing_orm is None:
-                self.session.add(model)
-        
-        await self.session.flush()
-        await self.session.refresh(model)
-        
+        # Un solo round trip: INSERT/UPDATE ... RETURNING
+        model = await save_returning(
+            self.session, ConexionORM, conexion_to_orm(conexion), "id_conexion", conexion.id
+        )
         return conexion_to_domain(model)
     
     async def create(self, conexion: Conexion) -> Conexion:
@@ -0,0 +1,84 @@
+"""
+Repositorio de EventSnapshot: implementación con SQLAlchemy.
+"""
+from typing import List, Optional, Sequence
+
+from sqlalchemy import select, delete as sql_delete
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.survillance.models import EventSnapshot as EventSnapshotORM
+from app.survillance.domain.entities.event_snapshot import EventSnapshot
+from app.survillance.domain.mappers import event_snapshot_to_domain, event_snapshot_to_orm
+from ._helpers import column_values, save_returning
+
+
+class EventSnapshotRepository:
+    """Adaptador de repositorio de snapshots de eventos usando entidades de dominio"""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def get(self, id: int) -> Optional[EventSnapshot]:
+        """Obtiene un snapshot por ID"""
+        result = await self.session.execute(
+            select(EventSnapshotORM).where(EventSnapshotORM.id_snapshot == id)
+        )
+        orm = result.scalar_one_or_none()
+        return event_snapshot_to_domain(orm) if orm else None
+
+    async def list_by_event(
+        self,
+        id_evento: int,
+        limit: int = 50,
+        offset: int = 0
+    ) -> Sequence[EventSnapshot]:
+        """Lista los snapshots de un evento, en orden de offset"""
+        result = await self.session.execute(
+            select(EventSnapshotORM)
+            .where(EventSnapshotORM.id_evento == id_evento)
+            .order_by(EventSnapshotORM.timestamp_rel_ms)
+            .limit(limit)
+            .offset(offset)
+        )
+        return [event_snapshot_to_domain(orm) for orm in result.scalars().all()]
+
+    async def create(self, snapshot: EventSnapshot) -> EventSnapshot:
+        """Crea un nuevo snapshot"""
+        model = await save_returning(
+            self.session, EventSnapshotORM, event_snapshot_to_orm(snapshot), "id_snapshot", snapshot.id
+        )
+        return event_snapshot_to_domain(model)
+
+    async def create_many(self, snapshots: Sequence[EventSnapshot]) -> List[EventSnapshot]:
+        """
+        Crea varios snapshots en un solo INSERT ... RETURNING. Un (evento, offset)
+        que ya existe se actualiza en lugar de duplicarse: extraer dos veces el
+        mismo evento (reintento u otro proceso) es idempotente.
+        """
+        if not snapshots:
+            return []
+        stmt = pg_insert(EventSnapshotORM).values(
+            [column_values(event_snapshot_to_orm(snapshot)) for snapshot in snapshots]
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[EventSnapshotORM.id_evento, EventSnapshotORM.timestamp_rel_ms],
+            set_={"ruta_imagen": stmt.excluded.ruta_imagen},
+        ).returning(EventSnapshotORM)
+        result = await self.session.execute(stmt.execution_options(populate_existing=True))
+        return [event_snapshot_to_domain(orm) for orm in result.scalars().all()]
+
+    async def delete(self, id: int) -> None:
+        """Elimina un snapshot"""
+        await self.session.execute(
+            sql_delete(EventSnapshotORM).where(EventSnapshotORM.id_snapshot == id)
+        )
+
+    async def delete_by_events(self, ids: Sequence[int]) -> int:
+        """Elimina los snapshots de varios eventos; retorna la cantidad borrada"""
+        if not ids:
+            return 0
+        result = await self.session.execute(
+            sql_delete(EventSnapshotORM).where(EventSnapshotORM.id_evento.in_(ids))
+        )
+        return result.rowcount or 0
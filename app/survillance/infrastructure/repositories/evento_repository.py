@@ -1,15 +1,91 @@
 """
 Repositorio de Evento: implementación con SQLAlchemy.
 """
-from typing import Optional, Sequence, List
+from typing import Any, AsyncIterator, Dict, Optional, Sequence, List, Tuple
 from datetime import datetime
 
-from sqlalchemy import select
+from sqlalchemy import (
+    Integer, Select, bindparam, exists, func, literal_column, select, tuple_, delete as sql_delete
+)
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.survillance.models import Evento as EventoORM
+from app.survillance.models import (
+    Evento as EventoORM,
+    EventSnapshot as EventSnapshotORM,
+    SerieConfianza as SerieConfianzaORM,
+)
 from app.survillance.domain.entities.event import Evento
 from app.survillance.domain.mappers import evento_to_domain, evento_to_orm
+from ._helpers import save_returning, insert_many_returning, update_many_by_pk
+from .evento_stats_repository import EventoStatsRepository
+
+
+# Consultas calientes armadas una sola vez (compiled cache + prepared statements de asyncpg)
+_GET_EVENTO = select(EventoORM).where(EventoORM.id_evento == bindparam("id"))
+
+# Columnas de la proyección de stream_rows (claves = campos de EventoResponse)
+_ROW_COLUMNS = (
+    EventoORM.id_evento,
+    EventoORM.id_conexion,
+    EventoORM.id_clip,
+    EventoORM.id_usuario,
+    EventoORM.tipo_evento,
+    EventoORM.confianza,
+    EventoORM.t_inicio_ms,
+    EventoORM.t_fin_ms,
+    EventoORM.timestamp_evento,
+    EventoORM.procesado,
+    EventoORM.subclip_path,
+    EventoORM.subclip_duracion_sec,
+    EventoORM.clips_cubiertos,
+)
+
+# Listados: una sentencia por combinación de filtros presentes, armada una sola
+# vez con bindparam (como en ClipRepository, sin lambda_stmt)
+_PAGE_QUERIES: Dict[Tuple[bool, ...], Select] = {}
+
+
+def _build_page_query(
+    id_conexion: bool, tipo_evento: bool, start_time: bool, end_time: bool, after: bool
+) -> Select:
+    query = select(EventoORM)
+    
+    if id_conexion:
+        query = query.where(EventoORM.id_conexion == bindparam("id_conexion"))
+    
+    if tipo_evento:
+        query = query.where(EventoORM.tipo_evento == bindparam("tipo_evento"))
+    
+    if start_time:
+        query = query.where(EventoORM.timestamp_evento >= bindparam("start_time"))
+    
+    if end_time:
+        query = query.where(EventoORM.timestamp_evento <= bindparam("end_time"))
+    
+    if after:
+        query = query.where(
+            tuple_(EventoORM.timestamp_evento, EventoORM.id_evento) < tuple_(
+                bindparam("after_time", type_=EventoORM.timestamp_evento.type),
+                bindparam("after_id", type_=Integer),
+            )
+        )
+    
+    return (
+        query.order_by(EventoORM.timestamp_evento.desc(), EventoORM.id_evento.desc())
+        .limit(bindparam("limit", type_=Integer))
+        .offset(bindparam("offset", type_=Integer))
+        # Lectura apta para la réplica (ver app.shared.db.RoutingSession)
+        .execution_options(use_replica=True)
+    )
+
+
+# Día UTC del evento. Literales en línea: el mismo texto SQL en SELECT y GROUP BY
+_DIA_UTC = func.timezone(
+    literal_column("'UTC'"),
+    func.date_trunc(
+        literal_column("'day'"), func.timezone(literal_column("'UTC'"), EventoORM.timestamp_evento)
+    ),
+)
 
 
 class EventoRepository:
@@ -20,9 +96,7 @@ class EventoRepository:
     
     async def get(self, id: int) -> Optional[Evento]:
         """Obtiene un evento por ID"""
-        result = await self.session.execute(
-            select(EventoORM).where(EventoORM.id_evento == id)
-        )
+        result = await self.session.execute(_GET_EVENTO, {"id": id})
         orm = result.scalar_one_or_none()
         return evento_to_domain(orm) if orm else None
     
@@ -37,25 +111,33 @@ class EventoRepository:
         id_conexion: Optional[int] = None,
         tipo_evento: Optional[str] = None,
         start_time: Optional[datetime] = None,
-        end_time: Optional[datetime] = None
+        end_time: Optional[datetime] = None,
+        after: Optional[Tuple[datetime, int]] = None
     ) -> Sequence[Evento]:
-        """Lista eventos con filtros opcionales"""
-        query = select(EventoORM)
+        """
+        Lista eventos con filtros opcionales, del más reciente al más antiguo.
+        `after` = (timestamp_evento, id_evento) de la última fila de la página anterior (keyset).
+        """
+        key = (
+            id_conexion is not None, tipo_evento is not None,
+            start_time is not None, end_time is not None, after is not None,
+        )
+        query = _PAGE_QUERIES.get(key)
+        if query is None:
+            query = _PAGE_QUERIES[key] = _build_page_query(*key)
         
+        params: Dict[str, Any] = {"limit": limit, "offset": offset}
         if id_conexion is not None:
-            query = query.where(EventoORM.id_conexion == id_conexion)
-        
+            params["id_conexion"] = id_conexion
         if tipo_evento is not None:
-            query = query.where(EventoORM.tipo_evento == tipo_evento)
-        
+            params["tipo_evento"] = tipo_evento
         if start_time is not None:
-            query = query.where(EventoORM.timestamp_evento >= start_time)
-        
+            params["start_time"] = start_time
         if end_time is not None:
-            query = query.where(EventoORM.timestamp_evento <= end_time)
-        
-        query = query.order_by(EventoORM.timestamp_evento.desc()).limit(limit).offset(offset)
-        result = await self.session.execute(query)
+            params["end_time"] = end_time
+        if after is not None:
+            params["after_time"], params["after_id"] = after
+        result = await self.session.execute(query, params)
         return [evento_to_domain(orm) for orm in result.scalars().all()]
     
     async def get_all(
@@ -65,10 +147,123 @@ class EventoRepository:
         id_conexion: Optional[int] = None,
         tipo_evento: Optional[str] = None,
         start_time: Optional[datetime] = None,
-        end_time: Optional[datetime] = None
+        end_time: Optional[datetime] = None,
+        after: Optional[Tuple[datetime, int]] = None
     ) -> List[Evento]:
         """Lista todos los eventos con filtros (alias para servicios)"""
-        return list(await self.list(limit, offset, id_conexion, tipo_evento, start_time, end_time))
+        return list(await self.list(limit, offset, id_conexion, tipo_evento, start_time, end_time, after))
+    
+    async def list_without_snapshots(
+        self,
+        since: datetime,
+        after_id: int = 0,
+        limit: int = 50,
+    ) -> List[Evento]:
+        """
+        Eventos con clip, posteriores a `since` e id > after_id, que todavía no
+        tienen snapshots; en orden de id (el worker de snapshots avanza after_id).
+        """
+        result = await self.session.execute(
+            select(EventoORM)
+            .where(
+                EventoORM.timestamp_evento >= since,
+                EventoORM.id_evento > after_id,
+                EventoORM.id_clip.is_not(None),
+                ~exists().where(EventSnapshotORM.id_evento == EventoORM.id_evento),
+            )
+            .order_by(EventoORM.id_evento)
+            .limit(limit)
+        )
+        return [evento_to_domain(orm) for orm in result.scalars().all()]
+    
+    async def stream_rows(
+        self,
+        id_conexion: Optional[int] = None,
+        tipo_evento: Optional[str] = None,
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None,
+        chunk_size: int = 1000,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Eventos filtrados como proyección de columnas (dicts planos), en orden
+        (timestamp_evento, id_evento) ascendente, para exportaciones. Las filas
+        llegan por un cursor del servidor de a chunk_size: la memoria no crece
+        con el total exportado.
+        """
+        query = select(*_ROW_COLUMNS)
+        
+        if id_conexion is not None:
+            query = query.where(EventoORM.id_conexion == id_conexion)
+        
+        if tipo_evento is not None:
+            query = query.where(EventoORM.tipo_evento == tipo_evento)
+        
+        if start_time is not None:
+            query = query.where(EventoORM.timestamp_evento >= start_time)
+        
+        if end_time is not None:
+            query = query.where(EventoORM.timestamp_evento <= end_time)
+        
+        query = (
+            query.order_by(EventoORM.timestamp_evento, EventoORM.id_evento)
+            # Lectura apta para la réplica (ver app.shared.db.RoutingSession)
+            .execution_options(use_replica=True, yield_per=chunk_size)
+        )
+        result = await self.session.stream(query)
+        async for row in result.mappings():
+            yield dict(row)
+    
+    async def stream_report_rows(
+        self,
+        start_time: Optional[datetime],
+        end_time: Optional[datetime],
+        min_confianza: Optional[float] = None,
+        tipo_evento: Optional[str] = None,
+        id_clip: Optional[int] = None,
+        chunk_size: int = 1000,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Agregado de un reporte hecho en SQL: una fila por (día UTC, conexión, tipo)
+        con total, suma/cantidad/máximo de confianza y primer/último evento.
+        Rango semiabierto [start_time, end_time). Las filas llegan por un cursor
+        del servidor de a chunk_size, sin materializar el resultado.
+        """
+        query = select(
+            _DIA_UTC.label("dia"),
+            EventoORM.id_conexion,
+            EventoORM.tipo_evento,
+            func.count().label("total"),
+            func.sum(EventoORM.confianza).label("suma_confianza"),
+            func.count(EventoORM.confianza).label("n_confianza"),
+            func.max(EventoORM.confianza).label("max_confianza"),
+            func.min(EventoORM.timestamp_evento).label("primer_evento"),
+            func.max(EventoORM.timestamp_evento).label("ultimo_evento"),
+        )
+        
+        if start_time is not None:
+            query = query.where(EventoORM.timestamp_evento >= start_time)
+        
+        if end_time is not None:
+            query = query.where(EventoORM.timestamp_evento < end_time)
+        
+        if min_confianza is not None:
+            query = query.where(EventoORM.confianza >= min_confianza)
+        
+        if tipo_evento is not None:
+            query = query.where(EventoORM.tipo_evento == tipo_evento)
+        
+        if id_clip is not None:
+            query = query.where(EventoORM.id_clip == id_clip)
+        
+        query = (
+            query.group_by(_DIA_UTC, EventoORM.id_conexion, EventoORM.tipo_evento)
+            .order_by(_DIA_UTC, EventoORM.id_conexion, EventoORM.tipo_evento)
+            # Lectura apta para la réplica (ver app.shared.db.RoutingSession)
+            .execution_options(use_replica=True, yield_per=chunk_size)
+        )
+        result = await self.session.stream(query)
+        async for row in result.mappings():
+            yield dict(row)
     
     async def save(self, evento: Evento) -> Evento:
         """
@@ -76,33 +271,61 @@ class EventoRepository:
         Si entity.id is None: crea nuevo registro.
         Si entity.id is not None: actualiza registro existente.
         """
-        if evento.id is None:
-            # Nueva entidad: crear modelo sin ID
-            model = evento_to_orm(evento)
-            self.session.add(model)
-        else:
-            # Entidad existente: buscar o crear modelo y actualizar
-            result = await self.session.execute(
-                select(EventoORM).where(EventoORM.id_evento == evento.id)
-            )
-            existing_orm = result.scalar_one_or_none()
-            model = evento_to_orm(evento, existing_orm)
-            if existing_orm is None:
-                self.session.add(model)
-        
-        await self.session.flush()
-        await self.session.refresh(model)
-        
+        # Un solo round trip: INSERT/UPDATE ... RETURNING
+        model = await save_returning(
+            self.session, EventoORM, evento_to_orm(evento), "id_evento", evento.id
+        )
         return evento_to_domain(model)
     
     async def create(self, evento: Evento) -> Evento:
-        """Crea un nuevo evento (alias para compatibilidad)"""
-        return await self.save(evento)
+        """Crea un nuevo evento y lo suma al rollup de estadísticas (misma transacción)"""
+        creado = await self.save(evento)
+        if evento.id is None:
+            await EventoStatsRepository(self.session).add([creado])
+        return creado
     
     async def update(self, evento: Evento) -> Evento:
         """Actualiza un evento existente (alias para compatibilidad)"""
         if evento.id is None:
             raise ValueError("No se puede actualizar un evento sin ID")
         return await self.save(evento)
-
-
+    
+    async def create_many(self, eventos: Sequence[Evento]) -> List[Evento]:
+        """
+        Crea varios eventos en lotes (INSERT ... RETURNING), en el orden recibido,
+        y los suma al rollup de estadísticas en la misma transacción.
+        """
+        models = await insert_many_returning(
+            self.session, EventoORM, [evento_to_orm(evento) for evento in eventos]
+        )
+        creados = [evento_to_domain(model) for model in models]
+        await EventoStatsRepository(self.session).add(creados)
+        return creados
+    
+    async def update_many(self, eventos: Sequence[Evento]) -> int:
+        """Actualiza varios eventos existentes por PK (executemany)"""
+        if any(evento.id is None for evento in eventos):
+            raise ValueError("No se puede actualizar un evento sin ID")
+        return await update_many_by_pk(
+            self.session, EventoORM, [evento_to_orm(evento) for evento in eventos]
+        )
+    
+    async def delete_many(self, ids: Sequence[int]) -> int:
+        """
+        Elimina varios eventos, sus series de confianza y sus snapshots.
+        eventos está particionada y no tiene FKs entrantes: el cascade es manual.
+        El rollup de estadísticas no se descuenta: conserva la historia más allá
+        de la retención de eventos.
+        """
+        if not ids:
+            return 0
+        await self.session.execute(
+            sql_delete(SerieConfianzaORM).where(SerieConfianzaORM.id_evento.in_(ids))
+        )
+        await self.session.execute(
+            sql_delete(EventSnapshotORM).where(EventSnapshotORM.id_evento.in_(ids))
+        )
+        result = await self.session.execute(
+            sql_delete(EventoORM).where(EventoORM.id_evento.in_(ids))
+        )
+        return result.rowcount or 0
@@ -0,0 +1,139 @@
+"""
+Repositorio del rollup de estadísticas de eventos: implementación con SQLAlchemy.
+"""
+from collections import defaultdict
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Sequence
+
+from sqlalchemy import delete as sql_delete, func, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.shared.time import truncate_utc
+from app.survillance.models import EventoStats as EventoStatsORM
+from app.survillance.domain.entities.event import Evento
+
+
+# Granularidades del rollup (mismos nombres que date_trunc de PostgreSQL)
+GRANULARIDADES = ("minute", "hour", "day")
+
+# Dimensiones de agrupación de las series (parámetro `por`)
+AGRUPACIONES = {
+    "total": (),
+    "conexion": ("id_conexion",),
+    "tipo": ("tipo_evento",),
+    "conexion_tipo": ("id_conexion", "tipo_evento"),
+}
+
+
+class EventoStatsRepository:
+    """Adaptador del rollup de estadísticas de eventos"""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def add(self, eventos: Sequence[Evento]) -> None:
+        """
+        Suma los eventos a sus buckets con un único INSERT ... ON CONFLICT DO UPDATE.
+        Los eventos se pre-agregan por clave (una fila no puede actualizarse dos veces
+        en la misma sentencia) y las filas van ordenadas por clave para que dos
+        transacciones concurrentes bloqueen los buckets en el mismo orden.
+        """
+        if not eventos:
+            return
+
+        acc: Dict[tuple, list] = defaultdict(lambda: [0, Decimal(0), 0, None])
+        for evento in eventos:
+            tipo = getattr(evento.tipo_evento, "value", evento.tipo_evento)
+            conf = (
+                Decimal(str(evento.confianza)).quantize(Decimal("0.01"))
+                if evento.confianza is not None else None
+            )
+            for granularidad in GRANULARIDADES:
+                key = (granularidad, evento.id_conexion, tipo,
+                       truncate_utc(evento.timestamp_evento, granularidad))
+                row = acc[key]
+                row[0] += 1
+                if conf is not None:
+                    row[1] += conf
+                    row[2] += 1
+                    row[3] = conf if row[3] is None else max(row[3], conf)
+
+        stmt = pg_insert(EventoStatsORM).values([
+            {
+                "granularidad": granularidad,
+                "id_conexion": id_conexion,
+                "tipo_evento": tipo,
+                "bucket": bucket,
+                "total": total,
+                "suma_confianza": suma,
+                "n_confianza": n,
+                "max_confianza": maximo,
+            }
+            for (granularidad, id_conexion, tipo, bucket), (total, suma, n, maximo)
+            in sorted(acc.items(), key=lambda item: item[0])
+        ])
+        table = EventoStatsORM.__table__
+        await self.session.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[table.c.granularidad, table.c.id_conexion,
+                                table.c.tipo_evento, table.c.bucket],
+                set_={
+                    "total": table.c.total + stmt.excluded.total,
+                    "suma_confianza": table.c.suma_confianza + stmt.excluded.suma_confianza,
+                    "n_confianza": table.c.n_confianza + stmt.excluded.n_confianza,
+                    # GREATEST ignora NULLs
+                    "max_confianza": func.greatest(table.c.max_confianza, stmt.excluded.max_confianza),
+                },
+            )
+        )
+
+    async def prune(self, granularidad: str, before: datetime) -> int:
+        """Borra los buckets de una granularidad anteriores a `before`; retorna cuántos"""
+        result = await self.session.execute(
+            sql_delete(EventoStatsORM)
+            .where(EventoStatsORM.granularidad == granularidad)
+            .where(EventoStatsORM.bucket < before)
+        )
+        return result.rowcount or 0
+
+    async def series(
+        self,
+        granularidad: str,
+        start_time: datetime,
+        end_time: datetime,
+        por: str = "tipo",
+        id_conexion: Optional[int] = None,
+        tipo_evento: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Filas del rollup en [start_time, end_time) agrupadas por bucket y las
+        dimensiones de `por`. El costo depende de la cantidad de buckets, no de eventos.
+        """
+        dims = [getattr(EventoStatsORM, name) for name in AGRUPACIONES[por]]
+        n_confianza = func.sum(EventoStatsORM.n_confianza)
+        query = (
+            select(
+                EventoStatsORM.bucket,
+                *dims,
+                func.sum(EventoStatsORM.total).label("total"),
+                (func.sum(EventoStatsORM.suma_confianza) / func.nullif(n_confianza, 0))
+                .label("confianza_promedio"),
+                func.max(EventoStatsORM.max_confianza).label("confianza_max"),
+            )
+            .where(EventoStatsORM.granularidad == granularidad)
+            .where(EventoStatsORM.bucket >= start_time)
+            .where(EventoStatsORM.bucket < end_time)
+            .group_by(EventoStatsORM.bucket, *dims)
+            .order_by(*dims, EventoStatsORM.bucket)
+            # Lectura apta para la réplica (ver app.shared.db.RoutingSession)
+            .execution_options(use_replica=True)
+        )
+        if id_conexion is not None:
+            query = query.where(EventoStatsORM.id_conexion == id_conexion)
+        if tipo_evento is not None:
+            query = query.where(EventoStatsORM.tipo_evento == tipo_evento)
+
+        result = await self.session.execute(query)
+        return [dict(row) for row in result.mappings().all()]
@@ -0,0 +1,91 @@
+"""
+Repositorio de la cola de ingesta de inferencia: implementación con SQLAlchemy.
+"""
+from typing import Optional, Sequence
+from datetime import datetime
+
+from sqlalchemy import bindparam, select, update, delete as sql_delete
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.survillance.models import InferenceIngest as InferenceIngestORM
+from app.survillance.domain.entities.inference_ingest import InferenceIngest
+from app.survillance.domain.enums import EstadoIngesta
+from app.survillance.domain.mappers import inference_ingest_to_domain, inference_ingest_to_orm
+from ._helpers import save_returning
+
+
+# Consulta caliente armada una sola vez (endpoint de estado)
+_GET_INGEST = select(InferenceIngestORM).where(InferenceIngestORM.id == bindparam("id"))
+
+
+class InferenceIngestRepository:
+    """Adaptador de repositorio de la cola de ingesta usando entidades de dominio"""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def create(self, ingest: InferenceIngest) -> InferenceIngest:
+        """Encola un webhook aceptado (INSERT ... RETURNING)"""
+        model = await save_returning(
+            self.session, InferenceIngestORM, inference_ingest_to_orm(ingest), "id", ingest.id
+        )
+        return inference_ingest_to_domain(model)
+
+    async def get(self, id: int) -> Optional[InferenceIngest]:
+        """Obtiene un webhook encolado por su tracking id"""
+        result = await self.session.execute(_GET_INGEST, {"id": id})
+        orm = result.scalar_one_or_none()
+        return inference_ingest_to_domain(orm) if orm else None
+
+    async def claim_due(self, now: datetime, limit: int = 20) -> Sequence[InferenceIngest]:
+        """
+        Bloquea (FOR UPDATE SKIP LOCKED) y devuelve webhooks pendientes vencidos,
+        los más viejos primero. Los bloqueos se liberan con el commit/rollback.
+        """
+        result = await self.session.execute(
+            select(InferenceIngestORM)
+            .where(InferenceIngestORM.estado == EstadoIngesta.PENDIENTE.value)
+            .where(InferenceIngestORM.proximo_intento <= now)
+            .order_by(InferenceIngestORM.proximo_intento, InferenceIngestORM.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        return [inference_ingest_to_domain(orm) for orm in result.scalars().all()]
+
+    async def update_many(self, ingests: Sequence[InferenceIngest]) -> int:
+        """
+        Actualiza el estado de varios webhooks por PK (executemany).
+        Solo las columnas de estado: el payload no se reenvía.
+        """
+        if any(ingest.id is None for ingest in ingests):
+            raise ValueError("No se puede actualizar un webhook encolado sin ID")
+        if not ingests:
+            return 0
+        await self.session.execute(
+            update(InferenceIngestORM),
+            [
+                {
+                    "id": ingest.id,
+                    "estado": ingest.estado.value,
+                    "intentos": ingest.intentos,
+                    "proximo_intento": ingest.proximo_intento,
+                    "resultado": ingest.resultado,
+                    "ultimo_error": ingest.ultimo_error,
+                    "procesado_at": ingest.procesado_at,
+                }
+                for ingest in ingests
+            ],
+        )
+        return len(ingests)
+
+    async def delete_finished_before(self, cutoff: datetime, limit: int = 1000) -> int:
+        """Borra hasta `limit` webhooks terminados antes de `cutoff` (lotes cortos)"""
+        oldest = (
+            select(InferenceIngestORM.id)
+            .where(InferenceIngestORM.procesado_at < cutoff)
+            .limit(limit)
+        )
+        result = await self.session.execute(
+            sql_delete(InferenceIngestORM).where(InferenceIngestORM.id.in_(oldest))
+        )
+        return result.rowcount or 0
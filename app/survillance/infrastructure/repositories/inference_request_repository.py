@@ -1,14 +1,17 @@
 """
 Repositorio de InferenceRequest: implementación con SQLAlchemy.
 """
-from typing import Optional
+from typing import Any, Dict, Optional, Sequence, Set
+from datetime import datetime
 
-from sqlalchemy import select
+from sqlalchemy import bindparam, select, update, delete as sql_delete
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.survillance.models import InferenceRequest as InferenceRequestORM
 from app.survillance.domain.entities.inference_request import InferenceRequest
 from app.survillance.domain.mappers import inference_request_to_domain, inference_request_to_orm
+from ._helpers import save_returning
 
 
 class InferenceRequestRepository:
@@ -44,29 +47,105 @@ class InferenceRequestRepository:
         )
         return result.scalar_one_or_none() is not None
     
+    async def claim(self, request_id: str, received_at: datetime) -> bool:
+        """
+        Registra el request_id si es nuevo, en un solo round trip
+        (INSERT ... ON CONFLICT (request_id) DO NOTHING RETURNING).
+        Retorna False si ya existía. Si otro request con el mismo id está en
+        curso, Postgres espera a que termine: no hay carrera ni error de unicidad.
+        """
+        result = await self.session.execute(
+            pg_insert(InferenceRequestORM)
+            .values(request_id=request_id, received_at=received_at)
+            .on_conflict_do_nothing(index_elements=[InferenceRequestORM.request_id])
+            .returning(InferenceRequestORM.id)
+        )
+        return result.scalar_one_or_none() is not None
+    
+    async def claim_many(self, request_ids: Sequence[str], received_at: datetime) -> Set[str]:
+        """
+        claim() para varios request_id en una sola sentencia.
+        Retorna los que se registraron ahora (los demás ya existían).
+        """
+        if not request_ids:
+            return set()
+        result = await self.session.execute(
+            pg_insert(InferenceRequestORM)
+            .values([{"request_id": rid, "received_at": received_at} for rid in request_ids])
+            .on_conflict_do_nothing(index_elements=[InferenceRequestORM.request_id])
+            .returning(InferenceRequestORM.request_id)
+        )
+        return set(result.scalars().all())
+    
+    async def release_many(self, request_ids: Sequence[str]) -> None:
+        """Libera request_ids reclamados que no se pudieron procesar (el reintento se procesa de nuevo)"""
+        if not request_ids:
+            return
+        await self.session.execute(
+            sql_delete(InferenceRequestORM)
+            .where(InferenceRequestORM.request_id.in_(list(request_ids)))
+        )
+    
+    async def store_response(self, request_id: str, response: Dict[str, Any]) -> None:
+        """Guarda la respuesta original para devolverla a los reintentos"""
+        await self.session.execute(
+            update(InferenceRequestORM)
+            .where(InferenceRequestORM.request_id == request_id)
+            .values(response=response)
+        )
+    
+    async def store_responses(self, responses: Dict[str, Dict[str, Any]]) -> None:
+        """store_response() para varios request_id con un solo executemany"""
+        if not responses:
+            return
+        table = InferenceRequestORM.__table__
+        await self.session.execute(
+            table.update()
+            .where(table.c.request_id == bindparam("rid"))
+            .values(response=bindparam("resp")),
+            [{"rid": rid, "resp": resp} for rid, resp in responses.items()],
+        )
+    
+    async def get_responses(self, request_ids: Sequence[str]) -> Dict[str, Optional[Dict[str, Any]]]:
+        """Respuestas guardadas de varios request_id"""
+        if not request_ids:
+            return {}
+        result = await self.session.execute(
+            select(InferenceRequestORM.request_id, InferenceRequestORM.response)
+            .where(InferenceRequestORM.request_id.in_(list(request_ids)))
+        )
+        return {rid: response for rid, response in result.all()}
+    
+    async def get_response(self, request_id: str) -> Optional[Dict[str, Any]]:
+        """Respuesta guardada de un request_id (None si no hay)"""
+        result = await self.session.execute(
+            select(InferenceRequestORM.response)
+            .where(InferenceRequestORM.request_id == request_id)
+        )
+        return result.scalar_one_or_none()
+    
+    async def delete_older_than(self, cutoff: datetime, limit: int = 1000) -> int:
+        """Borra hasta `limit` requests recibidos antes de `cutoff` (lotes cortos, sin bloqueos largos)"""
+        oldest = (
+            select(InferenceRequestORM.id)
+            .where(InferenceRequestORM.received_at < cutoff)
+            .limit(limit)
+        )
+        result = await self.session.execute(
+            sql_delete(InferenceRequestORM).where(InferenceRequestORM.id.in_(oldest))
+        )
+        return result.rowcount or 0
+    
     async def save(self, inference_request: InferenceRequest) -> InferenceRequest:
         """
         Guarda un inference request (crea o actualiza según si tiene ID).
         Si entity.id is None: crea nuevo registro.
         Si entity.id is not None: actualiza registro existente.
         """
-        if inference_request.id is None:
-            # Nueva entidad: crear modelo sin ID
-            model = inference_request_to_orm(inference_request)
-            self.session.add(model)
-        else:
-            # Entidad existente: buscar o crear modelo y actualizar
-            result = await self.session.execute(
-                select(InferenceRequestORM).where(InferenceRequestORM.id == inference_request.id)
-            )
-            existing_orm = result.scalar_one_or_none()
-            model = inference_request_to_orm(inference_request, existing_orm)
-            if existing_orm is None:
-                self.session.add(model)
-        
-        await self.session.flush()
-        await self.session.refresh(model)
-        
+        # Un solo round trip: INSERT/UPDATE ... RETURNING
+        model = await save_returning(
+            self.session, InferenceRequestORM, inference_request_to_orm(inference_request), "id", inference_request.id
+        )
         return inference_request_to_domain(model)
     
     async def create(self, inference_request: InferenceRequest) -> InferenceRequest:
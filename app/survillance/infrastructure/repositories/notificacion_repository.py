@@ -1,14 +1,21 @@
 """
 Repositorio de Notificacion: implementación con SQLAlchemy.
 """
-from typing import Optional, Sequence, List
+from typing import Iterable, Optional, Sequence, List
 
-from sqlalchemy import select
+from sqlalchemy import bindparam, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.survillance.models import Notificacion as NotificacionORM
 from app.survillance.domain.entities.notification import Notificacion
 from app.survillance.domain.mappers import notificacion_to_domain, notificacion_to_orm
+from ._helpers import save_returning
+
+
+# Consulta caliente armada una sola vez (compiled cache + prepared statements de asyncpg)
+_GET_NOTIFICACION = select(NotificacionORM).where(
+    NotificacionORM.id_notificacion == bindparam("id")
+)
 
 
 class NotificacionRepository:
@@ -19,9 +26,7 @@ class NotificacionRepository:
     
     async def get(self, id: int) -> Optional[Notificacion]:
         """Obtiene una notificación por ID"""
-        result = await self.session.execute(
-            select(NotificacionORM).where(NotificacionORM.id_notificacion == id)
-        )
+        result = await self.session.execute(_GET_NOTIFICACION, {"id": id})
         orm = result.scalar_one_or_none()
         return notificacion_to_domain(orm) if orm else None
     
@@ -32,11 +37,21 @@ class NotificacionRepository:
     async def list(
         self,
         limit: int = 50,
-        offset: int = 0
+        offset: int = 0,
+        after: Optional[int] = None
     ) -> Sequence[Notificacion]:
-        """Lista notificaciones con filtros opcionales"""
+        """
+        Lista notificaciones, de la más reciente a la más antigua.
+        `after` = id_notificacion de la última fila de la página anterior (keyset).
+        """
         query = select(NotificacionORM)
         
+        if after is not None:
+            query = query.where(NotificacionORM.id_notificacion < after)
+        
+        query = query.order_by(NotificacionORM.id_notificacion.desc())
+        # Lectura apta para la réplica (ver app.shared.db.RoutingSession)
+        query = query.execution_options(use_replica=True)
         query = query.limit(limit).offset(offset)
         result = await self.session.execute(query)
         return [notificacion_to_domain(orm) for orm in result.scalars().all()]
@@ -44,34 +59,62 @@ class NotificacionRepository:
     async def get_all(
         self,
         limit: int = 100,
-        offset: int = 0
+        offset: int = 0,
+        after: Optional[int] = None
     ) -> List[Notificacion]:
         """Lista todas las notificaciones con filtros (alias para servicios)"""
-        return list(await self.list(limit, offset))
+        return list(await self.list(limit, offset, after))
     
+    async def list_since(
+        self,
+        since: int,
+        *,
+        destinatarios: Iterable[str] = (),
+        id_conexiones: Iterable[int] = (),
+        id_oficinas: Iterable[int] = (),
+        tipos_evento: Iterable[str] = (),
+        min_confianza: float = 0.0,
+        limit: int = 500,
+    ) -> Sequence[Notificacion]:
+        """
+        Rango id > since para el replay del WebSocket. Cada condición de topic
+        usa su índice (columna, id_notificacion).
+        """
+        conds = []
+        if destinatarios:
+            conds.append(NotificacionORM.destinatario.in_(list(destinatarios)))
+        if id_conexiones:
+            conds.append(NotificacionORM.id_conexion.in_(list(id_conexiones)))
+        if id_oficinas:
+            conds.append(NotificacionORM.id_oficina.in_(list(id_oficinas)))
+        if tipos_evento:
+            conds.append(NotificacionORM.tipo_evento.in_(list(tipos_evento)))
+        if not conds:
+            return []
+
+        query = (
+            select(NotificacionORM)
+            .where(NotificacionORM.id_notificacion > since, or_(*conds))
+            .order_by(NotificacionORM.id_notificacion)
+            .limit(limit)
+        )
+        if min_confianza > 0:
+            query = query.where(
+                or_(NotificacionORM.confianza.is_(None), NotificacionORM.confianza >= min_confianza)
+            )
+        result = await self.session.execute(query)
+        return [notificacion_to_domain(orm) for orm in result.scalars().all()]
+
     async def save(self, notificacion: Notificacion) -> Notificacion:
         """
         Guarda una notificación (crea o actualiza según si tiene ID).
         Si entity.id is None: crea nuevo registro.
         Si entity.id is not None: actualiza registro existente.
         """
-        if notificacion.id is None:
-            # Nueva entidad: crear modelo sin ID
-            model = notificacion_to_orm(notificacion)
-            self.session.add(model)
-        else:
-            # Entidad existente: buscar o crear modelo y actualizar
-            result = await self.session.execute(
-                select(NotificacionORM).where(NotificacionORM.id_notificacion == notificacion.id)
-            )
-            existing_orm = result.scalar_one_or_none()
-            model = notificacion_to_orm(notificacion, existing_orm)
-            if existing_orm is None:
-                self.session.add(model)
-        
-        await self.session.flush()
-        await self.session.refresh(model)
-        
+        # Un solo round trip: INSERT/UPDATE ... RETURNING
+        model = await save_returning(
+            self.session, NotificacionORM, notificacion_to_orm(notificacion), "id_notificacion", notificacion.id
+        )
         return notificacion_to_domain(model)
     
     async def create(self, notificacion: Notificacion) -> Notificacion:
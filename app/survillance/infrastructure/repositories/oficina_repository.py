@@ -9,6 +9,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.survillance.models import Oficina as OficinaORM
 from app.survillance.domain.entities.office import Oficina
 from app.survillance.domain.mappers import oficina_to_domain, oficina_to_orm
+from ._helpers import save_returning
 
 
 class OficinaRepository:
@@ -46,23 +47,10 @@ class OficinaRepository:
         Si entity.id is None: crea nuevo registro.
         Si entity.id is not None: actualiza registro existente.
         """
-        if oficina.id is None:
-            # Nueva entidad: crear modelo sin ID
-            model = oficina_to_orm(oficina)
-            self.session.add(model)
-        else:
-            # Entidad existente: buscar o crear modelo y actualizar
-            result = await self.session.execute(
-                select(OficinaORM).where(OficinaORM.id_oficina == oficina.id)
-            )
-            existing_orm = result.scalar_one_or_none()
-            model = oficina_to_orm(oficina, existing_orm)
-            if existing_orm is None:
-                self.session.add(model)
-        
-        await self.session.flush()
-        await self.session.refresh(model)
-        
+        # Un solo round trip: INSERT/UPDATE ... RETURNING
+        model = await save_returning(
+            self.session, OficinaORM, oficina_to_orm(oficina), "id_oficina", oficina.id
+        )
         return oficina_to_domain(model)
     
     async def create(self, oficina: Oficina) -> Oficina:
@@ -0,0 +1,78 @@
+"""
+Repositorio del outbox de notificaciones: implementación con SQLAlchemy.
+"""
+from typing import List, Sequence
+from datetime import datetime
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.survillance.models import MensajeSalida as MensajeSalidaORM
+from app.survillance.domain.entities.outbox_message import MensajeSalida
+from app.survillance.domain.enums import EstadoNotificacion
+from app.survillance.domain.mappers import mensaje_salida_to_domain, mensaje_salida_to_orm
+from ._helpers import save_returning, insert_many_returning, update_many_by_pk
+
+
+class OutboxRepository:
+    """Adaptador de repositorio del outbox usando entidades de dominio"""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def claim_due(self, now: datetime, limit: int = 50) -> Sequence[MensajeSalida]:
+        """
+        Bloquea (FOR UPDATE SKIP LOCKED) y devuelve mensajes pendientes vencidos,
+        más los "enviando" cuyo lease venció (el dispatcher que los tomó murió).
+        Los bloqueos se liberan con el commit/rollback de la sesión: el llamador
+        los marca como enviando y commitea antes de enviar.
+        """
+        result = await self.session.execute(
+            select(MensajeSalidaORM)
+            .where(MensajeSalidaORM.estado.in_((
+                EstadoNotificacion.PENDIENTE.value,
+                EstadoNotificacion.ENVIANDO.value,
+            )))
+            .where(MensajeSalidaORM.proximo_intento <= now)
+            .order_by(MensajeSalidaORM.proximo_intento, MensajeSalidaORM.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        return [mensaje_salida_to_domain(orm) for orm in result.scalars().all()]
+
+    async def save(self, mensaje: MensajeSalida) -> MensajeSalida:
+        """
+        Guarda un mensaje (crea o actualiza según si tiene ID).
+        Si entity.id is None: crea nuevo registro.
+        Si entity.id is not None: actualiza registro existente.
+        """
+        # Un solo round trip: INSERT/UPDATE ... RETURNING
+        model = await save_returning(
+            self.session, MensajeSalidaORM, mensaje_salida_to_orm(mensaje), "id", mensaje.id
+        )
+        return mensaje_salida_to_domain(model)
+
+    async def create(self, mensaje: MensajeSalida) -> MensajeSalida:
+        """Encola un mensaje (alias para compatibilidad)"""
+        return await self.save(mensaje)
+
+    async def update(self, mensaje: MensajeSalida) -> MensajeSalida:
+        """Actualiza un mensaje existente (alias para compatibilidad)"""
+        if mensaje.id is None:
+            raise ValueError("No se puede actualizar un mensaje sin ID")
+        return await self.save(mensaje)
+
+    async def create_many(self, mensajes: Sequence[MensajeSalida]) -> List[MensajeSalida]:
+        """Encola varios mensajes en lotes (INSERT ... RETURNING)"""
+        models = await insert_many_returning(
+            self.session, MensajeSalidaORM, [mensaje_salida_to_orm(m) for m in mensajes]
+        )
+        return [mensaje_salida_to_domain(model) for model in models]
+
+    async def update_many(self, mensajes: Sequence[MensajeSalida]) -> int:
+        """Actualiza el estado de varios mensajes por PK (executemany)"""
+        if any(mensaje.id is None for mensaje in mensajes):
+            raise ValueError("No se puede actualizar un mensaje sin ID")
+        return await update_many_by_pk(
+            self.session, MensajeSalidaORM, [mensaje_salida_to_orm(m) for m in mensajes]
+        )
@@ -1,14 +1,17 @@
 """
 Repositorio de Reporte: implementación con SQLAlchemy.
 """
-from typing import Optional, Sequence, List
+from datetime import datetime
+from typing import Optional, Sequence, List, Tuple
 
-from sqlalchemy import select
+from sqlalchemy import select, tuple_, update as sql_update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.survillance.models import Reporte as ReporteORM
 from app.survillance.domain.entities.report import Reporte
+from app.survillance.domain.enums import EstadoReporte
 from app.survillance.domain.mappers import reporte_to_domain, reporte_to_orm
+from ._helpers import save_returning
 
 
 class ReporteRepository:
@@ -33,15 +36,25 @@ class ReporteRepository:
         self,
         limit: int = 50,
         offset: int = 0,
-        id_usuario: Optional[int] = None
+        id_usuario: Optional[int] = None,
+        after: Optional[Tuple[datetime, int]] = None
     ) -> Sequence[Reporte]:
-        """Lista reportes con filtros opcionales"""
+        """
+        Lista reportes con filtros opcionales, del más reciente al más antiguo.
+        `after` = (fecha_generacion, id_reporte) de la última fila de la página anterior (keyset).
+        """
         query = select(ReporteORM)
         
         if id_usuario is not None:
             query = query.where(ReporteORM.id_usuario == id_usuario)
         
-        query = query.order_by(ReporteORM.fecha_generacion.desc()).limit(limit).offset(offset)
+        if after is not None:
+            query = query.where(tuple_(ReporteORM.fecha_generacion, ReporteORM.id_reporte) < after)
+        
+        query = query.order_by(ReporteORM.fecha_generacion.desc(), ReporteORM.id_reporte.desc())
+        # Lectura apta para la réplica (ver app.shared.db.RoutingSession)
+        query = query.execution_options(use_replica=True)
+        query = query.limit(limit).offset(offset)
         result = await self.session.execute(query)
         return [reporte_to_domain(orm) for orm in result.scalars().all()]
     
@@ -49,10 +62,11 @@ class ReporteRepository:
         self,
         limit: int = 100,
         offset: int = 0,
-        id_usuario: Optional[int] = None
+        id_usuario: Optional[int] = None,
+        after: Optional[Tuple[datetime, int]] = None
     ) -> List[Reporte]:
         """Lista todos los reportes con filtros (alias para servicios)"""
-        return list(await self.list(limit, offset, id_usuario))
+        return list(await self.list(limit, offset, id_usuario, after))
     
     async def save(self, reporte: Reporte) -> Reporte:
         """
@@ -60,27 +74,41 @@ class ReporteRepository:
         Si entity.id is None: crea nuevo registro.
         Si entity.id is not None: actualiza registro existente.
         """
-        if reporte.id is None:
-            # Nueva entidad: crear modelo sin ID
-            model = reporte_to_orm(reporte)
-            self.session.add(model)
-        else:
-            # Entidad existente: buscar o crear modelo y actualizar
-            result = await self.session.execute(
-                select(ReporteORM).where(ReporteORM.id_reporte == reporte.id)
-            )
-            existing_orm = result.scalar_one_or_none()
-            model = reporte_to_orm(reporte, existing_orm)
-            if existing_orm is None:
-                self.session.add(model)
-        
-        await self.session.flush()
-        await self.session.refresh(model)
-        
+        # Un solo round trip: INSERT/UPDATE ... RETURNING
+        model = await save_returning(
+            self.session, ReporteORM, reporte_to_orm(reporte), "id_reporte", reporte.id
+        )
         return reporte_to_domain(model)
     
     async def create(self, reporte: Reporte) -> Reporte:
         """Crea un nuevo reporte (alias para compatibilidad)"""
         return await self.save(reporte)
-
-
+    
+    async def update(self, reporte: Reporte) -> Reporte:
+        """Actualiza un reporte existente (alias para compatibilidad)"""
+        if reporte.id is None:
+            raise ValueError("No se puede actualizar un reporte sin ID")
+        return await self.save(reporte)
+    
+    async def set_progress(self, id: int, progreso: int) -> None:
+        """Actualiza solo el avance de un reporte en generación (UPDATE de una columna)"""
+        await self.session.execute(
+            sql_update(ReporteORM)
+            .where(
+                ReporteORM.id_reporte == id,
+                ReporteORM.estado == EstadoReporte.GENERANDO.value,
+            )
+            .values(progreso=progreso)
+        )
+    
+    async def list_unfinished_ids(self, limit: int = 1000) -> List[int]:
+        """IDs de los reportes pendientes o a medio generar, del más viejo al más nuevo"""
+        result = await self.session.execute(
+            select(ReporteORM.id_reporte)
+            .where(ReporteORM.estado.in_(
+                [EstadoReporte.PENDIENTE.value, EstadoReporte.GENERANDO.value]
+            ))
+            .order_by(ReporteORM.id_reporte)
+            .limit(limit)
+        )
+        return list(result.scalars().all())
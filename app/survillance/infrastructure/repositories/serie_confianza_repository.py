@@ -0,0 +1,43 @@
+"""
+Repositorio de SerieConfianza: implementación con SQLAlchemy.
+"""
+from typing import Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.survillance.models import SerieConfianza as SerieConfianzaORM
+from app.survillance.domain.entities.confidence_series import SerieConfianza
+from app.survillance.domain.mappers import serie_confianza_to_domain, serie_confianza_to_orm
+from ._helpers import save_returning
+
+
+class SerieConfianzaRepository:
+    """Adaptador de repositorio de series de confianza usando entidades de dominio"""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def get_by_evento(self, id_evento: int) -> Optional[SerieConfianza]:
+        """Obtiene la serie de confianza de un evento"""
+        result = await self.session.execute(
+            select(SerieConfianzaORM).where(SerieConfianzaORM.id_evento == id_evento)
+        )
+        orm = result.scalar_one_or_none()
+        return serie_confianza_to_domain(orm) if orm else None
+
+    async def save(self, serie: SerieConfianza) -> SerieConfianza:
+        """
+        Guarda una serie (crea o actualiza según si tiene ID).
+        Si entity.id is None: crea nuevo registro.
+        Si entity.id is not None: actualiza registro existente.
+        """
+        # Un solo round trip: INSERT/UPDATE ... RETURNING
+        model = await save_returning(
+            self.session, SerieConfianzaORM, serie_confianza_to_orm(serie), "id_serie", serie.id
+        )
+        return serie_confianza_to_domain(model)
+
+    async def create(self, serie: SerieConfianza) -> SerieConfianza:
+        """Crea una nueva serie (alias para compatibilidad)"""
+        return await self.save(serie)
@@ -9,6 +9,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.survillance.models import Usuario as UsuarioORM
 from app.survillance.domain.entities.user import Usuario
 from app.survillance.domain.mappers import usuario_to_domain, usuario_to_orm
+from ._helpers import save_returning
 
 
 class UsuarioRepository:
@@ -58,23 +59,10 @@ class UsuarioRepository:
         Si entity.id is None: crea nuevo registro.
         Si entity.id is not None: actualiza registro existente.
         """
-        if usuario.id is None:
-            # Nueva entidad: crear modelo sin ID
-            model = usuario_to_orm(usuario)
-            self.session.add(model)
-        else:
-            # Entidad existente: buscar o crear modelo y actualizar
-            result = await self.session.execute(
-                select(UsuarioORM).where(UsuarioORM.id_usuario == usuario.id)
-            )
-            existing_orm = result.scalar_one_or_none()
-            model = usuario_to_orm(usuario, existing_orm)
-            if existing_orm is None:
-                self.session.add(model)
-        
-        await self.session.flush()
-        await self.session.refresh(model)
-        
+        # Un solo round trip: INSERT/UPDATE ... RETURNING
+        model = await save_returning(
+            self.session, UsuarioORM, usuario_to_orm(usuario), "id_usuario", usuario.id
+        )
         return usuario_to_domain(model)
     
     async def create(self, usuario: Usuario) -> Usuario:
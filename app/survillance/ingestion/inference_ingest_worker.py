@@ -0,0 +1,155 @@
+"""
+Workers de la cola de ingesta de inferencia: procesan en segundo plano los
+webhooks aceptados con 202 (inference_ingest), con reintentos con backoff.
+"""
+import asyncio
+import logging
+import random
+from datetime import timedelta
+from typing import Callable, List, Optional
+
+from fastapi import HTTPException, status
+
+from app.config.settings import settings
+from app.shared.db import AsyncSessionLocal
+from app.shared.time import now_utc
+from app.survillance.application.inference_service import InferenceService
+from app.survillance.infrastructure.repositories import (
+    ClipRepository,
+    EventoRepository,
+    InferenceIngestRepository,
+    InferenceRequestRepository,
+)
+
+logger = logging.getLogger(__name__)
+
+# Errores del payload: reintentar no los arregla
+_PERMANENT_ERRORS = {status.HTTP_400_BAD_REQUEST, 422}
+
+
+class InferenceIngestWorker:
+    """Pool de workers que drena la cola de ingesta de inferencia"""
+
+    def __init__(
+        self,
+        workers: int = 4,
+        batch_size: int = 20,
+        interval_seconds: float = 1.0,
+        max_attempts: int = 5,
+        retry_max_seconds: float = 300.0,
+        session_factory: Callable = AsyncSessionLocal,
+    ):
+        self.workers = workers
+        self.batch_size = batch_size
+        self.interval_seconds = interval_seconds
+        self.max_attempts = max_attempts
+        self.retry_max_seconds = retry_max_seconds
+        self.session_factory = session_factory
+        self.running = False
+        self.tasks: List[asyncio.Task] = []
+        self._wakeup: Optional[asyncio.Event] = None
+
+    async def start(self):
+        """Inicia el pool de workers"""
+        if self.running:
+            return
+
+        self.running = True
+        self._wakeup = asyncio.Event()
+        self.tasks = [asyncio.create_task(self._run_loop()) for _ in range(self.workers)]
+        logger.info("[INGEST] %s workers de inferencia iniciados", self.workers)
+
+    async def stop(self):
+        """Detiene los workers (lo pendiente queda en la cola)"""
+        if not self.running:
+            return
+
+        self.running = False
+
+        for task in self.tasks:
+            task.cancel()
+        await asyncio.gather(*self.tasks, return_exceptions=True)
+        self.tasks = []
+
+        logger.info("[INGEST] Workers de inferencia detenidos")
+
+    def notify(self) -> None:
+        """Despierta a los workers (hay un webhook nuevo commiteado)"""
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def _run_loop(self):
+        """Loop de un worker: si el lote vino lleno, sigue sin esperar"""
+        while self.running:
+            claimed = 0
+            try:
+                claimed = await self.process_once()
+            except Exception as e:
+                logger.warning("[INGEST] Error procesando la cola de inferencia: %s", e)
+
+            if claimed < self.batch_size:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=self.interval_seconds)
+                except asyncio.TimeoutError:
+                    pass
+                self._wakeup.clear()
+
+    def _backoff(self, intentos: int) -> timedelta:
+        """Backoff exponencial con jitter, acotado por retry_max_seconds"""
+        delay = min(self.retry_max_seconds, 2 ** max(0, intentos - 1))
+        return timedelta(seconds=delay * random.uniform(0.5, 1.0))
+
+    async def process_once(self) -> int:
+        """
+        Procesa un lote de webhooks vencidos.
+        Las filas quedan bloqueadas (SKIP LOCKED) hasta el commit, así varios
+        workers (y procesos) drenan la misma cola sin procesar duplicados.
+        Cada webhook corre en un SAVEPOINT: uno que falla no arrastra al lote.
+
+        Returns:
+            Cantidad de webhooks tomados de la cola
+        """
+        async with self.session_factory() as session:
+            repo = InferenceIngestRepository(session)
+            ingests = await repo.claim_due(now_utc(), self.batch_size)
+            if not ingests:
+                return 0
+
+            service = InferenceService(
+                EventoRepository(session),
+                ClipRepository(session),
+                InferenceRequestRepository(session),
+            )
+
+            for ingest in ingests:
+                try:
+                    async with session.begin_nested():
+                        response = await service.process_webhook(ingest.payload)
+                    ingest.mark_processed(response.model_dump(), now_utc())
+                except HTTPException as e:
+                    retry_at = (
+                        None if e.status_code in _PERMANENT_ERRORS
+                        else now_utc() + self._backoff(ingest.intentos + 1)
+                    )
+                    ingest.mark_failed_attempt(str(e.detail), retry_at, self.max_attempts, now_utc())
+                except Exception as e:
+                    ingest.mark_failed_attempt(
+                        str(e), now_utc() + self._backoff(ingest.intentos + 1),
+                        self.max_attempts, now_utc()
+                    )
+                    logger.warning("[INGEST] Webhook %s falló (intento %s): %s",
+                                   ingest.id, ingest.intentos, e)
+
+            await repo.update_many(ingests)
+            await session.commit()
+            return len(ingests)
+
+
+# Instancia global del pool
+inference_ingest_worker = InferenceIngestWorker(
+    workers=settings.INFERENCE_INGEST_WORKERS,
+    batch_size=settings.INFERENCE_INGEST_BATCH,
+    interval_seconds=settings.INFERENCE_INGEST_POLL_SECONDS,
+    max_attempts=settings.INFERENCE_INGEST_MAX_ATTEMPTS,
+    retry_max_seconds=settings.INFERENCE_INGEST_RETRY_MAX_SECONDS,
+)
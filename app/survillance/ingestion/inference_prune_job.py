@@ -0,0 +1,106 @@
+"""
+Job periódico que poda inference_requests más viejos que el TTL de idempotencia,
+para que el índice único de request_id se mantenga chico, y los webhooks de la
+cola de ingesta (inference_ingest) que terminaron antes del mismo TTL.
+"""
+import asyncio
+import logging
+from datetime import timedelta
+from typing import Optional
+
+from app.config.settings import settings
+from app.shared.db import AsyncSessionLocal
+from app.shared.time import now_utc
+from app.survillance.infrastructure.repositories import (
+    InferenceIngestRepository,
+    InferenceRequestRepository,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class InferencePruneJob:
+    """Job que borra requests de inferencia vencidos periódicamente"""
+
+    def __init__(self, interval_seconds: int = 3600, ttl_hours: int = 72, batch_size: int = 1000):
+        self.interval_seconds = interval_seconds
+        self.ttl_hours = ttl_hours
+        self.batch_size = batch_size
+        self.running = False
+        self.task: Optional[asyncio.Task] = None
+
+    async def start(self):
+        """Inicia el job periódico"""
+        if self.running:
+            return
+
+        self.running = True
+        self.task = asyncio.create_task(self._run_loop())
+        logger.info("[INFERENCE] Poda de requests iniciada (cada %ss, TTL %sh)",
+                    self.interval_seconds, self.ttl_hours)
+
+    async def stop(self):
+        """Detiene el job"""
+        if not self.running:
+            return
+
+        self.running = False
+
+        if self.task:
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+
+        logger.info("[INFERENCE] Poda de requests detenida")
+
+    async def _run_loop(self):
+        """Loop principal del job"""
+        while self.running:
+            try:
+                await self.run_once()
+            except Exception as e:
+                logger.warning("[INFERENCE] Error podando requests: %s", e)
+            await asyncio.sleep(self.interval_seconds)
+
+    async def run_once(self) -> int:
+        """
+        Borra los requests vencidos en lotes, un commit por lote.
+        Un reintento que llegue después del TTL se procesa como nuevo.
+        """
+        cutoff = now_utc() - timedelta(hours=self.ttl_hours)
+        total = await self._prune(
+            lambda session: InferenceRequestRepository(session).delete_older_than(
+                cutoff, self.batch_size
+            )
+        )
+        ingested = await self._prune(
+            lambda session: InferenceIngestRepository(session).delete_finished_before(
+                cutoff, self.batch_size
+            )
+        )
+
+        if total or ingested:
+            logger.info("[INFERENCE] %s requests vencidos y %s webhooks encolados eliminados",
+                        total, ingested)
+        return total + ingested
+
+    async def _prune(self, delete_batch) -> int:
+        """Repite delete_batch(session) hasta que borre menos que un lote"""
+        total = 0
+        while True:
+            async with AsyncSessionLocal() as session:
+                deleted = await delete_batch(session)
+                await session.commit()
+            total += deleted
+            if deleted < self.batch_size:
+                break
+        return total
+
+
+# Instancia global del job
+inference_prune_job = InferencePruneJob(
+    interval_seconds=settings.INFERENCE_PRUNE_SECONDS,
+    ttl_hours=settings.INFERENCE_REQUEST_TTL_HOURS,
+)
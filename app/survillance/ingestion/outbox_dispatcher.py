@@ -0,0 +1,185 @@
+"""
+Dispatcher del outbox: entrega en segundo plano los SMS encolados en
+notificaciones_outbox, con rate limit por destino y reintentos con backoff.
+
+Cada lote se toma en una transacción corta (FOR UPDATE SKIP LOCKED, se marca
+"enviando" con un lease y se commitea); los envíos HTTP corren fuera de
+cualquier transacción y los resultados se guardan en otra. Si el proceso muere
+en el medio, los mensajes se retoman al vencer el lease (al menos una vez).
+"""
+import asyncio
+import logging
+import random
+from datetime import timedelta
+from typing import Callable, Optional
+
+from app.config.settings import settings
+from app.shared.db import AsyncSessionLocal
+from app.shared.rate_limit import KeyedRateLimiter
+from app.shared.services.sms_service import SmsProvider, TwilioSmsResult, build_sms_provider
+from app.shared.time import now_utc
+from app.survillance.domain.entities.outbox_message import MensajeSalida
+from app.survillance.infrastructure.repositories import OutboxRepository
+
+logger = logging.getLogger(__name__)
+
+
+class OutboxDispatcher:
+    """Job que drena el outbox periódicamente"""
+
+    def __init__(
+        self,
+        interval_seconds: float = 2.0,
+        batch_size: int = 50,
+        provider_factory: Callable[[], SmsProvider] = build_sms_provider,
+        session_factory: Callable = AsyncSessionLocal,
+        claim_lease_seconds: float = 120.0,
+    ):
+        self.interval_seconds = interval_seconds
+        self.batch_size = batch_size
+        self.claim_lease_seconds = claim_lease_seconds
+        self.provider_factory = provider_factory
+        self.session_factory = session_factory
+        self.limiter = KeyedRateLimiter(
+            rate=settings.SMS_RATE_PER_MINUTE / 60.0,
+            capacity=settings.SMS_BURST,
+        )
+        self.provider: Optional[SmsProvider] = None
+        self.running = False
+        self.task: Optional[asyncio.Task] = None
+
+    async def start(self):
+        """Inicia el dispatcher"""
+        if self.running:
+            return
+
+        self.provider = self.provider_factory()
+        self.running = True
+        self.task = asyncio.create_task(self._run_loop())
+        logger.info("[OUTBOX] Dispatcher iniciado (cada %.1fs)", self.interval_seconds)
+
+    async def stop(self):
+        """Detiene el dispatcher y cierra el cliente HTTP del proveedor"""
+        if not self.running:
+            return
+
+        self.running = False
+
+        if self.task:
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+
+        if self.provider:
+            await self.provider.aclose()
+            self.provider = None
+
+        logger.info("[OUTBOX] Dispatcher detenido")
+
+    async def _run_loop(self):
+        """Loop principal: si el lote vino lleno, sigue sin esperar"""
+        while self.running:
+            claimed = 0
+            try:
+                claimed = await self.dispatch_once()
+            except Exception as e:
+                logger.warning("[OUTBOX] Error despachando outbox: %s", e)
+
+            if claimed < self.batch_size:
+                self.limiter.prune()
+                await asyncio.sleep(self.interval_seconds)
+
+    def _backoff(self, intentos: int) -> timedelta:
+        """Backoff exponencial con jitter, acotado por SMS_RETRY_MAX_SECONDS"""
+        delay = min(
+            settings.SMS_RETRY_MAX_SECONDS,
+            settings.SMS_RETRY_BASE_SECONDS * (2 ** max(0, intentos - 1)),
+        )
+        return timedelta(seconds=delay * random.uniform(0.5, 1.0))
+
+    async def _send(self, mensaje: MensajeSalida) -> TwilioSmsResult:
+        """Un envío; cualquier excepción del proveedor cuenta como intento fallido"""
+        try:
+            return await self.provider.send(mensaje.destinatario, mensaje.cuerpo)
+        except Exception as e:
+            return TwilioSmsResult(to=mensaje.destinatario, sid=None, success=False, error=e)
+
+    async def dispatch_once(self) -> int:
+        """
+        Procesa un lote de mensajes vencidos.
+        Las filas se toman con SKIP LOCKED y se marcan "enviando" en la misma
+        transacción, así varios procesos pueden drenar el mismo outbox sin
+        enviar duplicados y ninguna fila queda bloqueada durante el HTTP.
+
+        Returns:
+            Cantidad de mensajes tomados del outbox
+        """
+        if self.provider is None:
+            self.provider = self.provider_factory()
+
+        # 1) Tomar el lote y commitear: libera los bloqueos antes de enviar
+        async with self.session_factory() as session:
+            repo = OutboxRepository(session)
+            now = now_utc()
+            mensajes = await repo.claim_due(now, self.batch_size)
+            if not mensajes:
+                return 0
+
+            ready: list[MensajeSalida] = []
+            for mensaje in mensajes:
+                if mensaje.canal != "sms":
+                    mensaje.mark_failed_attempt(f"canal no soportado: {mensaje.canal}", None, 1)
+                    continue
+
+                wait = self.limiter.try_acquire(mensaje.destinatario)
+                if wait > 0:
+                    # Sin token para este destino: se pospone sin contar como intento
+                    mensaje.postpone(now + timedelta(seconds=wait))
+                else:
+                    mensaje.mark_sending(now + timedelta(seconds=self.claim_lease_seconds))
+                    ready.append(mensaje)
+
+            # Un solo executemany para todos los cambios de estado del lote
+            await repo.update_many(mensajes)
+            await session.commit()
+
+        if not ready:
+            return len(mensajes)
+
+        # 2) Los envíos se hacen en paralelo sobre el pool HTTP del proveedor, sin transacción
+        results = await asyncio.gather(*(self._send(m) for m in ready))
+
+        for mensaje, result in zip(ready, results):
+            if result.success:
+                mensaje.mark_sent(result.sid, now_utc())
+            else:
+                retry_at = (
+                    now_utc() + self._backoff(mensaje.intentos + 1)
+                    if result.retryable else None
+                )
+                mensaje.mark_failed_attempt(
+                    str(result.error), retry_at, settings.SMS_MAX_ATTEMPTS
+                )
+                logger.warning(
+                    "[OUTBOX] Error enviando SMS id=%s (intento %s/%s): %s",
+                    mensaje.id,
+                    mensaje.intentos,
+                    settings.SMS_MAX_ATTEMPTS,
+                    result.error,
+                )
+
+        # 3) Resultados en otra transacción corta
+        async with self.session_factory() as session:
+            await OutboxRepository(session).update_many(ready)
+            await session.commit()
+        return len(mensajes)
+
+
+# Instancia global del dispatcher
+outbox_dispatcher = OutboxDispatcher(
+    interval_seconds=settings.OUTBOX_POLL_SECONDS,
+    batch_size=settings.OUTBOX_BATCH_SIZE,
+    claim_lease_seconds=settings.OUTBOX_CLAIM_LEASE_SECONDS,
+)
@@ -0,0 +1,218 @@
+"""
+Job periódico de mantenimiento de particiones de clips y eventos:
+crea las particiones por adelantado y elimina las que ya vencieron.
+"""
+import asyncio
+import logging
+import os
+import shutil
+from datetime import timedelta
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from app.config.settings import settings
+from app.shared.db import AsyncSessionLocal
+from app.shared.time import now_utc
+from app.survillance.application.services.evento_service import stats_retention
+from app.survillance.application.sprite_sheets import sprite_day_dirs
+from app.survillance.infrastructure import partitions
+from app.survillance.infrastructure.repositories import (
+    ClipRepository,
+    ConexionRepository,
+    EventoStatsRepository,
+)
+from app.survillance.infrastructure.repositories.evento_stats_repository import GRANULARIDADES
+
+logger = logging.getLogger(__name__)
+
+
+def _is_event_subclip(path: Optional[str]) -> bool:
+    return bool(path) and ("/events/" in path or "\\events\\" in path)
+
+
+def _remove_files(paths: List[Optional[str]]) -> int:
+    deleted = 0
+    for path in paths:
+        if path and os.path.exists(path):
+            try:
+                os.remove(path)
+                deleted += 1
+            except OSError as e:
+                logger.warning("[PARTITIONS] No se pudo borrar %s: %s", path, e)
+    return deleted
+
+
+def _remove_dirs(paths: List[Path]) -> None:
+    for path in paths:
+        shutil.rmtree(path, ignore_errors=True)
+
+
+class PartitionJob:
+    """Job que mantiene las particiones periódicamente"""
+
+    def __init__(
+        self,
+        interval_seconds: int = 3600,
+        partition_interval: str = "day",
+        premake: int = 7,
+    ):
+        self.interval_seconds = interval_seconds
+        self.partition_interval = partition_interval
+        self.premake = premake
+        self.running = False
+        self.task: Optional[asyncio.Task] = None
+
+    async def start(self):
+        """Inicia el job periódico"""
+        if self.running:
+            return
+
+        self.running = True
+        self.task = asyncio.create_task(self._run_loop())
+        logger.info("[PARTITIONS] Job iniciado (cada %ss)", self.interval_seconds)
+
+    async def stop(self):
+        """Detiene el job"""
+        if not self.running:
+            return
+
+        self.running = False
+
+        if self.task:
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+
+        logger.info("[PARTITIONS] Job detenido")
+
+    async def _run_loop(self):
+        """Loop principal del job"""
+        while self.running:
+            await asyncio.sleep(self.interval_seconds)
+            try:
+                await self.run_once()
+            except Exception as e:
+                logger.warning("[PARTITIONS] Error en mantenimiento: %s", e)
+
+    async def run_once(self) -> Dict[str, List[str]]:
+        """Crea las particiones que faltan y elimina las vencidas"""
+        stats: Dict[str, List[str]] = {"created": [], "dropped": []}
+
+        async with AsyncSessionLocal() as session:
+            today = now_utc().date()
+            step = partitions.partition_step(self.partition_interval)
+            for table in partitions.PARTITIONED_TABLES:
+                if not await partitions.is_partitioned(session, table):
+                    logger.warning("[PARTITIONS] %s no está particionada (falta migrar)", table)
+                    continue
+                stats["created"] += await partitions.ensure_partitions(
+                    session,
+                    table,
+                    today - step,
+                    today + step * self.premake,
+                    self.partition_interval,
+                )
+
+            stats["dropped"] += await self._drop_expired_clips(session)
+            stats["dropped"] += await self._drop_expired_eventos(session)
+            pruned = await self._prune_stats(session)
+
+            await session.commit()
+
+        if pruned:
+            logger.info("[PARTITIONS] buckets de eventos_stats podados=%s", pruned)
+
+        if stats["created"] or stats["dropped"]:
+            logger.info(
+                "[PARTITIONS] creadas=%s eliminadas=%s", stats["created"], stats["dropped"]
+            )
+        return stats
+
+    async def _drop_expired_clips(self, session) -> List[str]:
+        """
+        Una partición de clips se elimina entera solo si todas sus filas
+        vencieron para todas las cámaras (retention_minutes más largo) y no
+        tiene subclips de eventos, que la retención nunca borra, ni clips que
+        filtra un reporte. Los eventos que apuntan a sus clips sueltan la
+        referencia en la misma transacción.
+        """
+        if not await partitions.is_partitioned(session, "clips"):
+            return []
+        max_minutes = await ConexionRepository(session).max_retention_minutes()
+        if max_minutes is None:
+            return []
+        cutoff = now_utc() - timedelta(minutes=max_minutes)
+
+        clip_repo = ClipRepository(session)
+        dropped = []
+        for particion in await partitions.list_partitions(session, "clips"):
+            if particion.hasta > cutoff:
+                break
+            paths = await partitions.partition_paths(session, particion, "storage_path")
+            if any(_is_event_subclip(p) for p in paths):
+                continue
+            ids = await partitions.partition_values(session, particion, "id_clip")
+            if await clip_repo.pinned_ids(ids):
+                logger.info("[PARTITIONS] %s tiene clips usados por reportes: se conserva", particion.nombre)
+                continue
+            await clip_repo.detach_eventos(ids, particion.desde, particion.hasta)
+            # Archivos primero: si el borrado de la partición falla, solo quedan filas huérfanas
+            await asyncio.to_thread(_remove_files, paths)
+            # Sprites de scrub: una carpeta por día de inicio, solo con clips de esta partición
+            await asyncio.to_thread(
+                _remove_dirs, sprite_day_dirs(settings.SPRITES_PATH, particion.desde, particion.hasta)
+            )
+            await partitions.drop_partition(session, particion)
+            dropped.append(particion.nombre)
+        return dropped
+
+    async def _prune_stats(self, session) -> int:
+        """
+        Poda los buckets finos del rollup de estadísticas (EVENT_STATS_*_RETENTION_DAYS):
+        sin esto eventos_stats crece sin límite aunque los eventos se borren.
+        """
+        repo = EventoStatsRepository(session)
+        now = now_utc()
+        pruned = 0
+        for granularidad in GRANULARIDADES:
+            retention = stats_retention(granularidad)
+            if retention is not None:
+                pruned += await repo.prune(granularidad, now - retention)
+        return pruned
+
+    async def _drop_expired_eventos(self, session) -> List[str]:
+        """Elimina particiones de eventos más viejas que EVENTOS_RETENTION_DAYS (si está activo)"""
+        if settings.EVENTOS_RETENTION_DAYS <= 0:
+            return []
+        if not await partitions.is_partitioned(session, "eventos"):
+            return []
+        cutoff = now_utc() - timedelta(days=settings.EVENTOS_RETENTION_DAYS)
+
+        dropped = []
+        for particion in await partitions.list_partitions(session, "eventos"):
+            if particion.hasta > cutoff:
+                break
+            await partitions.delete_referencing(
+                session, particion, "id_evento", "eventos_confianza", "id_evento"
+            )
+            snapshots = await partitions.referencing_values(
+                session, particion, "id_evento", "event_snapshots", "id_evento", "ruta_imagen"
+            )
+            await partitions.delete_referencing(
+                session, particion, "id_evento", "event_snapshots", "id_evento"
+            )
+            paths = await partitions.partition_paths(session, particion, "subclip_path")
+            await asyncio.to_thread(_remove_files, paths + snapshots)
+            await partitions.drop_partition(session, particion)
+            dropped.append(particion.nombre)
+        return dropped
+
+
+# Instancia global del job
+partition_job = PartitionJob(
+    interval_seconds=settings.PARTITION_JOB_SECONDS,
+    partition_interval=settings.PARTITION_INTERVAL,
+    premake=settings.PARTITION_PREMAKE,
+)
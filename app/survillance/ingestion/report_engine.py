@@ -0,0 +1,268 @@
+"""
+Motor de generación de reportes: arma en segundo plano los artefactos
+(CSV, JSON, PDF) de cada Reporte.
+
+- El agregado corre en SQL (EventoRepository.stream_report_rows) sobre la
+  réplica, por ventanas de días UTC; después de cada ventana se actualiza
+  reportes.progreso para que el cliente vea el avance de rangos largos.
+- El render y la escritura a disco corren en un pool de threads propio, sin
+  bloquear el event loop.
+- Los artefactos se cachean en REPORTS_PATH por hash de los filtros: un
+  reporte con los mismos filtros que otro ya generado queda listo sin tocar
+  la BD. Un rango que todavía no terminó (o terminó hace menos de
+  REPORT_CACHE_SETTLE_SECONDS, por eventos que llegan tarde) puede cambiar,
+  así que lleva una clave propia del reporte y no se comparte.
+"""
+import asyncio
+import logging
+import os
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from app.config.settings import settings
+from app.shared.db import AsyncSessionLocal, ReplicaSessionLocal
+from app.shared.time import now_utc, truncate_utc
+from app.survillance.application.report_renderers import RENDERERS
+from app.survillance.domain.entities.report import Reporte
+from app.survillance.domain.enums import EstadoReporte
+from app.survillance.infrastructure.repositories import EventoRepository, ReporteRepository
+
+logger = logging.getLogger(__name__)
+
+# Cambia con el formato de los artefactos: invalida el cache entero
+ENGINE_VERSION = 1
+
+# Avance reservado al render (el agregado llega hasta acá)
+_AGGREGATE_PROGRESS = 90
+
+
+def _filtros(reporte: Reporte) -> Dict[str, Any]:
+    return {
+        "rango_fecha_inicio": reporte.rango_fecha_inicio,
+        "rango_fecha_fin": reporte.rango_fecha_fin,
+        "filtro_confianza": float(reporte.filtro_confianza) if reporte.filtro_confianza is not None else None,
+        "tipo_evento": reporte.tipo_evento,
+        "id_clip": reporte.id_clip,
+    }
+
+
+class ReportEngine:
+    """Cola y pool de workers que generan los artefactos de los reportes"""
+
+    def __init__(
+        self,
+        workers: int = 2,
+        window_days: int = 1,
+        cache_settle_seconds: float = 900.0,
+        base_path: str = "storage/reports",
+        session_factory: Callable = AsyncSessionLocal,
+        read_session_factory: Callable = ReplicaSessionLocal,
+    ):
+        self.workers = workers
+        self.window_days = max(1, window_days)
+        self.cache_settle_seconds = cache_settle_seconds
+        self.base_path = Path(base_path)
+        self.session_factory = session_factory
+        self.read_session_factory = read_session_factory
+        self.running = False
+        self.tasks: List[asyncio.Task] = []
+        self.queue: Optional[asyncio.Queue] = None
+        self.executor: Optional[ThreadPoolExecutor] = None
+        self._queued: Set[int] = set()
+        # Artefactos en construcción: otro reporte con la misma clave espera y usa el cache
+        self._building: Dict[str, asyncio.Event] = {}
+
+    async def start(self):
+        """Inicia los workers y retoma los reportes pendientes o a medio generar"""
+        if self.running:
+            return
+
+        self.base_path.mkdir(parents=True, exist_ok=True)
+        self.running = True
+        self.queue = asyncio.Queue()
+        self.executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="report")
+        self.tasks = [asyncio.create_task(self._run_loop()) for _ in range(self.workers)]
+
+        try:
+            async with self.session_factory() as session:
+                for id_reporte in await ReporteRepository(session).list_unfinished_ids():
+                    self.submit(id_reporte)
+        except Exception as e:
+            logger.warning("[REPORT] No se pudieron retomar los reportes pendientes: %s", e)
+
+        logger.info("[REPORT] %s workers de reportes iniciados (%s en cola)",
+                    self.workers, self.queue.qsize())
+
+    async def stop(self):
+        """Detiene los workers (lo que quede en cola se retoma al arrancar)"""
+        if not self.running:
+            return
+
+        self.running = False
+
+        for task in self.tasks:
+            task.cancel()
+        await asyncio.gather(*self.tasks, return_exceptions=True)
+        self.tasks = []
+        self._queued.clear()
+
+        if self.executor:
+            self.executor.shutdown(wait=False)
+            self.executor = None
+
+        logger.info("[REPORT] Workers de reportes detenidos")
+
+    def submit(self, id_reporte: int) -> None:
+        """Encola un reporte ya commiteado (un mismo reporte no se encola dos veces)"""
+        if not self.running or id_reporte in self._queued:
+            return
+        self._queued.add(id_reporte)
+        self.queue.put_nowait(id_reporte)
+
+    def artifact_path(self, artefacto: str, formato: str) -> Path:
+        """Ruta del artefacto en disco para un formato (csv/json/pdf)"""
+        return self.base_path / f"{artefacto}.{formato}"
+
+    def artifact_key(self, reporte: Reporte, now: datetime) -> str:
+        """Clave del cache: hash de los filtros, propia del reporte si el rango sigue abierto"""
+        key = f"v{ENGINE_VERSION}-{reporte.filtro_hash()}"
+        if not reporte.is_closed(now - timedelta(seconds=self.cache_settle_seconds)):
+            key += f"-r{reporte.id}"
+        return key
+
+    def _cached(self, artefacto: str) -> bool:
+        return all(self.artifact_path(artefacto, formato).is_file() for formato in RENDERERS)
+
+    def windows(self, reporte: Reporte, now: datetime) -> List[Tuple[Optional[datetime], datetime]]:
+        """
+        Ventanas semiabiertas [inicio, fin) alineadas a días UTC, para que cada
+        día del agregado caiga entero en una sola ventana. Sin inicio, una sola.
+        """
+        start = reporte.rango_fecha_inicio
+        end = reporte.rango_fecha_fin if reporte.rango_fecha_fin and reporte.rango_fecha_fin < now else now
+        if start is None or start >= end:
+            return [(start, end)]
+
+        step = timedelta(days=self.window_days)
+        windows = []
+        current = start
+        while current < end:
+            following = min(truncate_utc(current, "day") + step, end)
+            windows.append((current, following))
+            current = following
+        return windows
+
+    async def _run_loop(self):
+        """Loop de un worker"""
+        while self.running:
+            id_reporte = await self.queue.get()
+            self._queued.discard(id_reporte)
+            try:
+                await self.generate(id_reporte)
+            except Exception as e:
+                logger.warning("[REPORT] Error generando el reporte %s: %s", id_reporte, e)
+
+    async def generate(self, id_reporte: int) -> None:
+        """Genera (o toma del cache) los artefactos de un reporte"""
+        now = now_utc()
+        async with self.session_factory() as session:
+            reporte = await ReporteRepository(session).get(id_reporte)
+        if reporte is None or reporte.estado == EstadoReporte.LISTO:
+            return
+
+        artefacto = self.artifact_key(reporte, now)
+        building = self._building.get(artefacto)
+        if building is not None:
+            await building.wait()
+
+        if self._cached(artefacto):
+            reporte.mark_ready(artefacto)
+            await self._save(reporte)
+            logger.info("[REPORT] Reporte %s listo desde el cache (%s)", id_reporte, artefacto)
+            return
+
+        reporte.mark_generating()
+        await self._save(reporte)
+
+        self._building[artefacto] = building = asyncio.Event()
+        try:
+            rows = await self._aggregate(reporte, now)
+            await self._render(artefacto, _filtros(reporte), rows, now_utc())
+            reporte.mark_ready(artefacto)
+            logger.info("[REPORT] Reporte %s generado (%s filas)", id_reporte, len(rows))
+        except Exception as e:
+            reporte.mark_failed(str(e) or type(e).__name__)
+            logger.warning("[REPORT] Reporte %s falló: %s", id_reporte, e)
+        finally:
+            del self._building[artefacto]
+            building.set()
+
+        await self._save(reporte)
+
+    async def _save(self, reporte: Reporte) -> None:
+        async with self.session_factory() as session:
+            await ReporteRepository(session).update(reporte)
+            await session.commit()
+
+    async def _aggregate(self, reporte: Reporte, now: datetime) -> List[Dict[str, Any]]:
+        """Agregado por ventanas sobre la réplica, informando el avance entre ventanas"""
+        windows = self.windows(reporte, now)
+        rows: List[Dict[str, Any]] = []
+        reported = 0
+        async with self.read_session_factory() as session:
+            repo = EventoRepository(session)
+            for done, (start, end) in enumerate(windows, start=1):
+                async for row in repo.stream_report_rows(
+                    start, end, reporte.filtro_confianza, reporte.tipo_evento, reporte.id_clip
+                ):
+                    rows.append(row)
+
+                progreso = done * _AGGREGATE_PROGRESS // len(windows)
+                if progreso > reported:
+                    await self._set_progress(reporte.id, progreso)
+                    reported = progreso
+        return rows
+
+    async def _set_progress(self, id_reporte: int, progreso: int) -> None:
+        """Avance en una transacción corta aparte, visible enseguida para los GET"""
+        async with self.session_factory() as session:
+            await ReporteRepository(session).set_progress(id_reporte, progreso)
+            await session.commit()
+
+    async def _render(
+        self,
+        artefacto: str,
+        filtros: Dict[str, Any],
+        rows: List[Dict[str, Any]],
+        generado: datetime,
+    ) -> None:
+        """Renderiza todos los formatos en paralelo en el pool de threads"""
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(
+            loop.run_in_executor(
+                self.executor, self._write, self.artifact_path(artefacto, formato),
+                render, filtros, rows, generado,
+            )
+            for formato, render in RENDERERS.items()
+        ))
+
+    @staticmethod
+    def _write(path: Path, render: Callable, filtros: Dict[str, Any],
+               rows: List[Dict[str, Any]], generado: datetime) -> None:
+        # Escritura atómica: un lector nunca ve un artefacto a medio escribir
+        data = render(filtros, rows, generado)
+        tmp = path.with_name(f"{path.name}.{uuid.uuid4().hex}.tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+
+
+# Instancia global del motor
+report_engine = ReportEngine(
+    workers=settings.REPORT_WORKERS,
+    window_days=settings.REPORT_WINDOW_DAYS,
+    cache_settle_seconds=settings.REPORT_CACHE_SETTLE_SECONDS,
+    base_path=settings.REPORTS_PATH,
+)
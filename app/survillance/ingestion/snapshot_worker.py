@@ -0,0 +1,201 @@
+"""
+Worker de snapshots: para cada evento nuevo extrae SNAPSHOT_FRAMES miniaturas
+WebP repartidas en la duración del evento (desde timestamp_evento) y guarda
+las filas de event_snapshots. Los listados de eventos muestran las miniaturas
+en lugar de bajar video.
+
+Los eventos se toman de la BD por id creciente (los que todavía no tienen
+snapshots), así que no hace falta engancharse en cada camino que crea eventos.
+Un evento cuyo clip todavía no está en disco se reintenta en el próximo
+re-escaneo completo (SNAPSHOT_RESCAN_SECONDS) mientras esté dentro de
+SNAPSHOT_LOOKBACK_HOURS. ffmpeg corre acotado por FFMPEG_MAX_PROCS.
+"""
+import asyncio
+import logging
+from datetime import timedelta
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from app.config.settings import settings
+from app.shared.db import AsyncSessionLocal
+from app.shared.ffmpeg_utils import extract_frame_webp
+from app.shared.time import now_utc
+from app.survillance.domain.entities import Clip, Evento
+from app.survillance.domain.entities.event_snapshot import EventSnapshot
+from app.survillance.domain.value_objects.media_paths import SnapshotPath
+from app.survillance.domain.value_objects.timestamps import MilliSeconds
+from app.survillance.infrastructure.repositories import (
+    ClipRepository,
+    EventoRepository,
+    EventSnapshotRepository,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def snapshot_offsets(evento: Evento, frames: int, default_span_ms: int) -> List[int]:
+    """Offsets (ms desde timestamp_evento) de los frames, repartidos en la duración del evento"""
+    span = int(evento.t_fin_ms) - int(evento.t_inicio_ms)
+    if span <= 0:
+        span = default_span_ms
+    if frames <= 1:
+        return [0]
+    # Eventos muy cortos: offsets repetidos colapsan en uno
+    return sorted({round(i * span / (frames - 1)) for i in range(frames)})
+
+
+class SnapshotWorker:
+    """Job que genera las miniaturas de los eventos nuevos"""
+
+    def __init__(
+        self,
+        interval_seconds: float = 2.0,
+        batch_size: int = 20,
+        frames: int = 3,
+        span_ms: int = 2000,
+        lookback_hours: int = 6,
+        rescan_seconds: int = 300,
+        base_path: str = "storage/snapshots",
+        width: int = 320,
+        quality: int = 70,
+        timeout_seconds: float = 20.0,
+        session_factory: Callable = AsyncSessionLocal,
+    ):
+        self.interval_seconds = interval_seconds
+        self.batch_size = batch_size
+        self.frames = frames
+        self.span_ms = span_ms
+        self.lookback_hours = lookback_hours
+        self.rescan_seconds = rescan_seconds
+        self.base_path = Path(base_path)
+        self.width = width
+        self.quality = quality
+        self.timeout_seconds = timeout_seconds
+        self.session_factory = session_factory
+        self.running = False
+        self.task: Optional[asyncio.Task] = None
+        # Último id_evento visto; vuelve a 0 en cada re-escaneo
+        self.after_id = 0
+        self._rescan_at = 0.0
+
+    async def start(self):
+        """Inicia el job"""
+        if self.running:
+            return
+
+        self.base_path.mkdir(parents=True, exist_ok=True)
+        self.running = True
+        self.task = asyncio.create_task(self._run_loop())
+        logger.info("[SNAPSHOT] Worker de snapshots iniciado (%s frames por evento)", self.frames)
+
+    async def stop(self):
+        """Detiene el job"""
+        if not self.running:
+            return
+
+        self.running = False
+
+        if self.task:
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+
+        logger.info("[SNAPSHOT] Worker de snapshots detenido")
+
+    async def _run_loop(self):
+        """Loop principal: si el lote vino lleno, sigue sin esperar"""
+        while self.running:
+            taken = 0
+            try:
+                taken = await self.process_once()
+            except Exception as e:
+                logger.warning("[SNAPSHOT] Error generando snapshots: %s", e)
+            if taken < self.batch_size:
+                await asyncio.sleep(self.interval_seconds)
+
+    def snapshot_path(self, evento: Evento, offset_ms: int) -> Path:
+        """Ruta de la miniatura, por día del evento (se poda por fecha)"""
+        day = evento.timestamp_evento.strftime("%Y/%m/%d")
+        return self.base_path / day / f"{evento.id}_{offset_ms}.webp"
+
+    async def process_once(self) -> int:
+        """
+        Toma un lote de eventos sin snapshots y extrae sus frames.
+
+        Returns:
+            Cantidad de eventos tomados
+        """
+        loop = asyncio.get_running_loop()
+        if loop.time() >= self._rescan_at:
+            self.after_id = 0
+            self._rescan_at = loop.time() + self.rescan_seconds
+
+        since = now_utc() - timedelta(hours=self.lookback_hours)
+        async with self.session_factory() as session:
+            eventos = await EventoRepository(session).list_without_snapshots(
+                since, self.after_id, self.batch_size
+            )
+            if not eventos:
+                return 0
+            clip_ids = {i for evento in eventos for i in (evento.clips_cubiertos or [evento.id_clip])}
+            clips = {clip.id: clip for clip in await ClipRepository(session).get_many(list(clip_ids))}
+
+        self.after_id = eventos[-1].id
+
+        results = await asyncio.gather(*(
+            self._extract(evento, [clips[i] for i in (evento.clips_cubiertos or [evento.id_clip]) if i in clips])
+            for evento in eventos
+        ))
+        snapshots = [snapshot for result in results for snapshot in result]
+
+        if snapshots:
+            async with self.session_factory() as session:
+                await EventSnapshotRepository(session).create_many(snapshots)
+                await session.commit()
+            logger.info("[SNAPSHOT] %s snapshots de %s eventos", len(snapshots), len(eventos))
+        return len(eventos)
+
+    async def _extract(self, evento: Evento, clips: List[Clip]) -> List[EventSnapshot]:
+        """Extrae los frames del evento desde el clip que cubre cada instante"""
+        targets: Dict[int, Path] = {}
+        jobs = []
+        for offset_ms in snapshot_offsets(evento, self.frames, self.span_ms):
+            instant = evento.timestamp_evento + timedelta(milliseconds=offset_ms)
+            clip = next((c for c in clips if c.contains_timestamp(instant)), None)
+            if clip is None:
+                continue
+            path = self.snapshot_path(evento, offset_ms)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            targets[offset_ms] = path
+            jobs.append(extract_frame_webp(
+                str(clip.storage_path),
+                (instant - clip.start_time_utc).total_seconds(),
+                path, self.width, self.quality, self.timeout_seconds,
+            ))
+
+        done = await asyncio.gather(*jobs)
+        return [
+            EventSnapshot(
+                id_evento=evento.id,
+                ruta_imagen=SnapshotPath(str(path)),
+                timestamp_rel_ms=MilliSeconds(offset_ms),
+            )
+            for (offset_ms, path), ok in zip(targets.items(), done) if ok
+        ]
+
+
+# Instancia global del job
+snapshot_worker = SnapshotWorker(
+    interval_seconds=settings.SNAPSHOT_POLL_SECONDS,
+    batch_size=settings.SNAPSHOT_BATCH,
+    frames=settings.SNAPSHOT_FRAMES,
+    span_ms=settings.SNAPSHOT_SPAN_MS,
+    lookback_hours=settings.SNAPSHOT_LOOKBACK_HOURS,
+    rescan_seconds=settings.SNAPSHOT_RESCAN_SECONDS,
+    base_path=settings.SNAPSHOTS_PATH,
+    width=settings.SNAPSHOT_WIDTH,
+    quality=settings.SNAPSHOT_QUALITY,
+    timeout_seconds=settings.SNAPSHOT_TIMEOUT_SECONDS,
+)
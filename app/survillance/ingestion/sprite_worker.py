@@ -0,0 +1,205 @@
+"""
+Worker de sprites de scrub: para cada clip nuevo arma la imagen con un frame
+cada SPRITE_INTERVAL_SECONDS y su pista WebVTT (ver
+app.survillance.application.sprite_sheets).
+
+Los clips se toman de la BD por id creciente dentro de SPRITE_LOOKBACK_HOURS.
+Un clip más viejo se genera al primer pedido con ensure(); los pedidos
+simultáneos del mismo clip esperan una sola generación y un clip que falló no
+se reintenta hasta pasados _FAILED_RETRY_SECONDS. Los
+archivos quedan en SPRITES_PATH y funcionan como cache: el .vtt se escribe
+último, así que su presencia indica que el sprite está completo.
+"""
+import asyncio
+import logging
+import os
+from datetime import timedelta
+from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple
+
+from app.config.settings import settings
+from app.shared.db import AsyncSessionLocal
+from app.shared.ffmpeg_utils import build_sprite_webp
+from app.shared.time import now_utc
+from app.survillance.application.sprite_sheets import SpriteLayout, render_vtt, sprite_paths
+from app.survillance.domain.entities import Clip
+from app.survillance.infrastructure.repositories import ClipRepository
+
+logger = logging.getLogger(__name__)
+
+# Un clip cuyo sprite falló no se reintenta antes de esto (evita un ffmpeg por pedido)
+_FAILED_RETRY_SECONDS = 300.0
+
+
+class SpriteWorker:
+    """Job que genera los sprites de scrub de los clips nuevos (y los pedidos a demanda)"""
+
+    def __init__(
+        self,
+        interval_seconds: float = 10.0,
+        batch_size: int = 10,
+        lookback_hours: int = 6,
+        prebuild: bool = True,
+        base_path: str = "storage/sprites",
+        frame_interval: int = 5,
+        max_frames: int = 200,
+        columns: int = 10,
+        tile_width: int = 160,
+        tile_height: int = 90,
+        quality: int = 60,
+        timeout_seconds: float = 120.0,
+        session_factory: Callable = AsyncSessionLocal,
+    ):
+        self.interval_seconds = interval_seconds
+        self.batch_size = batch_size
+        self.lookback_hours = lookback_hours
+        self.prebuild = prebuild
+        self.base_path = base_path
+        self.frame_interval = frame_interval
+        self.max_frames = max_frames
+        self.columns = columns
+        self.tile_width = tile_width
+        self.tile_height = tile_height
+        self.quality = quality
+        self.timeout_seconds = timeout_seconds
+        self.session_factory = session_factory
+        self.running = False
+        self.task: Optional[asyncio.Task] = None
+        # Último id_clip visto por el prebuild
+        self.after_id = 0
+        # Generaciones en curso por id_clip, compartidas entre pedidos
+        self._building: Dict[int, asyncio.Task] = {}
+        # id_clip -> loop.time() del último fallo
+        self._failed: Dict[int, float] = {}
+
+    async def start(self):
+        """Inicia el job (sin prebuild los sprites igual se generan a demanda)"""
+        if self.running or not self.prebuild:
+            return
+
+        self.running = True
+        self.task = asyncio.create_task(self._run_loop())
+        logger.info("[SPRITE] Worker de sprites iniciado")
+
+    async def stop(self):
+        """Detiene el job"""
+        if not self.running:
+            return
+
+        self.running = False
+
+        if self.task:
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+
+        logger.info("[SPRITE] Worker de sprites detenido")
+
+    async def _run_loop(self):
+        """Loop principal: si el lote vino lleno, sigue sin esperar"""
+        while self.running:
+            taken = 0
+            try:
+                taken = await self.process_once()
+            except Exception as e:
+                logger.warning("[SPRITE] Error generando sprites: %s", e)
+            if taken < self.batch_size:
+                await asyncio.sleep(self.interval_seconds)
+
+    def layout(self, clip: Clip) -> SpriteLayout:
+        return SpriteLayout.for_duration(
+            int(clip.duration_sec), self.frame_interval, self.max_frames,
+            self.columns, self.tile_width, self.tile_height,
+        )
+
+    def paths(self, clip: Clip) -> Tuple[Path, Path]:
+        """(imagen, vtt) del sprite del clip"""
+        return sprite_paths(self.base_path, clip)
+
+    def is_built(self, clip: Clip) -> bool:
+        return self.paths(clip)[1].is_file()
+
+    async def process_once(self) -> int:
+        """
+        Genera los sprites de un lote de clips nuevos.
+
+        Returns:
+            Cantidad de clips tomados
+        """
+        since = now_utc() - timedelta(hours=self.lookback_hours)
+        async with self.session_factory() as session:
+            clips = await ClipRepository(session).list_after_id(since, self.after_id, self.batch_size)
+        if not clips:
+            return 0
+
+        self.after_id = clips[-1].id
+        built = await asyncio.gather(*(self.ensure(clip) for clip in clips))
+        logger.info("[SPRITE] %s/%s sprites generados", sum(built), len(clips))
+        return len(clips)
+
+    async def ensure(self, clip: Clip) -> bool:
+        """
+        Garantiza que el sprite del clip esté en disco, generándolo si hace falta.
+
+        Returns:
+            True si el sprite está disponible
+        """
+        if self.is_built(clip):
+            return True
+
+        loop = asyncio.get_running_loop()
+        failed_at = self._failed.get(clip.id)
+        if failed_at is not None and loop.time() - failed_at < _FAILED_RETRY_SECONDS:
+            return False
+
+        task = self._building.get(clip.id)
+        if task is None:
+            task = asyncio.create_task(self._build(clip))
+            self._building[clip.id] = task
+            task.add_done_callback(lambda _: self._building.pop(clip.id, None))
+        # shield: si un pedido se cancela, la generación sigue para los demás
+        ok = await asyncio.shield(task)
+        if ok:
+            self._failed.pop(clip.id, None)
+        else:
+            self._failed[clip.id] = loop.time()
+        return ok
+
+    async def _build(self, clip: Clip) -> bool:
+        if not os.path.isfile(str(clip.storage_path)):
+            return False
+
+        image, vtt = self.paths(clip)
+        image.parent.mkdir(parents=True, exist_ok=True)
+        layout = self.layout(clip)
+        ok = await build_sprite_webp(
+            str(clip.storage_path), image, layout.interval, layout.columns, layout.rows,
+            layout.width, layout.height, self.quality, self.timeout_seconds,
+        )
+        if not ok:
+            return False
+
+        # El .vtt último y atómico: marca el sprite como completo
+        tmp = vtt.with_name(vtt.name + ".tmp")
+        tmp.write_text(render_vtt(layout, int(clip.duration_sec)), encoding="utf-8")
+        os.replace(tmp, vtt)
+        return True
+
+
+# Instancia global del job
+sprite_worker = SpriteWorker(
+    interval_seconds=settings.SPRITE_POLL_SECONDS,
+    batch_size=settings.SPRITE_BATCH,
+    lookback_hours=settings.SPRITE_LOOKBACK_HOURS,
+    prebuild=settings.SPRITE_PREBUILD,
+    base_path=settings.SPRITES_PATH,
+    frame_interval=settings.SPRITE_INTERVAL_SECONDS,
+    max_frames=settings.SPRITE_MAX_FRAMES,
+    columns=settings.SPRITE_COLUMNS,
+    tile_width=settings.SPRITE_TILE_WIDTH,
+    tile_height=settings.SPRITE_TILE_HEIGHT,
+    quality=settings.SPRITE_QUALITY,
+    timeout_seconds=settings.SPRITE_TIMEOUT_SECONDS,
+)
@@ -4,8 +4,9 @@ import asyncio
 import json
 import os
 import logging
+import time
 from dataclasses import dataclass
-from typing import Callable, Dict, List, Optional
+from typing import Callable, Dict, List, Optional, Tuple
 
 import websockets
 
@@ -13,12 +14,13 @@ import websockets
 from app.survillance.application.services.clip_service import ClipService
 from app.survillance.application.services.evento_service import EventoService
 from app.survillance.infrastructure.repositories import (
-    ClipRepository, EventoRepository,
+    ClipRepository, EventoRepository, SerieConfianzaRepository, OutboxRepository,
+    ConexionRepository,
 )
 from app.survillance.domain.enums import TipoEvento
 from datetime import datetime
 
-from app.shared.services.sms_service import TwilioSmsResult, sms_service
+from app.survillance.application.services.outbox_service import OutboxService
 
 logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO)
@@ -45,6 +47,29 @@ def _build_sms_body(
         f"Confianza: {conf_txt}"
     )
 
+# Oficina de cada conexión, para el topic oficina:<id> de las notificaciones.
+# La oficina de una cámara casi nunca cambia: se cachea por proceso y se vuelve
+# a leer pasados _OFICINA_TTL_SECONDS (una cámara movida de oficina se nota sin reiniciar).
+_OFICINA_TTL_SECONDS = 300.0
+_oficina_by_conexion: Dict[int, Tuple[Optional[int], float]] = {}
+
+
+async def _get_id_oficina(session, id_conexion: int) -> Optional[int]:
+    cached = _oficina_by_conexion.get(id_conexion)
+    if cached is not None and time.monotonic() - cached[1] < _OFICINA_TTL_SECONDS:
+        return cached[0]
+    conexion = await ConexionRepository(session).get_by_id(id_conexion)
+    id_oficina = conexion.id_oficina if conexion else None
+    _oficina_by_conexion[id_conexion] = (id_oficina, time.monotonic())
+    return id_oficina
+
+
+def _destinatario(id_conexion: int, id_oficina: Optional[int]) -> str:
+    """Destinatario de las alertas de una cámara: su oficina (o la cámara si no tiene)"""
+    if id_oficina is not None:
+        return f"oficina:{id_oficina}"
+    return f"camara:{id_conexion}"
+
 # ---------- Configuración ----------
 @dataclass
 class WsIngestSettings:
@@ -113,6 +138,28 @@ def _extract_top_class_and_prob(log_content: dict) -> tuple[str | None, float |
         return top_class, max_prob
     return None, None
 
+# --- Helper para extraer la matriz de probabilidades por frame ---
+def _extract_probability_series(log_content: dict) -> Dict[str, List[float]]:
+    """
+    Convierte los frames del log en columnas por clase (una lista de
+    probabilidades por clase, un valor por frame). Si una clase no aparece
+    en un frame se registra 0.0 para mantener las columnas alineadas.
+    Las claves son las etiquetas tal como vienen del modelo: "Fight" y
+    "fight" son clases distintas y no se pisan.
+    """
+    logs = log_content.get("logs", [])
+    frames = [log.get("probabilities") or {} for log in logs]
+    clases: Dict[str, None] = {}
+    for probabilities in frames:
+        clases.update(dict.fromkeys(probabilities))
+
+    columnas: Dict[str, List[float]] = {cls: [] for cls in clases}
+    for probabilities in frames:
+        for cls in clases:
+            prob = probabilities.get(cls, 0.0)
+            columnas[cls].append(float(prob) if isinstance(prob, (int, float)) else 0.0)
+    return columnas
+
 def _to_tipo_evento(top_cls: str | None) -> TipoEvento:
     k = (top_cls or "").strip().lower()
     if k == "forcejeo":
@@ -138,25 +185,28 @@ async def _create_clip_and_event(
     # ---------------------------------------------------------------
     top_cls = payload.get("top_class")
     confianza = payload.get("top_prob")
+    serie_columnas: Dict[str, List[float]] = {}
 
-    if not top_cls or confianza is None:
-        log_path = payload.get("log_path")
-        if log_path:
-            logger.info("[WS-INGEST] top_class/top_prob faltante. Leyendo log: %s", log_path)
-            
-            loop = asyncio.get_running_loop()
-            
-            # Ejecutar la lectura del archivo en un hilo separado para no bloquear el Event Loop
-            log_content = await loop.run_in_executor(
-                None, 
-                _read_json_file_sync, 
-                log_path
-            )
-            
-            if log_content:
+    log_path = payload.get("log_path")
+    if log_path:
+        loop = asyncio.get_running_loop()
+
+        # Ejecutar la lectura del archivo en un hilo separado para no bloquear el Event Loop
+        log_content = await loop.run_in_executor(
+            None,
+            _read_json_file_sync,
+            log_path
+        )
+
+        if log_content:
+            # Serie de confianza por clase (se guarda junto al evento)
+            serie_columnas = _extract_probability_series(log_content)
+
+            if not top_cls or confianza is None:
+                logger.info("[WS-INGEST] top_class/top_prob faltante. Usando log: %s", log_path)
                 # Calcular la clase y confianza máxima del archivo
                 extracted_top_cls, extracted_confianza = _extract_top_class_and_prob(log_content)
-                
+
                 # Sobrescribir solo si se extrajo algo válido
                 if extracted_top_cls and extracted_confianza is not None:
                     top_cls = extracted_top_cls
@@ -170,9 +220,10 @@ async def _create_clip_and_event(
         # Repos
         clip_repo = ClipRepository(session)
         evento_repo = EventoRepository(session)
+        serie_repo = SerieConfianzaRepository(session)
         # Services (EventoService necesita clip_repo)
         clip_service = ClipService(clip_repo)
-        evento_service = EventoService(evento_repo, clip_repo)
+        evento_service = EventoService(evento_repo, clip_repo, serie_repo)
 
         # Duración (seg)
         # ... (código existente para calcular start, end, duration_sec) ...
@@ -216,40 +267,50 @@ async def _create_clip_and_event(
             procesado=False,
         )
 
+        # 5) Serie de confianza por clase del log (savepoint: un fallo aquí no pierde el evento)
+        try:
+            async with session.begin_nested():
+                await evento_service.guardar_serie_confianza(evento.id, serie_columnas)
+        except Exception as e:
+            logger.warning("[WS-INGEST] No se pudo guardar la serie de confianza: %s", e)
+
         # ... (resto de la lógica de notificación) ...
         # (El resto del código dentro del async with session_factory() se mantiene igual)
+        # Notificación + SMS en un savepoint: si fallan, el evento se guarda igual
         try:
-            from app.survillance.infrastructure.repositories import NotificacionRepository
-            from app.survillance.application.services.notificacion_service import NotificacionService
-            from app.survillance.application.dto import NotificacionCreate
-
-            notif_repo = NotificacionRepository(session)
-            notif_service = NotificacionService(notif_repo)
-            
-            notif_msg = _build_sms_body(
-                tipo_evento=tipo_evento,
-                confianza=confianza,
-                camera_id="cam_01",
-                fecha_evento=start,
-            )
-
-            canal = "app"
-            destinatario = f"usuario:{id_conexion}"
-
-            notif = await notif_service.create(
-                NotificacionCreate(
-                    mensaje=notif_msg,
-                    canal=canal,
-                    destinatario="usuario:1",
+            async with session.begin_nested():
+                from app.survillance.infrastructure.repositories import NotificacionRepository
+                from app.survillance.application.services.notificacion_service import NotificacionService
+                from app.survillance.application.dto import NotificacionCreate
+
+                notif_repo = NotificacionRepository(session)
+                notif_service = NotificacionService(notif_repo)
+
+                notif_msg = _build_sms_body(
+                    tipo_evento=tipo_evento,
+                    confianza=confianza,
+                    camera_id="cam_01",
+                    fecha_evento=start,
                 )
-            )
 
-            sms_body = notif_msg  # reutilizamos el mismo mensaje
+                id_oficina = await _get_id_oficina(session, id_conexion)
+
+                await notif_service.create(
+                    NotificacionCreate(
+                        mensaje=notif_msg,
+                        canal="app",
+                        destinatario=_destinatario(id_conexion, id_oficina),
+                        id_conexion=id_conexion,
+                        id_oficina=id_oficina,
+                        tipo_evento=tipo_evento.value,
+                        confianza=confianza,
+                    )
+                )
 
-            sms_result: TwilioSmsResult = await sms_service.send_alert_sms(
-                sms_body,
-                max_retries=1,  # 1 intento extra (total 2 envíos)
-            )
+                # SMS al outbox en la misma transacción; lo envía el OutboxDispatcher
+                # (reutilizamos el mismo mensaje)
+                outbox_service = OutboxService(OutboxRepository(session))
+                await outbox_service.encolar_sms(notif_msg)
 
         except Exception as e:
             logger.warning("[WS-INGEST] No se pudo crear notificación: %s", e)
@@ -314,14 +375,17 @@ async def _handle_prediction_message(
             notif_service = NotificacionService(notif_repo)
             
             mensaje = f"[PRE-ALERTA] Posible {tipo_evento.value} detectado. Confianza: {confianza:.2f}"
-            canal = "app_pre"
-            destinatario = f"conexion:{id_conexion}"
+            id_oficina = await _get_id_oficina(session, id_conexion)
 
             await notif_service.create(
                 NotificacionCreate(
                     mensaje=mensaje,
-                    canal=canal,
-                    destinatario="usuario:1",
+                    canal="app_pre",
+                    destinatario=_destinatario(id_conexion, id_oficina),
+                    id_conexion=id_conexion,
+                    id_oficina=id_oficina,
+                    tipo_evento=tipo_evento.value,
+                    confianza=confianza,
                 )
             )
             await session.commit()
@@ -5,7 +5,7 @@ from typing import Dict
 from fastapi import APIRouter, Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.shared.db import get_session
+from app.shared.db import get_session, get_read_session, get_pool_status
 from app.shared.security import get_current_user_id
 from app.survillance.infrastructure.repositories import (
     ConexionRepository,
@@ -14,6 +14,7 @@ from app.survillance.infrastructure.repositories import (
 from app.survillance.application.retention_service import RetentionService
 from app.survillance.ingestion.camera_supervisor import camera_supervisor
 from app.survillance.ingestion.retention_job import retention_job
+from app.survillance.application.services.notification_ws_manager import manager as notification_ws_manager
 
 
 router = APIRouter(prefix="/api/admin", tags=["Administración"])
@@ -105,7 +106,7 @@ async def apply_retention(
 
 @router.get("/retention/status")
 async def get_retention_status(
-    session: AsyncSession = Depends(get_session),
+    session: AsyncSession = Depends(get_read_session),
     user_id: int = Depends(get_current_user_id)
 ) -> Dict:
     """Obtiene el estado de retención de todas las cámaras"""
@@ -142,4 +143,19 @@ async def stop_retention_job(
     
     return {
         "message": "Job de retención detenido"
-    }
\ No newline at end of file
+    }
+
+@router.get("/notifications/ws/status")
+async def get_notifications_ws_status(
+    user_id: int = Depends(get_current_user_id)
+) -> Dict:
+    """Suscriptores WebSocket de este proceso por destinatario y mensajes descartados"""
+    return notification_ws_manager.get_status()
+
+
+@router.get("/db/pool")
+async def get_db_pool_status(
+    user_id: int = Depends(get_current_user_id)
+) -> Dict:
+    """Conexiones en uso, saturación y espera de checkout de los pools de BD"""
+    return get_pool_status()
@@ -4,7 +4,7 @@ Controlador de autenticación: registro, login, refresh.
 from fastapi import APIRouter, Depends, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.shared.db import get_session
+from app.shared.db import get_session, get_read_session
 from app.survillance.infrastructure.repositories import UsuarioRepository
 from app.survillance.application.services.auth_service import AuthService
 from app.survillance.application.dto import *
@@ -20,7 +20,7 @@ async def get_users(
         default=None,
         description="Email del usuario a buscar. Si no se envía, devuelve todos."
     ),
-    session: AsyncSession = Depends(get_session),
+    session: AsyncSession = Depends(get_read_session),
 ):
     """
     GET /users
@@ -1,25 +1,58 @@
 """
-Controlador de clips: listado y búsqueda.
+Controlador de clips: listado, búsqueda, exportación y sprites de scrub.
 """
 from typing import List, Optional
 from datetime import datetime
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.shared.db import get_session
+from app.shared.db import ReplicaSessionLocal, get_read_session, get_replica_session
+from app.shared.export import export_response
+from app.shared.pagination import MAX_OFFSET, set_next_cursor
+from app.shared.responses import RowsJSONResponse, cached_file_response
 from app.shared.security import get_current_user_id
 from app.survillance.infrastructure.repositories import ClipRepository
 from app.survillance.application.services.clip_service import ClipService
 from app.survillance.application.dto import ClipResponse
+from app.survillance.ingestion.sprite_worker import sprite_worker
 
 
 router = APIRouter(prefix="/api/clips", tags=["Clips"])
 
+# El video de un clip no cambia; el sprite solo si cambia la configuración
+_SPRITE_CACHE = "private, max-age=86400"
+
+
+# Declarado antes de /{id_clip} para que "export" no se tome como un ID
+@router.get("/export")
+async def export_clips(
+    formato: str = Query("csv", pattern="^(csv|ndjson)$"),
+    gzip: bool = Query(False, description="Comprimir al vuelo (descarga .gz)"),
+    id_conexion: Optional[int] = Query(None),
+    start_time: Optional[datetime] = Query(None),
+    end_time: Optional[datetime] = Query(None),
+    user_id: int = Depends(get_current_user_id)
+):
+    """
+    Exporta todos los clips filtrados, en orden cronológico, como CSV o NDJSON
+    (mismos campos que ClipResponse). Las filas salen de un cursor del servidor
+    directo a la respuesta: memoria constante sin importar cuántas se exporten.
+    """
+    async def rows():
+        # Sesión propia: el stream se consume después de que el endpoint retornó
+        async with ReplicaSessionLocal() as session:
+            async for row in ClipService(ClipRepository(session)).stream_rows(
+                id_conexion, start_time, end_time
+            ):
+                yield row
+    
+    return export_response(rows(), list(ClipResponse.model_fields), formato, "clips", gzip)
+
 
 @router.get("/{id_clip}", response_model=ClipResponse)
 async def get_clip(
     id_clip: int,
-    session: AsyncSession = Depends(get_session),
+    session: AsyncSession = Depends(get_read_session),
     user_id: int = Depends(get_current_user_id)
 ):
     """Obtiene un clip por ID"""
@@ -30,19 +63,66 @@ async def get_clip(
     return ClipResponse.model_validate(clip)
 
 
-@router.get("", response_model=List[ClipResponse])
+@router.get("/{id_clip}/sprite.vtt")
+async def get_sprite_vtt(
+    id_clip: int,
+    request: Request,
+    session: AsyncSession = Depends(get_read_session),
+    user_id: int = Depends(get_current_user_id)
+):
+    """
+    Pista WebVTT de miniaturas para el scrub del reproductor. Cada cue apunta a
+    una celda de sprite.webp (`#xywh=`), relativa a esta URL. Si el sprite
+    todavía no existe se genera en el momento (después queda cacheado).
+    """
+    service = ClipService(ClipRepository(session), sprite_builder=sprite_worker)
+    clip = await service.get_by_id(id_clip)
+    # Devolver la conexión al pool antes de una posible generación con ffmpeg
+    await session.close()
+    _, vtt = await service.get_sprite(clip)
+    return cached_file_response(request, str(vtt), "text/vtt", _SPRITE_CACHE)
+
+
+@router.get("/{id_clip}/sprite.webp")
+async def get_sprite_image(
+    id_clip: int,
+    request: Request,
+    session: AsyncSession = Depends(get_read_session),
+    user_id: int = Depends(get_current_user_id)
+):
+    """Imagen WebP del sprite de scrub: un frame cada N segundos en grilla"""
+    service = ClipService(ClipRepository(session), sprite_builder=sprite_worker)
+    clip = await service.get_by_id(id_clip)
+    # Devolver la conexión al pool antes de una posible generación con ffmpeg
+    await session.close()
+    image, _ = await service.get_sprite(clip)
+    return cached_file_response(request, str(image), "image/webp", _SPRITE_CACHE)
+
+
+@router.get("", response_model=List[ClipResponse], response_class=RowsJSONResponse)
 async def list_clips(
     limit: int = Query(100, ge=1, le=1000),
-    offset: int = Query(0, ge=0),
+    cursor: Optional[str] = Query(None, description="Valor de X-Next-Cursor de la página anterior"),
+    offset: int = Query(0, ge=0, le=MAX_OFFSET),
     id_conexion: Optional[int] = Query(None),
     start_time: Optional[datetime] = Query(None),
     end_time: Optional[datetime] = Query(None),
-    session: AsyncSession = Depends(get_session),
+    session: AsyncSession = Depends(get_replica_session),
     user_id: int = Depends(get_current_user_id)
 ):
-    """Lista clips con filtros opcionales"""
+    """
+    Lista clips con filtros opcionales, del más reciente al más antiguo.
+    Para la página siguiente usar el header X-Next-Cursor como `cursor`.
+    
+    Camino de lectura liviano: proyección de columnas serializada directo con
+    orjson (sin entidades de dominio ni validación Pydantic por fila).
+    """
     clip_repo = ClipRepository(session)
     service = ClipService(clip_repo)
     
-    clips = await service.get_all(limit, offset, id_conexion, start_time, end_time)
-    return [ClipResponse.model_validate(c) for c in clips]
\ No newline at end of file
+    rows, next_cursor = await service.get_rows_page(
+        limit, cursor, offset, id_conexion, start_time, end_time
+    )
+    response = RowsJSONResponse(rows)
+    set_next_cursor(response, next_cursor)
+    return response
@@ -2,10 +2,11 @@
 Controlador CRUD de conexiones/cámaras.
 """
 from typing import List, Optional
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.shared.db import get_session
+from app.shared.db import get_session, get_read_session, get_replica_session
+from app.shared.pagination import MAX_OFFSET, set_next_cursor
 from app.shared.security import get_current_user_id
 from app.survillance.infrastructure.repositories import ConexionRepository
 from app.survillance.application.services.conexion_service import ConexionService
@@ -32,7 +33,7 @@ async def create_conexion(
 @router.get("/{id_conexion}", response_model=ConexionResponse)
 async def get_conexion(
     id_conexion: int,
-    session: AsyncSession = Depends(get_session),
+    session: AsyncSession = Depends(get_read_session),
     user_id: int = Depends(get_current_user_id)
 ):
     """Obtiene una conexión por ID"""
@@ -45,18 +46,26 @@ async def get_conexion(
 
 @router.get("", response_model=List[ConexionResponse])
 async def list_conexiones(
+    response: Response,
     limit: int = Query(100, ge=1, le=1000),
-    offset: int = Query(0, ge=0),
+    cursor: Optional[str] = Query(None, description="Valor de X-Next-Cursor de la página anterior"),
+    offset: int = Query(0, ge=0, le=MAX_OFFSET),
     id_oficina: Optional[int] = Query(None),
     habilitada: Optional[bool] = Query(None),
-    session: AsyncSession = Depends(get_session),
+    session: AsyncSession = Depends(get_replica_session),
     user_id: int = Depends(get_current_user_id)
 ):
-    """Lista todas las conexiones con filtros opcionales"""
+    """
+    Lista todas las conexiones con filtros opcionales, por id.
+    Para la página siguiente usar el header X-Next-Cursor como `cursor`.
+    """
     conexion_repo = ConexionRepository(session)
     service = ConexionService(conexion_repo)
     
-    conexiones = await service.get_all(limit, offset, id_oficina, habilitada)
+    conexiones, next_cursor = await service.get_page(
+        limit, cursor, offset, id_oficina, habilitada
+    )
+    set_next_cursor(response, next_cursor)
     return [ConexionResponse.model_validate(c) for c in conexiones]
 
 @router.patch("/{id_conexion}/habilitada", response_model=ConexionResponse)
@@ -1,25 +1,96 @@
 """
-Controlador de eventos: listado y generación de subclips.
+Controlador de eventos: listado, exportación, miniaturas y generación de subclips.
 """
 from typing import List, Optional
 from datetime import datetime
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.shared.db import get_session
+from app.shared.db import ReplicaSessionLocal, get_session, get_read_session, get_replica_session
+from app.shared.export import export_response
+from app.shared.pagination import MAX_OFFSET, set_next_cursor
+from app.shared.responses import cached_file_response
 from app.shared.security import get_current_user_id
-from app.survillance.infrastructure.repositories import EventoRepository, ClipRepository
+from app.survillance.infrastructure.repositories import (
+    EventoRepository,
+    ClipRepository,
+    SerieConfianzaRepository,
+    EventoStatsRepository,
+    EventSnapshotRepository,
+)
 from app.survillance.application.services.evento_service import EventoService
-from app.survillance.application.dto import EventoResponse
+from app.survillance.application.dto import (
+    EventoResponse,
+    EventoStatsResponse,
+    EventSnapshotResponse,
+    SerieConfianzaResponse,
+)
 
 
 router = APIRouter(prefix="/api/eventos", tags=["Eventos"])
 
+# Un snapshot no cambia nunca (mismo id -> misma imagen); la miniatura de un
+# evento puede aparecer después, así que se cachea menos
+_SNAPSHOT_CACHE = "private, max-age=31536000, immutable"
+_THUMBNAIL_CACHE = "private, max-age=3600"
+
+
+# Declarado antes de /{id_evento} para que "stats" no se tome como un ID
+@router.get("/stats", response_model=EventoStatsResponse)
+async def get_eventos_stats(
+    granularidad: str = Query("hour", pattern="^(minute|hour|day)$"),
+    start_time: Optional[datetime] = Query(None, description="Por defecto end_time - 24 h"),
+    end_time: Optional[datetime] = Query(None, description="Por defecto ahora"),
+    por: str = Query("tipo", pattern="^(total|conexion|tipo|conexion_tipo)$"),
+    id_conexion: Optional[int] = Query(None),
+    tipo_evento: Optional[str] = Query(None),
+    session: AsyncSession = Depends(get_replica_session),
+    user_id: int = Depends(get_current_user_id)
+):
+    """
+    Series de conteo y confianza (promedio/máxima) de eventos por bucket,
+    agrupadas por cámara y/o tipo. Se sirven del rollup eventos_stats, así
+    que el costo depende de la cantidad de buckets y no de eventos.
+    """
+    evento_repo = EventoRepository(session)
+    clip_repo = ClipRepository(session)
+    stats_repo = EventoStatsRepository(session)
+    service = EventoService(evento_repo, clip_repo, stats_repo=stats_repo)
+
+    return await service.get_stats(
+        granularidad, start_time, end_time, por, id_conexion, tipo_evento
+    )
+
+
+@router.get("/export")
+async def export_eventos(
+    formato: str = Query("csv", pattern="^(csv|ndjson)$"),
+    gzip: bool = Query(False, description="Comprimir al vuelo (descarga .gz)"),
+    id_conexion: Optional[int] = Query(None),
+    tipo_evento: Optional[str] = Query(None),
+    start_time: Optional[datetime] = Query(None),
+    end_time: Optional[datetime] = Query(None),
+    user_id: int = Depends(get_current_user_id)
+):
+    """
+    Exporta todos los eventos filtrados, en orden cronológico, como CSV o NDJSON
+    (mismos campos que EventoResponse). Las filas salen de un cursor del servidor
+    directo a la respuesta: memoria constante sin importar cuántas se exporten.
+    """
+    async def rows():
+        # Sesión propia: el stream se consume después de que el endpoint retornó
+        async with ReplicaSessionLocal() as session:
+            service = EventoService(EventoRepository(session), ClipRepository(session))
+            async for row in service.stream_rows(id_conexion, tipo_evento, start_time, end_time):
+                yield row
+    
+    return export_response(rows(), list(EventoResponse.model_fields), formato, "eventos", gzip)
+
 
 @router.get("/{id_evento}", response_model=EventoResponse)
 async def get_evento(
     id_evento: int,
-    session: AsyncSession = Depends(get_session),
+    session: AsyncSession = Depends(get_read_session),
     user_id: int = Depends(get_current_user_id)
 ):
     """Obtiene un evento por ID"""
@@ -33,26 +104,105 @@ async def get_evento(
 
 @router.get("", response_model=List[EventoResponse])
 async def list_eventos(
+    response: Response,
     limit: int = Query(100, ge=1, le=1000),
-    offset: int = Query(0, ge=0),
+    cursor: Optional[str] = Query(None, description="Valor de X-Next-Cursor de la página anterior"),
+    offset: int = Query(0, ge=0, le=MAX_OFFSET),
     id_conexion: Optional[int] = Query(None),
     tipo_evento: Optional[str] = Query(None),
     start_time: Optional[datetime] = Query(None),
     end_time: Optional[datetime] = Query(None),
-    session: AsyncSession = Depends(get_session),
+    session: AsyncSession = Depends(get_replica_session),
     user_id: int = Depends(get_current_user_id)
 ):
-    """Lista eventos con filtros opcionales"""
+    """
+    Lista eventos con filtros opcionales, del más reciente al más antiguo.
+    Para la página siguiente usar el header X-Next-Cursor como `cursor`.
+    """
     evento_repo = EventoRepository(session)
     clip_repo = ClipRepository(session)
     service = EventoService(evento_repo, clip_repo)
     
-    eventos = await service.get_all(
-        limit, offset, id_conexion, tipo_evento, start_time, end_time
+    eventos, next_cursor = await service.get_page(
+        limit, cursor, offset, id_conexion, tipo_evento, start_time, end_time
     )
+    set_next_cursor(response, next_cursor)
     return [EventoResponse.model_validate(e) for e in eventos]
 
 
+@router.get("/{id_evento}/confianza", response_model=SerieConfianzaResponse)
+async def get_serie_confianza(
+    id_evento: int,
+    puntos: int = Query(200, ge=1, le=5000),
+    agregacion: str = Query("max", pattern="^(max|mean)$"),
+    session: AsyncSession = Depends(get_read_session),
+    user_id: int = Depends(get_current_user_id)
+):
+    """Serie de confianza por clase del evento, submuestreada a `puntos`"""
+    evento_repo = EventoRepository(session)
+    clip_repo = ClipRepository(session)
+    serie_repo = SerieConfianzaRepository(session)
+    service = EventoService(evento_repo, clip_repo, serie_repo)
+
+    return await service.get_serie_confianza(id_evento, puntos, agregacion)
+
+
+@router.get("/{id_evento}/snapshots", response_model=List[EventSnapshotResponse])
+async def list_snapshots(
+    id_evento: int,
+    session: AsyncSession = Depends(get_replica_session),
+    user_id: int = Depends(get_current_user_id)
+):
+    """Miniaturas WebP del evento, en orden de offset desde timestamp_evento"""
+    service = EventoService(
+        EventoRepository(session), ClipRepository(session),
+        snapshot_repo=EventSnapshotRepository(session)
+    )
+    snapshots = await service.get_snapshots(id_evento)
+    return [
+        EventSnapshotResponse(
+            id_snapshot=snapshot.id,
+            id_evento=snapshot.id_evento,
+            timestamp_rel_ms=int(snapshot.timestamp_rel_ms),
+            url=f"{router.prefix}/{id_evento}/snapshots/{snapshot.id}",
+        )
+        for snapshot in snapshots
+    ]
+
+
+@router.get("/{id_evento}/snapshots/{id_snapshot}")
+async def get_snapshot(
+    id_evento: int,
+    id_snapshot: int,
+    request: Request,
+    session: AsyncSession = Depends(get_read_session),
+    user_id: int = Depends(get_current_user_id)
+):
+    """Imagen WebP de un snapshot (cacheable indefinidamente)"""
+    service = EventoService(
+        EventoRepository(session), ClipRepository(session),
+        snapshot_repo=EventSnapshotRepository(session)
+    )
+    snapshot = await service.get_snapshot(id_evento, id_snapshot)
+    return cached_file_response(request, str(snapshot.ruta_imagen), "image/webp", _SNAPSHOT_CACHE)
+
+
+@router.get("/{id_evento}/thumbnail")
+async def get_thumbnail(
+    id_evento: int,
+    request: Request,
+    session: AsyncSession = Depends(get_read_session),
+    user_id: int = Depends(get_current_user_id)
+):
+    """Miniatura del evento para grillas: el primer snapshot (404 si todavía no hay)"""
+    service = EventoService(
+        EventoRepository(session), ClipRepository(session),
+        snapshot_repo=EventSnapshotRepository(session)
+    )
+    snapshot = await service.get_snapshot(id_evento)
+    return cached_file_response(request, str(snapshot.ruta_imagen), "image/webp", _THUMBNAIL_CACHE)
+
+
 @router.post("/{id_evento}/generar-subclip", response_model=EventoResponse)
 async def generar_subclip(
     id_evento: int,
@@ -1,42 +1,135 @@
 """
 Controlador de webhook de inferencia: acepta contratos A y B.
+
+Los POST verifican la firma HMAC sobre el body crudo (app.shared.webhook_signature)
+antes de parsear JSON o abrir una transacción.
 """
-from fastapi import APIRouter, Depends, Request
+from typing import Any, List
+
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.shared.db import get_session
+from app.config.settings import settings
+from app.shared.db import get_session, get_read_session
+from app.shared.responses import loads
+from app.shared.webhook_signature import verified_body
 from app.survillance.infrastructure.repositories import (
     EventoRepository,
     ClipRepository,
-    InferenceRequestRepository
+    InferenceRequestRepository,
+    InferenceIngestRepository
 )
 from app.survillance.application.inference_service import InferenceService
-from app.survillance.application.dto import InferenceWebhookResponse
+from app.survillance.application.dto import (
+    InferenceAcceptedResponse,
+    InferenceBatchResponse,
+    InferenceIngestStatus,
+    InferenceWebhookResponse,
+)
+from app.survillance.ingestion.inference_ingest_worker import inference_ingest_worker
 
 
 router = APIRouter(prefix="/api/inferencia", tags=["Inferencia"])
 
 
+def _build_service(session: AsyncSession) -> InferenceService:
+    evento_repo = EventoRepository(session)
+    clip_repo = ClipRepository(session)
+    inference_repo = InferenceRequestRepository(session)
+    ingest_repo = InferenceIngestRepository(session)
+    
+    return InferenceService(evento_repo, clip_repo, inference_repo, ingest_repo)
+
+
+def _parse_batch(body: bytes, content_type: str) -> List[Any]:
+    """NDJSON (un webhook por línea) o un array JSON de webhooks"""
+    try:
+        if "ndjson" in content_type or "jsonlines" in content_type:
+            return [loads(line) for line in body.splitlines() if line.strip()]
+        payloads = loads(body)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Cuerpo inválido: {e}"
+        )
+    
+    if not isinstance(payloads, list):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Se esperaba un array JSON o NDJSON de webhooks"
+        )
+    return payloads
+
+
 @router.post("/resultados", response_model=InferenceWebhookResponse)
 async def recibir_resultados(
-    request: Request,
+    body: bytes = Depends(verified_body),
     session: AsyncSession = Depends(get_session)
 ):
     """
     Recibe resultados de inferencia de IA.
     Detecta automáticamente contrato A (offsets relativos) o B (timestamps absolutos).
     """
-    # Obtener payload como dict
-    payload = await request.json()
+    # Validación directa desde bytes (el contrato sale del modelo que valida)
+    data = InferenceService.parse_json(body)
     
-    # Crear servicio
-    evento_repo = EventoRepository(session)
-    clip_repo = ClipRepository(session)
-    inference_repo = InferenceRequestRepository(session)
+    response = await _build_service(session).process(data)
+    
+    return response
+
+
+@router.post("/resultados/batch", response_model=InferenceBatchResponse)
+async def recibir_resultados_batch(
+    request: Request,
+    body: bytes = Depends(verified_body),
+    session: AsyncSession = Depends(get_session)
+):
+    """
+    Recibe un lote de resultados de inferencia (contratos A y B mezclados).
+    Cuerpo: array JSON o NDJSON (Content-Type: application/x-ndjson).
+    Devuelve un resultado por item en el mismo orden; un item inválido
+    no invalida el resto del lote.
+    """
+    payloads = _parse_batch(body, request.headers.get("content-type", ""))
+    
+    if len(payloads) > settings.INFERENCE_BATCH_MAX_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Máximo {settings.INFERENCE_BATCH_MAX_ITEMS} items por lote"
+        )
+    
+    return await _build_service(session).process_batch(payloads)
+
+
+@router.post(
+    "/resultados/async",
+    response_model=InferenceAcceptedResponse,
+    status_code=status.HTTP_202_ACCEPTED
+)
+async def aceptar_resultados(
+    body: bytes = Depends(verified_body),
+    session: AsyncSession = Depends(get_session)
+):
+    """
+    Modo de aceptación rápida: valida el payload (contrato A o B), lo encola y
+    responde 202 con un tracking id sin esperar a clips ni eventos. Lo procesan
+    los workers de ingesta; el estado se consulta en /ingesta/{tracking_id}.
+    """
+    data = InferenceService.parse_json(body)
     
-    service = InferenceService(evento_repo, clip_repo, inference_repo)
+    response = await _build_service(session).accept(data)
     
-    # Procesar webhook (detecta contrato automáticamente)
-    response = await service.process_webhook(payload)
+    # Commit antes de despertar a los workers, para que ya vean la fila
+    await session.commit()
+    inference_ingest_worker.notify()
     
-    return response
\ No newline at end of file
+    return response
+
+
+@router.get("/ingesta/{tracking_id}", response_model=InferenceIngestStatus)
+async def estado_ingesta(
+    tracking_id: int,
+    session: AsyncSession = Depends(get_read_session)
+):
+    """Estado de procesamiento de un webhook aceptado con 202"""
+    return await _build_service(session).get_ingest_status(tracking_id)
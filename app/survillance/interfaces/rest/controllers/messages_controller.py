@@ -1,51 +1,34 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends
 from pydantic import BaseModel
-from twilio.rest import Client
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.config.settings import settings  # 👈 importa settings de tu app
+from app.shared.db import get_session
+from app.survillance.infrastructure.repositories import OutboxRepository
+from app.survillance.application.services.outbox_service import OutboxService
 
 router = APIRouter(prefix="/api/messages", tags=["Messages"])
 
-# ====== CONFIG TWILIO ======
-TWILIO_ACCOUNT_SID = settings.TWILIO_ACCOUNT_SID
-TWILIO_AUTH_TOKEN = settings.TWILIO_AUTH_TOKEN
-TWILIO_FROM_NUMBER = settings.TWILIO_FROM_NUMBER
-TWILIO_DEFAULT_TO_NUMBER = settings.TWILIO_DEFAULT_TO_NUMBER  # puede ser None
-
-twilio_client = Client(TWILIO_ACCOUNT_SID, TWILIO_AUTH_TOKEN)
-
 
 class AlertPayload(BaseModel):
     message: str
     phone_number: str | None = None  # si no viene, se usa TWILIO_DEFAULT_TO_NUMBER
 
 
-@router.post("/alert")
-async def send_twilio_alert(payload: AlertPayload):
+@router.post("/alert", status_code=202)
+async def send_twilio_alert(
+    payload: AlertPayload,
+    session: AsyncSession = Depends(get_session)
+):
     """
-    Envía una alerta por SMS usando Twilio.
+    Encola una alerta por SMS en el outbox; el OutboxDispatcher la envía.
 
     - Si viene phone_number en el body, se usa ese.
     - Si no, se usa TWILIO_DEFAULT_TO_NUMBER (por ejemplo el celular del operador).
     """
-    to_number = payload.phone_number or TWILIO_DEFAULT_TO_NUMBER
-
-    if not to_number:
-        raise HTTPException(
-            status_code=400,
-            detail="No se especificó phone_number y no hay TWILIO_DEFAULT_TO_NUMBER en Settings",
-        )
-
-    try:
-        msg = twilio_client.messages.create(
-            body=payload.message,
-            from_=TWILIO_FROM_NUMBER,
-            to=to_number,
-        )
-        return {
-            "sid": msg.sid,
-            "to": to_number,
-        }
-    except Exception as e:
-        print("Error Twilio:", e)
-        raise HTTPException(status_code=500, detail="Error al enviar SMS con Twilio")
+    service = OutboxService(OutboxRepository(session))
+    mensaje = await service.encolar_sms(payload.message, payload.phone_number)
+    return {
+        "id_outbox": mensaje.id,
+        "to": mensaje.destinatario,
+        "estado": mensaje.estado.value,
+    }
@@ -2,10 +2,11 @@
 Controlador CRUD de notificaciones.
 """
 from typing import List, Optional
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.shared.db import get_session
+from app.shared.db import get_session, get_replica_session
+from app.shared.pagination import MAX_OFFSET, set_next_cursor
 from app.shared.security import get_current_user_id
 from app.survillance.infrastructure.repositories import NotificacionRepository
 from app.survillance.application.services.notificacion_service import NotificacionService
@@ -31,16 +32,22 @@ async def create_notificacion(
 
 @router.get("", response_model=List[NotificacionResponse])
 async def list_notificaciones(
+    response: Response,
     limit: int = Query(100, ge=1, le=1000),
-    offset: int = Query(0, ge=0),
-    session: AsyncSession = Depends(get_session),
+    cursor: Optional[str] = Query(None, description="Valor de X-Next-Cursor de la página anterior"),
+    offset: int = Query(0, ge=0, le=MAX_OFFSET),
+    session: AsyncSession = Depends(get_replica_session),
     user_id: int = Depends(get_current_user_id)
 ):
-    """Lista notificaciones con filtros opcionales"""
+    """
+    Lista notificaciones, de la más reciente a la más antigua.
+    Para la página siguiente usar el header X-Next-Cursor como `cursor`.
+    """
     notif_repo = NotificacionRepository(session)
     service = NotificacionService(notif_repo)
     
-    notificaciones = await service.get_all(limit, offset)
+    notificaciones, next_cursor = await service.get_page(limit, cursor, offset)
+    set_next_cursor(response, next_cursor)
     return [NotificacionResponse.model_validate(n) for n in notificaciones]
 
 
@@ -6,7 +6,7 @@ from datetime import datetime
 from fastapi import APIRouter, Depends, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.shared.db import get_session
+from app.shared.db import get_session, get_read_session, get_replica_session
 from app.shared.security import get_current_user_id
 from app.survillance.infrastructure.repositories import OficinaRepository
 from app.survillance.application.services.oficina_service import OficinaService
@@ -43,7 +43,7 @@ async def create_oficina(
 @router.get("/{id_oficina}", response_model=OficinaResponse)
 async def get_oficina(
     id_oficina: int,
-    session: AsyncSession = Depends(get_session),
+    session: AsyncSession = Depends(get_read_session),
     user_id: int = Depends(get_current_user_id)
 ):
     """Obtiene una oficina por ID"""
@@ -68,7 +68,7 @@ async def get_oficina(
 async def list_oficinas(
     limit: int = Query(100, ge=1, le=1000),
     offset: int = Query(0, ge=0),
-    session: AsyncSession = Depends(get_session),
+    session: AsyncSession = Depends(get_replica_session),
     user_id: int = Depends(get_current_user_id)
 ):
     """Lista todas las oficinas"""
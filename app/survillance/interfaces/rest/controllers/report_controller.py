@@ -2,14 +2,18 @@
 Controlador CRUD de reportes.
 """
 from typing import List, Optional
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from fastapi.responses import FileResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.shared.db import get_session
+from app.shared.db import get_session, get_read_session, get_replica_session
+from app.shared.pagination import MAX_OFFSET, set_next_cursor
 from app.shared.security import get_current_user_id
 from app.survillance.infrastructure.repositories import ReporteRepository
 from app.survillance.application.services.reporte_service import ReporteService
 from app.survillance.application.dto import *
+from app.survillance.application.report_renderers import FORMATOS
+from app.survillance.ingestion.report_engine import report_engine
 
 
 router = APIRouter(prefix="/api/reportes", tags=["Reportes"])
@@ -21,28 +25,85 @@ async def create_reporte(
     session: AsyncSession = Depends(get_session),
     user_id: int = Depends(get_current_user_id)
 ):
-    """Crea un reporte"""
+    """
+    Crea un reporte y encola la generación de sus artefactos (CSV, JSON, PDF).
+    El avance se consulta en GET /{id_reporte}; listo, se baja de /{id_reporte}/descargar.
+    """
     reporte_repo = ReporteRepository(session)
     service = ReporteService(reporte_repo)
     
     reporte = await service.create(data, user_id)
+    
+    # Commit antes de encolar, para que el worker ya vea la fila
+    await session.commit()
+    report_engine.submit(reporte.id)
+    
     return ReporteResponse.model_validate(reporte)
 
 
 @router.get("", response_model=List[ReporteResponse])
 async def list_reportes(
+    response: Response,
     limit: int = Query(100, ge=1, le=1000),
-    offset: int = Query(0, ge=0),
+    cursor: Optional[str] = Query(None, description="Valor de X-Next-Cursor de la página anterior"),
+    offset: int = Query(0, ge=0, le=MAX_OFFSET),
     id_usuario: Optional[int] = Query(None),
-    session: AsyncSession = Depends(get_session),
+    session: AsyncSession = Depends(get_replica_session),
     user_id: int = Depends(get_current_user_id)
 ):
-    """Lista reportes con filtros opcionales"""
+    """
+    Lista reportes con filtros opcionales, del más reciente al más antiguo.
+    Para la página siguiente usar el header X-Next-Cursor como `cursor`.
+    """
     reporte_repo = ReporteRepository(session)
     service = ReporteService(reporte_repo)
     
     # Si no se especifica id_usuario, usar el del token
     filter_user_id = id_usuario if id_usuario is not None else None
     
-    reportes = await service.get_all(limit, offset, filter_user_id)
-    return [ReporteResponse.model_validate(r) for r in reportes]
\ No newline at end of file
+    reportes, next_cursor = await service.get_page(limit, cursor, offset, filter_user_id)
+    set_next_cursor(response, next_cursor)
+    return [ReporteResponse.model_validate(r) for r in reportes]
+
+
+@router.get("/{id_reporte}", response_model=ReporteResponse)
+async def get_reporte(
+    id_reporte: int,
+    session: AsyncSession = Depends(get_read_session),
+    user_id: int = Depends(get_current_user_id)
+):
+    """Obtiene un reporte con el estado y el progreso de su generación (primaria: sin atraso)"""
+    service = ReporteService(ReporteRepository(session))
+    reporte = await service.get_by_id(id_reporte)
+    return ReporteResponse.model_validate(reporte)
+
+
+@router.get("/{id_reporte}/descargar")
+async def descargar_reporte(
+    id_reporte: int,
+    formato: str = Query("csv", pattern="^(csv|json|pdf)$"),
+    session: AsyncSession = Depends(get_session),
+    user_id: int = Depends(get_current_user_id)
+):
+    """
+    Descarga un artefacto del reporte. 409 mientras se está generando o si falló.
+    Si el artefacto ya no está en disco, el reporte se vuelve a encolar.
+    """
+    service = ReporteService(ReporteRepository(session))
+    reporte = await service.get_ready(id_reporte)
+    
+    path = report_engine.artifact_path(reporte.artefacto, formato)
+    if not path.is_file():
+        await service.requeue(reporte)
+        await session.commit()
+        report_engine.submit(reporte.id)
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="El artefacto no está disponible; el reporte se está regenerando"
+        )
+    
+    return FileResponse(
+        path,
+        media_type=FORMATOS[formato],
+        filename=f"reporte_{reporte.id}.{formato}",
+    )
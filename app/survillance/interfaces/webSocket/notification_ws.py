@@ -1,18 +1,106 @@
-from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Depends
-from app.survillance.application.services.notification_ws_manager import manager
+import json
+from typing import List, Optional, Tuple
+
+from fastapi import APIRouter, Query, WebSocket, WebSocketDisconnect
+
+from app.config.settings import settings
+from app.shared.db import AsyncSessionLocal
+from app.survillance.infrastructure.repositories import NotificacionRepository
+from app.survillance.application.services.notificacion_service import (
+    NotificacionService,
+    notificacion_payload,
+)
+from app.survillance.application.services.notification_ws_manager import (
+    manager,
+    notification_topics,
+    is_valid_topic,
+)
 
 router = APIRouter()
 
+
+def _csv(value: Optional[str]) -> List[str]:
+    return [v.strip() for v in (value or "").split(",") if v.strip()]
+
+
 @router.websocket("/ws/notifications")
 async def notifications_ws(
     websocket: WebSocket,
-    destinatario: str,  # p.e. "conexion:1"
+    destinatario: Optional[str] = None,  # p.e. "oficina:3"
+    camaras: Optional[str] = Query(None, description="ids de conexión separados por coma"),
+    oficinas: Optional[str] = Query(None, description="ids de oficina separados por coma"),
+    tipos: Optional[str] = Query(None, description="tipos de evento separados por coma"),
+    min_confianza: float = Query(0.0, ge=0.0, le=1.0),
+    since: Optional[int] = Query(None, ge=0, description="última seq recibida; se reenvía el hueco"),
     # token: str = Query(None)  # si quieres validar JWT
 ):
-    await manager.connect(destinatario, websocket)
+    """
+    Suscripción a notificaciones por topics. Ejemplo:
+        /ws/notifications?camaras=1,2&tipos=robo&min_confianza=0.6
+
+    Después de conectar, el cliente puede cambiar su suscripción enviando:
+        {"action": "subscribe", "topics": ["oficina:3"], "min_confianza": 0.8}
+        {"action": "unsubscribe", "topics": ["camara:2"]}
+    Topics válidos: camara:<id>, oficina:<id>, tipo:<tipo_evento>, destinatario:<d>.
+
+    Cada notificación trae `seq`. Al reconectar con since=<última seq>, se
+    reenvían las notificaciones perdidas (no hace falta recargar la lista);
+    como los ids pueden commitear fuera de orden, el reenvío incluye las
+    últimas WS_REPLAY_REORDER_WINDOW seq anteriores y el cliente descarta las
+    que ya tiene.
+    Si el hueco supera WS_REPLAY_MAX_ROWS llega {"replay": "truncated", "since": <seq>}.
+    """
+    topics = notification_topics(destinatario=destinatario)
+    topics += [f"camara:{c}" for c in _csv(camaras)]
+    topics += [f"oficina:{o}" for o in _csv(oficinas)]
+    topics += [f"tipo:{t}" for t in _csv(tipos)]
+
+    truncated = False
+
+    async def load_from_db(desde: int) -> List[Tuple[int, str]]:
+        nonlocal truncated
+        async with AsyncSessionLocal() as session:
+            service = NotificacionService(NotificacionRepository(session))
+            notifs = await service.replay_since(
+                desde, topics, min_confianza, limit=settings.WS_REPLAY_MAX_ROWS
+            )
+        truncated = len(notifs) >= settings.WS_REPLAY_MAX_ROWS
+        return [(n.id, json.dumps(notificacion_payload(n), default=str)) for n in notifs]
+
+    client = await manager.connect(
+        websocket, topics, min_confianza, since=since, replay_loader=load_from_db
+    )
+    if truncated:
+        manager.reply(websocket, {"replay": "truncated", "since": client.last_seq})
     try:
         while True:
-            # No esperamos nada del cliente; solo para que la conexión no muera
-            await websocket.receive_text()
+            text = await websocket.receive_text()
+            try:
+                msg = json.loads(text)
+            except ValueError:
+                continue  # keep-alive u otro texto libre
+            if not isinstance(msg, dict):
+                continue
+
+            action = msg.get("action")
+            requested = [t for t in msg.get("topics") or [] if isinstance(t, str)]
+            invalid = [t for t in requested if not is_valid_topic(t)]
+            if invalid:
+                manager.reply(websocket, {"error": "topics inválidos", "topics": invalid})
+                continue
+
+            if action == "subscribe":
+                conf = msg.get("min_confianza")
+                if conf is not None and not (isinstance(conf, (int, float)) and 0.0 <= conf <= 1.0):
+                    manager.reply(websocket, {"error": "min_confianza debe estar entre 0 y 1"})
+                    continue
+                current = manager.subscribe(websocket, requested, conf)
+            elif action == "unsubscribe":
+                current = manager.unsubscribe(websocket, requested)
+            else:
+                continue
+            manager.reply(websocket, {"subscribed": sorted(current)})
     except WebSocketDisconnect:
-        manager.disconnect(destinatario, websocket)
\ No newline at end of file
+        pass
+    finally:
+        manager.disconnect(websocket)
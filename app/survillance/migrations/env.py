@@ -9,6 +9,7 @@ from alembic import context
 
 from app.shared.db import Base
 from app.config.settings import settings
+import app.survillance.models  # noqa: F401  (registra las tablas en Base.metadata)
 
 # Configuración de Alembic
 config = context.config
@@ -0,0 +1,75 @@
+"""Índices de las consultas calientes (listados, rangos, retención, replay WS)
+
+Revision ID: 0001_hot_path_indexes
+Revises:
+Create Date: 2026-10-19
+
+El esquema base se creó con Base.metadata.create_all, así que esta es la
+primera revisión: asume que las tablas existen. Los índices se crean con
+CREATE INDEX CONCURRENTLY (fuera de transacción) para no bloquear las
+escrituras de clips/eventos mientras se construyen; IF NOT EXISTS hace que
+la migración sea segura de re-ejecutar si un build concurrente quedó a medias
+(en ese caso hay que borrar el índice INVALID antes).
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0001_hot_path_indexes"
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Columnas de topic de notificaciones (metadatos del WebSocket)
+NOTIFICACION_COLUMNS = [
+    ("id_conexion", "INTEGER"),
+    ("id_oficina", "INTEGER"),
+    ("tipo_evento", "VARCHAR(50)"),
+    ("confianza", "DOUBLE PRECISION"),
+]
+
+# (nombre, tabla, columnas) — deben coincidir con los __table_args__ de los modelos
+INDEXES = [
+    # clips: listado keyset global y por cámara; retención por cámara
+    ("ix_clips_start_time_id", "clips", "start_time_utc, id_clip"),
+    ("ix_clips_conexion_start_time_id", "clips", "id_conexion, start_time_utc, id_clip"),
+    ("ix_clips_conexion_fecha_guardado", "clips", "id_conexion, fecha_guardado"),
+    # eventos: listado keyset global, por cámara y por tipo
+    ("ix_eventos_timestamp_id", "eventos", "timestamp_evento, id_evento"),
+    ("ix_eventos_conexion_timestamp_id", "eventos", "id_conexion, timestamp_evento, id_evento"),
+    ("ix_eventos_tipo_timestamp_id", "eventos", "tipo_evento, timestamp_evento, id_evento"),
+    # notificaciones: por destinatario y rangos de replay por topic
+    ("ix_notificaciones_destinatario_fecha", "notificaciones", "destinatario, fecha_envio"),
+    ("ix_notificaciones_destinatario_id", "notificaciones", "destinatario, id_notificacion"),
+    ("ix_notificaciones_conexion_id", "notificaciones", "id_conexion, id_notificacion"),
+    ("ix_notificaciones_oficina_id", "notificaciones", "id_oficina, id_notificacion"),
+    ("ix_notificaciones_tipo_id", "notificaciones", "tipo_evento, id_notificacion"),
+    # reportes: listado keyset global y por usuario
+    ("ix_reportes_fecha_id", "reportes", "fecha_generacion, id_reporte"),
+    ("ix_reportes_usuario_fecha_id", "reportes", "id_usuario, fecha_generacion, id_reporte"),
+]
+
+
+def upgrade() -> None:
+    for column, type_ in NOTIFICACION_COLUMNS:
+        op.execute(f"ALTER TABLE notificaciones ADD COLUMN IF NOT EXISTS {column} {type_}")
+
+    # CONCURRENTLY no puede correr dentro de una transacción
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.execute(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {table} ({columns})")
+        # Estadísticas al día para que el planner elija los índices nuevos
+        for table in sorted({t for _, t, _ in INDEXES}):
+            op.execute(f"ANALYZE {table}")
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, _, _ in reversed(INDEXES):
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
+
+    for column, _ in reversed(NOTIFICACION_COLUMNS):
+        op.execute(f"ALTER TABLE notificaciones DROP COLUMN IF EXISTS {column}")
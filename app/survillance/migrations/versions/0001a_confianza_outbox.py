@@ -0,0 +1,88 @@
+"""Tablas eventos_confianza y notificaciones_outbox
+
+Revision ID: 0001a_confianza_outbox
+Revises: 0001_hot_path_indexes
+Create Date: 2026-10-19
+
+Ambas tablas se agregaron después del esquema base (create_all) y ninguna
+revisión las creaba: fuera de desarrollo solo corre Alembic, así que la serie
+de confianza y el outbox de SMS fallaban con "relation does not exist".
+Va antes de 0002, que ya asume que existen. En una base creada con
+create_all las tablas ya están: se omiten.
+
+eventos_confianza se crea sin FK a eventos (0002 la particiona y una FK
+hacia una tabla particionada necesita la clave de partición).
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0001a_confianza_outbox"
+down_revision: Union[str, None] = "0001_hot_path_indexes"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+
+    if not inspector.has_table("eventos_confianza"):
+        op.create_table(
+            "eventos_confianza",
+            sa.Column("id_serie", sa.Integer(), primary_key=True, autoincrement=True),
+            sa.Column("id_evento", sa.Integer(), nullable=False),
+            sa.Column("clases", sa.JSON(), nullable=False),
+            sa.Column("n_frames", sa.Integer(), nullable=False),
+            sa.Column("formato", sa.String(20), nullable=False, server_default="f16le-col"),
+            sa.Column("datos", sa.LargeBinary(), nullable=False),
+            sa.Column(
+                "created_at",
+                sa.TIMESTAMP(timezone=True),
+                nullable=False,
+                server_default=sa.func.now(),
+            ),
+        )
+        op.create_index(
+            "ix_eventos_confianza_id_evento", "eventos_confianza", ["id_evento"], unique=True
+        )
+
+    if not inspector.has_table("notificaciones_outbox"):
+        op.create_table(
+            "notificaciones_outbox",
+            sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+            sa.Column("canal", sa.String(20), nullable=False, server_default="sms"),
+            sa.Column("destinatario", sa.String(150), nullable=False),
+            sa.Column("cuerpo", sa.String(1600), nullable=False),
+            sa.Column("estado", sa.String(50), nullable=False, server_default="pendiente"),
+            sa.Column("intentos", sa.Integer(), nullable=False, server_default="0"),
+            sa.Column(
+                "proximo_intento",
+                sa.TIMESTAMP(timezone=True),
+                nullable=False,
+                server_default=sa.func.now(),
+            ),
+            sa.Column("ultimo_error", sa.String(500)),
+            sa.Column("proveedor_id", sa.String(64)),
+            sa.Column(
+                "created_at",
+                sa.TIMESTAMP(timezone=True),
+                nullable=False,
+                server_default=sa.func.now(),
+            ),
+            sa.Column("enviado_at", sa.TIMESTAMP(timezone=True)),
+        )
+        op.create_index(
+            "ix_outbox_estado_proximo_intento",
+            "notificaciones_outbox",
+            ["estado", "proximo_intento"],
+        )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_outbox_estado_proximo_intento", table_name="notificaciones_outbox")
+    op.drop_table("notificaciones_outbox")
+    op.drop_index("ix_eventos_confianza_id_evento", table_name="eventos_confianza")
+    op.drop_table("eventos_confianza")
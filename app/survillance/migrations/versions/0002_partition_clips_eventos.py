@@ -0,0 +1,206 @@
+"""Particionar clips y eventos por rango de tiempo
+
+Revision ID: 0002_partition_clips_eventos
+Revises: 0001a_confianza_outbox
+Create Date: 2026-10-19
+
+Convierte clips (start_time_utc) y eventos (timestamp_evento) en tablas
+particionadas por RANGE. La clave de partición pasa a formar parte de la PK y
+se eliminan las FK que apuntaban a estas tablas (eventos.id_clip,
+reportes.id_clip, eventos_confianza.id_evento): Postgres exige que una FK
+hacia una tabla particionada incluya la clave de partición.
+
+Copia todas las filas (INSERT ... SELECT) con las tablas bloqueadas:
+correr en una ventana de mantenimiento. Después, PartitionJob crea las
+particiones futuras y elimina las vencidas. La historia anterior al mes en
+curso va en particiones mensuales (no una por día: un histórico de años
+serían miles de tablas en una sola transacción); desde ahí, una partición por
+día o semana como las que crea el job. El downgrade hace la copia
+inversa a tablas sin particionar y vuelve a crear las FK entrantes.
+"""
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.config.settings import settings
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0002_partition_clips_eventos"
+down_revision: Union[str, None] = "0001a_confianza_outbox"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# tabla -> (clave de partición, id serial, FKs salientes, índices)
+TABLES = {
+    "clips": (
+        "start_time_utc",
+        "id_clip",
+        [("id_conexion", "conexiones", "id_conexion")],
+        [
+            ("ix_clips_start_time_id", "start_time_utc, id_clip"),
+            ("ix_clips_conexion_start_time_id", "id_conexion, start_time_utc, id_clip"),
+            ("ix_clips_conexion_fecha_guardado", "id_conexion, fecha_guardado"),
+        ],
+    ),
+    "eventos": (
+        "timestamp_evento",
+        "id_evento",
+        [
+            ("id_conexion", "conexiones", "id_conexion"),
+            ("id_usuario", "usuarios", "id_usuario"),
+        ],
+        [
+            ("ix_eventos_timestamp_evento", "timestamp_evento"),
+            ("ix_eventos_timestamp_id", "timestamp_evento, id_evento"),
+            ("ix_eventos_conexion_timestamp_id", "id_conexion, timestamp_evento, id_evento"),
+            ("ix_eventos_tipo_timestamp_id", "tipo_evento, timestamp_evento, id_evento"),
+        ],
+    ),
+}
+
+# FKs hacia clips/eventos que existían antes de particionar:
+# (tabla, columna, tabla referida, columna referida, ON DELETE)
+INCOMING_FKS = [
+    ("eventos", "id_clip", "clips", "id_clip", None),
+    ("reportes", "id_clip", "clips", "id_clip", None),
+    ("eventos_confianza", "id_evento", "eventos", "id_evento", "CASCADE"),
+]
+
+
+def _utc(day: date) -> datetime:
+    return datetime.combine(day, time.min, tzinfo=timezone.utc)
+
+
+def _next_month(day: date) -> date:
+    return date(day.year + day.month // 12, day.month % 12 + 1, 1)
+
+
+def _create_partition(table: str, start: date, end: date) -> None:
+    op.execute(
+        f"CREATE TABLE {table}_p{start:%Y%m%d} PARTITION OF {table} "
+        f"FOR VALUES FROM ('{_utc(start).isoformat()}') TO ('{_utc(end).isoformat()}')"
+    )
+
+
+def _create_partitions(table: str, first_day: date, cutoff: date, last_day: date) -> None:
+    """Mensuales para [first_day, cutoff) y del intervalo configurado para [cutoff, last_day]"""
+    week = settings.PARTITION_INTERVAL == "week"
+    step = timedelta(weeks=1) if week else timedelta(days=1)
+    if week:
+        cutoff -= timedelta(days=cutoff.weekday())
+
+    start = first_day.replace(day=1)
+    while start < cutoff:
+        end = min(_next_month(start), cutoff)
+        _create_partition(table, start, end)
+        start = end
+
+    start = cutoff
+    while start <= last_day:
+        _create_partition(table, start, start + step)
+        start += step
+    op.execute(f"CREATE TABLE {table}_default PARTITION OF {table} DEFAULT")
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+
+    # FKs entrantes: no pueden apuntar a una tabla particionada sin su clave de partición
+    op.execute("""
+        DO $$
+        DECLARE r record;
+        BEGIN
+            FOR r IN
+                SELECT conname, conrelid::regclass AS tbl FROM pg_constraint
+                WHERE contype = 'f'
+                  AND confrelid IN ('clips'::regclass, 'eventos'::regclass)
+            LOOP
+                EXECUTE format('ALTER TABLE %s DROP CONSTRAINT %I', r.tbl, r.conname);
+            END LOOP;
+        END $$;
+    """)
+
+    today = datetime.now(timezone.utc).date()
+    cutoff = today.replace(day=1)
+    for table, (key, id_col, fks, indexes) in TABLES.items():
+        legacy = f"{table}_legacy"
+        op.execute(f"ALTER TABLE {table} RENAME TO {legacy}")
+        op.execute(f"ALTER TABLE {legacy} RENAME CONSTRAINT {table}_pkey TO {legacy}_pkey")
+        for name, _ in indexes:
+            op.execute(f"DROP INDEX IF EXISTS {name}")
+
+        op.execute(
+            f"CREATE TABLE {table} (LIKE {legacy} INCLUDING DEFAULTS INCLUDING CONSTRAINTS) "
+            f"PARTITION BY RANGE ({key})"
+        )
+        op.execute(f"ALTER TABLE {table} ADD PRIMARY KEY ({id_col}, {key})")
+        for column, ref_table, ref_column in fks:
+            op.execute(
+                f"ALTER TABLE {table} ADD FOREIGN KEY ({column}) "
+                f"REFERENCES {ref_table} ({ref_column})"
+            )
+
+        # La secuencia del serial pasa a pertenecer a la tabla nueva
+        seq = bind.execute(
+            sa.text("SELECT pg_get_serial_sequence(:t, :c)"), {"t": legacy, "c": id_col}
+        ).scalar()
+        if seq:
+            op.execute(f"ALTER SEQUENCE {seq} OWNED BY {table}.{id_col}")
+
+        first = bind.execute(sa.text(f"SELECT min({key}) FROM {legacy}")).scalar()
+        first_day = first.astimezone(timezone.utc).date() if first else today
+        _create_partitions(
+            table, first_day, cutoff, today + timedelta(days=settings.PARTITION_PREMAKE)
+        )
+
+        op.execute(f"INSERT INTO {table} SELECT * FROM {legacy}")
+        for name, columns in indexes:
+            op.execute(f"CREATE INDEX {name} ON {table} ({columns})")
+        op.execute(f"DROP TABLE {legacy}")
+        op.execute(f"ANALYZE {table}")
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+
+    for table, (key, id_col, fks, indexes) in TABLES.items():
+        partitioned = f"{table}_partitioned"
+        op.execute(f"ALTER TABLE {table} RENAME TO {partitioned}")
+        op.execute(f"ALTER TABLE {partitioned} RENAME CONSTRAINT {table}_pkey TO {partitioned}_pkey")
+        for name, _ in indexes:
+            op.execute(f"DROP INDEX IF EXISTS {name}")
+
+        op.execute(f"CREATE TABLE {table} (LIKE {partitioned} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)")
+        op.execute(f"ALTER TABLE {table} ADD PRIMARY KEY ({id_col})")
+        for column, ref_table, ref_column in fks:
+            op.execute(
+                f"ALTER TABLE {table} ADD FOREIGN KEY ({column}) "
+                f"REFERENCES {ref_table} ({ref_column})"
+            )
+
+        seq = bind.execute(
+            sa.text("SELECT pg_get_serial_sequence(:t, :c)"), {"t": partitioned, "c": id_col}
+        ).scalar()
+        if seq:
+            op.execute(f"ALTER SEQUENCE {seq} OWNED BY {table}.{id_col}")
+
+        op.execute(f"INSERT INTO {table} SELECT * FROM {partitioned}")
+        for name, columns in indexes:
+            op.execute(f"CREATE INDEX {name} ON {table} ({columns})")
+        # Borra también todas las particiones
+        op.execute(f"DROP TABLE {partitioned}")
+        op.execute(f"ANALYZE {table}")
+
+    # NOT VALID: las filas nuevas se validan, pero las referencias que quedaron
+    # colgadas mientras no había FK (particiones eliminadas) no hacen fallar el
+    # downgrade; VALIDATE CONSTRAINT después de limpiarlas.
+    for table, column, ref_table, ref_column, on_delete in INCOMING_FKS:
+        on_delete_sql = f" ON DELETE {on_delete}" if on_delete else ""
+        op.execute(
+            f"ALTER TABLE {table} ADD CONSTRAINT {table}_{column}_fkey FOREIGN KEY ({column}) "
+            f"REFERENCES {ref_table} ({ref_column}){on_delete_sql} NOT VALID"
+        )
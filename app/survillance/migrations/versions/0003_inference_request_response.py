@@ -0,0 +1,38 @@
+"""Respuesta guardada y poda por TTL de inference_requests
+
+Revision ID: 0003_inference_request_response
+Revises: 0002_partition_clips_eventos
+Create Date: 2026-10-19
+
+inference_requests.response guarda la respuesta original del webhook para
+devolverla a los reintentos con el mismo request_id. El índice por
+received_at lo usa InferencePruneJob para borrar los requests vencidos.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0003_inference_request_response"
+down_revision: Union[str, None] = "0002_partition_clips_eventos"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("ALTER TABLE inference_requests ADD COLUMN IF NOT EXISTS response JSON")
+
+    # CONCURRENTLY no puede correr dentro de una transacción
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_inference_requests_received_at "
+            "ON inference_requests (received_at)"
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_inference_requests_received_at")
+
+    op.execute("ALTER TABLE inference_requests DROP COLUMN IF EXISTS response")
@@ -0,0 +1,28 @@
+"""Clips cubiertos por cada evento
+
+Revision ID: 0004_eventos_clips_cubiertos
+Revises: 0003_inference_request_response
+Create Date: 2026-10-19
+
+eventos.clips_cubiertos guarda, en orden, los clips que atraviesa un evento
+del contrato B que cruza el borde entre segmentos (id_clip es el primero).
+En la tabla particionada el ALTER se propaga a todas las particiones.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0004_eventos_clips_cubiertos"
+down_revision: Union[str, None] = "0003_inference_request_response"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("ALTER TABLE eventos ADD COLUMN IF NOT EXISTS clips_cubiertos INTEGER[]")
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE eventos DROP COLUMN IF EXISTS clips_cubiertos")
@@ -0,0 +1,59 @@
+"""Cola de ingesta para el webhook de inferencia asíncrono
+
+Revision ID: 0005_inference_ingest
+Revises: 0004_eventos_clips_cubiertos
+Create Date: 2026-10-19
+
+inference_ingest guarda tal cual los webhooks aceptados con 202 por
+POST /api/inferencia/resultados/async; InferenceIngestWorker los procesa
+en segundo plano (FOR UPDATE SKIP LOCKED sobre estado/proximo_intento).
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0005_inference_ingest"
+down_revision: Union[str, None] = "0004_eventos_clips_cubiertos"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "inference_ingest",
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column("request_id", sa.String(64)),
+        sa.Column("payload", sa.JSON(), nullable=False),
+        sa.Column("estado", sa.String(20), nullable=False, server_default="pendiente"),
+        sa.Column("intentos", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column(
+            "proximo_intento",
+            sa.TIMESTAMP(timezone=True),
+            nullable=False,
+            server_default=sa.func.now(),
+        ),
+        sa.Column("resultado", sa.JSON()),
+        sa.Column("ultimo_error", sa.String(500)),
+        sa.Column(
+            "created_at",
+            sa.TIMESTAMP(timezone=True),
+            nullable=False,
+            server_default=sa.func.now(),
+        ),
+        sa.Column("procesado_at", sa.TIMESTAMP(timezone=True)),
+    )
+    op.create_index(
+        "ix_inference_ingest_estado_proximo_intento",
+        "inference_ingest",
+        ["estado", "proximo_intento"],
+    )
+    op.create_index("ix_inference_ingest_procesado_at", "inference_ingest", ["procesado_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_inference_ingest_procesado_at", table_name="inference_ingest")
+    op.drop_index("ix_inference_ingest_estado_proximo_intento", table_name="inference_ingest")
+    op.drop_table("inference_ingest")
@@ -0,0 +1,60 @@
+"""Rollup de estadísticas de eventos por minuto/hora/día
+
+Revision ID: 0006_eventos_stats
+Revises: 0005_inference_ingest
+Create Date: 2026-10-19
+
+eventos_stats lo mantiene EventoRepository.create/create_many con un upsert
+en la misma transacción que los eventos; esta migración crea la tabla y la
+llena con los eventos existentes. Los buckets son UTC (date_trunc sobre el
+timestamp en UTC, independiente del TimeZone de la sesión).
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0006_eventos_stats"
+down_revision: Union[str, None] = "0005_inference_ingest"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+GRANULARIDADES = ("minute", "hour", "day")
+
+
+def upgrade() -> None:
+    op.create_table(
+        "eventos_stats",
+        sa.Column("granularidad", sa.String(6), primary_key=True),
+        sa.Column("id_conexion", sa.Integer(), primary_key=True),
+        sa.Column("tipo_evento", sa.String(30), primary_key=True),
+        sa.Column("bucket", sa.TIMESTAMP(timezone=True), primary_key=True),
+        sa.Column("total", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("suma_confianza", sa.Numeric(14, 2), nullable=False, server_default="0"),
+        sa.Column("n_confianza", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("max_confianza", sa.Numeric(5, 2)),
+    )
+    op.create_index(
+        "ix_eventos_stats_granularidad_bucket", "eventos_stats", ["granularidad", "bucket"]
+    )
+
+    for granularidad in GRANULARIDADES:
+        op.execute(
+            f"""
+            INSERT INTO eventos_stats (granularidad, id_conexion, tipo_evento, bucket,
+                                       total, suma_confianza, n_confianza, max_confianza)
+            SELECT '{granularidad}', id_conexion, tipo_evento,
+                   date_trunc('{granularidad}', timestamp_evento AT TIME ZONE 'UTC') AT TIME ZONE 'UTC',
+                   count(*), COALESCE(sum(confianza), 0), count(confianza), max(confianza)
+            FROM eventos
+            GROUP BY 2, 3, 4
+            """
+        )
+    op.execute("ANALYZE eventos_stats")
+
+
+def downgrade() -> None:
+    op.drop_index("ix_eventos_stats_granularidad_bucket", table_name="eventos_stats")
+    op.drop_table("eventos_stats")
@@ -0,0 +1,44 @@
+"""Estado de generación de los reportes
+
+Revision ID: 0007_reportes_engine
+Revises: 0006_eventos_stats
+Create Date: 2026-10-19
+
+ReportEngine genera los artefactos (CSV/JSON/PDF) de cada reporte en segundo
+plano: estado/progreso exponen el avance y artefacto es la clave del cache
+(hash de los filtros) bajo REPORTS_PATH. Los reportes existentes quedan
+pendientes y se generan al arrancar.
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0007_reportes_engine"
+down_revision: Union[str, None] = "0006_eventos_stats"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "reportes",
+        sa.Column("estado", sa.String(20), nullable=False, server_default="pendiente"),
+    )
+    op.add_column(
+        "reportes",
+        sa.Column("progreso", sa.Integer(), nullable=False, server_default="0"),
+    )
+    op.add_column("reportes", sa.Column("artefacto", sa.String(80)))
+    op.add_column("reportes", sa.Column("error", sa.String(500)))
+    op.create_index("ix_reportes_estado", "reportes", ["estado"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_reportes_estado", table_name="reportes")
+    op.drop_column("reportes", "error")
+    op.drop_column("reportes", "artefacto")
+    op.drop_column("reportes", "progreso")
+    op.drop_column("reportes", "estado")
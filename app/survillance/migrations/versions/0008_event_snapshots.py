@@ -0,0 +1,48 @@
+"""Miniaturas WebP de eventos
+
+Revision ID: 0008_event_snapshots
+Revises: 0007_reportes_engine
+Create Date: 2026-10-19
+
+SnapshotWorker extrae SNAPSHOT_FRAMES frames alrededor de cada evento nuevo y
+guarda una fila por frame. eventos está particionada: id_evento es referencia
+lógica, sin FK (el cascade lo hace EventoRepository.delete_many).
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0008_event_snapshots"
+down_revision: Union[str, None] = "0007_reportes_engine"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "event_snapshots",
+        sa.Column("id_snapshot", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column("id_evento", sa.Integer(), nullable=False),
+        sa.Column("ruta_imagen", sa.Text(), nullable=False),
+        sa.Column("timestamp_rel_ms", sa.Integer(), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.TIMESTAMP(timezone=True),
+            nullable=False,
+            server_default=sa.func.now(),
+        ),
+    )
+    op.create_index(
+        "ux_event_snapshots_evento_ts",
+        "event_snapshots",
+        ["id_evento", "timestamp_rel_ms"],
+        unique=True,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ux_event_snapshots_evento_ts", table_name="event_snapshots")
+    op.drop_table("event_snapshots")
@@ -9,6 +9,11 @@ from .event_model import Evento
 from .notification_model import Notificacion
 from .report_model import Reporte
 from .inference_request_model import InferenceRequest
+from .confidence_series_model import SerieConfianza
+from .outbox_model import MensajeSalida
+from .inference_ingest_model import InferenceIngest
+from .event_stats_model import EventoStats
+from .event_snapshot_model import EventSnapshot
 
 __all__ = [
     "Oficina",
@@ -19,5 +24,10 @@ __all__ = [
     "Notificacion",
     "Reporte",
     "InferenceRequest",
+    "SerieConfianza",
+    "MensajeSalida",
+    "InferenceIngest",
+    "EventoStats",
+    "EventSnapshot",
 ]
 
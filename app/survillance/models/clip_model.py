@@ -3,7 +3,7 @@ SQLAlchemy 2.0 ORM model for Clip.
 """
 from datetime import datetime
 
-from sqlalchemy import ForeignKey, Integer, Text, TIMESTAMP
+from sqlalchemy import ForeignKey, Index, Integer, Text, TIMESTAMP
 from sqlalchemy.orm import relationship, Mapped, mapped_column
 
 from app.shared.db import Base
@@ -14,24 +14,42 @@ class Clip(Base):
     """Buffer of segmented clips on disk"""
     __tablename__ = "clips"
     
+    # Tabla particionada por rango de start_time_utc: la clave de partición
+    # tiene que formar parte de la PK. id_clip sigue siendo único (serial).
     id_clip: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     id_conexion: Mapped[int] = mapped_column(ForeignKey("conexiones.id_conexion"), nullable=False)
     storage_path: Mapped[str] = mapped_column(Text, nullable=False)
-    start_time_utc: Mapped[datetime] = mapped_column(TIMESTAMP(timezone=True), nullable=False)
+    start_time_utc: Mapped[datetime] = mapped_column(
+        TIMESTAMP(timezone=True),
+        primary_key=True,
+        nullable=False
+    )
     duration_sec: Mapped[int] = mapped_column(Integer, nullable=False)
     fecha_guardado: Mapped[datetime] = mapped_column(
         TIMESTAMP(timezone=True),
         default=now_utc
     )
     
+    # Índices para la paginación keyset (start_time_utc, id_clip), con y sin filtro de cámara,
+    # y para la retención (find_old_clips filtra por cámara y fecha_guardado)
+    __table_args__ = (
+        Index("ix_clips_start_time_id", "start_time_utc", "id_clip"),
+        Index("ix_clips_conexion_start_time_id", "id_conexion", "start_time_utc", "id_clip"),
+        Index("ix_clips_conexion_fecha_guardado", "id_conexion", "fecha_guardado"),
+        {"postgresql_partition_by": "RANGE (start_time_utc)"},
+    )
+    
     # Relationships
     conexion: Mapped["Conexion"] = relationship("Conexion", back_populates="clips")
+    # Sin FK hacia clips (Postgres exige la clave de partición en la FK): se une por id_clip
     eventos: Mapped[list["Evento"]] = relationship(
         "Evento",
+        primaryjoin="Clip.id_clip == foreign(Evento.id_clip)",
         back_populates="clip"
     )
     reportes: Mapped[list["Reporte"]] = relationship(
         "Reporte",
+        primaryjoin="Clip.id_clip == foreign(Reporte.id_clip)",
         back_populates="clip"
     )
 
@@ -0,0 +1,40 @@
+"""
+SQLAlchemy 2.0 ORM model for the per-class confidence series of an event.
+"""
+from datetime import datetime
+
+from sqlalchemy import Integer, JSON, LargeBinary, String, TIMESTAMP
+from sqlalchemy.orm import relationship, Mapped, mapped_column
+
+from app.shared.db import Base
+from app.shared.time import now_utc
+
+
+class SerieConfianza(Base):
+    """Per-frame class probabilities of an event, stored as a columnar float16 blob"""
+    __tablename__ = "eventos_confianza"
+
+    id_serie: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    # eventos está particionada: sin FK; al borrar una partición se limpian las series
+    id_evento: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        unique=True,
+        index=True
+    )
+    # Order of the columns inside `datos`
+    clases: Mapped[list[str]] = mapped_column(JSON, nullable=False)
+    n_frames: Mapped[int] = mapped_column(Integer, nullable=False)
+    formato: Mapped[str] = mapped_column(String(20), nullable=False, default="f16le-col")
+    datos: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        TIMESTAMP(timezone=True),
+        default=now_utc
+    )
+
+    # Relationships
+    evento: Mapped["Evento"] = relationship(
+        "Evento",
+        primaryjoin="foreign(SerieConfianza.id_evento) == Evento.id_evento",
+        back_populates="serie_confianza"
+    )
@@ -3,9 +3,9 @@ SQLAlchemy 2.0 ORM model for Event.
 """
 from datetime import datetime
 from decimal import Decimal
-from typing import Optional
+from typing import List, Optional
 
-from sqlalchemy import Boolean, ForeignKey, Integer, Numeric, String, Text, TIMESTAMP
+from sqlalchemy import ARRAY, Boolean, ForeignKey, Index, Integer, Numeric, String, Text, TIMESTAMP
 from sqlalchemy.orm import relationship, Mapped, mapped_column
 
 from app.shared.db import Base
@@ -17,23 +17,48 @@ class Evento(Base):
     
     id_evento: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     id_conexion: Mapped[int] = mapped_column(ForeignKey("conexiones.id_conexion"), nullable=False)
-    id_clip: Mapped[Optional[int]] = mapped_column(ForeignKey("clips.id_clip"))
+    # clips está particionada: id_clip es referencia lógica, sin FK
+    id_clip: Mapped[Optional[int]] = mapped_column(Integer)
     id_usuario: Mapped[Optional[int]] = mapped_column(ForeignKey("usuarios.id_usuario"))
     tipo_evento: Mapped[str] = mapped_column(String(30), nullable=False)
     confianza: Mapped[Optional[Decimal]] = mapped_column(Numeric(5, 2))
     t_inicio_ms: Mapped[Optional[int]] = mapped_column(Integer)
     t_fin_ms: Mapped[Optional[int]] = mapped_column(Integer)
+    # Clave de partición (RANGE), por eso forma parte de la PK
     timestamp_evento: Mapped[datetime] = mapped_column(
         TIMESTAMP(timezone=True),
+        primary_key=True,
         nullable=False,
         index=True
     )
     procesado: Mapped[bool] = mapped_column(Boolean, default=False)
     subclip_path: Mapped[Optional[str]] = mapped_column(Text)
     subclip_duracion_sec: Mapped[Optional[int]] = mapped_column(Integer)
+    # Clips que cubre el evento, en orden (id_clip es el primero)
+    clips_cubiertos: Mapped[Optional[List[int]]] = mapped_column(ARRAY(Integer))
+    
+    # Índices para la paginación keyset (timestamp_evento, id_evento), con filtro
+    # opcional de cámara o de tipo de evento
+    __table_args__ = (
+        Index("ix_eventos_timestamp_id", "timestamp_evento", "id_evento"),
+        Index("ix_eventos_conexion_timestamp_id", "id_conexion", "timestamp_evento", "id_evento"),
+        Index("ix_eventos_tipo_timestamp_id", "tipo_evento", "timestamp_evento", "id_evento"),
+        {"postgresql_partition_by": "RANGE (timestamp_evento)"},
+    )
     
     # Relationships
     conexion: Mapped["Conexion"] = relationship("Conexion", back_populates="eventos")
-    clip: Mapped[Optional["Clip"]] = relationship("Clip", back_populates="eventos")
+    clip: Mapped[Optional["Clip"]] = relationship(
+        "Clip",
+        primaryjoin="foreign(Evento.id_clip) == Clip.id_clip",
+        back_populates="eventos"
+    )
     usuario: Mapped[Optional["Usuario"]] = relationship("Usuario", back_populates="eventos")
+    serie_confianza: Mapped[Optional["SerieConfianza"]] = relationship(
+        "SerieConfianza",
+        primaryjoin="Evento.id_evento == foreign(SerieConfianza.id_evento)",
+        back_populates="evento",
+        uselist=False,
+        cascade="all, delete-orphan"
+    )
 
@@ -0,0 +1,31 @@
+"""
+SQLAlchemy 2.0 ORM model for EventSnapshot.
+"""
+from datetime import datetime
+
+from sqlalchemy import Index, Integer, Text, TIMESTAMP
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.shared.db import Base
+from app.shared.time import now_utc
+
+
+class EventSnapshot(Base):
+    """WebP thumbnail extracted from the video around an event"""
+    __tablename__ = "event_snapshots"
+    __table_args__ = (
+        # One frame per offset: a repeated extraction (retry, another process) is a no-op
+        Index("ux_event_snapshots_evento_ts", "id_evento", "timestamp_rel_ms", unique=True),
+    )
+
+    id_snapshot: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    # eventos está particionada: id_evento es referencia lógica, sin FK
+    id_evento: Mapped[int] = mapped_column(Integer, nullable=False)
+    ruta_imagen: Mapped[str] = mapped_column(Text, nullable=False)
+    # Offset del frame desde el inicio del evento
+    timestamp_rel_ms: Mapped[int] = mapped_column(Integer, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        TIMESTAMP(timezone=True),
+        nullable=False,
+        default=now_utc
+    )
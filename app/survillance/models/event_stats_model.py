@@ -0,0 +1,34 @@
+"""
+SQLAlchemy 2.0 ORM model for the event statistics rollup.
+"""
+from datetime import datetime
+from decimal import Decimal
+from typing import Optional
+
+from sqlalchemy import Index, Integer, Numeric, String, TIMESTAMP
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.shared.db import Base
+
+
+class EventoStats(Base):
+    """
+    Per-bucket event counters by (id_conexion, tipo_evento), maintained
+    incrementally (upsert) as events are created. One row per
+    granularity (minute/hour/day) and bucket start.
+    """
+    __tablename__ = "eventos_stats"
+    __table_args__ = (
+        # Series across all cameras (the PK covers the per-camera ones)
+        Index("ix_eventos_stats_granularidad_bucket", "granularidad", "bucket"),
+    )
+
+    granularidad: Mapped[str] = mapped_column(String(6), primary_key=True)
+    id_conexion: Mapped[int] = mapped_column(Integer, primary_key=True)
+    tipo_evento: Mapped[str] = mapped_column(String(30), primary_key=True)
+    bucket: Mapped[datetime] = mapped_column(TIMESTAMP(timezone=True), primary_key=True)
+    total: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    # Promedio = suma_confianza / n_confianza (eventos sin confianza no cuentan)
+    suma_confianza: Mapped[Decimal] = mapped_column(Numeric(14, 2), nullable=False, default=0)
+    n_confianza: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    max_confianza: Mapped[Optional[Decimal]] = mapped_column(Numeric(5, 2))
@@ -0,0 +1,40 @@
+"""
+SQLAlchemy 2.0 ORM model for the inference webhook ingest queue.
+"""
+from datetime import datetime
+from typing import Any, Optional
+
+from sqlalchemy import Index, Integer, JSON, String, TIMESTAMP
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.shared.db import Base
+from app.shared.time import now_utc
+
+
+class InferenceIngest(Base):
+    """Inference webhook accepted with 202, waiting for the ingest workers"""
+    __tablename__ = "inference_ingest"
+    __table_args__ = (
+        # The workers poll pending rows by due time
+        Index("ix_inference_ingest_estado_proximo_intento", "estado", "proximo_intento"),
+        # Pruning of finished rows
+        Index("ix_inference_ingest_procesado_at", "procesado_at"),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    request_id: Mapped[Optional[str]] = mapped_column(String(64))
+    payload: Mapped[dict[str, Any]] = mapped_column(JSON, nullable=False)
+    estado: Mapped[str] = mapped_column(String(20), nullable=False, default="pendiente")
+    intentos: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    proximo_intento: Mapped[datetime] = mapped_column(
+        TIMESTAMP(timezone=True),
+        nullable=False,
+        default=now_utc
+    )
+    resultado: Mapped[Optional[dict[str, Any]]] = mapped_column(JSON)
+    ultimo_error: Mapped[Optional[str]] = mapped_column(String(500))
+    created_at: Mapped[datetime] = mapped_column(
+        TIMESTAMP(timezone=True),
+        default=now_utc
+    )
+    procesado_at: Mapped[Optional[datetime]] = mapped_column(TIMESTAMP(timezone=True))
@@ -2,8 +2,9 @@
 Modelo ORM de SQLAlchemy 2.0 para InferenceRequest.
 """
 from datetime import datetime
+from typing import Any, Optional
 
-from sqlalchemy import Integer, String, TIMESTAMP
+from sqlalchemy import Integer, JSON, String, TIMESTAMP
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.shared.db import Base
@@ -19,6 +20,9 @@ class InferenceRequest(Base):
     received_at: Mapped[datetime] = mapped_column(
         TIMESTAMP(timezone=True),
         default=now_utc,
-        nullable=False
+        nullable=False,
+        index=True  # poda por TTL
     )
+    # Respuesta original, se devuelve tal cual a los reintentos con el mismo request_id
+    response: Mapped[Optional[dict[str, Any]]] = mapped_column(JSON, nullable=True)
 
@@ -4,7 +4,7 @@ SQLAlchemy 2.0 ORM model for Notification.
 from datetime import datetime
 from typing import Optional
 
-from sqlalchemy import ForeignKey, Integer, String, TIMESTAMP
+from sqlalchemy import Float, ForeignKey, Index, Integer, String, TIMESTAMP
 from sqlalchemy.orm import relationship, Mapped, mapped_column
 from app.shared.time import now_utc
 
@@ -20,4 +20,18 @@ class Notificacion(Base):
     canal: Mapped[Optional[str]] = mapped_column(String(50))
     destinatario: Mapped[Optional[str]] = mapped_column(String(150))
     estado: Mapped[str] = mapped_column(String(50), default="pendiente")
-    fecha_envio: Mapped[Optional[datetime]] = mapped_column(TIMESTAMP(timezone=True), default=now_utc)
\ No newline at end of file
+    fecha_envio: Mapped[Optional[datetime]] = mapped_column(TIMESTAMP(timezone=True), default=now_utc)
+
+    # Topics del WebSocket; id_notificacion hace de secuencia para el replay (since=<seq>)
+    id_conexion: Mapped[Optional[int]] = mapped_column(Integer)
+    id_oficina: Mapped[Optional[int]] = mapped_column(Integer)
+    tipo_evento: Mapped[Optional[str]] = mapped_column(String(50))
+    confianza: Mapped[Optional[float]] = mapped_column(Float)
+
+    __table_args__ = (
+        Index("ix_notificaciones_destinatario_id", "destinatario", "id_notificacion"),
+        Index("ix_notificaciones_destinatario_fecha", "destinatario", "fecha_envio"),
+        Index("ix_notificaciones_conexion_id", "id_conexion", "id_notificacion"),
+        Index("ix_notificaciones_oficina_id", "id_oficina", "id_notificacion"),
+        Index("ix_notificaciones_tipo_id", "tipo_evento", "id_notificacion"),
+    )
\ No newline at end of file
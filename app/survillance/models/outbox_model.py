@@ -0,0 +1,39 @@
+"""
+SQLAlchemy 2.0 ORM model for the notification outbox.
+"""
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import Index, Integer, String, TIMESTAMP
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.shared.db import Base
+from app.shared.time import now_utc
+
+
+class MensajeSalida(Base):
+    """Outgoing message (SMS) waiting to be delivered by the dispatcher"""
+    __tablename__ = "notificaciones_outbox"
+    __table_args__ = (
+        # The dispatcher polls pending rows by due time
+        Index("ix_outbox_estado_proximo_intento", "estado", "proximo_intento"),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    canal: Mapped[str] = mapped_column(String(20), nullable=False, default="sms")
+    destinatario: Mapped[str] = mapped_column(String(150), nullable=False)
+    cuerpo: Mapped[str] = mapped_column(String(1600), nullable=False)
+    estado: Mapped[str] = mapped_column(String(50), nullable=False, default="pendiente")
+    intentos: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    proximo_intento: Mapped[datetime] = mapped_column(
+        TIMESTAMP(timezone=True),
+        nullable=False,
+        default=now_utc
+    )
+    ultimo_error: Mapped[Optional[str]] = mapped_column(String(500))
+    proveedor_id: Mapped[Optional[str]] = mapped_column(String(64))
+    created_at: Mapped[datetime] = mapped_column(
+        TIMESTAMP(timezone=True),
+        default=now_utc
+    )
+    enviado_at: Mapped[Optional[datetime]] = mapped_column(TIMESTAMP(timezone=True))
@@ -5,7 +5,7 @@ from datetime import datetime
 from decimal import Decimal
 from typing import Optional
 
-from sqlalchemy import ForeignKey, Integer, Numeric, String, Text, TIMESTAMP
+from sqlalchemy import ForeignKey, Index, Integer, Numeric, String, Text, TIMESTAMP
 from sqlalchemy.orm import relationship, Mapped, mapped_column
 
 from app.shared.db import Base
@@ -18,7 +18,8 @@ class Reporte(Base):
     
     id_reporte: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     id_usuario: Mapped[int] = mapped_column(ForeignKey("usuarios.id_usuario"), nullable=False)
-    id_clip: Mapped[Optional[int]] = mapped_column(ForeignKey("clips.id_clip"))
+    # clips está particionada: id_clip es referencia lógica, sin FK
+    id_clip: Mapped[Optional[int]] = mapped_column(Integer)
     titulo: Mapped[Optional[str]] = mapped_column(String(200))
     descripcion: Mapped[Optional[str]] = mapped_column(Text)
     rango_fecha_inicio: Mapped[Optional[datetime]] = mapped_column(TIMESTAMP(timezone=True))
@@ -29,8 +30,25 @@ class Reporte(Base):
         TIMESTAMP(timezone=True),
         default=now_utc
     )
+    # Generación de artefactos (ReportEngine): estado, avance 0-100 y clave del cache
+    estado: Mapped[str] = mapped_column(String(20), nullable=False, default="pendiente")
+    progreso: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    artefacto: Mapped[Optional[str]] = mapped_column(String(80))
+    error: Mapped[Optional[str]] = mapped_column(String(500))
+    
+    # Índices para la paginación keyset (fecha_generacion, id_reporte), con y sin filtro de usuario
+    __table_args__ = (
+        Index("ix_reportes_fecha_id", "fecha_generacion", "id_reporte"),
+        Index("ix_reportes_usuario_fecha_id", "id_usuario", "fecha_generacion", "id_reporte"),
+        # Reportes a retomar al arrancar (pendiente/generando)
+        Index("ix_reportes_estado", "estado"),
+    )
     
     # Relationships
     usuario: Mapped["Usuario"] = relationship("Usuario", back_populates="reportes")
-    clip: Mapped[Optional["Clip"]] = relationship("Clip", back_populates="reportes")
+    clip: Mapped[Optional["Clip"]] = relationship(
+        "Clip",
+        primaryjoin="foreign(Reporte.id_clip) == Clip.id_clip",
+        back_populates="reportes"
+    )
 
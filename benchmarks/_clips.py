@@ -0,0 +1,37 @@
+"""Tabla clips en un SQLite en memoria para los benchmarks (sin Postgres)"""
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import insert, text
+from sqlalchemy.orm import Session
+
+from app.survillance.models import Clip as ClipORM
+
+# Misma forma que clips (la DDL del modelo es de Postgres: PK compuesta con serial)
+_CREATE_CLIPS = text(
+    "CREATE TABLE clips (id_clip INTEGER, id_conexion INTEGER, storage_path TEXT, "
+    "start_time_utc TIMESTAMP, duration_sec INTEGER, fecha_guardado TIMESTAMP, "
+    "PRIMARY KEY (id_clip, start_time_utc))"
+)
+# Como ix_clips_conexion_start_time_id: los listados por cámara no recorren la tabla
+_INDEX_CLIPS = text("CREATE INDEX ix_clips_conexion_start_time_id ON clips (id_conexion, start_time_utc, id_clip)")
+
+START = datetime(2026, 1, 1, tzinfo=timezone.utc)
+CAMERAS = 8
+
+
+def seed_clips(session: Session, rows: int) -> None:
+    """Crea la tabla y carga `rows` clips de 10 s repartidos entre CAMERAS cámaras"""
+    session.execute(_CREATE_CLIPS)
+    session.execute(_INDEX_CLIPS)
+    session.execute(insert(ClipORM), [
+        {
+            "id_clip": i + 1,
+            "id_conexion": 1 + i % CAMERAS,
+            "storage_path": f"storage/clips/cam_{i % CAMERAS}/{i:08d}.mp4",
+            "start_time_utc": START + timedelta(seconds=10 * i),
+            "duration_sec": 10,
+            "fecha_guardado": START + timedelta(seconds=10 * i + 12),
+        }
+        for i in range(rows)
+    ])
+    session.commit()
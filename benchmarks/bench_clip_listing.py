@@ -0,0 +1,86 @@
+"""
+Benchmark de GET /api/clips para páginas de 1000 filas: camino anterior (ORM ->
+entidad de dominio -> ClipResponse -> JSONResponse) contra la proyección de
+columnas serializada con orjson (ClipRepository.list_rows + RowsJSONResponse).
+
+Las filas salen de un SQLite en memoria, así que el tiempo es el costo Python
+por página (hidratación, mapeo, validación, serialización), que es lo que
+cambia entre los dos caminos; el costo de la consulta en Postgres es el mismo.
+
+    PYTHONPATH=. python benchmarks/bench_clip_listing.py [--rows 1000] [--repeat 50]
+"""
+import argparse
+import json
+import statistics
+import time
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import Session
+
+from app.shared.responses import RowsJSONResponse
+from app.survillance.application.dto import ClipResponse
+from app.survillance.domain.mappers import clip_to_domain
+from app.survillance.infrastructure.repositories.clip_repository import _ROW_COLUMNS
+from app.survillance.models import Clip as ClipORM
+from benchmarks._clips import seed_clips
+
+
+def orm_page(session: Session, limit: int) -> bytes:
+    """Camino anterior: entidades de dominio y validación Pydantic por fila"""
+    result = session.execute(
+        select(ClipORM).order_by(ClipORM.start_time_utc.desc(), ClipORM.id_clip.desc()).limit(limit)
+    )
+    clips = [clip_to_domain(orm) for orm in result.scalars().all()]
+    session.expunge_all()
+    content = [ClipResponse.model_validate(clip) for clip in clips]
+    return JSONResponse(jsonable_encoder(content)).body
+
+
+def projection_page(session: Session, limit: int) -> bytes:
+    """Camino actual: proyección de columnas en dicts, serializada con orjson"""
+    result = session.execute(
+        select(*_ROW_COLUMNS).order_by(ClipORM.start_time_utc.desc(), ClipORM.id_clip.desc()).limit(limit)
+    )
+    return RowsJSONResponse([dict(row) for row in result.mappings()]).body
+
+
+def _measure(fn, session: Session, limit: int, repeat: int) -> list:
+    fn(session, limit)  # warm-up (compilación de la sentencia)
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(session, limit)
+        times.append((time.perf_counter() - start) * 1000)
+    return times
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rows", type=int, default=1000, help="filas por página")
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    engine = create_engine("sqlite://")
+    with Session(engine) as session:
+        seed_clips(session, args.rows)
+        # Los dos caminos tienen que producir el mismo JSON
+        assert json.loads(orm_page(session, args.rows)) == json.loads(projection_page(session, args.rows))
+        results = {
+            "orm + dominio + ClipResponse": _measure(orm_page, session, args.rows, args.repeat),
+            "proyección + orjson": _measure(projection_page, session, args.rows, args.repeat),
+        }
+
+    baseline = statistics.median(results["orm + dominio + ClipResponse"])
+    print(f"página de {args.rows} clips, {args.repeat} repeticiones (ms)")
+    for name, times in results.items():
+        median = statistics.median(times)
+        print(
+            f"  {name:<30} mediana {median:8.2f}  p95 {sorted(times)[int(len(times) * 0.95) - 1]:8.2f}"
+            f"  x{baseline / median:.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
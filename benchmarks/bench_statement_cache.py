@@ -0,0 +1,127 @@
+"""
+Microbenchmark del costo Python por consulta: sentencias armadas en cada
+llamada con select(...) (camino anterior), con lambda_stmt encadenado y las
+sentencias cacheadas de los repositorios (armadas una sola vez con bindparam).
+
+Contra un SQLite en memoria, así que casi todo el tiempo es Python: armar la
+sentencia, calcular su cache key, buscarla en el cache de SQL compilado,
+ejecutar y cargar las filas. Con Postgres se suma el round trip, que es el
+mismo en los dos caminos.
+
+    PYTHONPATH=. python benchmarks/bench_statement_cache.py [--repeat 5000]
+"""
+import argparse
+import statistics
+import time
+from datetime import timedelta
+from typing import Callable, Dict, List
+
+from sqlalchemy import create_engine, lambda_stmt, select, tuple_
+from sqlalchemy.orm import Session
+
+from app.survillance.infrastructure.repositories.clip_repository import _GET_CLIP, ClipRepository
+from app.survillance.models import Clip as ClipORM
+from benchmarks._clips import CAMERAS, START, seed_clips
+
+ROWS = 20000
+PAGE = 50
+
+
+def _ids(i: int):
+    """Parámetros que cambian en cada llamada (así no se mide un cache de resultados)"""
+    id_conexion = 1 + i % CAMERAS
+    start_time = START + timedelta(seconds=i % 1000)
+    end_time = start_time + timedelta(hours=6)
+    after = (end_time - timedelta(minutes=5), ROWS)
+    return id_conexion, start_time, end_time, after
+
+
+def get_plain(session: Session, i: int):
+    return session.execute(select(ClipORM).where(ClipORM.id_clip == 1 + i % ROWS)).scalar_one_or_none()
+
+
+def get_cached(session: Session, i: int):
+    return session.execute(_GET_CLIP, {"id": 1 + i % ROWS}).scalar_one_or_none()
+
+
+def list_plain(session: Session, i: int):
+    id_conexion, start_time, end_time, (after_time, after_id) = _ids(i)
+    query = (
+        select(ClipORM)
+        .where(ClipORM.id_conexion == id_conexion)
+        .where(ClipORM.start_time_utc >= start_time)
+        .where(ClipORM.start_time_utc <= end_time)
+        .where(tuple_(ClipORM.start_time_utc, ClipORM.id_clip) < tuple_(after_time, after_id))
+        .order_by(ClipORM.start_time_utc.desc(), ClipORM.id_clip.desc())
+        .limit(PAGE)
+        .offset(0)
+    )
+    return session.execute(query).scalars().all()
+
+
+def list_lambda(session: Session, i: int):
+    id_conexion, start_time, end_time, (after_time, after_id) = _ids(i)
+    query = lambda_stmt(lambda: select(ClipORM))
+    query += lambda s: s.where(ClipORM.id_conexion == id_conexion)
+    query += lambda s: s.where(ClipORM.start_time_utc >= start_time)
+    query += lambda s: s.where(ClipORM.start_time_utc <= end_time)
+    query += lambda s: s.where(
+        tuple_(ClipORM.start_time_utc, ClipORM.id_clip) < tuple_(after_time, after_id)
+    )
+    query += lambda s: s.order_by(
+        ClipORM.start_time_utc.desc(), ClipORM.id_clip.desc()
+    ).limit(PAGE).offset(0)
+    return session.execute(query).scalars().all()
+
+
+def list_cached(session: Session, i: int):
+    id_conexion, start_time, end_time, after = _ids(i)
+    query, params = ClipRepository._page_query(False, PAGE, 0, id_conexion, start_time, end_time, after)
+    return session.execute(query, params).scalars().all()
+
+
+def _as_list(result) -> list:
+    return result if isinstance(result, list) else [result]
+
+
+def _measure(fn: Callable, session: Session, repeat: int) -> List[float]:
+    for i in range(50):  # warm-up: compilación y caches
+        fn(session, i)
+    session.expunge_all()
+    times = []
+    for i in range(repeat):
+        start = time.perf_counter()
+        fn(session, i)
+        times.append((time.perf_counter() - start) * 1e6)
+        session.expunge_all()
+    return times
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--repeat", type=int, default=5000)
+    args = parser.parse_args()
+
+    cases: Dict[str, Dict[str, Callable]] = {
+        "get por id": {"select()": get_plain, "cacheada": get_cached},
+        f"listado cámara+rango+keyset ({PAGE} filas)": {
+            "select()": list_plain, "lambda_stmt": list_lambda, "cacheada": list_cached,
+        },
+    }
+    engine = create_engine("sqlite://")
+    with Session(engine) as session:
+        seed_clips(session, ROWS)
+        print(f"{args.repeat} llamadas por caso, mediana por consulta (µs)")
+        for name, paths in cases.items():
+            expected = [clip.id_clip for clip in _as_list(paths["select()"](session, 7))]
+            assert all([clip.id_clip for clip in _as_list(fn(session, 7))] == expected for fn in paths.values())
+            session.expunge_all()
+            medians = {path: statistics.median(_measure(fn, session, args.repeat)) for path, fn in paths.items()}
+            base = medians["select()"]
+            print(f"  {name}")
+            for path, median in medians.items():
+                print(f"    {path:<12} {median:8.1f}  ({base / median:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+import asyncio
+import os
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+
+@pytest.fixture
+def pg_run():
+    """
+    Corre `scenario(session)` contra el Postgres de DATABASE_URL (ya migrado)
+    dentro de una transacción que se descarta al final. Sin Postgres, skip.
+    """
+    url = os.environ.get("DATABASE_URL", "")
+    if not url.startswith("postgresql"):
+        pytest.skip("DATABASE_URL no apunta a Postgres")
+
+    def run(scenario):
+        async def main():
+            engine = create_async_engine(url)
+            try:
+                try:
+                    conn = await engine.connect()
+                except Exception as e:
+                    pytest.skip(f"Postgres no disponible: {e}")
+                try:
+                    trans = await conn.begin()
+                    session = AsyncSession(bind=conn, expire_on_commit=False)
+                    try:
+                        return await scenario(session)
+                    finally:
+                        await session.close()
+                        await trans.rollback()
+                finally:
+                    await conn.close()
+            finally:
+                await engine.dispose()
+
+        return asyncio.run(main())
+
+    return run
@@ -0,0 +1,49 @@
+"""Planes de ejecución (EXPLAIN) de las sentencias que emite un repositorio"""
+import json
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+async def explain_calls(session: AsyncSession, call: Callable[[], Awaitable[Any]]) -> List[Dict]:
+    """
+    Ejecuta `call()` y retorna el plan de cada sentencia que emitió, con los
+    mismos parámetros (así el plan es el de la consulta real del repositorio).
+    """
+    captured: List[Tuple[str, Any]] = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        captured.append((statement, parameters))
+
+    engine = session.bind.sync_engine
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        await call()
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+
+    conn = await session.connection()
+    plans = []
+    for statement, parameters in captured:
+        result = await conn.exec_driver_sql("EXPLAIN (FORMAT JSON) " + statement, parameters)
+        plan = result.scalar()
+        plans.append((json.loads(plan) if isinstance(plan, str) else plan)[0]["Plan"])
+    return plans
+
+
+def plan_nodes(plan: Dict) -> Iterator[Dict]:
+    """Todos los nodos de un plan"""
+    yield plan
+    for child in plan.get("Plans", ()):
+        yield from plan_nodes(child)
+
+
+def scanned_relations(plans: List[Dict]) -> List[Tuple[str, str]]:
+    """(tipo de nodo, tabla) de cada nodo que lee una tabla"""
+    return [
+        (node["Node Type"], node["Relation Name"])
+        for plan in plans
+        for node in plan_nodes(plan)
+        if "Relation Name" in node
+    ]
@@ -0,0 +1,30 @@
+from datetime import timedelta
+
+import pytest
+
+from app.shared.time import now_utc
+from app.survillance.infrastructure import partitions
+from app.survillance.infrastructure.repositories import ClipRepository
+from app.survillance.infrastructure.repositories.clip_repository import _MAX_CLIP_SECONDS
+from tests.plans import explain_calls, scanned_relations
+
+
+def test_find_by_time_range_reads_only_partitions_in_range(pg_run):
+    async def scenario(session):
+        if not await partitions.is_partitioned(session, "clips"):
+            pytest.skip("clips no está particionada (falta migrar)")
+
+        end = now_utc()
+        start = end - timedelta(minutes=30)
+        repo = ClipRepository(session)
+        plans = await explain_calls(session, lambda: repo.find_by_time_range(1, start, end))
+        return start, end, plans, await partitions.list_partitions(session, "clips")
+
+    start, end, plans, particiones = pg_run(scenario)
+
+    desde = start - timedelta(seconds=_MAX_CLIP_SECONDS)
+    in_range = {p.nombre for p in particiones if p.desde < end and desde < p.hasta}
+    scanned = {table for _, table in scanned_relations(plans)}
+    assert scanned
+    assert scanned <= in_range | {"clips_default"}
+    assert len(scanned - {"clips_default"}) < len(particiones)
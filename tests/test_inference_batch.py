@@ -0,0 +1,52 @@
+import asyncio
+
+from app.survillance.application.inference_service import InferenceService
+
+
+class FakeInferenceRepo:
+    def __init__(self):
+        self.claimed = []
+
+    async def claim_many(self, request_ids, now):
+        # ninguno es nuevo: los válidos responden como replay (200)
+        self.claimed += request_ids
+        return set()
+
+    async def get_responses(self, request_ids):
+        return {}
+
+    async def store_responses(self, responses):
+        pass
+
+    async def release_many(self, request_ids):
+        pass
+
+
+class FakeEventoRepo:
+    async def create_many(self, eventos):
+        return []
+
+
+class FakeClipRepo:
+    async def get_many(self, ids):
+        return []
+
+
+def _payload(request_id):
+    return {
+        "request_id": request_id,
+        "conexion_id": 1,
+        "modelo_version": "v1",
+        "eventos": [{"tipo": "golpe", "confianza": 0.9, "t_inicio_ms": 0, "t_fin_ms": 100}],
+    }
+
+
+def test_oversized_request_id_is_a_422_for_that_item_only():
+    repo = FakeInferenceRepo()
+    service = InferenceService(FakeEventoRepo(), FakeClipRepo(), repo)
+    results = asyncio.run(service.process_batch([_payload("x" * 65), _payload("ok-1")]))
+
+    assert results.items[0].status == 422
+    assert results.items[1].status == 200
+    # el request_id largo nunca llega al INSERT del claim
+    assert repo.claimed == ["ok-1"]
@@ -0,0 +1,80 @@
+import asyncio
+import json
+
+from app.survillance.application.services.notification_ws_manager import NotificationWSManager
+
+
+class FakeWebSocket:
+    def __init__(self):
+        self.sent = []
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, text):
+        self.sent.append(json.loads(text))
+
+
+def _message(seq, topic="camara:1"):
+    return {"topics": [topic], "confianza": None, "seq": seq, "payload": {"seq": seq}}
+
+
+async def _drain():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+def test_out_of_order_commits_are_all_delivered():
+    async def scenario():
+        manager = NotificationWSManager(reorder_window=100)
+        ws = FakeWebSocket()
+        await manager.connect(ws, ["camara:1"])
+
+        # id 11 commitea antes que id 10
+        await manager.deliver_local(_message(11))
+        await manager.deliver_local(_message(10))
+        # un duplicado (p.e. desde otro proceso) no se reenvía
+        await manager.deliver_local(_message(11))
+        await _drain()
+        await manager.stop()
+        return [m["seq"] for m in ws.sent]
+
+    assert asyncio.run(scenario()) == [11, 10]
+
+
+def test_replay_includes_late_commits_below_since():
+    async def scenario():
+        manager = NotificationWSManager(reorder_window=5)
+        for seq in (100, 111, 112):
+            await manager.deliver_local(_message(seq))
+        # id 110 commitea después de que el cliente vio el 112
+        await manager.deliver_local(_message(110))
+
+        ws = FakeWebSocket()
+        await manager.connect(ws, ["camara:1"], since=112)
+        await manager.deliver_local(_message(110))
+        await _drain()
+        await manager.stop()
+        return [m["seq"] for m in ws.sent]
+
+    # al-menos-una-vez: 111 y 112 se repiten, 110 no se pierde ni se duplica
+    assert asyncio.run(scenario()) == [111, 112, 110]
+
+
+def test_replay_falls_back_to_loader_with_reorder_margin():
+    async def scenario():
+        manager = NotificationWSManager(reorder_window=5)
+        requested = []
+
+        async def loader(desde):
+            requested.append(desde)
+            return [(seq, json.dumps({"seq": seq})) for seq in (48, 51)]
+
+        ws = FakeWebSocket()
+        await manager.connect(ws, ["camara:1"], since=50, replay_loader=loader)
+        await manager.stop()
+        return requested, [m["seq"] for m in ws.sent]
+
+    requested, sent = asyncio.run(scenario())
+    assert requested == [45]
+    assert sent == [48, 51]
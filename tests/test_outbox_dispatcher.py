@@ -0,0 +1,184 @@
+import asyncio
+from dataclasses import replace
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.config.settings import settings
+from app.shared.rate_limit import KeyedRateLimiter
+from app.shared.services.sms_service import FakeSmsProvider, TwilioSmsResult
+from app.survillance.domain.entities.outbox_message import MensajeSalida
+from app.survillance.domain.enums import EstadoNotificacion
+from app.survillance.ingestion import outbox_dispatcher as dispatcher_module
+from app.survillance.ingestion.outbox_dispatcher import OutboxDispatcher
+
+START = datetime(2026, 1, 1, tzinfo=timezone.utc)
+MAX_ATTEMPTS = 3
+
+
+class Clock:
+    def __init__(self):
+        self.now = START
+
+    def __call__(self):
+        return self.now
+
+
+class FakeOutboxTable:
+    """Filas del outbox en memoria: cada lectura y escritura copia, como la BD"""
+
+    def __init__(self, *mensajes):
+        self.rows = {m.id: replace(m) for m in mensajes}
+        self.commits = 0
+
+    def row(self, id):
+        return self.rows[id]
+
+
+class FakeSession:
+    def __init__(self, table):
+        self.table = table
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def commit(self):
+        self.table.commits += 1
+
+
+class FakeOutboxRepository:
+    def __init__(self, session):
+        self.table = session.table
+
+    async def claim_due(self, now, limit=50):
+        due = [
+            m for m in self.table.rows.values()
+            if m.estado in (EstadoNotificacion.PENDIENTE, EstadoNotificacion.ENVIANDO)
+            and m.proximo_intento <= now
+        ]
+        return [replace(m) for m in due[:limit]]
+
+    async def update_many(self, mensajes):
+        for m in mensajes:
+            self.table.rows[m.id] = replace(m)
+        return len(mensajes)
+
+
+@pytest.fixture
+def outbox(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(dispatcher_module, "OutboxRepository", FakeOutboxRepository)
+    monkeypatch.setattr(dispatcher_module, "now_utc", clock)
+    monkeypatch.setattr(settings, "SMS_MAX_ATTEMPTS", MAX_ATTEMPTS)
+
+    def build(provider, *mensajes):
+        table = FakeOutboxTable(*mensajes)
+        dispatcher = OutboxDispatcher(
+            provider_factory=lambda: provider,
+            session_factory=lambda: FakeSession(table),
+        )
+        # Sin rate limit: aquí solo se prueban los reintentos
+        dispatcher.limiter = KeyedRateLimiter(rate=1000.0, capacity=1000)
+        return dispatcher, table, clock
+
+    return build
+
+
+def _mensaje(id=1):
+    return MensajeSalida(canal="sms", destinatario="+5491100000000", cuerpo="alerta", proximo_intento=START, id=id)
+
+
+def _backoff_bounds(intentos):
+    delay = min(settings.SMS_RETRY_MAX_SECONDS, settings.SMS_RETRY_BASE_SECONDS * 2 ** (intentos - 1))
+    return timedelta(seconds=delay * 0.5), timedelta(seconds=delay)
+
+
+def test_failed_sms_is_retried_with_backoff_until_dead(outbox):
+    provider = FakeSmsProvider(fail_next=MAX_ATTEMPTS)
+    dispatcher, table, clock = outbox(provider, _mensaje())
+
+    async def scenario():
+        for intento in range(1, MAX_ATTEMPTS):
+            assert await dispatcher.dispatch_once() == 1
+            mensaje = table.row(1)
+            assert mensaje.estado == EstadoNotificacion.PENDIENTE
+            assert mensaje.intentos == intento
+            assert mensaje.ultimo_error == "fallo simulado"
+            low, high = _backoff_bounds(intento)
+            assert clock.now + low <= mensaje.proximo_intento <= clock.now + high
+
+            # Antes del backoff no se vuelve a tomar
+            assert await dispatcher.dispatch_once() == 0
+            clock.now = mensaje.proximo_intento
+
+        assert await dispatcher.dispatch_once() == 1
+        # Muerto: no se reintenta más
+        clock.now += timedelta(days=1)
+        assert await dispatcher.dispatch_once() == 0
+
+    asyncio.run(scenario())
+    mensaje = table.row(1)
+    assert mensaje.estado == EstadoNotificacion.FALLIDA
+    assert mensaje.intentos == MAX_ATTEMPTS
+    assert provider.sent == []
+
+
+def test_message_is_claimed_before_sending_and_sent_after_retry(outbox):
+    class RecordingProvider(FakeSmsProvider):
+        async def send(self, to, body):
+            # El claim ya está commiteado cuando sale el HTTP
+            claimed.append((table.row(1).estado, table.commits))
+            return await super().send(to, body)
+
+    claimed = []
+    provider = RecordingProvider(fail_next=1)
+    dispatcher, table, clock = outbox(provider, _mensaje())
+
+    async def scenario():
+        await dispatcher.dispatch_once()
+        clock.now = table.row(1).proximo_intento
+        await dispatcher.dispatch_once()
+
+    asyncio.run(scenario())
+    assert claimed == [(EstadoNotificacion.ENVIANDO, 1), (EstadoNotificacion.ENVIANDO, 3)]
+    mensaje = table.row(1)
+    assert mensaje.estado == EstadoNotificacion.ENVIADA
+    assert mensaje.intentos == 1
+    assert mensaje.proveedor_id == provider.sent[0].sid
+    assert mensaje.ultimo_error is None
+
+
+def test_expired_lease_is_claimed_again(outbox):
+    provider = FakeSmsProvider()
+    # Un dispatcher tomó el mensaje y murió antes de registrar el resultado
+    mensaje = _mensaje()
+    mensaje.mark_sending(START + timedelta(seconds=120))
+    dispatcher, table, clock = outbox(provider, mensaje)
+
+    async def scenario():
+        assert await dispatcher.dispatch_once() == 0
+        clock.now = START + timedelta(seconds=120)
+        assert await dispatcher.dispatch_once() == 1
+
+    asyncio.run(scenario())
+    assert table.row(1).estado == EstadoNotificacion.ENVIADA
+    assert len(provider.sent) == 1
+
+
+def test_permanent_error_is_dead_after_one_attempt(outbox):
+    class RejectingProvider(FakeSmsProvider):
+        async def send(self, to, body):
+            return TwilioSmsResult(
+                to=to, sid=None, success=False, error=RuntimeError("Twilio HTTP 400"), retryable=False
+            )
+
+    dispatcher, table, clock = outbox(RejectingProvider(), _mensaje())
+
+    asyncio.run(dispatcher.dispatch_once())
+    mensaje = table.row(1)
+    assert mensaje.estado == EstadoNotificacion.FALLIDA
+    assert mensaje.intentos == 1
+    assert mensaje.ultimo_error == "Twilio HTTP 400"
@@ -0,0 +1,21 @@
+from app.survillance.ingestion.ws_event_consumer import _extract_probability_series
+
+
+def test_labels_differing_in_case_keep_separate_columns():
+    log_content = {
+        "logs": [
+            {"probabilities": {"Fight": 0.9, "fight": 0.1}},
+            {"probabilities": {"fight": 0.4}},
+            {"probabilities": {"Normal": 0.7, "Fight": "n/a"}},
+        ]
+    }
+
+    assert _extract_probability_series(log_content) == {
+        "Fight": [0.9, 0.0, 0.0],
+        "fight": [0.1, 0.4, 0.0],
+        "Normal": [0.0, 0.0, 0.7],
+    }
+
+
+def test_empty_log_has_no_columns():
+    assert _extract_probability_series({}) == {}
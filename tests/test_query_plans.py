@@ -0,0 +1,111 @@
+"""
+Regresión de planes: con ~1M filas en clips y eventos, los listados, el
+keyset y las búsquedas por rango no hacen Seq Scan sobre ninguna tabla
+(o partición) con datos. Corre contra el Postgres migrado de DATABASE_URL,
+dentro de una transacción que se descarta; PLAN_TEST_ROWS cambia el volumen.
+"""
+import os
+from datetime import timedelta
+
+from sqlalchemy import ARRAY, Integer, String, bindparam, text
+
+from app.shared.time import now_utc
+from app.survillance.domain.enums import TipoEvento
+from app.survillance.infrastructure.repositories import ClipRepository, EventoRepository
+from app.survillance.models import Conexion, Oficina
+from tests.plans import explain_calls, scanned_relations
+
+ROWS = int(os.environ.get("PLAN_TEST_ROWS", "1000000"))
+CAMERAS = 20
+DAYS = 7
+# Una partición con menos filas que esto puede leerse entera sin problema
+SMALL_TABLE_ROWS = 1000
+
+# Filas repartidas entre las cámaras y a lo largo de los últimos DAYS días
+_SEED_CLIPS = text(
+    "INSERT INTO clips (id_conexion, storage_path, start_time_utc, duration_sec, fecha_guardado) "
+    "SELECT (:ids)[1 + g % cardinality(:ids)], 'storage/plan-test.mp4', "
+    "now() - make_interval(secs => g * CAST(:step AS double precision)), 60, now() "
+    "FROM generate_series(1, CAST(:rows AS integer)) AS g"
+).bindparams(bindparam("ids", type_=ARRAY(Integer)))
+
+_SEED_EVENTOS = text(
+    "INSERT INTO eventos (id_conexion, tipo_evento, timestamp_evento, procesado) "
+    "SELECT (:ids)[1 + g % cardinality(:ids)], (:tipos)[1 + g % cardinality(:tipos)], "
+    "now() - make_interval(secs => g * CAST(:step AS double precision)), false "
+    "FROM generate_series(1, CAST(:rows AS integer)) AS g"
+).bindparams(bindparam("ids", type_=ARRAY(Integer)), bindparam("tipos", type_=ARRAY(String)))
+
+
+async def _seed(session):
+    oficina = Oficina(nombre_oficina="plan-test")
+    session.add(oficina)
+    await session.flush()
+    conexiones = [
+        Conexion(id_oficina=oficina.id_oficina, nombre_camara=f"plan-{i}", rtsp_url="rtsp://plan-test")
+        for i in range(CAMERAS)
+    ]
+    session.add_all(conexiones)
+    await session.flush()
+
+    ids = [c.id_conexion for c in conexiones]
+    step = DAYS * 86400 / ROWS
+    await session.execute(_SEED_CLIPS, {"ids": ids, "rows": ROWS, "step": step})
+    await session.execute(
+        _SEED_EVENTOS, {"ids": ids, "tipos": [t.value for t in TipoEvento], "rows": ROWS, "step": step}
+    )
+    await session.execute(text("ANALYZE clips"))
+    await session.execute(text("ANALYZE eventos"))
+    return ids[0]
+
+
+async def _large_relations(session):
+    result = await session.execute(
+        text(
+            "SELECT relname FROM pg_class "
+            "WHERE relkind = 'r' AND reltuples > :rows "
+            "AND (relname LIKE 'clips%' OR relname LIKE 'eventos%')"
+        ),
+        {"rows": SMALL_TABLE_ROWS},
+    )
+    return {row[0] for row in result.all()}
+
+
+def test_hot_paths_do_not_seq_scan(pg_run):
+    async def scenario(session):
+        id_conexion = await _seed(session)
+        clips = ClipRepository(session)
+        eventos = EventoRepository(session)
+
+        now = now_utc()
+        desde, hasta = now - timedelta(days=2), now - timedelta(days=1)
+        after = (now - timedelta(days=3), 1)
+        tipo = TipoEvento.GOLPE.value
+
+        calls = {
+            "clips.list": lambda: clips.list(50),
+            "clips.list camara": lambda: clips.list(50, id_conexion=id_conexion),
+            "clips.list keyset": lambda: clips.list(50, after=after),
+            "clips.list camara keyset": lambda: clips.list(50, id_conexion=id_conexion, after=after),
+            "clips.list rango": lambda: clips.list(50, id_conexion=id_conexion, start_time=desde, end_time=hasta),
+            "clips.list_rows": lambda: clips.list_rows(50, id_conexion=id_conexion),
+            "clips.find_by_time_range": lambda: clips.find_by_time_range(id_conexion, desde, desde + timedelta(hours=1)),
+            "clips.find_overlapping": lambda: clips.find_overlapping(id_conexion, desde, desde + timedelta(hours=1)),
+            "eventos.list": lambda: eventos.list(50),
+            "eventos.list camara": lambda: eventos.list(50, id_conexion=id_conexion),
+            "eventos.list tipo": lambda: eventos.list(50, tipo_evento=tipo),
+            "eventos.list keyset": lambda: eventos.list(50, after=after),
+            "eventos.list tipo keyset": lambda: eventos.list(50, tipo_evento=tipo, after=after),
+            "eventos.list rango": lambda: eventos.list(50, id_conexion=id_conexion, start_time=desde, end_time=hasta),
+        }
+        plans = {name: await explain_calls(session, call) for name, call in calls.items()}
+        return plans, await _large_relations(session)
+
+    plans, large = pg_run(scenario)
+
+    assert large, "el seed no llenó ninguna partición"
+    seq_scans = {
+        name: sorted({table for node, table in scanned_relations(plan) if node == "Seq Scan" and table in large})
+        for name, plan in plans.items()
+    }
+    assert {name: tables for name, tables in seq_scans.items() if tables} == {}
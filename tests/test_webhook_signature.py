@@ -0,0 +1,71 @@
+import asyncio
+import time
+
+import pytest
+from fastapi import Depends, FastAPI, HTTPException
+from fastapi.testclient import TestClient
+
+from app.config.settings import settings
+from app.shared.webhook_signature import (
+    SIGNATURE_HEADER,
+    TIMESTAMP_HEADER,
+    read_body,
+    sign,
+    verified_body,
+)
+
+app = FastAPI()
+
+
+@app.post("/hook")
+async def hook(body: bytes = Depends(verified_body)):
+    return {"size": len(body)}
+
+
+def _chunks(total: int, size: int = 1024):
+    sent = 0
+    while sent < total:
+        yield b"x" * min(size, total - sent)
+        sent += size
+
+
+def test_chunked_body_over_limit_is_rejected(monkeypatch):
+    monkeypatch.setattr(settings, "WEBHOOK_SECRET", "")
+    monkeypatch.setattr(settings, "WEBHOOK_MAX_BODY_BYTES", 4096)
+    client = TestClient(app)
+
+    # Un generador se envía chunked, sin Content-Length
+    response = client.post("/hook", content=_chunks(10_000))
+    assert response.status_code == 413
+
+    response = client.post("/hook", content=_chunks(4096))
+    assert response.status_code == 200
+    assert response.json() == {"size": 4096}
+
+
+def test_read_body_stops_at_the_limit():
+    class StreamingRequest:
+        read = 0
+
+        async def stream(self):
+            for chunk in _chunks(1_000_000):
+                self.read += 1
+                yield chunk
+
+    request = StreamingRequest()
+    with pytest.raises(HTTPException) as exc:
+        asyncio.run(read_body(request, 4096))
+    assert exc.value.status_code == 413
+    assert request.read == 5
+
+
+def test_signed_body_is_verified(monkeypatch):
+    monkeypatch.setattr(settings, "WEBHOOK_SECRET", "s3cret")
+    client = TestClient(app)
+    body = b'{"ok": true}'
+    timestamp = int(time.time())
+    headers = {TIMESTAMP_HEADER: str(timestamp), SIGNATURE_HEADER: sign("s3cret", timestamp, body)}
+
+    assert client.post("/hook", content=body, headers=headers).status_code == 200
+    headers[SIGNATURE_HEADER] = sign("otro", timestamp, body)
+    assert client.post("/hook", content=body, headers=headers).status_code == 401